@@ -1,7 +1,20 @@
 """Kolping Study Cockpit - Local connector with Playwright and keyring."""
 
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 
-from kolping_cockpit.connector import LocalConnector
+if TYPE_CHECKING:
+    from kolping_cockpit.connector import LocalConnector
 
 __all__ = ["LocalConnector"]
+
+
+def __getattr__(name: str) -> Any:
+    # Playwright and keyring are only imported when the connector is used
+    if name == "LocalConnector":
+        from kolping_cockpit.connector import LocalConnector
+
+        return LocalConnector
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -0,0 +1,24 @@
+"""Console entry point for Kolping Study Cockpit (``kolping`` / ``python -m kolping_cockpit``)."""
+
+import sys
+
+
+def main() -> None:
+    """Run the CLI.
+
+    ``kolping version`` is answered without importing Typer, Rich or any
+    command module.
+    """
+    if sys.argv[1:] == ["version"]:
+        from kolping_cockpit import __version__
+
+        sys.stdout.write(f"Kolping Study Cockpit v{__version__}\n")
+        return
+
+    from kolping_cockpit.cli import app
+
+    app()
+
+
+if __name__ == "__main__":
+    main()
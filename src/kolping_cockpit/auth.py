@@ -1,11 +1,16 @@
 """Authentication module for interactive browser login."""
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from kolping_cockpit.settings import get_settings, store_secret
 
+if TYPE_CHECKING:
+    from kolping_cockpit.browser import BlockingProfile, BrowserPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,61 +40,69 @@ def get_auth_storage_path() -> Path:
     return auth_dir
 
 
-def interactive_login(headless: bool = False) -> LoginResult:
+def interactive_login(
+    headless: bool = False, profile: "BlockingProfile | None" = None
+) -> LoginResult:
     """
     Perform interactive login via Playwright browser.
 
     Opens a browser window for Microsoft Entra authentication.
     Supports MFA. Stores session tokens securely after successful login.
+    The browser comes from the browser pool, so inside ``kolping shell`` it
+    is only launched once.
 
     Args:
         headless: Run browser in headless mode (default False for MFA support)
+        profile: Routing profile aborting non-essential requests
 
     Returns:
         LoginResult with success status and extracted tokens
     """
-    from playwright.sync_api import sync_playwright
+    from kolping_cockpit.browser import browser_pool
+
+    with browser_pool() as pool:
+        return pool.run(lambda pool: _interactive_login(pool, headless, profile))
 
+
+async def _interactive_login(
+    pool: "BrowserPool", headless: bool, profile: "BlockingProfile | None"
+) -> LoginResult:
     settings = get_settings()
     auth_storage = get_auth_storage_path() / "state.json"
 
-    with sync_playwright() as p:
-        # Use persistent context to maintain login state
-        browser = p.chromium.launch(headless=headless)
-
-        # Create context with storage state if exists
-        context_options = {
-            "viewport": {"width": 1280, "height": 720},
-        }
-        if auth_storage.exists():
-            context_options["storage_state"] = str(auth_storage)
+    # Create context with storage state if exists
+    context_options: dict[str, Any] = {
+        "viewport": {"width": 1280, "height": 720},
+    }
+    if auth_storage.exists():
+        context_options["storage_state"] = str(auth_storage)
 
-        context = browser.new_context(**context_options)
-        page = context.new_page()
+    async with pool.context(headless=headless, profile=profile, **context_options) as context:
+        page = await context.new_page()
 
         try:
             # Navigate to Moodle portal (will redirect to Microsoft login)
-            page.goto(settings.moodle_login_url, timeout=60000)
+            await page.goto(settings.moodle_login_url, timeout=60000)
 
             # Pre-fill username if available from environment
             if settings.username:
                 try:
                     # Microsoft login form
                     email_input = page.locator('input[type="email"], input[name="loginfmt"]')
-                    if email_input.is_visible(timeout=3000):
-                        email_input.fill(settings.username)
+                    await email_input.wait_for(state="visible", timeout=3000)
+                    await email_input.fill(settings.username)
                 except Exception:
                     logger.debug("Email input not found or not visible yet", exc_info=True)
 
             # Wait for user to complete login
             # We detect successful login by checking for Moodle dashboard URL
-            page.wait_for_url(
+            await page.wait_for_url(
                 f"{settings.moodle_base_url}/**",
                 timeout=300000,  # 5 minutes for MFA
             )
 
             # Extract session cookies
-            cookies = context.cookies()
+            cookies = await context.cookies()
             moodle_session = None
             for cookie in cookies:
                 if cookie["name"] == "MoodleSession":
@@ -100,14 +113,14 @@ def interactive_login(headless: bool = False) -> LoginResult:
             username = settings.username
             try:
                 # Moodle often shows username in user menu
-                user_element = page.locator(".usertext, .usermenu .userbutton")
-                if user_element.is_visible(timeout=2000):
-                    username = user_element.inner_text()
+                user_element = page.locator(".usertext, .usermenu .userbutton").first
+                await user_element.wait_for(state="visible", timeout=2000)
+                username = await user_element.inner_text()
             except Exception:
                 logger.debug("Could not extract username from page", exc_info=True)
 
             # Save browser state for future sessions
-            context.storage_state(path=str(auth_storage))
+            await context.storage_state(path=str(auth_storage))
 
             # Store session in keyring
             if moodle_session:
@@ -128,10 +141,6 @@ def interactive_login(headless: bool = False) -> LoginResult:
                 error=error_msg,
             )
 
-        finally:
-            context.close()
-            browser.close()
-
 
 def get_stored_session() -> tuple[str | None, str | None]:
     """
@@ -152,3 +161,310 @@ def is_logged_in() -> bool:
     """Check if user has stored session tokens."""
     moodle_session, access_token = get_stored_session()
     return bool(moodle_session or access_token)
+
+
+# Entry point of the "Mein Studium" app, whose GraphQL requests carry the bearer token
+CMS_URL = "https://cms.kolping-hochschule.de/"
+
+# Entra pages that need the user: account picker, email/password form, MFA prompts
+LOGIN_FORM_SELECTOR = (
+    'input[name="loginfmt"], input[name="passwd"], input[name="otc"], '
+    "#tilesHolder, #idDiv_SAOTCAS_Title, #idDiv_SAASTO_Title"
+)
+
+
+@dataclass
+class CapturedCredentials:
+    """Credentials captured from a browser session."""
+
+    graphql_token: str | None = None
+    moodle_session: str | None = None
+    interaction_required: bool = False
+
+
+def bearer_token(request: Any, audience: str) -> str | None:
+    """Get the bearer token of a GraphQL request if it is issued for the audience."""
+    if "graphql" not in request.url.lower():
+        return None
+    auth_header = request.headers.get("authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return None
+
+    from kolping_cockpit.tokens import decode_jwt_payload
+
+    token = auth_header[7:]
+    aud = decode_jwt_payload(token).get("aud")
+    matches = audience in aud if isinstance(aud, list) else aud == audience
+    return token if matches else None
+
+
+def is_moodle_dashboard(response: Any, moodle_base_url: str) -> bool:
+    """Whether a response is a Moodle page served to a logged-in user.
+
+    Moodle redirects anonymous sessions to the login page, so a dashboard
+    document means the session cookie set during the SSO redirect is valid.
+    """
+    return (
+        response.url.startswith(f"{moodle_base_url}/my")
+        and response.request.resource_type == "document"
+        and response.status == 200
+    )
+
+
+async def capture_credentials(
+    context: Any,
+    *,
+    token: bool = True,
+    moodle: bool = True,
+    timeout: float = 120,
+    audience: str | None = None,
+    interactive: bool = True,
+) -> CapturedCredentials:
+    """
+    Capture the GraphQL bearer token and the Moodle session of a browser context.
+
+    Opens the CMS and the Moodle dashboard in two pages of the same context and
+    waits for both artifacts at once: the first GraphQL request with a token
+    for the gateway audience, and the dashboard response after which the
+    context holds an authenticated ``MoodleSession`` cookie. When one page
+    completes the SSO login, the other page is reloaded so it follows the
+    Entra SSO cookie instead of waiting for a second login. Returns as soon as
+    all requested artifacts are captured; missing ones are None after the
+    timeout.
+
+    Without ``interactive``, the capture stops as soon as a page shows an
+    Entra login form, account picker or MFA prompt and sets
+    ``interaction_required`` instead of waiting for the user.
+
+    Args:
+        context: Playwright ``BrowserContext`` (async API)
+        token: Capture the GraphQL bearer token
+        moodle: Capture the Moodle session cookie
+        timeout: Seconds to wait for the (interactive) login
+        audience: Required token audience (default: GraphQL gateway)
+        interactive: Wait for the user to log in if SSO does not complete
+
+    Returns:
+        CapturedCredentials with the captured values
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    from kolping_cockpit.tokens import GRAPHQL_AUDIENCE
+
+    settings = get_settings()
+    audience = audience or GRAPHQL_AUDIENCE
+    result = CapturedCredentials()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    pages: dict[str, Any] = {}
+
+    def remaining_ms() -> float:
+        # Playwright treats a timeout of 0 as "wait forever"
+        return max((deadline - loop.time()) * 1000, 1)
+
+    async def follow_sso(done: str) -> None:
+        """Reload the other page once one of them completed the login."""
+        for name, url in (("token", CMS_URL), ("moodle", settings.moodle_login_url)):
+            if name != done and name in pages and not pages[name].is_closed():
+                try:
+                    await pages[name].goto(url, wait_until="commit")
+                except Exception:
+                    logger.debug(f"Failed to reload {url} after SSO", exc_info=True)
+
+    async def capture_token() -> None:
+        request = await context.wait_for_event(
+            "request",
+            predicate=lambda request: bearer_token(request, audience) is not None,
+            timeout=remaining_ms(),
+        )
+        result.graphql_token = bearer_token(request, audience)
+        if moodle and result.moodle_session is None:
+            await follow_sso("token")
+
+    async def capture_moodle_session() -> None:
+        while result.moodle_session is None:
+            await context.wait_for_event(
+                "response",
+                predicate=lambda response: is_moodle_dashboard(response, settings.moodle_base_url),
+                timeout=remaining_ms(),
+            )
+            for cookie in await context.cookies(settings.moodle_base_url):
+                if cookie["name"] == "MoodleSession":
+                    result.moodle_session = cookie["value"]
+        if token and result.graphql_token is None:
+            await follow_sso("moodle")
+
+    async def watch_login_form(page: Any) -> None:
+        await page.wait_for_selector(LOGIN_FORM_SELECTOR, state="visible", timeout=remaining_ms())
+        logger.debug(f"Login needs user interaction on {page.url}")
+        result.interaction_required = True
+        for task in tasks:
+            task.cancel()
+
+    tasks: list[asyncio.Task[None]] = []
+    watchers: list[asyncio.Task[None]] = []
+    try:
+        if token:
+            tasks.append(asyncio.create_task(capture_token()))
+        if moodle:
+            tasks.append(asyncio.create_task(capture_moodle_session()))
+
+        # Start both navigations without waiting for the pages to load
+        if token:
+            pages["token"] = await context.new_page()
+            await pages["token"].goto(CMS_URL, wait_until="commit")
+        if moodle:
+            pages["moodle"] = await context.new_page()
+            await pages["moodle"].goto(settings.moodle_login_url, wait_until="commit")
+
+        if not interactive:
+            watchers = [asyncio.create_task(watch_login_form(page)) for page in pages.values()]
+
+        for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(outcome, PlaywrightTimeoutError):
+                logger.debug("Timed out waiting for browser credentials")
+            elif isinstance(outcome, Exception):
+                logger.debug("Credential capture failed", exc_info=outcome)
+    finally:
+        # Also runs if a navigation fails, so no listener outlives the capture
+        for task in (*tasks, *watchers):
+            task.cancel()
+        await asyncio.gather(*tasks, *watchers, return_exceptions=True)
+    return result
+
+
+async def _acquire_credentials(
+    pool: "BrowserPool",
+    headless: bool,
+    storage_state: Path | None,
+    profile: "BlockingProfile | None",
+    **options: Any,
+) -> CapturedCredentials:
+    context_options: dict[str, Any] = {"viewport": {"width": 1280, "height": 800}}
+    if storage_state is not None and storage_state.exists():
+        context_options["storage_state"] = str(storage_state)
+
+    async with pool.context(headless=headless, profile=profile, **context_options) as context:
+        captured = await capture_credentials(context, **options)
+
+        # Keep the refreshed SSO cookies for the next silent refresh
+        if storage_state is not None and (captured.graphql_token or captured.moodle_session):
+            await context.storage_state(path=str(storage_state))
+        return captured
+
+
+def acquire_credentials(
+    headless: bool = False,
+    *,
+    token: bool = True,
+    moodle: bool = True,
+    timeout: float = 120,
+    interactive: bool = True,
+    profile: "BlockingProfile | None" = None,
+) -> CapturedCredentials:
+    """
+    Open a browser context and capture credentials with :func:`capture_credentials`.
+
+    The browser starts with the saved login state (``state.json``), which is
+    updated after a successful capture.
+
+    Args:
+        headless: Run browser in headless mode (may not work with MFA)
+        token: Capture the GraphQL bearer token
+        moodle: Capture the Moodle session cookie
+        timeout: Seconds to wait for the login
+        interactive: Wait for the user if SSO does not complete on its own
+        profile: Routing profile aborting non-essential requests
+
+    Returns:
+        CapturedCredentials with the captured values
+    """
+    from kolping_cockpit.browser import browser_pool
+
+    storage_state = get_auth_storage_path() / "state.json"
+    with browser_pool() as pool:
+        return pool.run(
+            lambda pool: _acquire_credentials(
+                pool,
+                headless,
+                storage_state,
+                profile,
+                token=token,
+                moodle=moodle,
+                timeout=timeout,
+                interactive=interactive,
+            )
+        )
+
+
+def refresh_credentials(
+    *,
+    token: bool = True,
+    moodle: bool = True,
+    timeout: float = 30,
+    fallback: bool = True,
+    fallback_timeout: float = 120,
+    profile: "BlockingProfile | None" = None,
+) -> CapturedCredentials:
+    """
+    Renew credentials silently from the saved browser login.
+
+    Starts a headless browser with the storage state saved by earlier logins,
+    so the Entra SSO cookie completes the redirects without user interaction.
+    Only if that is not possible (no saved state, expired SSO session, MFA
+    prompt) does it fall back to a visible browser for an interactive login.
+
+    Args:
+        token: Capture the GraphQL bearer token
+        moodle: Capture the Moodle session cookie
+        timeout: Seconds for the silent attempt
+        fallback: Open a visible browser if the silent attempt fails
+        fallback_timeout: Seconds to wait for the interactive login
+        profile: Routing profile aborting non-essential requests
+
+    Returns:
+        CapturedCredentials; ``interaction_required`` is set if the silent
+        attempt needed the user and no fallback was made
+    """
+    from kolping_cockpit.browser import browser_pool
+
+    # Both attempts share one browser pool
+    with browser_pool():
+        return _refresh_credentials(token, moodle, timeout, fallback, fallback_timeout, profile)
+
+
+def _refresh_credentials(
+    token: bool,
+    moodle: bool,
+    timeout: float,
+    fallback: bool,
+    fallback_timeout: float,
+    profile: "BlockingProfile | None",
+) -> CapturedCredentials:
+    captured = CapturedCredentials(interaction_required=True)
+    if (get_auth_storage_path() / "state.json").exists():
+        captured = acquire_credentials(
+            True,
+            token=token,
+            moodle=moodle,
+            timeout=timeout,
+            interactive=False,
+            profile=profile,
+        )
+        if (captured.graphql_token or not token) and (captured.moodle_session or not moodle):
+            return captured
+        logger.debug(f"Silent refresh incomplete (interaction: {captured.interaction_required})")
+
+    if not fallback:
+        return captured
+    interactive = acquire_credentials(
+        False,
+        token=token and not captured.graphql_token,
+        moodle=moodle and not captured.moodle_session,
+        timeout=fallback_timeout,
+        profile=profile,
+    )
+    return CapturedCredentials(
+        graphql_token=captured.graphql_token or interactive.graphql_token,
+        moodle_session=captured.moodle_session or interactive.moodle_session,
+    )
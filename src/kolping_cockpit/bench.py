@@ -0,0 +1,265 @@
+"""Load and latency probe for the Moodle portal and the GraphQL gateway.
+
+``kolping bench`` replays a weighted mix of the operations a sync performs
+(a named GraphQL query, dashboard, course list, calendar month, course page)
+through the real clients, so the numbers include parsing. It runs either a
+fixed number of workers issuing operations back to back (closed loop) or a
+fixed operation rate (open loop). In the open loop, latency is measured from
+the scheduled start, so a backend that falls behind shows up as queueing
+delay instead of as a silently lower rate.
+
+An operation fails if it raises, if any of its HTTP responses has an error
+status, or if a GraphQL query returns errors and no data. Bytes are counted
+from the responses as received (before decoding).
+"""
+
+import math
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from kolping_cockpit.graphql_client import KolpingGraphQLClient
+from kolping_cockpit.moodle_client import KolpingMoodleClient
+
+DEFAULT_MIX = "graphql=2,dashboard,courses,calendar,course"
+
+
+@dataclass
+class BenchClients:
+    """Clients and parameters the operations run with."""
+
+    moodle: KolpingMoodleClient
+    graphql: KolpingGraphQLClient
+    query: str = "myStudentGradeOverview"
+    course_id: str = "1"
+
+
+def _graphql(clients: BenchClients) -> None:
+    response = clients.graphql.execute_named_query(clients.query)
+    if response.has_errors and not response.data:
+        raise RuntimeError(response.errors[0].message)  # type: ignore[index]
+
+
+OPERATIONS: dict[str, Callable[[BenchClients], Any]] = {
+    "graphql": _graphql,
+    "dashboard": lambda clients: clients.moodle.get_dashboard(),
+    "courses": lambda clients: clients.moodle.get_courses(),
+    "calendar": lambda clients: clients.moodle.get_calendar_events(),
+    "course": lambda clients: clients.moodle.get_course_details(clients.course_id),
+}
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Parse an operation mix such as 'graphql=3,dashboard,courses=0.5'.
+
+    Operations without a weight get weight 1.
+
+    Raises:
+        ValueError: For unknown operations or invalid weights
+    """
+    mix: dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}' (known: {', '.join(OPERATIONS)})")
+        value = float(weight) if weight else 1.0
+        if not math.isfinite(value) or value < 0:
+            raise ValueError(f"Invalid weight for '{name}': {weight}")
+        mix[name] = value
+    if not any(mix.values()):
+        raise ValueError("The mix contains no operation with a positive weight")
+    return mix
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class BenchSample:
+    """One executed operation."""
+
+    operation: str
+    latency: float = 0.0  # seconds
+    requests: int = 0
+    bytes: int = 0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded."""
+        return self.error is None
+
+
+@dataclass
+class OperationStats:
+    """Aggregated samples of one operation (or of all, as 'total')."""
+
+    operation: str
+    count: int
+    errors: int
+    requests: int
+    bytes: int
+    p50: float  # seconds
+    p95: float
+    p99: float
+    throughput: float  # operations per second
+
+    @property
+    def error_rate(self) -> float:
+        """Share of failed operations (0-1)."""
+        return self.errors / self.count if self.count else 0.0
+
+
+@dataclass
+class BenchReport:
+    """Samples of a benchmark run."""
+
+    samples: list[BenchSample] = field(default_factory=list)
+    elapsed: float = 0.0  # seconds
+
+    def _aggregate(self, operation: str, samples: list[BenchSample]) -> OperationStats:
+        latencies = [s.latency for s in samples]
+        return OperationStats(
+            operation=operation,
+            count=len(samples),
+            errors=sum(1 for s in samples if not s.ok),
+            requests=sum(s.requests for s in samples),
+            bytes=sum(s.bytes for s in samples),
+            p50=percentile(latencies, 50),
+            p95=percentile(latencies, 95),
+            p99=percentile(latencies, 99),
+            throughput=len(samples) / self.elapsed if self.elapsed else 0.0,
+        )
+
+    def stats(self) -> list[OperationStats]:
+        """Statistics per operation (in order of first use), then the total."""
+        by_operation: dict[str, list[BenchSample]] = {}
+        for sample in self.samples:
+            by_operation.setdefault(sample.operation, []).append(sample)
+        rows = [self._aggregate(name, samples) for name, samples in by_operation.items()]
+        return [*rows, self._aggregate("total", self.samples)]
+
+    def error_kinds(self) -> Counter[str]:
+        """Number of failures per error description."""
+        return Counter(s.error for s in self.samples if s.error is not None)
+
+
+# Sample of the operation running on the current worker thread
+_current = threading.local()
+
+
+def _record_response(response: httpx.Response) -> None:
+    sample: BenchSample | None = getattr(_current, "sample", None)
+    if sample is None:
+        return
+    response.read()
+    sample.requests += 1
+    sample.bytes += response.num_bytes_downloaded
+    if response.status_code >= 400 and sample.error is None:
+        sample.error = f"HTTP {response.status_code}"
+
+
+def _instrument(client: httpx.Client) -> None:
+    hooks = client.event_hooks
+    if _record_response not in hooks["response"]:
+        client.event_hooks = {**hooks, "response": [*hooks["response"], _record_response]}
+
+
+def _execute(clients: BenchClients, operation: str, scheduled: float) -> BenchSample:
+    sample = BenchSample(operation)
+    _current.sample = sample
+    try:
+        OPERATIONS[operation](clients)
+    except Exception as e:
+        if sample.error is None:
+            sample.error = type(e).__name__
+    finally:
+        _current.sample = None
+        sample.latency = time.perf_counter() - scheduled
+    return sample
+
+
+def run_bench(
+    clients: BenchClients,
+    mix: dict[str, float],
+    *,
+    concurrency: int = 4,
+    rate: float | None = None,
+    duration: float | None = 10.0,
+    max_operations: int | None = None,
+    seed: int | None = None,
+) -> BenchReport:
+    """Run the operation mix against the clients' endpoints.
+
+    Args:
+        clients: Clients to run the operations with (instrumented in place)
+        mix: Operation weights, see :func:`parse_mix`
+        concurrency: Workers (closed loop) or maximum operations in flight (open loop)
+        rate: Operations per second for an open loop; None runs back to back
+        duration: Seconds to run (None: until ``max_operations``)
+        max_operations: Stop after this many operations
+        seed: Seed for the operation order
+
+    Returns:
+        The samples and the wall-clock time of the run
+    """
+    if duration is None and max_operations is None:
+        raise ValueError("Either a duration or a maximum number of operations is required")
+    _instrument(clients.moodle.client)
+    _instrument(clients.graphql.client)
+
+    names, weights = list(mix), list(mix.values())
+    start = time.perf_counter()
+    deadline = math.inf if duration is None else start + duration
+    limit = math.inf if max_operations is None else max_operations
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as pool:
+        if rate is None:
+            lock = threading.Lock()
+            issued = 0
+
+            def worker(rng: random.Random) -> list[BenchSample]:
+                nonlocal issued
+                samples = []
+                while time.perf_counter() < deadline:
+                    with lock:
+                        if issued >= limit:
+                            break
+                        issued += 1
+                    operation = rng.choices(names, weights)[0]
+                    samples.append(_execute(clients, operation, time.perf_counter()))
+                return samples
+
+            rngs = [
+                random.Random(None if seed is None else seed + i)  # noqa: S311
+                for i in range(concurrency)
+            ]
+            futures = [pool.submit(worker, rng) for rng in rngs]
+            samples = [sample for future in futures for sample in future.result()]
+        else:
+            rng = random.Random(seed)  # noqa: S311
+            interval = 1 / rate
+            scheduled_futures = []
+            index = 0
+            while index < limit and (scheduled := start + index * interval) < deadline:
+                time.sleep(max(0.0, scheduled - time.perf_counter()))
+                operation = rng.choices(names, weights)[0]
+                scheduled_futures.append(pool.submit(_execute, clients, operation, scheduled))
+                index += 1
+            samples = [future.result() for future in scheduled_futures]
+
+    return BenchReport(samples=samples, elapsed=time.perf_counter() - start)
@@ -0,0 +1,258 @@
+"""Shared Playwright helpers for the browser-based flows.
+
+Login, token capture and the local connector only need a few documents,
+scripts, one request header and one cookie from the CMS, Moodle and the
+Microsoft login pages. Loading their images, videos, fonts, analytics and
+other third-party content makes every run slower without changing the
+result. :class:`BlockingProfile` installs a route on a browser context that
+aborts such requests.
+
+Launching Chromium costs seconds, creating a context in a running browser
+milliseconds. :class:`BrowserPool` keeps the browser process alive (for the
+lifetime of ``kolping shell``/``watch``, or of one command) and hands out a
+fresh context for every use.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+from urllib.parse import urlsplit
+
+from kolping_cockpit.session import current_session
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BlockingProfile:
+    """Network routing profile that aborts non-essential browser requests.
+
+    A request is aborted if its resource type is blocked, or if its host does
+    not end with one of the allowed host suffixes. The counters show how much
+    a run saved.
+    """
+
+    resource_types: frozenset[str] = frozenset({"image", "media", "font"})
+    allow_hosts: tuple[str, ...] = ()
+    blocked: int = 0
+    allowed: int = 0
+    blocked_hosts: set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_settings(cls) -> "BlockingProfile | None":
+        """Create the profile configured in the settings (None if disabled)."""
+        from kolping_cockpit.settings import get_settings
+
+        settings = get_settings()
+        if not settings.browser_block:
+            return None
+        return cls(
+            resource_types=frozenset(settings.browser_block_resources),
+            allow_hosts=tuple(settings.browser_allow_hosts),
+        )
+
+    def is_allowed_host(self, url: str) -> bool:
+        """Whether the URL's host is first-party (an allowed suffix, or any if none)."""
+        if not self.allow_hosts:
+            return True
+        host = urlsplit(url).hostname or ""
+        return any(host == suffix or host.endswith(f".{suffix}") for suffix in self.allow_hosts)
+
+    def should_block(self, request: Any) -> bool:
+        """Whether a Playwright request is aborted by this profile."""
+        if request.url.startswith(("data:", "blob:")):
+            return False
+        return request.resource_type in self.resource_types or not self.is_allowed_host(request.url)
+
+    def handle(self, route: Any) -> Any:
+        """Route handler; works with the sync and the async Playwright API."""
+        if self.should_block(route.request):
+            self.blocked += 1
+            self.blocked_hosts.add(urlsplit(route.request.url).hostname or "")
+            return route.abort()
+        self.allowed += 1
+        return route.continue_()
+
+    def attach(self, context: Any) -> Any:
+        """Install the profile on a browser context.
+
+        Returns:
+            The result of ``context.route`` (a coroutine with the async API)
+        """
+        return context.route("**/*", self.handle)
+
+    def summary(self) -> str:
+        """Describe the requests handled so far, e.g. '42 blocked, 17 allowed'."""
+        return f"{self.blocked} blocked, {self.allowed} allowed"
+
+
+class BrowserPool:
+    """Keeps Chromium running and hands out browser contexts.
+
+    The pool runs the async Playwright API on its own event loop thread, so
+    synchronous callers (CLI commands, the shell) submit coroutines with
+    :meth:`run` and the browser outlives each call. A headless and a headed
+    browser (interactive login) are launched on first use.
+
+    Every context holds credentials (saved login state, session cookies), so
+    contexts are never shared or reused: each use gets a new context, which
+    is closed afterwards. Creating one in the running browser is what makes
+    browser operations fast.
+    """
+
+    def __init__(self) -> None:
+        self.launches = 0
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._playwright: Any = None
+        self._browsers: dict[bool, Any] = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def run(self, func: Callable[["BrowserPool"], Coroutine[Any, Any, T]]) -> T:
+        """Run a coroutine function on the pool's event loop and wait for its result.
+
+        Args:
+            func: Called with the pool; typically uses :meth:`context`
+        """
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BrowserPool.run() called from the pool's own event loop")
+        return asyncio.run_coroutine_threadsafe(func(self), loop).result()
+
+    def iterate(self, func: Callable[["BrowserPool"], AsyncIterator[T]]) -> Iterator[T]:
+        """Run an async generator on the pool's event loop and yield its items as they arrive.
+
+        Args:
+            func: Called with the pool; returns the async generator to consume
+        """
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BrowserPool.iterate() called from the pool's own event loop")
+        items: queue.Queue[Any] = queue.Queue()
+        done = object()
+
+        async def pump() -> None:
+            try:
+                async for item in func(self):
+                    items.put(item)
+            finally:
+                items.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), loop)
+        try:
+            while (item := items.get()) is not done:
+                yield item
+            future.result()  # re-raise errors of the generator
+        finally:
+            future.cancel()  # consumer stopped early
+
+    async def browser(self, headless: bool = True) -> Any:
+        """The running browser, launched on first use (and again if it crashed)."""
+        browser = self._browsers.get(headless)
+        if browser is not None and browser.is_connected():
+            return browser
+
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        browser = await self._playwright.chromium.launch(headless=headless)
+        self.launches += 1
+        self._browsers[headless] = browser
+        return browser
+
+    @asynccontextmanager
+    async def context(
+        self,
+        *,
+        headless: bool = True,
+        profile: BlockingProfile | None = None,
+        **options: Any,
+    ) -> AsyncIterator[Any]:
+        """Hand out a new browser context, closed when the block ends.
+
+        Args:
+            headless: Use the headless browser (False for interactive login)
+            profile: Routing profile attached to the context
+            **options: ``new_context`` options, e.g. ``storage_state``
+        """
+        context = await (await self.browser(headless)).new_context(**options)
+        try:
+            if profile is not None:
+                await profile.attach(context)
+            yield context
+        finally:
+            await _close_quietly(context)
+
+    async def _shutdown(self) -> None:
+        for browser in self._browsers.values():
+            await _close_quietly(browser)
+        self._browsers.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def close(self) -> None:
+        """Close the browsers and stop the loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=30)
+        except Exception:
+            logger.debug("Failed to shut down browser pool", exc_info=True)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+async def _close_quietly(target: Any) -> None:
+    try:
+        await target.close()
+    except Exception:
+        logger.debug("Failed to close browser resource", exc_info=True)
+
+
+_active_pool: BrowserPool | None = None
+
+
+@contextmanager
+def browser_pool() -> Iterator[BrowserPool]:
+    """Yield a browser pool, reusing the shell session's or an enclosing block's pool.
+
+    Outside of a session, the outermost block creates the pool and closes it
+    at the end, so nested browser operations share one browser.
+    """
+    global _active_pool
+    session = current_session()
+    if session is not None:
+        yield session.browser
+        return
+    if _active_pool is not None:
+        yield _active_pool
+        return
+
+    pool = _active_pool = BrowserPool()
+    try:
+        yield pool
+    finally:
+        _active_pool = None
+        pool.close()
@@ -0,0 +1,271 @@
+"""Incremental index of HTTP captures for offline analysis (``kolping analyze``).
+
+Captures live in ``docs/<name>/`` folders: ``response_body.json`` with a
+GraphQL response, ``*.html`` pages saved from Moodle and ``*.har`` browser
+exports (also directly in ``docs/``), which are streamed entry by entry. Extracting their data
+means parsing JSON and building a BeautifulSoup tree per page (after the byte
+prefilter of :mod:`kolping_cockpit.prefilter`), so the results are kept in an
+index (``exports/.cache/captures.json``) with the path, mtime, size and content
+hash of each file.
+
+A scan stats every capture and only parses files that are new or changed;
+files whose stat changed but whose hash did not (e.g. after a copy) are not
+parsed again either. Larger batches are parsed in a process pool.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from kolping_cockpit.prefilter import (
+    EVENT_MARKERS,
+    GRAPHQL_MARKERS,
+    contains_any,
+    event_strainer,
+    open_bytes,
+    parse_filtered,
+)
+
+logger = logging.getLogger(__name__)
+
+# Below this many files to parse, a process pool costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+INDEX_VERSION = 1
+
+
+@dataclass
+class CaptureEntry:
+    """Index record of one capture file and the data extracted from it."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    kind: str  # "graphql", "html" or "har"
+    grade: dict[str, Any] | None = None
+    student: dict[str, Any] | None = None
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class CaptureData:
+    """Data extracted from all captures of a directory."""
+
+    grade: dict[str, Any] | None = None
+    student: dict[str, Any] | None = None
+    events: list[dict[str, Any]] = field(default_factory=list)
+    entries: list[CaptureEntry] = field(default_factory=list)
+    parsed: int = 0
+
+
+def _sha256(content: bytes | mmap.mmap) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _file_sha256(path: Path) -> str:
+    with open_bytes(path) as content:
+        return _sha256(content)
+
+
+def _extract_graphql(content: bytes | mmap.mmap) -> dict[str, Any]:
+    if not contains_any(content, GRAPHQL_MARKERS):
+        return {}
+    try:
+        data = json.loads(content[:])
+    except ValueError:
+        return {}
+    if not isinstance(data, dict) or not isinstance(data.get("data"), dict):
+        return {}
+    return {
+        "grade": data["data"].get("myStudentGradeOverview"),
+        "student": data["data"].get("myStudentData"),
+    }
+
+
+def _extract_calendar(content: bytes | mmap.mmap) -> dict[str, Any]:
+    soup = parse_filtered(content, EVENT_MARKERS, event_strainer())
+    if soup is None:
+        return {}
+    events = []
+    for elem in soup.find_all("div", class_="event", attrs={"data-region": "event-item"}):
+        link = elem.find("a", attrs={"data-event-id": True})
+        date_div = elem.find("div", class_="date")
+        if not (link and date_div):
+            continue
+
+        # Extract timestamp from link href
+        href = str(link.get("href", ""))
+        match = re.search(r"time=(\d+)", href)
+        events.append(
+            {
+                "title": link.get_text(strip=True),
+                "date_text": date_div.get_text(strip=True).replace("»", "→"),
+                "timestamp": int(match.group(1)) if match else None,
+                "url": href,
+            }
+        )
+    return {"events": events}
+
+
+def _extract_har(path: Path) -> dict[str, Any]:
+    from kolping_cockpit.har import iter_har_entries
+
+    extracted: dict[str, Any] = {"events": []}
+    for entry in iter_har_entries(path):
+        if entry.is_graphql:
+            for key, value in _extract_graphql(entry.body()).items():
+                if value:
+                    extracted[key] = value
+        elif entry.is_html:
+            extracted["events"].extend(_extract_calendar(entry.body()).get("events", []))
+    return extracted
+
+
+def parse_capture(path: str, kind: str) -> CaptureEntry:
+    """Read, hash and extract one capture file (runs in pool workers)."""
+    file_path = Path(path)
+    stat = file_path.stat()
+    with open_bytes(file_path) as content:
+        digest = _sha256(content)
+        try:
+            if kind == "har":
+                extracted = _extract_har(file_path)
+            elif kind == "graphql":
+                extracted = _extract_graphql(content)
+            else:
+                extracted = _extract_calendar(content)
+        except Exception:
+            logger.debug(f"Failed to parse capture {file_path.name}", exc_info=True)
+            extracted = {}
+    return CaptureEntry(
+        path=path,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        sha256=digest,
+        kind=kind,
+        **extracted,
+    )
+
+
+def iter_capture_files(docs_dir: Path) -> Iterator[tuple[Path, str]]:
+    """List the capture files of a directory as (path, kind), in analysis order."""
+    for subdir in sorted(docs_dir.iterdir()):
+        if subdir.suffix == ".har" and subdir.is_file():
+            yield subdir, "har"
+        if not subdir.is_dir():
+            continue
+        response_file = subdir / "response_body.json"
+        if response_file.exists():
+            yield response_file, "graphql"
+        for html_file in sorted(subdir.glob("*.html")):
+            yield html_file, "html"
+        for har_file in sorted(subdir.glob("*.har")):
+            yield har_file, "har"
+
+
+class CaptureIndex:
+    """JSON index of parsed capture files."""
+
+    def __init__(self, path: Path | None, workers: int | None = None):
+        """Initialize the index.
+
+        Args:
+            path: Index file (None keeps the index in memory only)
+            workers: Size of the process pool (default: CPU count)
+        """
+        self.path = Path(path) if path else None
+        self.workers = workers
+        self.entries: dict[str, CaptureEntry] = self._load()
+
+    @classmethod
+    def from_settings(cls, workers: int | None = None) -> "CaptureIndex":
+        """Open the index at the configured location."""
+        from kolping_cockpit.settings import get_settings
+
+        return cls(get_settings().get_capture_index_path(), workers)
+
+    def _load(self) -> dict[str, CaptureEntry]:
+        if self.path is None:
+            return {}
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                content = json.load(f)
+            if content.get("version") != INDEX_VERSION:
+                return {}
+            return {e["path"]: CaptureEntry(**e) for e in content["entries"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {"version": INDEX_VERSION, "entries": [asdict(e) for e in self.entries.values()]},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.path)
+
+    def _parse_all(self, todo: list[tuple[str, str]]) -> list[CaptureEntry]:
+        if len(todo) < PARALLEL_THRESHOLD or self.workers == 1:
+            return [parse_capture(path, kind) for path, kind in todo]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            paths, kinds = zip(*todo, strict=True)
+            return list(pool.map(parse_capture, paths, kinds, chunksize=4))
+
+    def scan(self, docs_dir: Path) -> CaptureData:
+        """Bring the index up to date with a capture directory and collect its data.
+
+        Later captures win for the grade overview and student data; events of
+        all pages are combined and deduplicated by timestamp.
+        """
+        files = list(iter_capture_files(docs_dir))
+        todo: list[tuple[str, str]] = []
+        for file_path, kind in files:
+            key = str(file_path.resolve())
+            entry = self.entries.get(key)
+            stat = file_path.stat()
+            if entry is None or entry.kind != kind:
+                todo.append((key, kind))
+            elif (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+                if entry.size == stat.st_size and entry.sha256 == _file_sha256(file_path):
+                    entry.mtime_ns = stat.st_mtime_ns  # touched or copied, same content
+                else:
+                    todo.append((key, kind))
+
+        for entry in self._parse_all(todo):
+            self.entries[entry.path] = entry
+
+        # Forget files removed from this directory
+        current = {str(file_path.resolve()) for file_path, _kind in files}
+        root = str(docs_dir.resolve()) + os.sep
+        for key in [k for k in self.entries if k.startswith(root) and k not in current]:
+            del self.entries[key]
+        self.save()
+
+        data = CaptureData(parsed=len(todo))
+        seen_timestamps = set()
+        for file_path, _kind in files:
+            entry = self.entries[str(file_path.resolve())]
+            data.entries.append(entry)
+            data.grade = entry.grade or data.grade
+            data.student = entry.student or data.student
+            for event in entry.events:
+                ts = event.get("timestamp")
+                if ts and ts not in seen_timestamps:
+                    seen_timestamps.add(ts)
+                    data.events.append(event)
+        return data
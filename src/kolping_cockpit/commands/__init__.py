@@ -0,0 +1,206 @@
+"""CLI command modules for Kolping Study Cockpit.
+
+Each module defines a Typer app with one or more commands. The top-level CLI
+(:mod:`kolping_cockpit.cli`) imports a module only when one of its commands
+runs, so heavy dependencies (httpx, bs4, playwright, keyring, pydantic-settings)
+stay out of ``kolping --help`` and ``kolping version``. Command bodies import
+clients and settings locally for the same reason.
+"""
+
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+import typer
+from rich.console import Console
+
+from kolping_cockpit.render import OutputFormat
+from kolping_cockpit.session import current_session
+
+if TYPE_CHECKING:
+    from kolping_cockpit.render import Renderer
+
+logger = logging.getLogger(__name__)
+
+console = Console()
+
+# --format option of the reporting commands (deadlines, exams, analyze, fetch)
+FORMAT_OPTION = typer.Option(
+    OutputFormat.RICH, "--format", help="Output format: rich, plain, json or ndjson (scripts)"
+)
+
+
+@contextmanager
+def graphql_client() -> Iterator[Any]:
+    """Yield a GraphQL client, reusing the shell session's client when one is active."""
+    session = current_session()
+    if session is not None:
+        yield session.graphql
+        return
+
+    from kolping_cockpit.graphql_client import KolpingGraphQLClient
+
+    with KolpingGraphQLClient() as client:
+        yield client
+
+
+@contextmanager
+def moodle_client() -> Iterator[Any]:
+    """Yield a Moodle client, reusing the shell session's client when one is active."""
+    session = current_session()
+    if session is not None:
+        yield session.moodle
+        return
+
+    from kolping_cockpit.moodle_client import KolpingMoodleClient
+
+    with KolpingMoodleClient() as client:
+        yield client
+
+
+def commit_to_store(files: dict, log: Callable[[str], Any] = console.print) -> None:
+    """Commit export files to today's snapshot in the export store."""
+    from kolping_cockpit.export_store import ExportStore
+
+    session = current_session()
+    store = session.store if session is not None else ExportStore.from_settings()
+    result = store.commit(files)
+    log(f"[green]✓ Snapshot {result.snapshot.date} stored: {', '.join(sorted(files))}[/green]")
+    log(f"[dim]  {result.new_chunks} new / {result.total_chunks} chunks ({store.root})[/dim]")
+
+
+def record_history(data: dict) -> None:
+    """Append the grade overview contained in fetched data to the history database."""
+    from datetime import UTC, datetime
+
+    from kolping_cockpit.history import GradeHistory
+
+    timestamp = datetime.now(UTC).isoformat()
+    session = current_session()
+    try:
+        if session is not None:
+            session.history.record_export(data, timestamp)
+        else:
+            with GradeHistory.from_settings() as history:
+                history.record_export(data, timestamp)
+    except Exception:
+        logger.debug("Failed to record grade history", exc_info=True)
+
+
+# Change event type -> label for refresh summaries
+_CHANGE_LABELS = {
+    "grade": "Note",
+    "status": "Status",
+    "module": "Modul",
+    "deadline": "Neuer Termin",
+    "deadline_changed": "Termin geändert",
+    "deadline_removed": "Termin entfällt",
+    "overview": "Übersicht",
+}
+
+
+def _short(value: Any) -> str:
+    if value is None or value == "":
+        return "–"
+    if isinstance(value, dict | list):
+        return "…"
+    return str(value)[:40]
+
+
+def output_renderer(output_format: Any) -> "Renderer":
+    """Create the renderer for a ``--format`` option value."""
+    from kolping_cockpit.render import create_renderer
+
+    return create_renderer(output_format, console)
+
+
+def print_fetch_errors(data: dict, log: Callable[[str], Any] = console.print) -> None:
+    """Print the errors collected by a fetch function."""
+    if data.get("errors"):
+        log("\n[yellow]⚠ Einige Datenquellen nicht verfügbar:[/yellow]")
+        for err in data["errors"]:
+            log(f"  [dim]{err}[/dim]")
+
+
+def stale_while_revalidate(
+    fetch: Callable[[Callable[[str], Any]], dict],
+    render: Callable[[dict], Any],
+    out: "Renderer",
+    fresh: bool = False,
+) -> None:
+    """Render the last known snapshot immediately and refresh it in the background.
+
+    Without cached data (or with ``fresh``) the command waits for the fetch and
+    renders live data as before. Otherwise the cached snapshot is rendered with
+    its age, and a concise summary of what changed follows once the background
+    refresh is done. Machine-readable formats render once: the refreshed
+    snapshot, or the cached one if the refresh failed.
+
+    Args:
+        fetch: Fetches a ``fetch.json``-shaped export (with an "errors" list);
+               receives a function for progress messages
+        render: Renders a normalized snapshot
+        out: Renderer of the command
+        fresh: Skip the cache and wait for live data
+    """
+    from kolping_cockpit import swr
+    from kolping_cockpit.snapshot import normalize_snapshot
+
+    cached = None if fresh else swr.load_cached()
+    if cached is None or not out.interactive:
+        data = fetch(out.message)
+        print_fetch_errors(data, out.message)
+        parts = swr.fetched_parts(data)
+        updated = None
+        if parts:
+            updated = swr.update_cache(data, cached if cached is not None else swr.load_cached())
+            record_history(data)
+        if cached is None:
+            render(normalize_snapshot({"fetch.json": data}))
+        else:
+            render(updated or cached)
+        return
+
+    refresh = swr.Revalidation(lambda: fetch(lambda _message: None))
+    console.print(
+        f"[dim]Stand: {swr.format_age(cached.get('timestamp'))} "
+        "– Aktualisierung läuft im Hintergrund[/dim]"
+    )
+    render(cached)
+
+    try:
+        with console.status("[dim]Aktualisiere...[/dim]"):
+            data = refresh.wait()
+    except Exception as e:
+        logger.debug("Background refresh failed", exc_info=True)
+        console.print(f"\n[yellow]⚠ Aktualisierung fehlgeschlagen: {e}[/yellow]")
+        return
+
+    parts = swr.fetched_parts(data)
+    if not parts:
+        console.print(
+            "\n[yellow]⚠ Aktualisierung fehlgeschlagen – angezeigt: letzter Stand[/yellow]"
+        )
+        for err in data.get("errors", []):
+            console.print(f"  [dim]{err}[/dim]")
+        return
+
+    updated = swr.update_cache(data, cached)
+    record_history(data)
+    changes = swr.changes(cached, updated, parts)
+    if not changes:
+        console.print("\n[green]✓ Aktuell – keine Änderungen[/green]")
+    else:
+        console.print(f"\n[bold]🔄 {len(changes)} Änderung(en) seit dem angezeigten Stand:[/bold]")
+        for change in changes:
+            what = change.label or change.key or change.path
+            detail = f" ({change.field})" if change.field and change.type == "module" else ""
+            values = ""
+            if not isinstance(change.old, dict) and not isinstance(change.new, dict):
+                values = f": {_short(change.old)} → {_short(change.new)}"
+            console.print(
+                f"  • {_CHANGE_LABELS.get(change.type, change.type)}: {what}{detail}{values}"
+            )
+    for err in data.get("errors", []):
+        console.print(f"  [dim]{err}[/dim]")
@@ -0,0 +1,228 @@
+"""Analyze command: offline analysis of HTTP captures."""
+
+import logging
+from datetime import datetime
+
+import typer
+
+from kolping_cockpit.commands import FORMAT_OPTION, output_renderer
+from kolping_cockpit.render import Column, OutputFormat
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer()
+
+_STATUS_MARKUP = {
+    "bestanden": "[green]bestanden[/green]",
+    "nicht bestanden": "[red]nicht bestanden[/red]",
+    "angemeldet": "[blue]ANGEMELDET[/blue]",
+    "abgemeldet": "[yellow]abgemeldet[/yellow]",
+}
+
+EXAM_COLUMNS = [
+    Column("modulbezeichnung", "Modul", style="bold", truncate=45),
+    Column("semester", "Sem.", justify="center"),
+    Column(
+        "examStatus",
+        "Status",
+        style="cyan",
+        empty="offen",
+        format=lambda s: _STATUS_MARKUP.get(s, f"[dim]{s}[/dim]"),
+    ),
+    Column("note", "Note", justify="right", empty="-"),
+    Column("eCTS", "ECTS", justify="right", empty="0"),
+]
+
+REGISTERED_COLUMNS = [
+    Column("modulbezeichnung", "Modul", style="bold", truncate=50),
+    Column("semester", "Sem.", justify="center"),
+    Column("pruefungsform", "Prüfungsform", style="cyan"),
+    Column("eCTS", "ECTS", justify="right", empty="0"),
+]
+
+FAILED_COLUMNS = REGISTERED_COLUMNS[:3]
+
+EVENT_COLUMNS = [
+    Column("title", "Modul/Event", style="bold", max_width=40, truncate=40),
+    Column(
+        "start_time",
+        "Datum & Zeit",
+        style="cyan",
+        max_width=35,
+        format=lambda iso: datetime.fromisoformat(iso).strftime("%a, %d.%m.%Y %H:%M"),
+    ),
+]
+
+
+@app.command("analyze")
+def analyze_captures(
+    docs_dir: str = typer.Option("docs", "--docs", "-d", help="Directory with HTTP captures"),
+    show_all: bool = typer.Option(
+        False, "--all", "-a", help="Show all modules, not just open ones"
+    ),
+    jobs: int = typer.Option(
+        None, "--jobs", "-j", help="Parallel parser processes (default: CPU count)"
+    ),
+    output_format: OutputFormat = FORMAT_OPTION,
+) -> None:
+    """
+    Analyze captured HTTP data for exam dates and deadlines.
+
+    Reads from local capture files (docs/ folder) to extract:
+    - GraphQL grade overview with exam status
+    - Moodle calendar events with dates
+    - Klausur (exam) dates
+
+    This works offline using previously captured data. Parsed captures are
+    indexed, so repeated runs only read new or changed files.
+    """
+    from datetime import UTC
+    from pathlib import Path
+
+    out = output_renderer(output_format)
+    out.print("[bold cyan]📊 Kolping Study Cockpit - Offline Analyse[/bold cyan]")
+    out.print("=" * 60)
+
+    docs_path = Path(docs_dir)
+    if not docs_path.exists():
+        out.message(f"[red]✗ Verzeichnis nicht gefunden: {docs_path}[/red]")
+        raise typer.Exit(code=1)
+
+    # 1. Load grade overview, student data and calendar events (parsing only new captures)
+    from kolping_cockpit.captures import CaptureIndex
+
+    out.message("\n[dim]Suche Prüfungsdaten und Kalender-Daten...[/dim]")
+    captures = CaptureIndex.from_settings(workers=jobs).scan(docs_path)
+    for entry in captures.entries:
+        location = f"{Path(entry.path).parent.name}/"
+        if entry.grade:
+            out.message(f"[green]✓ Prüfungsdaten gefunden in {location}[/green]")
+        if entry.student:
+            out.message(f"[green]✓ Studentendaten gefunden in {location}[/green]")
+        if entry.events:
+            name = Path(entry.path).name
+            out.message(f"[green]✓ {len(entry.events)} Events gefunden in {name}[/green]")
+    out.message(f"[dim]{len(captures.entries)} Captures, {captures.parsed} neu eingelesen[/dim]")
+
+    grade_data = captures.grade
+    student_data = captures.student
+    calendar_events = captures.events
+
+    # 3. Display student info
+    if student_data:
+        name = f"{student_data.get('vorname', '')} {student_data.get('nachname', '')}"
+        out.print()
+        out.fields("student", [("name", "Student", name)])
+
+    # 4. Display exam overview from GraphQL
+    if grade_data:
+        out.fields(
+            "overview",
+            [
+                (
+                    "currentSemester",
+                    "Aktuelles Semester",
+                    grade_data.get("currentSemester", "Unbekannt"),
+                ),
+                ("grade", "Notendurchschnitt", grade_data.get("grade", "-")),
+                ("eCTS", "Erreichte ECTS", grade_data.get("eCTS", 0)),
+            ],
+        )
+
+        modules = grade_data.get("modules", [])
+
+        # Find all Klausuren (exams)
+        out.table(
+            "exams",
+            "📝 ALLE KLAUSUREN",
+            EXAM_COLUMNS,
+            sorted(
+                (m for m in modules if m.get("pruefungsform") == "Klausur"),
+                key=lambda x: (x.get("semester", 99), x.get("modulbezeichnung", "")),
+            ),
+            title_style="bold magenta",
+            border_style="magenta",
+        )
+
+        # Categorize all modules
+        angemeldet = [m for m in modules if m.get("examStatus") == "angemeldet"]
+        nicht_bestanden = [m for m in modules if m.get("examStatus") == "nicht bestanden"]
+        abgemeldet = [m for m in modules if m.get("examStatus") == "abgemeldet"]
+        offen = [
+            m
+            for m in modules
+            if m.get("examStatus") is None and m.get("pruefungsform") != "Anerkennung"
+        ]
+        bestanden = [m for m in modules if m.get("examStatus") == "bestanden"]
+        anerkannt = [m for m in modules if m.get("examStatus") == "anerkannt"]
+
+        # Show registered exams (urgent!)
+        out.table(
+            "registered",
+            "🔴 ANGEMELDETE PRÜFUNGEN (Termine beachten!)",
+            REGISTERED_COLUMNS,
+            angemeldet,
+            title_style="bold red",
+            border_style="red",
+        )
+
+        # Show failed exams
+        out.table(
+            "failed",
+            "⚠️ NICHT BESTANDEN (Wiederholung nötig)",
+            FAILED_COLUMNS,
+            nicht_bestanden,
+            title_style="bold yellow",
+            border_style="yellow",
+        )
+
+        # Summary
+        bestanden_ects = sum(m.get("eCTS", 0) for m in bestanden)
+        anerkannt_ects = sum(m.get("eCTS", 0) for m in anerkannt)
+        offen_ects = sum(m.get("eCTS", 0) for m in offen)
+        summary = f"""
+[green]✓ Bestanden:[/green] {len(bestanden)} Module ({bestanden_ects:.0f} ECTS)
+[green]✓ Anerkannt:[/green] {len(anerkannt)} Module ({anerkannt_ects:.0f} ECTS)
+[red]✗ Nicht bestanden:[/red] {len(nicht_bestanden)} Module
+[blue]○ Angemeldet:[/blue] {len(angemeldet)} Module
+[yellow]○ Abgemeldet:[/yellow] {len(abgemeldet)} Module
+[dim]○ Offen:[/dim] {len(offen)} Module ({offen_ects:.0f} ECTS)
+        """
+        out.summary(
+            "summary",
+            "Zusammenfassung",
+            {
+                "bestanden": len(bestanden),
+                "bestanden_ects": bestanden_ects,
+                "anerkannt": len(anerkannt),
+                "anerkannt_ects": anerkannt_ects,
+                "nicht_bestanden": len(nicht_bestanden),
+                "angemeldet": len(angemeldet),
+                "abgemeldet": len(abgemeldet),
+                "offen": len(offen),
+                "offen_ects": offen_ects,
+            },
+            summary.strip(),
+        )
+
+    # 5. Display calendar events with proper dates, sorted by timestamp
+    out.table(
+        "events",
+        "📅 KOMMENDE TERMINE (aus Moodle Kalender)",
+        EVENT_COLUMNS,
+        (
+            {**event, "start_time": datetime.fromtimestamp(event["timestamp"], tz=UTC).isoformat()}
+            for event in sorted(calendar_events, key=lambda x: x["timestamp"])
+        ),
+        limit=15,
+    )
+
+    # Final summary
+    if not grade_data and not calendar_events:
+        out.message("\n[yellow]Keine Daten gefunden. Stelle sicher, dass:[/yellow]")
+        out.message("  1. HTTP-Captures im docs/ Ordner liegen")
+        out.message("  2. ZIP-Dateien entpackt wurden")
+        out.message("  3. response_body.json oder .html Dateien vorhanden sind")
+    else:
+        out.print("\n[dim]Datenquelle: Offline-Analyse von HTTP-Captures[/dim]")
+    out.close()
@@ -0,0 +1,582 @@
+"""Credential, login and token commands."""
+
+import logging
+from typing import Any
+
+import typer
+
+from kolping_cockpit.commands import console
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer()
+
+# --block option of the browser commands (login, get-token, renew)
+BLOCK_OPTION = typer.Option(
+    True,
+    "--block/--no-block",
+    help="Abort images, fonts and third-party requests (see KOLPING_BROWSER_* settings)",
+)
+
+
+def _blocking_profile(block: bool) -> Any:
+    """Create the configured routing profile, None if blocking is off."""
+    from kolping_cockpit.browser import BlockingProfile
+
+    return BlockingProfile.from_settings() if block else None
+
+
+def _print_browser_timing(elapsed: float, profile: Any) -> None:
+    """Print the browser run time and what the routing profile blocked."""
+    requests = profile.summary() if profile is not None else "no blocking"
+    console.print(f"[dim]Browser: {elapsed:.1f} s ({requests})[/dim]")
+
+
+@app.command()
+def configure() -> None:
+    """
+    Configure credentials for the connector.
+
+    Credentials are securely stored in the system keyring.
+    """
+    from kolping_cockpit.connector import LocalConnector
+
+    console.print("[bold cyan]Configure Kolping Cockpit Credentials[/bold cyan]")
+    console.print("=" * 50)
+
+    username = typer.prompt("Username")
+    password = typer.prompt("Password", hide_input=True)
+
+    try:
+        LocalConnector.store_credentials(username, password)
+        console.print("[green]✓ Credentials stored securely[/green]")
+    except Exception as e:
+        console.print(f"[red]✗ Error storing credentials: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+
+@app.command()
+def login(
+    headless: bool = typer.Option(
+        False,
+        "--headless/--headed",
+        help="Run browser in headless mode (default: headed for MFA)",
+    ),
+    block: bool = BLOCK_OPTION,
+) -> None:
+    """
+    Interactive login via browser.
+
+    Opens a browser window for Microsoft Entra authentication.
+    Supports MFA. Stores session tokens securely after login.
+
+    NOTE: Requires a display (X server). In Codespaces without GUI,
+    use 'kolping login-manual' instead.
+    """
+    import os
+    import sys
+    import time
+
+    from kolping_cockpit.auth import interactive_login
+
+    console.print("[bold cyan]Kolping Study Cockpit - Interactive Login[/bold cyan]")
+    console.print("=" * 50)
+
+    # Check for display availability
+    if not headless and not os.environ.get("DISPLAY") and sys.platform == "linux":
+        console.print("[yellow]⚠ No display detected (Codespace/SSH environment)[/yellow]")
+        console.print()
+        console.print("[bold]Options:[/bold]")
+        console.print("  1. Run locally with GUI: [cyan]kolping login[/cyan]")
+        console.print("  2. Manual token entry:   [cyan]kolping login-manual[/cyan]")
+        console.print("  3. Force headless:       [cyan]kolping login --headless[/cyan]")
+        console.print()
+        console.print("[dim]Headless login may not work with MFA.[/dim]")
+        raise typer.Exit(code=1)
+
+    console.print("[yellow]Opening browser for authentication...[/yellow]")
+    console.print("[dim]Complete the login in the browser window (MFA may be required)[/dim]")
+
+    try:
+        profile = _blocking_profile(block)
+        start = time.perf_counter()
+        result = interactive_login(headless=headless, profile=profile)
+        _print_browser_timing(time.perf_counter() - start, profile)
+        if result.success:
+            console.print("[green]✓ Login successful![/green]")
+            console.print(f"[dim]Session stored for user: {result.username}[/dim]")
+        else:
+            console.print(f"[red]✗ Login failed: {result.error}[/red]")
+            raise typer.Exit(code=1)
+    except Exception as e:
+        console.print(f"[red]✗ Login error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+
+@app.command()
+def logout() -> None:
+    """
+    Clear stored session tokens.
+
+    Removes all stored authentication tokens from keyring.
+    """
+    from kolping_cockpit.settings import delete_secret
+
+    console.print("[bold cyan]Kolping Study Cockpit - Logout[/bold cyan]")
+    console.print("=" * 50)
+
+    secrets_to_clear = ["moodle_session", "graphql_bearer_token", "access_token"]
+    cleared = 0
+
+    for secret in secrets_to_clear:
+        if delete_secret(secret):
+            cleared += 1
+            console.print(f"[green]✓ Cleared: {secret}[/green]")
+
+    if cleared > 0:
+        console.print(f"\n[green]✓ Logged out successfully ({cleared} tokens cleared)[/green]")
+    else:
+        console.print("[yellow]No stored tokens found[/yellow]")
+
+
+@app.command("login-manual")
+def login_manual() -> None:
+    """
+    Manual token entry for headless environments.
+
+    Use this in Codespaces or SSH sessions where no GUI is available.
+    You'll need to login via browser elsewhere and paste the session cookie.
+
+    Priority: Uses KOLPING_* environment variables if available (repo secrets).
+    """
+    from kolping_cockpit.settings import get_secret_from_env_or_keyring, get_settings, store_secret
+
+    settings = get_settings()
+
+    console.print("[bold cyan]Kolping Study Cockpit - Manual Login[/bold cyan]")
+    console.print("=" * 50)
+    console.print()
+
+    # Check if we already have credentials from environment/repo secrets
+    existing_moodle = get_secret_from_env_or_keyring("moodle_session")
+    existing_graphql = get_secret_from_env_or_keyring("graphql_bearer_token")
+
+    if existing_moodle:
+        console.print("[green]✓ Moodle session found in environment/repo secrets[/green]")
+    if existing_graphql:
+        console.print("[green]✓ GraphQL token found in environment/repo secrets[/green]")
+
+    if existing_moodle and existing_graphql:
+        console.print()
+        console.print("[bold green]All credentials already configured from secrets![/bold green]")
+        console.print("Use 'kolping status' to verify connection.")
+        return
+
+    console.print()
+    console.print("[yellow]Instructions:[/yellow]")
+    console.print("1. Open in your local browser:")
+    console.print(f"   [cyan]{settings.moodle_login_url}[/cyan]")
+    console.print()
+    console.print("2. Login with your Microsoft account (complete MFA if needed)")
+    console.print()
+    console.print("3. After successful login, open Developer Tools (F12)")
+    console.print("   → Application tab → Cookies → portal.kolping-hochschule.de")
+    console.print("   → Copy the value of 'MoodleSession'")
+    console.print()
+
+    if not existing_moodle:
+        moodle_session = typer.prompt("Paste MoodleSession cookie value")
+
+        if moodle_session:
+            store_secret("moodle_session", moodle_session.strip())
+            console.print("[green]✓ Session stored successfully![/green]")
+        else:
+            console.print("[red]✗ No session provided[/red]")
+            raise typer.Exit(code=1)
+    else:
+        console.print("[dim]Skipping - already configured from secrets[/dim]")
+
+    # Optional: Also ask for GraphQL bearer token
+    console.print()
+    console.print("[yellow]Optional: GraphQL Bearer Token[/yellow]")
+    console.print("If you also want to access 'Mein Studium' data:")
+    console.print("1. Open: [cyan]https://khs-meinstudium.de[/cyan]")
+    console.print("2. Login and open Developer Tools (F12) → Network tab")
+    console.print("3. Look for GraphQL requests and copy the Authorization header")
+    console.print()
+
+    if not existing_graphql:
+        bearer_token = typer.prompt(
+            "Paste Bearer token (or press Enter to skip)", default="", show_default=False
+        )
+
+        if bearer_token:
+            # Remove "Bearer " prefix if included
+            token = bearer_token.strip()
+            if token.lower().startswith("bearer "):
+                token = token[7:]
+            success = store_secret("graphql_bearer_token", token)
+            if success:
+                console.print("[green]✓ GraphQL token stored![/green]")
+            else:
+                console.print("[red]✗ Failed to store GraphQL token![/red]")
+    else:
+        console.print("[dim]Skipping - already configured from secrets[/dim]")
+
+
+@app.command("set-moodle")
+def set_moodle_token() -> None:
+    """
+    Set only the Moodle session cookie.
+
+    Use this to update just the Moodle token without affecting GraphQL.
+    """
+    from kolping_cockpit.settings import store_secret
+
+    console.print("[bold cyan]Set Moodle Session Cookie[/bold cyan]")
+    console.print("=" * 50)
+
+    moodle_session = typer.prompt("Paste MoodleSession cookie value")
+
+    if moodle_session:
+        success = store_secret("moodle_session", moodle_session.strip())
+        if success:
+            console.print("[green]✓ Moodle session stored![/green]")
+        else:
+            console.print("[red]✗ Failed to store session![/red]")
+            raise typer.Exit(code=1)
+    else:
+        console.print("[red]✗ No session provided[/red]")
+        raise typer.Exit(code=1)
+
+
+@app.command("set-graphql")
+def set_graphql_token() -> None:
+    """
+    Set only the GraphQL bearer token.
+
+    Use this to update just the GraphQL token without affecting Moodle.
+    """
+    from kolping_cockpit.settings import store_secret
+
+    console.print("[bold cyan]Set GraphQL Bearer Token[/bold cyan]")
+    console.print("=" * 50)
+
+    bearer_token = typer.prompt("Paste Bearer token")
+
+    if bearer_token:
+        # Remove "Bearer " prefix if included
+        token = bearer_token.strip()
+        if token.lower().startswith("bearer "):
+            token = token[7:]
+        success = store_secret("graphql_bearer_token", token)
+        if success:
+            console.print("[green]✓ GraphQL token stored![/green]")
+        else:
+            console.print("[red]✗ Failed to store token![/red]")
+            raise typer.Exit(code=1)
+    else:
+        console.print("[red]✗ No token provided[/red]")
+        raise typer.Exit(code=1)
+
+
+@app.command("get-token")
+def get_graphql_token_auto(
+    headless: bool = typer.Option(
+        False,
+        "--headless",
+        help="Run browser in headless mode (may not work with MFA)",
+    ),
+    timeout: int = typer.Option(
+        120,
+        "--timeout",
+        "-t",
+        help="Timeout in seconds for login completion",
+    ),
+    moodle_also: bool = typer.Option(
+        True,
+        "--moodle/--no-moodle",
+        help="Also capture Moodle session cookie",
+    ),
+    block: bool = BLOCK_OPTION,
+) -> None:
+    """
+    Automatically extract GraphQL Bearer token and Moodle session via browser.
+
+    Opens a browser, logs into cms.kolping-hochschule.de and Moodle,
+    and captures both the Bearer token and Moodle session cookie.
+
+    Priority: Uses KOLPING_* environment variables if already set (repo secrets).
+    """
+    from kolping_cockpit.settings import (
+        get_secret_from_env_or_keyring,
+        get_secret_store,
+        get_settings,
+        store_secret,
+    )
+
+    console.print("[bold cyan]🔑 Automatic Token & Session Extraction[/bold cyan]")
+    console.print("=" * 50)
+    console.print()
+
+    # Check for existing credentials from environment
+    existing_graphql = get_secret_from_env_or_keyring("graphql_bearer_token")
+    existing_moodle = get_secret_from_env_or_keyring("moodle_session")
+
+    if existing_graphql:
+        console.print("[green]✓ GraphQL token already configured from environment/secrets[/green]")
+    if existing_moodle:
+        console.print("[green]✓ Moodle session already configured from environment/secrets[/green]")
+
+    if existing_graphql and existing_moodle:
+        console.print()
+        console.print("[bold green]All credentials already configured from secrets![/bold green]")
+        console.print("Use 'kolping status' to verify connection.")
+        console.print()
+        console.print("[dim]To force re-extraction, unset environment variables:[/dim]")
+        console.print("[dim]  unset KOLPING_GRAPHQL_BEARER_TOKEN[/dim]")
+        console.print("[dim]  unset KOLPING_MOODLE_SESSION[/dim]")
+        return
+
+    console.print("Dieser Befehl öffnet einen Browser und loggt automatisch ein.")
+    console.print("Nach erfolgreicher Anmeldung werden Tokens extrahiert.")
+    console.print()
+
+    try:
+        import playwright.async_api  # noqa: F401
+    except ImportError:
+        console.print("[red]✗ Playwright nicht installiert![/red]")
+        console.print("  Installiere mit: pip install playwright && playwright install chromium")
+        raise typer.Exit(code=1) from None
+
+    import time
+
+    from kolping_cockpit.auth import CMS_URL, acquire_credentials
+
+    want_token = not existing_graphql
+    want_moodle = moodle_also and not existing_moodle
+
+    console.print("[yellow]Starte Browser...[/yellow]")
+    console.print(f"[cyan]Öffne: {CMS_URL} und {get_settings().moodle_login_url}[/cyan]")
+    console.print()
+    console.print("[bold yellow]⚡ AKTION ERFORDERLICH:[/bold yellow]")
+    console.print("1. Logge dich im Browser ein (Microsoft SSO)")
+    console.print("2. Navigiere zu 'Mein Studium' wenn nötig")
+    console.print("3. Der Browser schließt sich, sobald Token und Session erfasst sind")
+    console.print()
+    console.print(f"[dim]Warte max. {timeout} Sekunden auf Token...[/dim]")
+
+    profile = _blocking_profile(block)
+    start = time.perf_counter()
+    try:
+        captured = acquire_credentials(
+            headless, token=want_token, moodle=want_moodle, timeout=timeout, profile=profile
+        )
+    except Exception as e:
+        error_msg = str(e)
+        if "Timeout" in error_msg:
+            console.print("[red]✗ Timeout - Seite hat zu lange gebraucht[/red]")
+        else:
+            console.print(f"[red]✗ Fehler: {error_msg}[/red]")
+        raise typer.Exit(code=1) from None
+
+    _print_browser_timing(time.perf_counter() - start, profile)
+
+    if want_moodle and not captured.moodle_session:
+        console.print("[yellow]⚠ Konnte Moodle session nicht erfassen[/yellow]")
+
+    # Store captured credentials (one write of the secrets file)
+    success_count = 0
+
+    try:
+        with get_secret_store().batch():
+            if captured.graphql_token:
+                success = store_secret("graphql_bearer_token", captured.graphql_token)
+                if success:
+                    console.print()
+                    console.print(
+                        "[bold green]✓ GraphQL token erfolgreich extrahiert "
+                        "und gespeichert![/bold green]"
+                    )
+                    console.print()
+                    # Show token preview
+                    token = captured.graphql_token
+                    console.print(f"[dim]Token (gekürzt): {token[:50]}...{token[-20:]}[/dim]")
+                    success_count += 1
+                else:
+                    console.print("[red]✗ Konnte GraphQL token nicht speichern[/red]")
+
+            if captured.moodle_session:
+                success = store_secret("moodle_session", captured.moodle_session)
+                if success:
+                    console.print()
+                    console.print(
+                        "[bold green]✓ Moodle session erfolgreich gespeichert![/bold green]"
+                    )
+                    success_count += 1
+                else:
+                    console.print("[red]✗ Konnte Moodle session nicht speichern[/red]")
+    except OSError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        raise typer.Exit(code=1) from None
+
+    if want_token and not captured.graphql_token:
+        console.print()
+        console.print("[red]✗ Kein GraphQL Token erfasst[/red]")
+        console.print()
+        console.print("[yellow]Mögliche Ursachen:[/yellow]")
+        console.print("  • Login nicht abgeschlossen")
+        console.print("  • Nicht zu 'Mein Studium' navigiert")
+        console.print("  • Timeout zu kurz (--timeout erhöhen)")
+        console.print()
+        console.print("[cyan]Alternative: Manuell Token setzen[/cyan]")
+        console.print("  kolping set-graphql")
+        raise typer.Exit(code=1)
+
+    if success_count == 0:
+        console.print()
+        console.print("[green]✓ Credentials bereits vorhanden (aus Secrets)[/green]")
+
+
+@app.command("renew")
+def renew_credentials(
+    timeout: int = typer.Option(
+        30, "--timeout", "-t", help="Timeout in seconds for the silent refresh"
+    ),
+    interactive: bool = typer.Option(
+        True,
+        "--interactive/--no-interactive",
+        help="Open a browser for login/MFA if the silent refresh fails",
+    ),
+    moodle_also: bool = typer.Option(
+        True,
+        "--moodle/--no-moodle",
+        help="Also renew the Moodle session cookie",
+    ),
+    block: bool = BLOCK_OPTION,
+) -> None:
+    """
+    Renew token and Moodle session silently from the saved browser login.
+
+    Uses the login state saved by 'kolping login' / 'kolping get-token' in a
+    headless browser. Falls back to an interactive login only if Microsoft
+    asks for a password or MFA; use --no-interactive in scheduled jobs.
+    """
+    import time
+
+    from kolping_cockpit.auth import refresh_credentials
+    from kolping_cockpit.settings import get_secret_store
+
+    console.print("[yellow]Erneuere Zugangsdaten im Hintergrund...[/yellow]")
+    profile = _blocking_profile(block)
+    start = time.perf_counter()
+    try:
+        captured = refresh_credentials(
+            moodle=moodle_also, timeout=timeout, fallback=interactive, profile=profile
+        )
+    except Exception as e:
+        console.print(f"[red]✗ Fehler: {e}[/red]")
+        raise typer.Exit(code=1) from None
+    _print_browser_timing(time.perf_counter() - start, profile)
+
+    store = get_secret_store()
+    try:
+        with store.batch():
+            if captured.graphql_token:
+                store.set("graphql_bearer_token", captured.graphql_token)
+                console.print("[green]✓ GraphQL token erneuert[/green]")
+            if captured.moodle_session:
+                store.set("moodle_session", captured.moodle_session)
+                console.print("[green]✓ Moodle session erneuert[/green]")
+    except OSError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        raise typer.Exit(code=1) from None
+
+    if not captured.graphql_token or (moodle_also and not captured.moodle_session):
+        if captured.interaction_required:
+            console.print("[red]✗ Anmeldung erfordert Benutzereingabe (Login/MFA)[/red]")
+            console.print("  kolping renew --interactive  oder  kolping get-token")
+        else:
+            console.print("[red]✗ Zugangsdaten konnten nicht erneuert werden[/red]")
+        raise typer.Exit(code=1)
+
+
+@app.command("extract-token")
+def extract_token_from_captures(
+    path: str = typer.Argument(
+        "docs", help="Directory, file or archive (zip/tar) with HTTP captures"
+    ),
+    audience: str | None = typer.Option(
+        None, "--audience", help="Required token audience (default: GraphQL gateway)"
+    ),
+    jobs: int = typer.Option(None, "--jobs", "-j", help="Scanner threads"),
+) -> None:
+    """
+    Extract GraphQL token from existing HTTP captures in docs/ folder.
+
+    Use this if you have recent HAR/HTTP captures with a valid token. Any
+    directory or zip/tar archive can be scanned; every file is searched for
+    JWTs, not just request headers.
+    """
+    from datetime import UTC, datetime
+    from pathlib import Path
+
+    from kolping_cockpit.settings import store_secret
+    from kolping_cockpit.tokens import GRAPHQL_AUDIENCE, rank_tokens, scan_tokens
+
+    console.print("[bold cyan]🔍 Token aus HTTP Captures extrahieren[/bold cyan]")
+    console.print("=" * 50)
+
+    root = Path(path)
+    target_audience = audience or GRAPHQL_AUDIENCE
+    if not root.exists():
+        console.print(f"[red]✗ Pfad nicht gefunden: {root}[/red]")
+        raise typer.Exit(code=1)
+
+    with console.status(f"Durchsuche {root}..."):
+        candidates = rank_tokens(scan_tokens(root, workers=jobs), target_audience)
+
+    if not candidates:
+        console.print("[red]✗ Keine Token in HTTP Captures gefunden[/red]")
+        raise typer.Exit(code=1)
+
+    console.print(f"\n[green]Gefundene Tokens: {len(candidates)}[/green]\n")
+
+    for candidate in candidates:
+        if not candidate.matches(target_audience):
+            marker = "[dim]falsche aud[/dim]"
+        elif candidate.is_expired():
+            marker = "[yellow]abgelaufen[/yellow]"
+        else:
+            marker = "[bold green]✓ KORREKT[/bold green]"
+        console.print(f"  {marker}")
+        more = f" (+{len(candidate.sources) - 1} weitere)" if len(candidate.sources) > 1 else ""
+        console.print(f"    [dim]Quelle: {candidate.sources[0]}{more}[/dim]")
+        console.print(f"    [dim]Audience: {candidate.audience or 'unknown'}[/dim]")
+        if candidate.expires is not None:
+            expires = (
+                datetime.fromtimestamp(candidate.expires, UTC)
+                .astimezone()
+                .strftime("%d.%m.%Y %H:%M")
+            )
+            console.print(f"    [dim]Gültig bis: {expires}[/dim]")
+
+    best = candidates[0]
+    if best.matches(target_audience):
+        console.print()
+        prompt = "Token mit korrekter Audience gefunden. Speichern?"
+        if best.is_expired():
+            prompt = "Nur abgelaufene Token mit korrekter Audience gefunden. Trotzdem speichern?"
+        if typer.confirm(prompt):
+            success = store_secret("graphql_bearer_token", best.token)
+            if success:
+                console.print("[bold green]✓ Token gespeichert![/bold green]")
+            else:
+                console.print("[red]✗ Speichern fehlgeschlagen[/red]")
+    else:
+        console.print()
+        console.print("[yellow]⚠ Kein Token mit korrekter Audience gefunden.[/yellow]")
+        console.print(f"  Benötigte Audience: {target_audience}")
+        console.print()
+        console.print("[cyan]Lösung: Neue HTTP Capture erstellen oder Browser-Login nutzen[/cyan]")
+        console.print("  kolping get-token")
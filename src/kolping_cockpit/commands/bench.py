@@ -0,0 +1,159 @@
+"""Bench command measuring the portal and the GraphQL gateway under load."""
+
+import typer
+
+from kolping_cockpit.commands import console
+
+app = typer.Typer()
+
+
+@app.command()
+def bench(
+    mix: str = typer.Option(
+        "graphql=2,dashboard,courses,calendar,course",
+        "--mix",
+        "-m",
+        help="Weighted operations (graphql, dashboard, courses, calendar, course)",
+    ),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", min=1, help="Parallel operations"),
+    rate: float = typer.Option(
+        None, "--rate", "-r", min=0.01, help="Operations per second (default: back to back)"
+    ),
+    duration: float = typer.Option(10.0, "--duration", "-d", min=0.1, help="Seconds to run"),
+    operations: int = typer.Option(
+        None, "--operations", "-n", min=1, help="Stop after this many operations"
+    ),
+    moodle_url: str = typer.Option(
+        None, "--moodle-url", help="Moodle base URL to target (e.g. a local stand-in)"
+    ),
+    graphql_url: str = typer.Option(
+        None, "--graphql-url", help="GraphQL endpoint to target (e.g. a local stand-in)"
+    ),
+    stand_in: str = typer.Option(
+        None,
+        "--stand-in",
+        help="Target a local stand-in serving these recordings (see 'kolping stand-in')",
+    ),
+    synthetic: int = typer.Option(
+        None,
+        "--synthetic",
+        min=1,
+        help="Target a local stand-in serving a generated account with this many modules",
+    ),
+    query: str = typer.Option("myStudentGradeOverview", "--query", help="Named GraphQL query"),
+    course_id: str = typer.Option(None, "--course", help="Course ID for 'course' operations"),
+    seed: int = typer.Option(
+        None, "--seed", help="Seed for the operation order and generated data"
+    ),
+) -> None:
+    """
+    Measure latency and throughput of portal and GraphQL operations.
+
+    Replays a weighted mix of the operations a sync performs through the real
+    clients and reports p50/p95/p99 latency, throughput, error rate and bytes
+    per operation. With --rate, operations start at a fixed rate and latency
+    includes any queueing delay. With --moodle-url/--graphql-url the stored
+    credentials are not sent; use this to benchmark a local stand-in offline,
+    or let --stand-in (recordings) or --synthetic (generated data) start one
+    for the run.
+    """
+    from rich.table import Table
+
+    from kolping_cockpit.bench import BenchClients, parse_mix, run_bench
+    from kolping_cockpit.graphql_client import KolpingGraphQLClient
+    from kolping_cockpit.moodle_client import KolpingMoodleClient
+
+    try:
+        weights = parse_mix(mix)
+    except ValueError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        raise typer.Exit(code=1) from None
+
+    standin = None
+    if synthetic is not None:
+        from kolping_cockpit.standin import StandIn
+        from kolping_cockpit.synthetic import SyntheticConfig, generate_dataset
+
+        dataset = generate_dataset(SyntheticConfig(modules=synthetic, seed=seed or 0))
+        standin = StandIn(dataset.standin_data()).start()
+        moodle_url, graphql_url = standin.url, standin.graphql_endpoint
+    elif stand_in is not None:
+        from pathlib import Path
+
+        from kolping_cockpit.standin import StandIn, StandInData
+
+        if not Path(stand_in).is_dir():
+            console.print(f"[red]✗ Recordings directory not found: {stand_in}[/red]")
+            raise typer.Exit(code=1)
+        standin = StandIn(StandInData.from_directory(Path(stand_in))).start()
+        moodle_url, graphql_url = standin.url, standin.graphql_endpoint
+
+    # Placeholder credentials keep the stored ones from reaching other hosts
+    moodle = KolpingMoodleClient(session_cookie="stand-in" if moodle_url else None)
+    graphql = KolpingGraphQLClient(bearer_token="stand-in" if graphql_url else None)
+    if moodle_url:
+        moodle.base_url = moodle_url.rstrip("/")
+    if graphql_url:
+        graphql.endpoint = graphql_url
+
+    if course_id is None and weights.get("course"):
+        try:
+            courses = moodle.get_courses()
+        except Exception:
+            courses = []
+        course_id = courses[0].id if courses else "1"
+        console.print(f"[dim]Course operations use course {course_id} (--course to change)[/dim]")
+
+    clients = BenchClients(moodle=moodle, graphql=graphql, query=query, course_id=course_id or "1")
+    mode = f"{rate:g} ops/s" if rate else "back to back"
+    limit = f"{operations} operations" if operations else f"{duration:g}s"
+    console.print(f"[bold cyan]Benchmark:[/bold cyan] {mix} · {concurrency} workers · {mode}")
+    console.print(f"[dim]  Moodle: {moodle.base_url}  GraphQL: {graphql.endpoint}[/dim]")
+    console.print(f"[dim]Running for {limit}...[/dim]")
+
+    try:
+        report = run_bench(
+            clients,
+            weights,
+            concurrency=concurrency,
+            rate=rate,
+            duration=None if operations else duration,
+            max_operations=operations,
+            seed=seed,
+        )
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Benchmark cancelled[/yellow]")
+        raise typer.Exit(code=130) from None
+    finally:
+        moodle.close()
+        graphql.close()
+        if standin is not None:
+            standin.close()
+
+    table = Table(title=f"Benchmark Results ({report.elapsed:.2f}s)")
+    table.add_column("Operation", style="cyan")
+    for column in ("Count", "Errors", "p50 ms", "p95 ms", "p99 ms", "ops/s", "KiB"):
+        table.add_column(column, justify="right")
+    rows = report.stats()
+    for index, stats in enumerate(rows):
+        errors = f"{stats.errors} ({stats.error_rate:.0%})" if stats.errors else "0"
+        table.add_row(
+            stats.operation,
+            str(stats.count),
+            f"[red]{errors}[/red]" if stats.errors else errors,
+            f"{stats.p50 * 1000:.0f}",
+            f"{stats.p95 * 1000:.0f}",
+            f"{stats.p99 * 1000:.0f}",
+            f"{stats.throughput:.1f}",
+            f"{stats.bytes / 1024:.0f}",
+            end_section=index == len(rows) - 2,  # separate the total
+        )
+    console.print(table)
+
+    total = rows[-1]
+    console.print(
+        f"[dim]{total.requests} HTTP requests, {total.bytes / 1024 / 1024:.2f} MiB received, "
+        f"{total.requests / report.elapsed if report.elapsed else 0:.1f} requests/s[/dim]"
+    )
+    for error, count in report.error_kinds().most_common():
+        console.print(f"[yellow]⚠ {count}× {error}[/yellow]")
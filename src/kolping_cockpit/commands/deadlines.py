@@ -0,0 +1,247 @@
+"""Deadlines command: exam status and upcoming Moodle events."""
+
+from collections import Counter
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import typer
+
+from kolping_cockpit.commands import (
+    FORMAT_OPTION,
+    graphql_client,
+    moodle_client,
+    output_renderer,
+    stale_while_revalidate,
+)
+from kolping_cockpit.render import Column, OutputFormat, Renderer
+
+app = typer.Typer()
+
+# Columns of the module tables (rows are the modules of the grade overview)
+MODULE_COLUMNS = [
+    Column("modulbezeichnung", "Modul", style="bold", truncate=50),
+    Column("semester", "Sem.", justify="center"),
+    Column("pruefungsform", "Prüfungsform", style="cyan"),
+    Column("eCTS", "ECTS", justify="right", empty="0"),
+]
+
+EVENT_COLUMNS = [
+    Column("title", "Event", style="bold", truncate=40),
+    Column("start_time", "Datum/Zeit", style="cyan"),
+    Column("course_name", "Kurs", style="dim", empty=""),
+]
+
+
+@app.command("deadlines")
+def show_deadlines(
+    include_past: bool = typer.Option(
+        False, "--include-past", "-p", help="Include past/completed modules"
+    ),
+    semester: int = typer.Option(
+        None, "--semester", "-s", help="Filter by specific semester number"
+    ),
+    fresh: bool = typer.Option(
+        False, "--fresh", "-f", help="Wait for live data instead of showing the last known state"
+    ),
+    output_format: OutputFormat = FORMAT_OPTION,
+) -> None:
+    """
+    Show upcoming exams, assignments and deadlines.
+
+    Combines data from:
+    - GraphQL API (exam registrations, module status)
+    - Moodle Calendar (upcoming events, deadlines)
+
+    The last known data is shown immediately and refreshed in the background;
+    changes are listed once the refresh is done.
+
+    Example:
+        kolping deadlines
+        kolping deadlines --semester 3
+        kolping deadlines --format ndjson | jq -r 'select(.section == "registered")'
+    """
+    out = output_renderer(output_format)
+    out.print("[bold cyan]📚 Kolping Study Cockpit - Prüfungen & Deadlines[/bold cyan]")
+    out.print("=" * 60)
+
+    stale_while_revalidate(
+        _fetch_deadline_data,
+        lambda snapshot: _render_deadlines(out, snapshot, include_past, semester),
+        out,
+        fresh=fresh,
+    )
+    out.close()
+
+
+def _fetch_deadline_data(log: Callable[[str], Any]) -> dict:
+    """Fetch exam status (GraphQL) and calendar events (Moodle) as fetch.json export."""
+    from datetime import UTC, datetime
+
+    data: dict[str, Any] = {
+        "fetch_timestamp": datetime.now(UTC).isoformat(),
+        "graphql": {},
+        "moodle": {},
+        "errors": [],
+    }
+    errors = data["errors"]
+
+    # 1. Fetch GraphQL data (exam status)
+    log("\n[dim]Lade Prüfungsstatus...[/dim]")
+    try:
+        with graphql_client() as client:
+            if client.is_authenticated:
+                success, _ = client.test_connection()
+                if success:
+                    response = client.execute_named_query("myStudentGradeOverview")
+                    if response.data and "myStudentGradeOverview" in response.data:
+                        data["graphql"]["gradeOverview"] = response.data["myStudentGradeOverview"]
+                        log("[green]✓ Prüfungsdaten geladen[/green]")
+                else:
+                    errors.append("GraphQL: Verbindung fehlgeschlagen")
+            else:
+                errors.append("GraphQL: Kein Bearer Token konfiguriert")
+    except Exception as e:
+        errors.append(f"GraphQL: {e}")
+
+    # 2. Fetch Moodle calendar events
+    log("[dim]Lade Kalender-Events...[/dim]")
+    try:
+        with moodle_client() as client:
+            if client.is_authenticated:
+                is_valid, _ = client.test_session()
+                if is_valid:
+                    calendar_events = client.get_upcoming_deadlines()
+                    data["moodle"]["events"] = [
+                        {
+                            "id": e.id,
+                            "title": e.title,
+                            "start_time": e.start_time,
+                            "course_name": e.course_name,
+                            "url": e.url,
+                        }
+                        for e in calendar_events
+                    ]
+                    log(f"[green]✓ {len(calendar_events)} Kalender-Events geladen[/green]")
+                else:
+                    errors.append("Moodle: Session abgelaufen")
+            else:
+                errors.append("Moodle: Keine Session konfiguriert")
+    except Exception as e:
+        errors.append(f"Moodle: {e}")
+
+    return data
+
+
+def _render_deadlines(
+    out: Renderer, snapshot: dict, include_past: bool, semester: int | None
+) -> None:
+    """Render exam overview and calendar events of a normalized snapshot."""
+    grade_data = None
+    if snapshot.get("modules") or snapshot.get("overview"):
+        grade_data = {**snapshot["overview"], "modules": list(snapshot["modules"].values())}
+    calendar_events = list((snapshot.get("events") or {}).values())
+
+    # 3. Display exam overview
+    if grade_data:
+        out.print()
+        out.fields(
+            "overview",
+            [
+                (
+                    "currentSemester",
+                    "Aktuelles Semester",
+                    grade_data.get("currentSemester", "Unbekannt"),
+                ),
+                ("grade", "Notendurchschnitt", grade_data.get("grade", "-")),
+                ("eCTS", "Erreichte ECTS", grade_data.get("eCTS", 0)),
+            ],
+        )
+
+        modules = grade_data.get("modules", [])
+
+        # Filter by semester if specified
+        if semester:
+            modules = [m for m in modules if m.get("semester") == semester]
+
+        def with_status(status: str | None) -> Iterator[dict]:
+            return (m for m in modules if m.get("examStatus") == status)
+
+        # Show registered exams (urgent!)
+        out.table(
+            "registered",
+            "🔴 ANGEMELDETE PRÜFUNGEN",
+            MODULE_COLUMNS,
+            with_status("angemeldet"),
+            title_style="bold red",
+            border_style="red",
+        )
+
+        # Show failed exams (need retry)
+        out.table(
+            "failed",
+            "⚠️ NICHT BESTANDEN (Wiederholung nötig)",
+            MODULE_COLUMNS,
+            with_status("nicht bestanden"),
+            title_style="bold yellow",
+            border_style="yellow",
+        )
+
+        # Show deregistered exams
+        out.table(
+            "deregistered",
+            "📋 ABGEMELDET (neu anmelden)",
+            MODULE_COLUMNS,
+            with_status("abgemeldet"),
+            title_style="bold blue",
+            border_style="blue",
+        )
+
+        # Show open modules (not yet registered)
+        offen = [m for m in with_status(None) if m.get("pruefungsform") != "Anerkennung"]
+        if offen and not include_past:
+            # Filter to current semester range (show semesters 1-5 for WiSe 2025-2026 = 5th sem)
+            current_sem_num = 5  # Could be parsed from currentSemester
+            offen_relevant = [m for m in offen if m.get("semester", 0) <= current_sem_num]
+        else:
+            offen_relevant = offen
+
+        out.table(
+            "open",
+            "📝 OFFENE MODULE (noch nicht angemeldet)",
+            MODULE_COLUMNS,
+            sorted(offen_relevant, key=lambda x: x.get("semester", 99)),
+            title_style="bold",
+        )
+
+        # Summary panel
+        counts = Counter(m.get("examStatus") for m in modules)
+        summary = f"""
+[green]✓ Bestanden:[/green] {counts["bestanden"]} Module
+[green]✓ Anerkannt:[/green] {counts["anerkannt"]} Module
+[red]✗ Nicht bestanden:[/red] {counts["nicht bestanden"]} Module
+[blue]○ Angemeldet:[/blue] {counts["angemeldet"]} Module
+[yellow]○ Abgemeldet:[/yellow] {counts["abgemeldet"]} Module
+[dim]○ Offen:[/dim] {len(offen)} Module
+        """
+        out.summary(
+            "summary",
+            "Zusammenfassung",
+            {
+                "bestanden": counts["bestanden"],
+                "anerkannt": counts["anerkannt"],
+                "nicht_bestanden": counts["nicht bestanden"],
+                "angemeldet": counts["angemeldet"],
+                "abgemeldet": counts["abgemeldet"],
+                "offen": len(offen),
+            },
+            summary.strip(),
+        )
+
+    # 4. Display calendar events
+    out.table(
+        "events", "📅 KOMMENDE TERMINE (Moodle Kalender)", EVENT_COLUMNS, calendar_events, limit=10
+    )
+
+    # Final hint
+    out.print("\n[dim]Tipp: Prüfungstermine im Moodle-Portal unter Kalender prüfen![/dim]")
+    out.print("[dim]      kolping export all - für vollständigen Datenexport[/dim]")
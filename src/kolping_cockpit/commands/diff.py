@@ -0,0 +1,118 @@
+"""Diff command comparing two export snapshots."""
+
+import typer
+
+from kolping_cockpit.commands import console
+
+app = typer.Typer()
+
+_COLLECTION_TITLES = {
+    "overview": "Übersicht",
+    "modules": "Module",
+    "exams": "Prüfungstermine",
+    "events": "Termine",
+    "courses": "Kurse",
+    "assignments": "Aufgaben",
+    "grades": "Moodle-Noten",
+    "student": "Studentendaten",
+}
+
+
+def _format_diff_value(value: object) -> str:
+    if value is None or value == "":
+        return "–"
+    if isinstance(value, dict | list):
+        return f"<{type(value).__name__}>"
+    return str(value)[:40]
+
+
+@app.command("diff")
+def diff_snapshots_command(
+    date_a: str = typer.Argument(None, help="Older snapshot date (default: second latest)"),
+    date_b: str = typer.Argument(None, help="Newer snapshot date (default: latest)"),
+    patch: bool = typer.Option(False, "--patch", help="Print a JSON Patch (RFC 6902)"),
+    output: str = typer.Option(None, "--output", "-o", help="Write the JSON Patch to a file"),
+) -> None:
+    """
+    Show what changed between two snapshots.
+
+    Modules are matched by modulId, events and courses by id, so only real
+    changes (new grades, new events, status changes) are listed.
+
+    Example:
+        kolping diff
+        kolping diff 2026-01-01 2026-01-11
+        kolping diff 2026-01-01 --patch > changes.json
+    """
+    import json
+    import sys
+    from itertools import groupby
+    from pathlib import Path
+
+    from kolping_cockpit.diff import diff_snapshots, to_json_patch
+    from kolping_cockpit.snapshot import available_dates, load_snapshot
+
+    dates = available_dates()
+    if date_b is None:
+        date_b = dates[-1] if dates else None
+    if date_a is None:
+        older = [d for d in dates if date_b and d < date_b]
+        date_a = older[-1] if older else None
+    if not date_a or not date_b:
+        console.print("[red]✗ Mindestens zwei Snapshots nötig (kolping export all)[/red]")
+        raise typer.Exit(code=1)
+
+    try:
+        old, new = load_snapshot(date_a), load_snapshot(date_b)
+    except KeyError as e:
+        console.print(f"[red]✗ {e.args[0]}[/red]")
+        raise typer.Exit(code=1) from e
+
+    changes = diff_snapshots(old, new)
+
+    if patch or output:
+        patch_json = json.dumps(to_json_patch(changes), indent=2, ensure_ascii=False, default=str)
+        if output:
+            Path(output).write_text(patch_json + "\n", encoding="utf-8")
+            console.print(f"[green]✓ JSON Patch geschrieben: {output}[/green]")
+        else:
+            sys.stdout.write(patch_json + "\n")
+        return
+
+    console.print(f"[bold cyan]Änderungen {date_a} → {date_b}[/bold cyan]")
+    count = 0
+    section = None
+    for (collection, key), group in groupby(
+        changes, key=lambda c: (c.collection or c.path.split("/")[1], c.key)
+    ):
+        if collection != section:
+            section = collection
+            console.print(f"\n[bold]{_COLLECTION_TITLES.get(collection, collection)}[/bold]")
+
+        group_changes = list(group)
+        if key is None:
+            # Top-level fields (overview, student data)
+            for change in group_changes:
+                count += 1
+                field = change.path.rsplit("/", 1)[-1]
+                console.print(
+                    f"  [yellow]~[/yellow] {field}: {_format_diff_value(change.old)} → "
+                    f"{_format_diff_value(change.new)}"
+                )
+            continue
+
+        count += 1
+        first = group_changes[0]
+        if first.op == "add" and first.field is None:
+            console.print(f"  [green]+[/green] {first.label}")
+        elif first.op == "remove" and first.field is None:
+            console.print(f"  [red]-[/red] {first.label}")
+        else:
+            fields = ", ".join(
+                f"{c.field}: {_format_diff_value(c.old)} → {_format_diff_value(c.new)}"
+                for c in group_changes
+            )
+            console.print(f"  [yellow]~[/yellow] {first.label}: {fields}")
+
+    if not count:
+        console.print("\n[green]Keine Änderungen[/green]")
@@ -0,0 +1,532 @@
+"""Exams command: exam dates and assessment requirements."""
+
+from collections.abc import Callable
+from typing import Any
+
+import typer
+from rich.panel import Panel
+
+from kolping_cockpit.commands import (
+    FORMAT_OPTION,
+    graphql_client,
+    moodle_client,
+    output_renderer,
+    stale_while_revalidate,
+)
+from kolping_cockpit.render import Column, OutputFormat, Renderer
+
+# Constants for display formatting
+MODULE_NAME_MAX_LENGTH = 50
+COURSE_NAME_MATCH_LENGTH = 20
+
+app = typer.Typer()
+
+_ENDPOINT_STATUS = {
+    "ok": "[green]✓[/green]",
+    "error": "[yellow]⚠[/yellow]",
+    "empty": "[yellow]○[/yellow]",
+    "failed": "[red]✗[/red]",
+}
+
+ENDPOINT_COLUMNS = [
+    Column("query", "Query", style="cyan"),
+    Column("status", "Status", style="magenta", format=lambda s: _ENDPOINT_STATUS.get(s, s)),
+    Column("result", "Ergebnis"),
+]
+
+REGISTERED_COLUMNS = [
+    Column("modulbezeichnung", "Modul", style="bold", max_width=40, truncate=40),
+    Column("semester", "Sem.", justify="center", width=5),
+    Column("pruefungsform", "Prüfungsform", style="cyan", max_width=15, truncate=15),
+    Column("eCTS", "ECTS", justify="right", width=5, empty="0"),
+    Column("termin", "Termin", style="yellow", max_width=25, empty="Siehe Kalender", truncate=25),
+]
+
+OPEN_COLUMNS = [
+    Column("modulbezeichnung", "Modul", style="bold", max_width=40, truncate=40),
+    Column("semester", "Sem.", justify="center", width=5),
+    Column("pruefungsform", "Prüfungsform", style="cyan", max_width=20, truncate=20),
+    Column("eCTS", "ECTS", justify="right", width=5, empty="0"),
+    Column(
+        "moodleCourse",
+        "Moodle Kurs",
+        style="dim",
+        max_width=15,
+        empty="–",
+        format=lambda _name: "✓ Verfügbar",
+    ),
+]
+
+COMPLETED_COLUMNS = [
+    Column("modulbezeichnung", "Modul", style="bold", max_width=40, truncate=40),
+    Column("semester", "Sem.", justify="center", width=5),
+    Column("pruefungsform", "Prüfungsform", style="cyan", max_width=15, truncate=15),
+    Column("note", "Note", justify="right", width=5, empty="anerkannt"),
+    Column("eCTS", "ECTS", justify="right", width=5, empty="0"),
+]
+
+FAILED_COLUMNS = [column for column in COMPLETED_COLUMNS if column.key != "note"]
+
+EVENT_COLUMNS = [
+    Column("title", "Event", style="bold", max_width=45, truncate=45),
+    Column("start_time", "Datum/Zeit", style="cyan", max_width=25),
+    Column("url", "Link", style="dim", max_width=10, empty="–", format=lambda _url: "✓"),
+]
+
+COURSE_COLUMNS = [
+    Column("name", "Kurs", style="bold", max_width=50, truncate=50),
+    Column(
+        "url",
+        "Link",
+        style="cyan",
+        max_width=30,
+        empty="",
+        format=lambda url: url[:30] + "..." if len(url) > 30 else url,
+    ),
+]
+
+
+@app.command("exams")
+def show_comprehensive_exams(
+    semester: int = typer.Option(
+        None,
+        "--semester",
+        "-s",
+        help="Filter by specific semester number (default: current semester)",
+    ),
+    include_completed: bool = typer.Option(
+        False, "--completed", "-c", help="Include completed modules"
+    ),
+    analyze_endpoints: bool = typer.Option(
+        False, "--analyze", "-a", help="First analyze all available GraphQL endpoints"
+    ),
+    fresh: bool = typer.Option(
+        False, "--fresh", "-f", help="Wait for live data instead of showing the last known state"
+    ),
+    output_format: OutputFormat = FORMAT_OPTION,
+) -> None:
+    """
+    Comprehensive exam dates and requirements overview.
+
+    Fetches and displays:
+    - All exam dates for registered modules this semester
+    - Required assessment types for each module (Klausur, Lerntagebuch, etc.)
+    - Links to Moodle courses and materials
+    - Upcoming deadlines from Moodle calendar
+    - What you need to do for each module
+
+    If --analyze is set, first analyzes all available GraphQL endpoints.
+    The last known data is shown immediately and refreshed in the background.
+
+    Example:
+        kolping exams
+        kolping exams --semester 3
+        kolping exams --analyze
+        kolping exams --format json > exams.json
+    """
+    out = output_renderer(output_format)
+    out.print(
+        "[bold cyan]📚 Kolping Study Cockpit - Prüfungstermine & Leistungsübersicht[/bold cyan]"
+    )
+    out.print("=" * 70)
+
+    # Step 1: Analyze endpoints if requested
+    if analyze_endpoints:
+        out.print("\n[bold yellow]🔍 SCHRITT 1: Analyse aller verfügbaren Endpunkte[/bold yellow]")
+        out.message("[dim]Teste alle bekannten GraphQL Queries...[/dim]\n")
+
+        try:
+            with graphql_client() as client:
+                if not client.is_authenticated:
+                    out.message("[red]✗ Kein Bearer Token konfiguriert[/red]")
+                    out.message("[dim]  Setze Token mit: kolping set-graphql[/dim]")
+                else:
+                    # Test each available query
+                    test_queries = [
+                        "myStudentData",
+                        "myStudentGradeOverview",
+                        "moduls",
+                        "semesters",
+                        "pruefungs",
+                        "studiengangs",
+                        "matchModulStudent",
+                    ]
+
+                    out.table(
+                        "endpoints",
+                        "GraphQL Endpoint Analyse",
+                        ENDPOINT_COLUMNS,
+                        (_test_query(client, name) for name in test_queries),
+                    )
+                    out.print()
+        except Exception as e:
+            out.message(f"[red]✗ Analyse fehlgeschlagen: {e}[/red]\n")
+
+    # Step 2: Fetch comprehensive exam data
+    out.print("[bold yellow]🎓 SCHRITT 2: Lade Prüfungsdaten und Modulübersicht[/bold yellow]\n")
+    stale_while_revalidate(
+        _fetch_exam_data,
+        lambda snapshot: _render_exams(out, snapshot, semester, include_completed),
+        out,
+        fresh=fresh,
+    )
+    out.close()
+
+
+def _test_query(client: Any, query_name: str) -> dict[str, Any]:
+    """Run a named query and describe its result as an endpoint table row."""
+    try:
+        response = client.execute_named_query(query_name, simple=True)
+    except Exception as e:
+        return {"query": query_name, "status": "failed", "result": str(e)[:50]}
+
+    if response.has_errors:
+        error_msg = response.errors[0].message if response.errors else "Unknown"
+        return {"query": query_name, "status": "error", "result": f"Fehler: {error_msg}"}
+    if not response.data:
+        return {"query": query_name, "status": "empty", "result": "Leer"}
+
+    # Count results
+    data_val = next(iter(response.data.values()))
+    if isinstance(data_val, list):
+        result = f"{len(data_val)} Einträge"
+    elif isinstance(data_val, dict):
+        result = f"{len(data_val)} Felder"
+    else:
+        result = "Daten vorhanden"
+    return {"query": query_name, "status": "ok", "result": result}
+
+
+def _fetch_exam_data(log: Callable[[str], Any]) -> dict:
+    """Fetch grade overview, exam dates, calendar events and courses as fetch.json export."""
+    from datetime import UTC, datetime
+
+    data: dict[str, Any] = {
+        "fetch_timestamp": datetime.now(UTC).isoformat(),
+        "graphql": {},
+        "moodle": {},
+        "errors": [],
+    }
+    errors = data["errors"]
+
+    # Fetch from GraphQL
+    log("[dim]Lade GraphQL Daten...[/dim]")
+    try:
+        with graphql_client() as client:
+            if not client.is_authenticated:
+                errors.append("GraphQL: Kein Bearer Token konfiguriert")
+            else:
+                success, _ = client.test_connection()
+                if not success:
+                    errors.append("GraphQL: Verbindung fehlgeschlagen")
+                else:
+                    # Get grade overview (includes all modules with status)
+                    response = client.execute_named_query("myStudentGradeOverview")
+                    if response.data and "myStudentGradeOverview" in response.data:
+                        data["graphql"]["gradeOverview"] = response.data["myStudentGradeOverview"]
+                        log("[green]✓ Prüfungsübersicht geladen[/green]")
+
+                    # Get exam dates
+                    response = client.execute_named_query("pruefungs", simple=True)
+                    if response.data and "pruefungs" in response.data:
+                        data["graphql"]["exams"] = response.data["pruefungs"]
+                        exam_count = len(data["graphql"]["exams"])
+                        log(f"[green]✓ {exam_count} Prüfungstermine gefunden[/green]")
+
+    except Exception as e:
+        errors.append(f"GraphQL: {e}")
+        log(f"[red]✗ GraphQL Fehler: {e}[/red]")
+
+    # Fetch from Moodle
+    log("[dim]Lade Moodle Daten...[/dim]")
+    try:
+        with moodle_client() as client:
+            if not client.is_authenticated:
+                errors.append("Moodle: Keine Session konfiguriert")
+            else:
+                is_valid, _ = client.test_session()
+                if not is_valid:
+                    errors.append("Moodle: Session abgelaufen")
+                else:
+                    # Get calendar events
+                    calendar_events = client.get_upcoming_deadlines()
+                    data["moodle"]["events"] = [
+                        {
+                            "id": e.id,
+                            "title": e.title,
+                            "start_time": e.start_time,
+                            "course_name": e.course_name,
+                            "url": e.url,
+                        }
+                        for e in calendar_events
+                    ]
+                    log(f"[green]✓ {len(calendar_events)} Kalender-Events geladen[/green]")
+
+                    # Get courses
+                    moodle_courses = client.get_courses()
+                    data["moodle"]["courses"] = [
+                        {"id": c.id, "name": c.name, "url": c.url} for c in moodle_courses
+                    ]
+                    log(f"[green]✓ {len(moodle_courses)} Kurse geladen[/green]")
+    except Exception as e:
+        errors.append(f"Moodle: {e}")
+        log(f"[red]✗ Moodle Fehler: {e}[/red]")
+
+    return data
+
+
+def _render_exams(
+    out: Renderer, snapshot: dict, semester: int | None, include_completed: bool
+) -> None:
+    """Render the exam and module overview of a normalized snapshot."""
+    grade_data = None
+    if snapshot.get("modules") or snapshot.get("overview"):
+        grade_data = {**snapshot["overview"], "modules": list(snapshot["modules"].values())}
+    exam_dates = list((snapshot.get("exams") or {}).values())
+    calendar_events = list((snapshot.get("events") or {}).values())
+    moodle_courses = list((snapshot.get("courses") or {}).values())
+
+    out.print()
+
+    # Step 3: Display comprehensive overview
+    if grade_data:
+        current_sem = grade_data.get("currentSemester", "Unbekannt")
+
+        # Safely parse current semester number
+        current_sem_num = None
+        if isinstance(current_sem, str) and current_sem.strip():
+            parts = current_sem.strip().split()
+            if parts:
+                # Extract leading digits from first token (e.g. "1.", "1", "1.Semester")
+                digits = "".join(ch for ch in parts[0] if ch.isdigit())
+                if digits:
+                    try:
+                        current_sem_num = int(digits)
+                    except ValueError:
+                        current_sem_num = None
+
+        out.fields(
+            "overview",
+            [
+                ("currentSemester", "📊 Aktuelles Semester", current_sem),
+                ("grade", "Notendurchschnitt", grade_data.get("grade", "-")),
+                ("eCTS", "Erreichte ECTS", grade_data.get("eCTS", 0)),
+            ],
+        )
+
+        modules = grade_data.get("modules", [])
+
+        # Filter by semester if specified
+        if semester:
+            modules = [m for m in modules if m.get("semester") == semester]
+            display_semester = semester
+        elif current_sem_num:
+            display_semester = current_sem_num
+        else:
+            display_semester = None
+
+        # Categorize modules
+        angemeldet = [m for m in modules if m.get("examStatus") == "angemeldet"]
+        bestanden = [m for m in modules if m.get("examStatus") == "bestanden"]
+        anerkannt = [m for m in modules if m.get("examStatus") == "anerkannt"]
+        nicht_bestanden = [m for m in modules if m.get("examStatus") == "nicht bestanden"]
+        offen = [
+            m
+            for m in modules
+            if m.get("examStatus") is None and m.get("pruefungsform") != "Anerkennung"
+        ]
+
+        # Filter open modules to current semester range if not explicitly set
+        if not semester and display_semester and not include_completed:
+            offen = [m for m in offen if m.get("semester", 0) <= display_semester]
+
+        # Show registered exams with dates
+        exams_by_module = {
+            str(e["modulId"]): e for e in reversed(exam_dates) if e.get("modulId") is not None
+        }
+        count = out.table(
+            "registered",
+            "🔴 ANGEMELDETE PRÜFUNGEN MIT TERMINEN",
+            REGISTERED_COLUMNS,
+            (
+                {**m, "termin": _exam_date(exams_by_module.get(str(m.get("modulId"))))}
+                for m in sorted(angemeldet, key=lambda x: x.get("semester", 99))
+            ),
+            title_style="bold red",
+            border_style="red",
+        )
+
+        # Show what's needed for each exam
+        if count:
+            out.print("\n[bold]📋 Was du für die angemeldeten Prüfungen brauchst:[/bold]\n")
+        for m in angemeldet:
+            pruefungsform = m.get("pruefungsform", "Unbekannt")
+            modul_name = m.get("modulbezeichnung", "Unbekannt")
+
+            requirements = _get_requirements_for_pruefungsform(pruefungsform)
+
+            out.print(
+                Panel(
+                    f"[bold]{modul_name}[/bold]\n"
+                    f"[cyan]Prüfungsform:[/cyan] {pruefungsform}\n"
+                    f"[yellow]Erforderlich:[/yellow]\n{requirements}",
+                    border_style="blue",
+                )
+            )
+
+        # Show open modules with requirements
+        semester_info = f" (Semester {display_semester})" if display_semester else ""
+        count = out.table(
+            "open",
+            f"📝 OFFENE MODULE{semester_info}",
+            OPEN_COLUMNS,
+            (
+                {**m, "moodleCourse": _matching_course(m, moodle_courses)}
+                for m in sorted(offen, key=lambda x: x.get("semester", 99))
+            ),
+            title_style="bold",
+        )
+
+        # Group by assessment type
+        if count:
+            out.print("\n[bold]📚 Offene Module nach Prüfungsform gruppiert:[/bold]\n")
+
+        pruefungsformen: dict[str, list] = {}
+        for m in offen:
+            pform = m.get("pruefungsform", "Unbekannt")
+            if pform not in pruefungsformen:
+                pruefungsformen[pform] = []
+            pruefungsformen[pform].append(m)
+
+        for pform, modules_list in sorted(pruefungsformen.items()):
+            count = len(modules_list)
+            ects_sum = sum(m.get("eCTS", 0) for m in modules_list)
+            requirements = _get_requirements_for_pruefungsform(pform)
+
+            out.print(f"[bold cyan]{pform}[/bold cyan] ({count} Module, {ects_sum} ECTS)")
+            out.print(f"[dim]{requirements}[/dim]")
+            for mod in modules_list:
+                out.print(
+                    f"  • {mod.get('modulbezeichnung', '?')[:MODULE_NAME_MAX_LENGTH]} "
+                    f"(Sem. {mod.get('semester', '?')})"
+                )
+            out.print()
+
+        # Show completed and failed modules if requested
+        if include_completed:
+            out.table(
+                "completed",
+                "✓ ABGESCHLOSSENE MODULE",
+                COMPLETED_COLUMNS,
+                sorted(bestanden + anerkannt, key=lambda x: x.get("semester", 99)),
+                title_style="bold green",
+                border_style="green",
+            )
+            out.table(
+                "failed",
+                "⚠️ NICHT BESTANDEN (Wiederholung nötig)",
+                FAILED_COLUMNS,
+                sorted(nicht_bestanden, key=lambda x: x.get("semester", 99)),
+                title_style="bold yellow",
+                border_style="yellow",
+            )
+
+    # Show calendar events with course links
+    out.table(
+        "events",
+        "📅 KOMMENDE TERMINE & DEADLINES (Moodle)",
+        EVENT_COLUMNS,
+        calendar_events,
+        limit=15,
+    )
+
+    # Show Moodle courses with links
+    if len(moodle_courses) > 20:
+        out.print(f"\n[dim]... und {len(moodle_courses) - 20} weitere Kurse[/dim]")
+    out.table("courses", "🔗 MOODLE KURSE & MATERIALIEN", COURSE_COLUMNS, moodle_courses, limit=20)
+
+    # Final tips
+    out.print("\n[bold cyan]💡 Nützliche Links:[/bold cyan]")
+    out.print("  • Moodle Portal: https://portal.kolping-hochschule.de")
+    out.print("  • Mein Studium: https://cms.kolping-hochschule.de")
+    out.print("  • Kalender: https://portal.kolping-hochschule.de/calendar/view.php")
+    out.print("\n[dim]Tipp: Verwende 'kolping export all' für vollständigen JSON-Export[/dim]")
+
+
+def _exam_date(exam: dict | None) -> str | None:
+    """Format date, time and room of an exam, None if the date is unknown."""
+    if not exam or not exam.get("datum"):
+        return None
+    exam_date = f"{exam['datum']}"
+    if exam.get("uhrzeit"):
+        exam_date += f" {exam['uhrzeit']}"
+    if exam.get("raum"):
+        exam_date += f" ({exam['raum']})"
+    return exam_date
+
+
+def _matching_course(module: dict, moodle_courses: list[dict]) -> str | None:
+    """Find the Moodle course of a module by a simple fuzzy match on its name."""
+    prefix = module.get("modulbezeichnung", "?")[:COURSE_NAME_MATCH_LENGTH].lower()
+    return next(
+        (c.get("name") for c in moodle_courses if prefix in (c.get("name") or "").lower()),
+        None,
+    )
+
+
+def _get_requirements_for_pruefungsform(pruefungsform: str) -> str:
+    """Get description of requirements for a given assessment type."""
+    requirements_map = {
+        "Klausur": (
+            "  • Schriftliche Prüfung im Prüfungszeitraum\n"
+            "  • Anmeldung erforderlich\n"
+            "  • Prüfungsvorbereitung empfohlen"
+        ),
+        "Lerntagebuch": (
+            "  • Regelmäßige Reflexion über Lernprozess\n"
+            "  • Dokumentation in vorgegebenem Format\n"
+            "  • Abgabe über Moodle"
+        ),
+        "Präsentation": (
+            "  • Vorbereitung einer Präsentation (10-20 Min.)\n"
+            "  • Handout oder Folien\n"
+            "  • Präsentation vor Kurs/Dozent"
+        ),
+        "Seminararbeit": (
+            "  • Schriftliche Ausarbeitung (10-15 Seiten)\n"
+            "  • Wissenschaftliche Zitierweise\n"
+            "  • Abgabe als PDF über Moodle"
+        ),
+        "E-Portfolio": (
+            "  • Digitale Sammlung von Lernartefakten\n"
+            "  • Reflexion über Lernfortschritt\n"
+            "  • Online-Präsentation"
+        ),
+        "Mündliche Prüfung": (
+            "  • Terminvereinbarung mit Prüfer\n"
+            "  • Vorbereitung auf Prüfungsgespräch\n"
+            "  • Ca. 20-30 Minuten"
+        ),
+        "Anerkennung": (
+            "  • Nachweis über Praxisphase\n"
+            "  • Bestätigung vom Arbeitgeber\n"
+            "  • Einreichung über Studierendensekretariat"
+        ),
+        "Exposé": (
+            "  • Forschungsplan für Abschlussarbeit\n  • 3-5 Seiten\n  • Einreichung beim Betreuer"
+        ),
+        "Bachelorthesis & Kolloquium": (
+            "  • Wissenschaftliche Arbeit (40-60 Seiten)\n"
+            "  • Kolloquium (30 Min. Verteidigung)\n"
+            "  • Anmeldung und Themenfindung"
+        ),
+        "Praxistransferbericht": (
+            "  • Bericht über Praxisphase (10-15 Seiten)\n"
+            "  • Reflexion der praktischen Tätigkeit\n"
+            "  • Abgabe über Moodle"
+        ),
+    }
+
+    return requirements_map.get(
+        pruefungsform, "  • Details siehe Modulhandbuch\n  • Informationen auf Moodle"
+    )
@@ -0,0 +1,309 @@
+"""Export commands: GraphQL, Moodle and combined exports."""
+
+import typer
+from rich.table import Table
+
+from kolping_cockpit.commands import (
+    commit_to_store,
+    console,
+    graphql_client,
+    moodle_client,
+    record_history,
+)
+
+app = typer.Typer(
+    name="export",
+    help="Export study data from various sources",
+)
+
+
+@app.command("graphql")
+def export_graphql(
+    output: str = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Output JSON file path (default: today's snapshot in the export store)",
+    ),
+    simple: bool = typer.Option(
+        True,
+        "--simple/--full",
+        help="Use simplified queries (less fields, more reliable)",
+    ),
+    query: str = typer.Option(
+        None,
+        "--query",
+        "-q",
+        help="Execute a specific query (myStudentData, moduls, semesters, etc.)",
+    ),
+) -> None:
+    """
+    Export data from the GraphQL API ("Mein Studium").
+
+    Available queries:
+    - myStudentData: Personal student data
+    - myStudentGradeOverview: Grades and ECTS
+    - moduls: All available modules
+    - semesters: Semester information
+    - pruefungs: Exam appointments
+    - matchModulStudent: Your enrolled modules
+
+    Examples:
+        kolping export graphql
+        kolping export graphql --query myStudentData
+        kolping export graphql --full -o study_data.json
+    """
+    import json
+    from datetime import UTC, datetime
+    from pathlib import Path
+
+    console.print("[bold cyan]Kolping Study Cockpit - GraphQL Export[/bold cyan]")
+    console.print("=" * 50)
+
+    # Determine output path (default: deduplicated export store)
+    output_path = Path(output) if output else None
+    if output_path:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with graphql_client() as client:
+            console.print(f"[dim]Endpoint: {client.endpoint}[/dim]")
+            console.print(f"[dim]Authenticated: {'Yes' if client.is_authenticated else 'No'}[/dim]")
+
+            # Test connection
+            success, message = client.test_connection()
+            if not success:
+                console.print(f"[red]✗ Connection failed: {message}[/red]")
+                raise typer.Exit(code=1)
+
+            console.print(f"[green]✓ Connected: {message}[/green]")
+
+            if query:
+                # Execute specific query
+                console.print(f"[yellow]Executing query: {query}...[/yellow]")
+                response = client.execute_named_query(query, simple=simple)
+
+                if response.has_errors:
+                    for error in response.errors or []:
+                        console.print(f"[red]✗ Error: {error.message}[/red]")
+
+                data = {
+                    "query": query,
+                    "timestamp": datetime.now(UTC).isoformat(),
+                    "data": response.data,
+                    "errors": [e.message for e in response.errors or []],
+                }
+            else:
+                # Export all
+                console.print(f"[yellow]Exporting all data (simple={simple})...[/yellow]")
+                data = client.export_all(simple=simple)
+
+            # Save to file or snapshot store
+            if output_path:
+                with output_path.open("w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+                console.print(f"[green]✓ Data exported to: {output_path}[/green]")
+            else:
+                commit_to_store({"graphql.json": data})
+            record_history(data)
+
+            # Display summary
+            if "data" in data and data["data"]:
+                table = Table(title="Export Summary")
+                table.add_column("Data Type", style="cyan")
+                table.add_column("Records", style="magenta")
+
+                for key, value in data["data"].items():
+                    if isinstance(value, dict):
+                        count = "1 object"
+                    elif isinstance(value, list):
+                        count = f"{len(value)} items"
+                    else:
+                        count = "present"
+                    table.add_row(key, count)
+
+                console.print(table)
+
+            if "errors" in data and data["errors"]:
+                console.print("[yellow]⚠ Some queries had errors (see export file)[/yellow]")
+
+    except Exception as e:
+        console.print(f"[red]✗ Export error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+
+@app.command("moodle")
+def export_moodle(
+    output: str = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Output JSON file path (default: today's snapshot in the export store)",
+    ),
+) -> None:
+    """
+    Export data from Moodle Portal.
+
+    Exports:
+    - Dashboard overview
+    - Enrolled courses
+    - Assignments and deadlines
+    - Grades
+    - Upcoming calendar events
+
+    Requires valid MoodleSession cookie (use 'kolping login-manual' first).
+    """
+    import json
+    from pathlib import Path
+
+    console.print("[bold cyan]Kolping Study Cockpit - Moodle Export[/bold cyan]")
+    console.print("=" * 50)
+
+    # Determine output path (default: deduplicated export store)
+    output_path = Path(output) if output else None
+    if output_path:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with moodle_client() as client:
+            console.print(f"[dim]Portal: {client.base_url}[/dim]")
+            console.print(
+                f"[dim]Session: {'Configured' if client.is_authenticated else 'Not set'}[/dim]"
+            )
+
+            if not client.is_authenticated:
+                console.print("[red]✗ No MoodleSession cookie found[/red]")
+                console.print("[yellow]Run 'kolping login-manual' to set session[/yellow]")
+                raise typer.Exit(code=1)
+
+            # Test session
+            is_valid, message = client.test_session()
+            if not is_valid:
+                console.print(f"[red]✗ Session invalid: {message}[/red]")
+                console.print("[yellow]Run 'kolping login-manual' to refresh session[/yellow]")
+                raise typer.Exit(code=1)
+
+            console.print(f"[green]✓ Session valid: {message}[/green]")
+            console.print("[yellow]Exporting Moodle data...[/yellow]")
+
+            # Export all data
+            data = client.export_all()
+
+            # Save to file or snapshot store
+            if output_path:
+                with output_path.open("w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+                console.print(f"[green]✓ Data exported to: {output_path}[/green]")
+            else:
+                commit_to_store({"moodle.json": data})
+
+            # Display summary
+            if "data" in data and data["data"]:
+                table = Table(title="Export Summary")
+                table.add_column("Data Type", style="cyan")
+                table.add_column("Records", style="magenta")
+
+                for key, value in data["data"].items():
+                    if isinstance(value, dict):
+                        if "courses" in value:
+                            count = f"{len(value.get('courses', []))} courses"
+                        else:
+                            count = "1 object"
+                    elif isinstance(value, list):
+                        count = f"{len(value)} items"
+                    else:
+                        count = "present"
+                    table.add_row(key, count)
+
+                console.print(table)
+
+            if "errors" in data and data["errors"]:
+                console.print("[yellow]⚠ Some exports had errors:[/yellow]")
+                for key, error in data["errors"].items():
+                    console.print(f"  [red]{key}: {error}[/red]")
+
+    except Exception as e:
+        console.print(f"[red]✗ Export error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+
+@app.command("all")
+def export_all(
+    output_dir: str = typer.Option(
+        None,
+        "--output-dir",
+        "-d",
+        help="Output directory (default: today's snapshot in the export store)",
+    ),
+) -> None:
+    """
+    Export all available data (GraphQL + Moodle).
+
+    Creates separate files for each data source. Without --output-dir the
+    files are committed to the deduplicated export store
+    (see 'kolping snapshots').
+    """
+    import json
+    from pathlib import Path
+
+    console.print("[bold cyan]Kolping Study Cockpit - Full Export[/bold cyan]")
+    console.print("=" * 50)
+
+    # Determine output directory (default: deduplicated export store)
+    base_path = Path(output_dir) if output_dir else None
+    if base_path:
+        base_path.mkdir(parents=True, exist_ok=True)
+
+    results = {"graphql": None, "moodle": None}
+
+    def save(filename: str, data: dict) -> str:
+        if base_path is None:
+            return f"snapshot:{filename}"
+        path = base_path / filename
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        return str(path)
+
+    # Export GraphQL
+    console.print("\n[bold]1. GraphQL API Export[/bold]")
+    try:
+        with graphql_client() as client:
+            success, _ = client.test_connection()
+            if success:
+                results["graphql"] = client.export_all(simple=True)
+                record_history(results["graphql"])
+                graphql_path = save("graphql.json", results["graphql"])
+                console.print(f"[green]✓ GraphQL: {graphql_path}[/green]")
+            else:
+                console.print("[yellow]⚠ GraphQL: Connection failed[/yellow]")
+    except Exception as e:
+        console.print(f"[red]✗ GraphQL error: {e}[/red]")
+
+    # Export Moodle
+    console.print("\n[bold]2. Moodle Portal Export[/bold]")
+    try:
+        with moodle_client() as client:
+            if client.is_authenticated:
+                is_valid, _ = client.test_session()
+                if is_valid:
+                    results["moodle"] = client.export_all()
+                    moodle_path = save("moodle.json", results["moodle"])
+                    console.print(f"[green]✓ Moodle: {moodle_path}[/green]")
+                else:
+                    console.print("[yellow]⚠ Moodle: Session expired[/yellow]")
+            else:
+                console.print("[yellow]⚠ Moodle: No session configured[/yellow]")
+    except Exception as e:
+        console.print(f"[red]✗ Moodle error: {e}[/red]")
+
+    # Summary
+    console.print("\n" + "=" * 50)
+    if base_path:
+        console.print(f"[bold]Export complete: {base_path}[/bold]")
+    else:
+        files = {f"{name}.json": data for name, data in results.items() if data is not None}
+        if files:
+            commit_to_store(files)
+
+    exported = sum(1 for v in results.values() if v is not None)
+    console.print(f"[dim]Successfully exported: {exported}/2 sources[/dim]")
@@ -0,0 +1,369 @@
+"""Fetch command: full online fetch of all study data."""
+
+import typer
+
+from kolping_cockpit.commands import (
+    FORMAT_OPTION,
+    commit_to_store,
+    graphql_client,
+    moodle_client,
+    output_renderer,
+    record_history,
+)
+from kolping_cockpit.render import Column, OutputFormat
+
+app = typer.Typer()
+
+_EXAM_SYMBOLS = {
+    "bestanden": "[green]✓[/green]",
+    "nicht bestanden": "[red]✗[/red]",
+    "angemeldet": "[blue]●[/blue]",
+    "abgemeldet": "[yellow]○[/yellow]",
+}
+
+_MODULE_STATUS = {
+    "bestanden": "[green]bestanden[/green]",
+    "nicht bestanden": "[red]nicht best.[/red]",
+    "angemeldet": "[blue]ANGEMELDET[/blue]",
+    "abgemeldet": "[yellow]abgemeldet[/yellow]",
+    "anerkannt": "[cyan]anerkannt[/cyan]",
+}
+
+EXAM_COLUMNS = [
+    Column("modulbezeichnung", "Modul", style="bold", max_width=45, truncate=45),
+    Column("semester", "Sem.", justify="center"),
+    Column(
+        "examStatus",
+        "Status",
+        empty="offen",
+        format=lambda s: _EXAM_SYMBOLS.get(s, "[dim]○[/dim]"),
+    ),
+    Column("note", "Note", justify="right", empty="-"),
+]
+
+MODULE_COLUMNS = [
+    Column("modulbezeichnung", "Modul", style="bold", max_width=40, truncate=40),
+    Column("semester", "Sem.", justify="center"),
+    Column("pruefungsform", "Prüfungsform", max_width=15, truncate=15),
+    Column(
+        "examStatus",
+        "Status",
+        empty="-",
+        format=lambda s: _MODULE_STATUS.get(s, f"[dim]{s}[/dim]"),
+    ),
+    Column("eCTS", "ECTS", justify="right", empty="0"),
+]
+
+EVENT_COLUMNS = [
+    Column("title", "Event", style="bold", max_width=45, truncate=45),
+    Column("start_time", "Datum/Zeit", style="cyan"),
+    Column("course_name", "Kurs", style="dim", max_width=20, empty="", truncate=20),
+]
+
+COURSE_COLUMNS = [
+    Column("name", "Kurs", style="bold", truncate=60),
+    Column("id", "ID", style="dim"),
+]
+
+
+@app.command("fetch")
+def fetch_all_online(
+    output: str = typer.Option(None, "--output", "-o", help="Output JSON file path for export"),
+    limit: int = typer.Option(0, "--limit", "-l", help="Limit number of events (0 = unlimited)"),
+    output_format: OutputFormat = FORMAT_OPTION,
+) -> None:
+    """
+    Full online fetch of all study data.
+
+    Fetches LIVE data from:
+    - GraphQL API: All modules, grades, student data
+    - Moodle Portal: All calendar events, courses, assignments
+
+    Requires valid tokens (use 'kolping set-graphql' and 'kolping set-moodle').
+    The result is stored as today's snapshot (see 'kolping snapshots'), which
+    diff, serve, watch and the history read.
+
+    Example:
+        kolping fetch
+        kolping fetch --output study_data.json
+        kolping fetch --format ndjson | jq -c 'select(.section == "modules")'
+    """
+    import json
+    from datetime import UTC, datetime
+    from pathlib import Path
+
+    out = output_renderer(output_format)
+    out.print("[bold cyan]🌐 Kolping Study Cockpit - Online Vollfetch[/bold cyan]")
+    out.print("=" * 60)
+
+    all_data: dict = {
+        "fetch_timestamp": datetime.now(UTC).isoformat(),
+        "graphql": {},
+        "moodle": {},
+        "errors": [],
+    }
+
+    # 1. GraphQL Full Fetch
+    out.message("\n[bold]1. GraphQL API Fetch[/bold]")
+    try:
+        with graphql_client() as client:
+            if not client.is_authenticated:
+                out.message("[red]✗ Kein Bearer Token konfiguriert[/red]")
+                out.message("[dim]  Setze Token mit: kolping set-graphql <TOKEN>[/dim]")
+                all_data["errors"].append("GraphQL: Kein Bearer Token")
+            else:
+                out.message("[dim]  Teste Verbindung...[/dim]")
+                success, msg = client.test_connection()
+                if not success:
+                    out.message(f"[red]✗ Verbindung fehlgeschlagen: {msg}[/red]")
+                    all_data["errors"].append(f"GraphQL: {msg}")
+                else:
+                    out.message("[green]✓ Verbunden[/green]")
+
+                    # Fetch student data
+                    out.message("[dim]  Lade Studentendaten...[/dim]")
+                    response = client.execute_named_query("myStudentData")
+                    if response.data and "myStudentData" in response.data:
+                        all_data["graphql"]["student"] = response.data["myStudentData"]
+                        student_data = response.data["myStudentData"]
+                        vorname = student_data.get("vorname", "")
+                        nachname = student_data.get("nachname", "")
+                        name = f"{vorname} {nachname}"
+                        out.message(f"[green]✓ Student: {name}[/green]")
+                    elif response.has_errors:
+                        out.message(f"[yellow]⚠ Studentendaten: {response.errors}[/yellow]")
+
+                    # Fetch grade overview (all modules)
+                    out.message("[dim]  Lade Prüfungsübersicht...[/dim]")
+                    response = client.execute_named_query("myStudentGradeOverview")
+                    if response.data and "myStudentGradeOverview" in response.data:
+                        overview = response.data["myStudentGradeOverview"]
+                        all_data["graphql"]["gradeOverview"] = overview
+                        modules = overview.get("modules", [])
+                        out.message(f"[green]✓ {len(modules)} Module geladen[/green]")
+                        out.message(
+                            f"[dim]  Durchschnitt: {overview.get('grade', '-')} | "
+                            f"ECTS: {overview.get('eCTS', 0)} | "
+                            f"Semester: {overview.get('currentSemester', '?')}[/dim]"
+                        )
+                    elif response.has_errors:
+                        out.message(f"[yellow]⚠ Prüfungsdaten: {response.errors}[/yellow]")
+
+    except Exception as e:
+        out.message(f"[red]✗ GraphQL Fehler: {e}[/red]")
+        all_data["errors"].append(f"GraphQL: {e}")
+
+    # 2. Moodle Full Fetch
+    out.message("\n[bold]2. Moodle Portal Fetch[/bold]")
+    try:
+        with moodle_client() as client:
+            if not client.is_authenticated:
+                out.message("[red]✗ Keine Moodle Session konfiguriert[/red]")
+                out.message("[dim]  Setze Session mit: kolping set-moodle <SESSION>[/dim]")
+                all_data["errors"].append("Moodle: Keine Session")
+            else:
+                out.message("[dim]  Teste Session...[/dim]")
+                is_valid, msg = client.test_session()
+                if not is_valid:
+                    out.message(f"[red]✗ Session ungültig: {msg}[/red]")
+                    all_data["errors"].append(f"Moodle: {msg}")
+                else:
+                    out.message("[green]✓ Session gültig[/green]")
+
+                    # Fetch dashboard
+                    out.message("[dim]  Lade Dashboard...[/dim]")
+                    dashboard = client.get_dashboard()
+                    all_data["moodle"]["user"] = dashboard.user_name
+                    out.message(f"[green]✓ User: {dashboard.user_name}[/green]")
+
+                    # Fetch courses
+                    out.message("[dim]  Lade Kurse...[/dim]")
+                    courses = client.get_courses()
+                    all_data["moodle"]["courses"] = [
+                        {"id": c.id, "name": c.name, "url": c.url} for c in courses
+                    ]
+                    out.message(f"[green]✓ {len(courses)} Kurse geladen[/green]")
+
+                    # Fetch calendar events (all upcoming)
+                    out.message("[dim]  Lade Kalender-Events...[/dim]")
+                    events = client.get_upcoming_deadlines()
+                    all_data["moodle"]["events"] = [
+                        {
+                            "id": e.id,
+                            "title": e.title,
+                            "start_time": e.start_time,
+                            "course_name": e.course_name,
+                            "url": e.url,
+                        }
+                        for e in events
+                    ]
+                    out.message(f"[green]✓ {len(events)} Events geladen[/green]")
+
+                    # Fetch assignments
+                    out.message("[dim]  Lade Aufgaben...[/dim]")
+                    assignments = client.get_assignments()
+                    all_data["moodle"]["assignments"] = [
+                        {
+                            "id": a.id,
+                            "name": a.name,
+                            "due_date": a.due_date,
+                            "course_name": a.course_name,
+                        }
+                        for a in assignments
+                    ]
+                    out.message(f"[green]✓ {len(assignments)} Aufgaben geladen[/green]")
+
+                    # Fetch grades
+                    out.message("[dim]  Lade Noten...[/dim]")
+                    grades = client.get_grades()
+                    all_data["moodle"]["grades"] = [
+                        {"item": g.item_name, "grade": g.grade} for g in grades
+                    ]
+                    out.message(f"[green]✓ {len(grades)} Noteneinträge[/green]")
+
+    except Exception as e:
+        out.message(f"[red]✗ Moodle Fehler: {e}[/red]")
+        all_data["errors"].append(f"Moodle: {e}")
+
+    # 3. Display Results
+    out.print("\n" + "=" * 60)
+    out.print("[bold]📊 ERGEBNISSE[/bold]\n")
+
+    # Student Info
+    student = all_data["graphql"].get("student", {})
+    if student:
+        out.fields(
+            "student",
+            [
+                ("name", "Student", f"{student.get('vorname', '')} {student.get('nachname', '')}"),
+                ("emailKh", "Email", student.get("emailKh", "")),
+            ],
+        )
+
+    # Grade Overview
+    overview = all_data["graphql"].get("gradeOverview", {})
+    if overview:
+        out.print()
+        out.fields(
+            "overview",
+            [
+                ("currentSemester", "Semester", overview.get("currentSemester", "?")),
+                ("grade", "Notendurchschnitt", overview.get("grade", "-")),
+                ("eCTS", "ECTS", overview.get("eCTS", 0)),
+            ],
+        )
+
+        modules = overview.get("modules", [])
+
+        # Klausuren
+        out.table(
+            "exams",
+            "📝 KLAUSUREN",
+            EXAM_COLUMNS,
+            sorted(
+                (m for m in modules if m.get("pruefungsform") == "Klausur"),
+                key=lambda x: x.get("semester", 99),
+            ),
+            title_style="bold magenta",
+        )
+
+        # Alle Module (ungecapped)
+        display_modules = modules if limit == 0 else modules[:limit]
+        out.table(
+            "modules",
+            "📚 ALLE MODULE",
+            MODULE_COLUMNS,
+            sorted(
+                display_modules,
+                key=lambda x: (x.get("semester", 99), x.get("modulbezeichnung", "")),
+            ),
+            title_style="bold",
+        )
+
+        # Summary
+        bestanden = [m for m in modules if m.get("examStatus") == "bestanden"]
+        anerkannt = [m for m in modules if m.get("examStatus") == "anerkannt"]
+        nicht_bestanden = [m for m in modules if m.get("examStatus") == "nicht bestanden"]
+        angemeldet = [m for m in modules if m.get("examStatus") == "angemeldet"]
+        abgemeldet = [m for m in modules if m.get("examStatus") == "abgemeldet"]
+        offen = [
+            m
+            for m in modules
+            if m.get("examStatus") is None and m.get("pruefungsform") != "Anerkennung"
+        ]
+        bestanden_ects = sum(m.get("eCTS", 0) for m in bestanden)
+        anerkannt_ects = sum(m.get("eCTS", 0) for m in anerkannt)
+        offen_ects = sum(m.get("eCTS", 0) for m in offen)
+
+        summary = f"""
+[green]✓ Bestanden:[/green] {len(bestanden)} ({bestanden_ects:.0f} ECTS)
+[cyan]✓ Anerkannt:[/cyan] {len(anerkannt)} ({anerkannt_ects:.0f} ECTS)
+[red]✗ Nicht bestanden:[/red] {len(nicht_bestanden)}
+[blue]● Angemeldet:[/blue] {len(angemeldet)}
+[yellow]○ Abgemeldet:[/yellow] {len(abgemeldet)}
+[dim]○ Offen:[/dim] {len(offen)} ({offen_ects:.0f} ECTS)
+        """
+        out.summary(
+            "summary",
+            "Zusammenfassung",
+            {
+                "bestanden": len(bestanden),
+                "bestanden_ects": bestanden_ects,
+                "anerkannt": len(anerkannt),
+                "anerkannt_ects": anerkannt_ects,
+                "nicht_bestanden": len(nicht_bestanden),
+                "angemeldet": len(angemeldet),
+                "abgemeldet": len(abgemeldet),
+                "offen": len(offen),
+                "offen_ects": offen_ects,
+            },
+            summary.strip(),
+        )
+
+    # Moodle Events (all, ungecapped)
+    moodle_events = all_data["moodle"].get("events", [])
+    out.table(
+        "events",
+        "📅 ALLE TERMINE (Moodle Kalender)",
+        EVENT_COLUMNS,
+        moodle_events if limit == 0 else moodle_events[:limit],
+        title_style="bold green",
+    )
+
+    # Courses
+    courses = all_data["moodle"].get("courses", [])
+    if len(courses) > 20:
+        out.print(f"\n[dim]  ... und {len(courses) - 20} weitere Kurse[/dim]")
+    out.table(
+        "courses",
+        "📖 EINGESCHRIEBENE KURSE",
+        COURSE_COLUMNS,
+        courses,
+        limit=20,
+        title_style="bold blue",
+    )
+
+    # Errors
+    if all_data["errors"]:
+        out.message("\n[yellow]⚠ Fehler während des Fetchs:[/yellow]")
+        for err in all_data["errors"]:
+            out.message(f"  [red]• {err}[/red]")
+
+    if overview:
+        record_history(all_data)
+    if all_data["graphql"] or all_data["moodle"]:
+        try:
+            commit_to_store({"fetch.json": all_data}, out.message)
+        except OSError as e:
+            out.message(f"[yellow]⚠ Snapshot nicht gespeichert: {e}[/yellow]")
+
+    # Save to file if requested
+    if output:
+        output_path = Path(output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("w", encoding="utf-8") as f:
+            json.dump(all_data, f, indent=2, ensure_ascii=False, default=str)
+        out.message(f"\n[green]✓ Daten exportiert nach: {output_path}[/green]")
+
+    out.print("\n[dim]Datenquelle: Live Online-Abfrage[/dim]")
+    out.close()
@@ -0,0 +1,148 @@
+"""History commands for grades, exam status and ECTS over time."""
+
+import typer
+from rich.table import Table
+
+from kolping_cockpit.commands import console
+
+app = typer.Typer(
+    name="history",
+    help="Grade, status and ECTS history across all syncs",
+)
+
+_SINCE_OPTION = typer.Option(None, "--since", help="Start date (YYYY-MM-DD)")
+_UNTIL_OPTION = typer.Option(None, "--until", help="End date inclusive (YYYY-MM-DD)")
+
+
+def _history_range(since: str | None, until: str | None) -> tuple[str | None, str | None]:
+    """Convert date options into an inclusive timestamp range."""
+    if until and len(until) == 10:
+        # Include the whole end day
+        until = f"{until}T\uffff"
+    return since, until
+
+
+@app.command("backfill")
+def history_backfill() -> None:
+    """
+    Backfill the history from existing exports and snapshots.
+
+    Reads exports/*/graphql.json, exports/*/fetch.json and the export store.
+    Running it again does not create duplicates.
+    """
+    from kolping_cockpit.history import GradeHistory
+    from kolping_cockpit.settings import get_settings
+
+    settings = get_settings()
+    with GradeHistory.from_settings() as history:
+        inserted = history.backfill(settings.export_dir)
+    console.print(f"[green]✓ {inserted} Modul-Einträge übernommen[/green]")
+
+
+@app.command("module")
+def history_module(
+    query: str = typer.Argument(..., help="modulId or part of the module name"),
+    since: str | None = _SINCE_OPTION,
+    until: str | None = _UNTIL_OPTION,
+) -> None:
+    """
+    Show when a module changed its exam status or grade.
+
+    Example:
+        kolping history module Statistik
+    """
+    from kolping_cockpit.history import GradeHistory
+
+    since, until = _history_range(since, until)
+    with GradeHistory.from_settings() as history:
+        matches = history.find_modules(query)
+        if not matches:
+            console.print(f"[yellow]Kein Modul gefunden für: {query}[/yellow]")
+            raise typer.Exit(code=1)
+
+        for modul_id, name in matches:
+            table = Table(title=f"{name or '?'} ({modul_id})")
+            table.add_column("Zeitpunkt", style="cyan")
+            table.add_column("Status")
+            table.add_column("Note", justify="right")
+
+            for change in history.module_changes(modul_id, since=since, until=until):
+                table.add_row(change.ts[:16], change.exam_status or "offen", change.note or "-")
+            console.print(table)
+
+
+@app.command("changes")
+def history_changes(
+    since: str | None = _SINCE_OPTION,
+    until: str | None = _UNTIL_OPTION,
+) -> None:
+    """
+    List all status and grade changes across modules.
+
+    Example:
+        kolping history changes --since 2026-01-01
+    """
+    from kolping_cockpit.history import GradeHistory
+
+    since, until = _history_range(since, until)
+    table = Table(title="Status- und Notenänderungen")
+    table.add_column("Zeitpunkt", style="cyan")
+    table.add_column("Modul", style="bold", max_width=40)
+    table.add_column("Änderung")
+
+    with GradeHistory.from_settings() as history:
+        for change in history.module_changes(since=since, until=until):
+            if change.previous_status is None and change.previous_note is None:
+                description = f"erfasst: {change.exam_status or 'offen'}"
+            else:
+                description = (
+                    f"{change.previous_status or 'offen'} → {change.exam_status or 'offen'}"
+                )
+            if change.note and change.note != change.previous_note:
+                description += f" (Note {change.note})"
+            table.add_row(
+                change.ts[:16], (change.modulbezeichnung or change.modul_id)[:40], description
+            )
+
+    console.print(table)
+
+
+@app.command("ects")
+def history_ects(
+    since: str | None = _SINCE_OPTION,
+    until: str | None = _UNTIL_OPTION,
+) -> None:
+    """
+    Show earned ECTS per semester over time.
+
+    Only observations where the numbers changed are listed.
+    """
+    from itertools import groupby
+
+    from kolping_cockpit.history import GradeHistory
+
+    since, until = _history_range(since, until)
+    with GradeHistory.from_settings() as history:
+        rows = history.ects_by_semester(since=since, until=until)
+
+    if not rows:
+        console.print("[yellow]Keine Historie vorhanden (kolping history backfill)[/yellow]")
+        return
+
+    semesters = sorted({semester for _, semester, _ in rows if semester is not None})
+    table = Table(title="Erreichte ECTS pro Semester")
+    table.add_column("Zeitpunkt", style="cyan")
+    for semester in semesters:
+        table.add_column(f"Sem. {semester}", justify="right")
+    table.add_column("Summe", justify="right", style="bold")
+
+    previous: tuple | None = None
+    for ts, group in groupby(rows, key=lambda row: row[0]):
+        per_semester = {semester: ects for _, semester, ects in group}
+        values = tuple(per_semester.get(semester, 0.0) for semester in semesters)
+        if values == previous:
+            continue
+        previous = values
+        table.add_row(ts[:16], *(f"{v:.0f}" for v in values), f"{sum(per_semester.values()):.0f}")
+
+    console.print(table)
@@ -0,0 +1,141 @@
+"""Version, status and diagnostics commands."""
+
+import typer
+from rich.table import Table
+
+from kolping_cockpit.commands import console, moodle_client
+
+app = typer.Typer()
+
+
+@app.command()
+def version() -> None:
+    """Show version information."""
+    from kolping_cockpit import __version__
+
+    console.print(f"Kolping Study Cockpit v{__version__}")
+
+
+@app.command()
+def status(
+    fresh: bool = typer.Option(
+        False, "--fresh", "-f", help="Do not show the last check result while testing"
+    ),
+) -> None:
+    """
+    Show current authentication and export status.
+
+    The Moodle session test runs in the background; the result of the last
+    test is shown until it finishes.
+    """
+    from kolping_cockpit import swr
+    from kolping_cockpit.settings import get_secret_from_env_or_keyring, get_settings
+
+    settings = get_settings()
+
+    moodle = get_secret_from_env_or_keyring("moodle_session")
+    graphql = get_secret_from_env_or_keyring("graphql_bearer_token")
+
+    def test_moodle() -> tuple[bool, str]:
+        with moodle_client() as client:
+            return client.test_session()
+
+    # Start the network check first so it overlaps with the local output
+    moodle_check = swr.Revalidation(test_moodle) if moodle else None
+
+    console.print("[bold cyan]Kolping Study Cockpit - Status[/bold cyan]")
+    console.print("=" * 50)
+
+    # Check stored tokens
+    table = Table(title="Authentication Status")
+    table.add_column("Token", style="cyan")
+    table.add_column("Status", style="magenta")
+    table.add_column("Action")
+
+    table.add_row(
+        "Moodle Session",
+        "[green]✓ Set[/green]" if moodle else "[red]✗ Not set[/red]",
+        "" if moodle else "kolping login-manual",
+    )
+    table.add_row(
+        "GraphQL Token",
+        "[green]✓ Set[/green]" if graphql else "[yellow]○ Optional[/yellow]",
+        "" if graphql else "(set via login-manual)",
+    )
+
+    console.print(table)
+
+    # Show endpoints
+    console.print()
+    console.print("[bold]Endpoints:[/bold]")
+    console.print(f"  Moodle: {settings.moodle_base_url}")
+    console.print(f"  GraphQL: {settings.graphql_endpoint}")
+
+    # Show age of the last known data
+    cached = swr.load_cached()
+    console.print()
+    console.print("[bold]Data:[/bold]")
+    if cached:
+        console.print(f"  Last update: {swr.format_time(cached.get('timestamp'))}")
+    else:
+        console.print("  No data yet (run 'kolping fetch')")
+
+    # Test connections if tokens are available
+    if moodle_check is not None:
+        console.print()
+        cache = swr.LiveCache.from_settings()
+        last = None if fresh else cache.load_check("moodle")
+        if last:
+            mark = "[green]✓" if last.get("ok") else "[red]✗"
+            console.print(
+                f"{mark} Moodle: {last.get('message')}[/] "
+                f"[dim](last test {swr.format_time(last.get('checked_at'))})[/dim]"
+            )
+        try:
+            with console.status("[yellow]Testing Moodle session...[/yellow]"):
+                is_valid, message = moodle_check.wait()
+        except Exception as e:
+            console.print(f"[red]✗ Moodle test failed: {e}[/red]")
+            return
+        cache.save_check("moodle", is_valid, message)
+
+        if last and last.get("ok") == is_valid and last.get("message") == message:
+            console.print("[dim]  Confirmed by a new test[/dim]")
+        elif is_valid:
+            console.print(f"[green]✓ Moodle: {message}[/green]")
+        else:
+            console.print(f"[red]✗ Moodle: {message}[/red]")
+
+
+@app.command()
+def diagnose(
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Show detailed output including headers",
+    ),
+) -> None:
+    """
+    Diagnose connectivity and configuration.
+
+    Checks:
+    - Environment variables and secrets
+    - Moodle portal redirect chain (redacted)
+    - GraphQL endpoint availability
+
+    The checks run concurrently; network requests are listed with their
+    DNS, connect, TLS, time-to-first-byte and total times.
+    """
+    import asyncio
+
+    from kolping_cockpit.diagnostics import run_diagnostics
+
+    console.print("[bold cyan]Kolping Study Cockpit - Diagnostics[/bold cyan]")
+    console.print("=" * 50)
+
+    try:
+        asyncio.run(run_diagnostics(console, verbose=verbose))
+    except Exception as e:
+        console.print(f"[red]✗ Diagnostic error: {e}[/red]")
+        raise typer.Exit(code=1) from e
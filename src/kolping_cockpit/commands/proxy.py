@@ -0,0 +1,57 @@
+"""Proxy command running a caching reverse proxy for the GraphQL gateway."""
+
+import typer
+
+from kolping_cockpit.commands import console
+
+app = typer.Typer()
+
+
+@app.command()
+def proxy(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+    port: int = typer.Option(8766, "--port", "-p", help="TCP port"),
+    upstream: str = typer.Option(
+        None, "--upstream", "-u", help="GraphQL endpoint to forward to (default: the gateway)"
+    ),
+    ttl: float = typer.Option(60.0, "--ttl", help="Seconds a cached response stays valid"),
+) -> None:
+    """
+    Run a caching reverse proxy for the GraphQL gateway.
+
+    Set KOLPING_GRAPHQL_ENDPOINT=http://127.0.0.1:8766/graphql (or the KMP
+    client's endpoint) to route queries through it. Identical queries are
+    answered from the cache per token subject; GET /_proxy/stats shows hit
+    and miss counters.
+    """
+    from dataclasses import asdict
+
+    from kolping_cockpit.proxy import GraphQLProxy, create_proxy_server
+    from kolping_cockpit.settings import GRAPHQL_GATEWAY
+
+    # Not KOLPING_GRAPHQL_ENDPOINT: clients set it to the proxy itself
+    graphql_proxy = GraphQLProxy(upstream or GRAPHQL_GATEWAY, ttl=ttl)
+    try:
+        server = create_proxy_server(graphql_proxy, host, port)
+    except OSError as e:
+        console.print(f"[red]✗ Cannot bind {host}:{port}: {e}[/red]")
+        graphql_proxy.close()
+        raise typer.Exit(code=1) from None
+    except ValueError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        graphql_proxy.close()
+        raise typer.Exit(code=1) from None
+
+    bound_host, bound_port = server.server_address[:2]
+    console.print(f"[green]✓ Proxy on http://{bound_host}:{bound_port}/graphql[/green]")
+    console.print(f"[dim]  Upstream: {graphql_proxy.upstream} (TTL {ttl:g}s)[/dim]")
+    console.print("[dim]Press Ctrl+C to stop.[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        stats = asdict(graphql_proxy.stats)
+        console.print("\n[yellow]Proxy stopped[/yellow]")
+        console.print("[dim]  " + ", ".join(f"{k}={v}" for k, v in stats.items()) + "[/dim]")
+    finally:
+        server.server_close()
+        graphql_proxy.close()
@@ -0,0 +1,42 @@
+"""Serve command exposing the cached snapshot over a local HTTP API."""
+
+import typer
+
+from kolping_cockpit.commands import console
+
+app = typer.Typer()
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+    port: int = typer.Option(8765, "--port", "-p", help="TCP port"),
+) -> None:
+    """
+    Serve the latest snapshot as a local HTTP/JSON API.
+
+    Endpoints: /api/meta, /api/snapshot, /api/overview, /api/student and
+    /api/<modules|exams|events|courses|assignments|grades>[/<id>].
+    Use ?fields=a,b to select fields. Run 'kolping fetch' (or 'kolping
+    export all') to store new data; the server picks up new snapshots
+    automatically.
+    """
+    from kolping_cockpit.server import create_server
+    from kolping_cockpit.settings import get_settings
+
+    export_dir = get_settings().export_dir
+    try:
+        server = create_server(export_dir, host, port)
+    except OSError as e:
+        console.print(f"[red]✗ Cannot bind {host}:{port}: {e}[/red]")
+        raise typer.Exit(code=1) from None
+
+    bound_host, bound_port = server.server_address[:2]
+    console.print(f"[green]✓ Serving {export_dir} on http://{bound_host}:{bound_port}/api[/green]")
+    console.print("[dim]Press Ctrl+C to stop.[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Server stopped[/yellow]")
+    finally:
+        server.server_close()
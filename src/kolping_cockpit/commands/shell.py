@@ -0,0 +1,113 @@
+"""Interactive shell that runs commands in one long-lived process."""
+
+import contextlib
+import logging
+import shlex
+import time
+from typing import Any
+
+import typer
+
+from kolping_cockpit.commands import console
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer()
+
+# Commands that change stored credentials; clients are recreated afterwards
+AUTH_COMMANDS = frozenset(
+    {
+        "configure",
+        "login",
+        "logout",
+        "login-manual",
+        "set-moodle",
+        "set-graphql",
+        "get-token",
+        "renew",
+        "extract-token",
+    }
+)
+EXIT_COMMANDS = frozenset({"exit", "quit", "q"})
+
+
+def run_command(group: Any, args: list[str]) -> int:
+    """Run one CLI command in-process.
+
+    Click's standalone mode prints usage errors and aborts itself and always
+    ends with SystemExit, which is turned into the exit code here. Any other
+    exception of a command is printed, so the shell keeps running.
+
+    Returns:
+        Exit code of the command
+    """
+    try:
+        group.main(args, prog_name="kolping", standalone_mode=True)
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        logger.debug(f"Command {args[:1]} failed", exc_info=True)
+        console.print(f"[red]✗ {type(e).__name__}: {e}[/red]")
+        return 1
+    return 0
+
+
+@app.command()
+def shell(
+    ctx: typer.Context,
+    timing: bool = typer.Option(False, "--timing", "-t", help="Show run time of each command"),
+) -> None:
+    """Interactive shell that keeps clients and connections open between commands.
+
+    Settings, tokens from the keyring, the HTTP connection pools to Moodle and
+    the GraphQL gateway, the export store and the history database are set up
+    once and reused by every command (deadlines, exams, fetch, status, ...).
+
+    Type a command without the 'kolping' prefix, 'help' for the command list
+    and 'exit' (or Ctrl+D) to leave.
+    """
+    from kolping_cockpit import __version__
+    from kolping_cockpit.session import ClientSession
+
+    with contextlib.suppress(ImportError):
+        import readline  # noqa: F401 - line editing and history for input()
+
+    group = ctx.find_root().command
+
+    console.print(f"[bold cyan]Kolping Study Cockpit v{__version__} - Shell[/bold cyan]")
+    console.print("[dim]'help' lists commands, 'exit' quits.[/dim]")
+
+    with ClientSession() as session:
+        while True:
+            try:
+                line = input("kolping> ")
+            except (EOFError, KeyboardInterrupt):
+                console.print()
+                break
+
+            try:
+                args = shlex.split(line)
+            except ValueError as e:
+                console.print(f"[red]✗ {e}[/red]")
+                continue
+
+            if not args:
+                continue
+            if args[0] in EXIT_COMMANDS:
+                break
+            if args[0] == "shell":
+                console.print("[yellow]Already in the shell[/yellow]")
+                continue
+            if args[0] == "help":
+                args = [*args[1:], "--help"]
+
+            start = time.perf_counter()
+            exit_code = run_command(group, args)
+            if timing:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                console.print(f"[dim]exit {exit_code} · {elapsed_ms:.0f} ms[/dim]")
+
+            if args[0] in AUTH_COMMANDS:
+                session.reset_clients()
@@ -0,0 +1,148 @@
+"""Snapshot commands for the deduplicated export store."""
+
+import logging
+
+import typer
+from rich.table import Table
+
+from kolping_cockpit.commands import console
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer(
+    name="snapshots",
+    help="Browse and maintain the deduplicated export history",
+)
+
+
+@app.command("list")
+def snapshots_list() -> None:
+    """
+    List all stored export snapshots.
+    """
+    from kolping_cockpit.export_store import ExportStore
+
+    store = ExportStore.from_settings()
+    snapshots = store.snapshots()
+    if not snapshots:
+        console.print("[yellow]No snapshots stored yet (run 'kolping export all')[/yellow]")
+        return
+
+    table = Table(title=f"Export Snapshots ({store.root})")
+    table.add_column("Date", style="cyan")
+    table.add_column("Files")
+    table.add_column("Updated", style="dim")
+
+    for snapshot in snapshots:
+        table.add_row(snapshot.date, ", ".join(sorted(snapshot.files)), snapshot.created_at[:19])
+
+    console.print(table)
+    chunks, size = store.disk_usage()
+    console.print(f"[dim]{len(snapshots)} snapshots, {chunks} chunks, {size / 1024:.1f} KiB[/dim]")
+
+
+@app.command("checkout")
+def snapshots_checkout(
+    date: str = typer.Argument(None, help="Snapshot date (YYYY-MM-DD, default: latest)"),
+    output_dir: str = typer.Option(
+        None,
+        "--output-dir",
+        "-d",
+        help="Target directory (default: exports/YYYY-MM-DD/)",
+    ),
+) -> None:
+    """
+    Restore the JSON files of a snapshot.
+
+    Example:
+        kolping snapshots checkout 2026-01-11
+    """
+    from pathlib import Path
+
+    from kolping_cockpit.export_store import ExportStore
+    from kolping_cockpit.settings import get_settings
+
+    store = ExportStore.from_settings()
+    if date is None:
+        latest = store.latest()
+        if latest is None:
+            console.print("[red]✗ No snapshots stored[/red]")
+            raise typer.Exit(code=1)
+        date = latest.date
+
+    dest = Path(output_dir) if output_dir else get_settings().export_dir / date
+    try:
+        written = store.checkout(date, dest)
+    except KeyError as e:
+        console.print(f"[red]✗ {e.args[0]}[/red]")
+        raise typer.Exit(code=1) from e
+
+    for path in written:
+        console.print(f"[green]✓ {path}[/green]")
+
+
+@app.command("gc")
+def snapshots_gc(
+    dry_run: bool = typer.Option(
+        False, "--dry-run", "-n", help="Only report what would be removed"
+    ),
+) -> None:
+    """
+    Remove chunks no longer referenced by any snapshot.
+    """
+    from kolping_cockpit.export_store import ExportStore
+
+    store = ExportStore.from_settings()
+    result = store.gc(dry_run=dry_run)
+    action = "Would remove" if dry_run else "Removed"
+    console.print(
+        f"[green]✓ {action} {result.removed} chunks "
+        f"({result.freed_bytes / 1024:.1f} KiB), kept {result.kept}[/green]"
+    )
+
+
+@app.command("import")
+def snapshots_import(
+    prune: bool = typer.Option(
+        False, "--prune", help="Delete the legacy directories after importing"
+    ),
+) -> None:
+    """
+    Import legacy full-copy exports (exports/YYYY-MM-DD/*.json) into the store.
+    """
+    import json
+    import re
+    import shutil
+
+    from kolping_cockpit.export_store import ExportStore
+    from kolping_cockpit.settings import get_settings
+
+    export_dir = get_settings().export_dir
+    store = ExportStore.from_settings()
+    imported = 0
+
+    if export_dir.exists():
+        for day_dir in sorted(export_dir.iterdir()):
+            if not day_dir.is_dir() or not re.fullmatch(r"\d{4}-\d{2}-\d{2}", day_dir.name):
+                continue
+            files = {}
+            for json_file in sorted(day_dir.glob("*.json")):
+                try:
+                    with json_file.open(encoding="utf-8") as f:
+                        files[json_file.name] = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    logger.debug(f"Skipping unreadable export {json_file}", exc_info=True)
+            if not files:
+                continue
+
+            result = store.commit(files, date=day_dir.name)
+            imported += 1
+            console.print(
+                f"[green]✓ {day_dir.name}: {len(files)} files, "
+                f"{result.new_chunks} new chunks[/green]"
+            )
+            if prune:
+                shutil.rmtree(day_dir)
+
+    if not imported:
+        console.print("[yellow]No legacy export directories found[/yellow]")
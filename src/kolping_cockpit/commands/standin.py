@@ -0,0 +1,81 @@
+"""Stand-in command serving recorded Moodle pages and GraphQL responses."""
+
+import typer
+
+from kolping_cockpit.commands import console
+
+app = typer.Typer()
+
+
+@app.command("stand-in")
+def stand_in(
+    recordings: str = typer.Argument(None, help="Directory with graphql/ and moodle/ recordings"),
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+    port: int = typer.Option(8767, "--port", "-p", help="TCP port"),
+    latency: float = typer.Option(0.0, "--latency", min=0, help="Seconds added to each response"),
+    jitter: float = typer.Option(0.0, "--jitter", min=0, help="+/- seconds of random latency"),
+    scale: int = typer.Option(1, "--scale", min=1, help="Copies of every repeated item"),
+    synthetic: int = typer.Option(
+        None, "--synthetic", min=1, help="Serve a generated account with this many modules"
+    ),
+    seed: int = typer.Option(None, "--seed", help="Seed for the jitter and generated data"),
+) -> None:
+    """
+    Serve recorded Moodle pages and GraphQL responses for offline runs.
+
+    Point the clients at it to run fetch, export or bench without network
+    access:
+
+        KOLPING_MOODLE_BASE_URL=http://127.0.0.1:8767
+        KOLPING_GRAPHQL_ENDPOINT=http://127.0.0.1:8767/graphql
+
+    Any MoodleSession cookie and bearer token are accepted. Instead of
+    recordings, --synthetic serves a generated account of any size for
+    scaling tests.
+
+    Example:
+        kolping stand-in tests/fixtures/standin --latency 0.05
+        kolping stand-in --synthetic 5000 --seed 1
+    """
+    from pathlib import Path
+
+    from kolping_cockpit.standin import StandInConfig, StandInData, create_standin_server
+
+    if synthetic:
+        from kolping_cockpit.synthetic import SyntheticConfig, generate_dataset
+
+        dataset = generate_dataset(SyntheticConfig(modules=synthetic, seed=seed or 0))
+        data = dataset.standin_data()
+    elif recordings and Path(recordings).is_dir():
+        data = StandInData.from_directory(Path(recordings))
+    else:
+        console.print(
+            f"[red]✗ Recordings directory not found: {recordings}[/red]"
+            if recordings
+            else "[red]✗ Pass a recordings directory or --synthetic[/red]"
+        )
+        raise typer.Exit(code=1)
+
+    config = StandInConfig(latency=latency, jitter=jitter, scale=scale, seed=seed)
+    try:
+        server = create_standin_server(data, config, host, port)
+    except OSError as e:
+        console.print(f"[red]✗ Cannot bind {host}:{port}: {e}[/red]")
+        raise typer.Exit(code=1) from None
+
+    bound_host, bound_port = server.server_address[:2]
+    url = f"http://{bound_host}:{bound_port}"
+    console.print(f"[green]✓ Stand-in on {url}[/green]")
+    console.print(
+        f"[dim]  {len(data.pages)} pages, {len(data.graphql)} GraphQL fields, "
+        f"scale {scale}, latency {latency:g}s ± {jitter:g}s[/dim]"
+    )
+    console.print(f"[dim]  KOLPING_MOODLE_BASE_URL={url}[/dim]")
+    console.print(f"[dim]  KOLPING_GRAPHQL_ENDPOINT={url}/graphql[/dim]")
+    console.print("[dim]Press Ctrl+C to stop.[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stand-in stopped[/yellow]")
+    finally:
+        server.server_close()
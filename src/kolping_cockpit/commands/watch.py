@@ -0,0 +1,63 @@
+"""Watch command polling for new grades, status changes and deadlines."""
+
+import typer
+
+app = typer.Typer()
+
+
+@app.command()
+def watch(
+    min_interval: float = typer.Option(5.0, "--min", help="Minutes between polls after a change"),
+    max_interval: float = typer.Option(120.0, "--max", help="Maximum minutes between polls"),
+    exam_interval: float = typer.Option(
+        15.0, "--exam-max", help="Maximum minutes while registered exams await results"
+    ),
+    output: str = typer.Option(None, "--output", "-o", help="Append events as JSON lines"),
+    hook: str = typer.Option(None, "--hook", help="Command run per event (event JSON on stdin)"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Do not print events to stdout"),
+    count: int = typer.Option(None, "--count", "-n", help="Stop after N polls"),
+) -> None:
+    """
+    Watch for new grades, status changes and deadlines.
+
+    Polls the grade overview and the Moodle calendar with pooled connections.
+    The interval drops to --min after a change and grows to --max while
+    nothing happens. Events are printed as JSON lines (one per change);
+    progress messages go to stderr.
+    """
+    from pathlib import Path
+
+    from rich.console import Console
+
+    from kolping_cockpit.commands import record_history
+    from kolping_cockpit.session import ClientSession
+    from kolping_cockpit.snapshot import available_dates, load_snapshot
+    from kolping_cockpit.watch import AdaptiveInterval, EventSink, Watcher, fetch_delta
+
+    status = Console(stderr=True)
+
+    baseline = None
+    dates = available_dates()
+    if dates:
+        baseline = load_snapshot(dates[-1])
+        status.print(f"[dim]Baseline: snapshot {dates[-1]}[/dim]")
+
+    interval = AdaptiveInterval(
+        minimum=min_interval * 60, maximum=max_interval * 60, exam_maximum=exam_interval * 60
+    )
+    sink = EventSink(stdout=not quiet, output=Path(output) if output else None, hook=hook)
+
+    with ClientSession() as session:
+        watcher = Watcher(
+            lambda: fetch_delta(session),
+            sink,
+            interval,
+            baseline=baseline,
+            on_change=record_history,
+            status=lambda message: status.print(f"[dim]{message}[/dim]"),
+        )
+        status.print("[bold cyan]Watching for changes (Ctrl+C to stop)[/bold cyan]")
+        try:
+            watcher.run(max_polls=count)
+        except KeyboardInterrupt:
+            status.print("\n[yellow]Watcher stopped[/yellow]")
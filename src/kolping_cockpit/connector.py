@@ -1,12 +1,93 @@
-"""Local connector using Playwright and keyring for secure credential management."""
+"""Local connector using Playwright and keyring for secure credential management.
 
-from datetime import UTC
+The connector exports data by opening several portal views (grade overview,
+calendar months, course pages) as pages of one authenticated browser
+context. Views are loaded concurrently, up to ``max_pages`` at a time, and
+their records are streamed back as soon as a view is extracted.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import Any
 
 import keyring
-from playwright.sync_api import sync_playwright
 from pydantic import BaseModel, Field
 
+from kolping_cockpit.browser import BlockingProfile, BrowserPool, browser_pool
+
+logger = logging.getLogger(__name__)
+
+# Grade overview: one record per course row
+GRADES_SCRIPT = """() => Array.from(document.querySelectorAll("table#overview-grade tbody tr"))
+  .filter(row => row.querySelector("td a"))
+  .map(row => ({
+    course: row.querySelector("td a").textContent.trim(),
+    url: row.querySelector("td a").href,
+    grade: (row.querySelectorAll("td")[1] || {}).textContent?.trim() || null,
+  }))"""
+
+# Calendar month view: one record per event, with the timestamp of its day
+CALENDAR_SCRIPT = """() => Array.from(document.querySelectorAll('[data-region="day"]'))
+  .flatMap(day => Array.from(day.querySelectorAll("[data-event-id]")).map(event => ({
+    id: event.dataset.eventId,
+    title: (event.getAttribute("title") || event.textContent).trim(),
+    day: Number(day.dataset.dayTimestamp) || null,
+    url: event.href || null,
+  })))"""
+
+# Course page: one record per section with its activities
+COURSE_SCRIPT = """() => Array.from(document.querySelectorAll("li.section"))
+  .map(section => ({
+    course: document.querySelector(".page-header-headings h1, h1")?.textContent.trim() || null,
+    section: section.querySelector(".sectionname")?.textContent.trim() || null,
+    activities: Array.from(section.querySelectorAll(".activityinstance a, .activityname a"))
+      .map(a => ({title: a.textContent.trim(), url: a.href})),
+  }))"""
+
+
+@dataclass
+class PortalView:
+    """A portal page and the script extracting its records."""
+
+    name: str
+    path: str  # Relative to the connector's base URL
+    script: str  # JavaScript function returning a list of record objects
+
+
+def default_views(
+    months: int = 3, course_ids: list[int] | None = None, start: int | None = None
+) -> list[PortalView]:
+    """
+    Get the portal views exported by default.
+
+    Args:
+        months: Number of calendar months, starting with the current one
+        course_ids: Moodle course IDs whose course pages are exported
+        start: Unix timestamp within the first month (default: now)
+
+    Returns:
+        Grade overview, calendar months and course pages
+    """
+    first = datetime.fromtimestamp(start, UTC) if start else datetime.now(UTC)
+    first = first.replace(day=1, hour=12, minute=0, second=0, microsecond=0)
+    views = [PortalView("grades", "/grade/report/overview/index.php", GRADES_SCRIPT)]
+    for offset in range(months):
+        year, month = divmod(first.month - 1 + offset, 12)
+        timestamp = int(first.replace(year=first.year + year, month=month + 1).timestamp())
+        views.append(
+            PortalView(
+                "calendar",
+                f"/calendar/view.php?view=month&time={timestamp}",
+                CALENDAR_SCRIPT,
+            )
+        )
+    for course_id in course_ids or []:
+        views.append(PortalView("course", f"/course/view.php?id={course_id}", COURSE_SCRIPT))
+    return views
+
 
 class ConnectorConfig(BaseModel):
     """Configuration for the local connector."""
@@ -14,10 +95,22 @@ class ConnectorConfig(BaseModel):
     service_name: str = Field(default="kolping-cockpit", description="Keyring service name")
     username_key: str = Field(default="username", description="Username key in keyring")
     base_url: str = Field(
-        default="https://example.com",
+        default="https://portal.kolping-hochschule.de",
         description="Base URL for the target system",
     )
     timeout: int = Field(default=30000, description="Page timeout in milliseconds")
+    max_pages: int = Field(default=4, description="Views loaded concurrently")
+    block_resources: bool = Field(
+        default=True,
+        description="Abort non-essential requests with the configured browser profile",
+    )
+
+
+async def _close_page(page: Any) -> None:
+    try:
+        await page.close()
+    except Exception:
+        logger.debug("Failed to close page", exc_info=True)
 
 
 class LocalConnector:
@@ -79,60 +172,122 @@ class LocalConnector:
 
         return username, password
 
-    def export_data(self) -> dict[str, Any]:
+    def export_data(self, views: list[PortalView] | None = None) -> dict[str, Any]:
         """
         Export data using Playwright browser automation.
 
+        Args:
+            views: Portal views to export (default: :func:`default_views`)
+
         Returns:
             Dictionary containing exported data
         """
-        username, password = self.get_credentials()
+        username, _password = self.get_credentials()
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless)
-            context = browser.new_context()
-            page = context.new_page()
+        return {
+            "version": "0.1.0",
+            "exported_at": self._get_timestamp(),
+            "user": username,
+            "records": list(self.iter_records(views)),
+        }
 
-            try:
-                # This is a placeholder implementation
-                # In a real scenario, this would navigate to the actual system
-                # and extract data
+    def iter_records(self, views: list[PortalView] | None = None) -> Iterator[dict[str, Any]]:
+        """
+        Stream the records of several portal views as they are extracted.
 
-                page.set_default_timeout(self.config.timeout)
+        The browser context comes from the browser pool, so a running shell
+        session saves the Chromium launch.
 
-                # Example: Navigate to login page
-                # page.goto(f"{self.config.base_url}/login")
+        Args:
+            views: Portal views to export (default: :func:`default_views`)
 
-                # Example: Login
-                # page.fill("#username", username)
-                # page.fill("#password", password)
-                # page.click("#login-button")
+        Yields:
+            Records with the name of their view under ``"view"``
+        """
+        views = default_views() if views is None else views
+        with browser_pool() as pool:
+            yield from pool.iterate(lambda pool: self._iter_records(pool, views))
 
-                # Example: Navigate to data page
-                # page.goto(f"{self.config.base_url}/data")
+    async def _iter_records(
+        self, pool: BrowserPool, views: list[PortalView]
+    ) -> AsyncIterator[dict[str, Any]]:
+        from kolping_cockpit.auth import get_auth_storage_path
+        from kolping_cockpit.settings import get_secret_from_env_or_keyring
 
-                # Example: Extract data
-                # data = page.evaluate("() => window.dataObject")
+        # Authenticate with the saved browser login and the stored Moodle session
+        options: dict[str, Any] = {}
+        storage_state = get_auth_storage_path() / "state.json"
+        if storage_state.exists():
+            options["storage_state"] = str(storage_state)
+        profile = BlockingProfile.from_settings() if self.config.block_resources else None
 
-                # For now, return mock data
-                data = {
-                    "version": "0.1.0",
-                    "exported_at": self._get_timestamp(),
-                    "user": username,
-                    "records": [
+        async with pool.context(headless=self.headless, profile=profile, **options) as context:
+            context.set_default_timeout(self.config.timeout)
+            moodle_session = get_secret_from_env_or_keyring("moodle_session")
+            if moodle_session:
+                await context.add_cookies(
+                    [
                         {
-                            "id": 1,
-                            "title": "Sample Record",
-                            "description": "This is a sample record",
+                            "name": "MoodleSession",
+                            "value": moodle_session,
+                            "url": self.config.base_url,
                         }
-                    ],
-                }
+                    ]
+                )
+
+            async for record in self.extract_views(context, views):
+                yield record
 
-                return data
+    async def extract_views(
+        self, context: Any, views: list[PortalView]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Extract views in concurrent pages of one browser context.
+
+        At most ``config.max_pages`` pages are open at a time. Records are
+        yielded as soon as their view is extracted, regardless of view order;
+        views that fail to load are logged and skipped.
+
+        Args:
+            context: Playwright ``BrowserContext`` (async API)
+            views: Portal views to extract
 
+        Yields:
+            Records with the name of their view under ``"view"``
+        """
+        semaphore = asyncio.Semaphore(max(self.config.max_pages, 1))
+        results: asyncio.Queue[list[dict[str, Any]]] = asyncio.Queue()
+
+        async def extract(view: PortalView) -> None:
+            records: list[dict[str, Any]] = []
+            page = None
+            try:
+                async with semaphore:
+                    try:
+                        page = await context.new_page()
+                        await page.goto(f"{self.config.base_url}{view.path}")
+                        extracted = await page.evaluate(view.script)
+                        records = [{"view": view.name, **record} for record in extracted or []]
+                    except Exception:
+                        logger.warning(
+                            f"Failed to extract {view.name} from {view.path}", exc_info=True
+                        )
+                    finally:
+                        if page is not None:
+                            await _close_page(page)
             finally:
-                context.close()
-                browser.close()
+                # The consumer waits for one result per view, so failed views report too
+                results.put_nowait(records)
+
+        tasks = [asyncio.create_task(extract(view)) for view in views]
+        try:
+            for _ in tasks:
+                for record in await results.get():
+                    yield record
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     @staticmethod
     def _get_timestamp() -> str:
@@ -1,13 +1,139 @@
-"""Diagnostics module for checking connectivity and configuration."""
+"""Diagnostics module for checking connectivity and configuration.
 
+The checks run concurrently. HTTP checks record a timing breakdown of each
+request (DNS lookup, TCP connect, TLS handshake, time to first byte, total)
+through httpx event hooks and httpcore's ``trace`` extension, so slow
+diagnoses show where the time goes.
+"""
+
+import asyncio
 import os
-from dataclasses import dataclass
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
 
 import httpx
 from rich.console import Console
 from rich.table import Table
 
 
+@dataclass
+class RequestTiming:
+    """Timing breakdown of one HTTP request, in milliseconds.
+
+    Phases that did not happen (e.g. connect and TLS on a reused connection,
+    DNS for a host that was already resolved) are None. ``connect`` includes
+    the transport's own address lookup.
+    """
+
+    method: str
+    url: str
+    status: int | None = None
+    dns: float | None = None
+    connect: float | None = None
+    tls: float | None = None
+    ttfb: float | None = None
+    total: float | None = None
+
+    def summary(self) -> str:
+        """Format the phases, e.g. 'dns 12 · connect 31 · tls 48 · ttfb 95 · total 97 ms'."""
+        phases = [
+            (name, getattr(self, name)) for name in ("dns", "connect", "tls", "ttfb", "total")
+        ]
+        text = " · ".join(f"{name} {value:.0f}" for name, value in phases if value is not None)
+        return f"{text} ms" if text else "–"
+
+
+class _PhaseTimer:
+    """Collects the httpcore trace events of one request."""
+
+    def __init__(self, timing: RequestTiming, start: float):
+        self.timing = timing
+        self.start = start
+        self._started: dict[str, float] = {}
+
+    async def trace(self, name: str, info: dict[str, Any]) -> None:
+        now = time.perf_counter()
+        event, _, state = name.rpartition(".")
+        if state == "started":
+            self._started[event] = now
+            return
+        started = self._started.pop(event, None)
+        if started is None or state != "complete":
+            return
+        elapsed = (now - started) * 1000
+        if event == "connection.connect_tcp":
+            self.timing.connect = elapsed
+        elif event == "connection.start_tls":
+            self.timing.tls = elapsed
+        elif event.endswith(".receive_response_headers"):
+            self.timing.ttfb = (now - self.start) * 1000
+
+
+class TimingRecorder:
+    """Records a :class:`RequestTiming` for every request of an httpx client.
+
+    Pass :attr:`event_hooks` to ``httpx.AsyncClient``. The request hook
+    resolves new hosts once (timed as DNS) and attaches a trace callback;
+    the response hook reads the body and completes the timing. Requests that
+    fail without a response are recorded by :meth:`flush`.
+    """
+
+    def __init__(self) -> None:
+        self.timings: list[RequestTiming] = []
+        self._timers: dict[int, _PhaseTimer] = {}
+        self._resolved: set[tuple[str, int]] = set()
+
+    @property
+    def event_hooks(self) -> dict[str, list[Any]]:
+        """Event hooks for ``httpx.AsyncClient``."""
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        timing = RequestTiming(method=request.method, url=redact_url(str(request.url)))
+        host = request.url.host
+        port = request.url.port or (443 if request.url.scheme == "https" else 80)
+        if (host, port) not in self._resolved:
+            self._resolved.add((host, port))
+            start = time.perf_counter()
+            try:
+                await asyncio.get_running_loop().getaddrinfo(host, port)
+                timing.dns = (time.perf_counter() - start) * 1000
+            except OSError:
+                pass  # The request itself reports the failure
+
+        timer = _PhaseTimer(timing, time.perf_counter())
+        self._timers[id(request)] = timer
+        request.extensions["trace"] = timer.trace
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        timer = self._timers.pop(id(response.request), None)
+        if timer is None:
+            return
+        await response.aread()
+        timer.timing.status = response.status_code
+        timer.timing.total = (time.perf_counter() - timer.start) * 1000
+        self.timings.append(timer.timing)
+
+    def flush(self) -> list[RequestTiming]:
+        """Record the requests that got no response (timeout, connect or TLS failure).
+
+        Their timing has the phases completed before the failure, no status,
+        and the time until now as total.
+
+        Returns:
+            All recorded timings
+        """
+        now = time.perf_counter()
+        for timer in self._timers.values():
+            timer.timing.total = (now - timer.start) * 1000
+            self.timings.append(timer.timing)
+        self._timers.clear()
+        return self.timings
+
+
 @dataclass
 class DiagnosticResult:
     """Result of a diagnostic check."""
@@ -16,6 +142,8 @@ class DiagnosticResult:
     status: str  # "ok", "warning", "error"
     message: str
     details: dict | None = None
+    timings: list[RequestTiming] = field(default_factory=list)
+    duration: float | None = None  # milliseconds
 
 
 def redact_value(value: str | None, show_chars: int = 3) -> str:
@@ -44,6 +172,13 @@ def redact_url(url: str) -> str:
     return url
 
 
+def _short_url(url: str, limit: int = 60) -> str:
+    """Host and path of a URL, shortened for table display."""
+    parts = urlsplit(url)
+    text = f"{parts.netloc}{parts.path}" if parts.netloc else url
+    return text if len(text) <= limit else f"{text[: limit - 1]}…"
+
+
 async def check_secrets() -> DiagnosticResult:
     """Check if required secrets are configured."""
     secrets = {
@@ -86,9 +221,12 @@ async def check_moodle_redirect(verbose: bool = False) -> DiagnosticResult:
     url = settings.moodle_login_url
 
     redirects: list[dict] = []
+    recorder = TimingRecorder()
 
     try:
-        async with httpx.AsyncClient(follow_redirects=False, timeout=10.0) as client:
+        async with httpx.AsyncClient(
+            follow_redirects=False, timeout=10.0, event_hooks=recorder.event_hooks
+        ) as client:
             current_url = url
             max_redirects = 10
 
@@ -98,6 +236,7 @@ async def check_moodle_redirect(verbose: bool = False) -> DiagnosticResult:
                     "step": i + 1,
                     "url": redact_url(current_url),
                     "status": response.status_code,
+                    "time": recorder.timings[-1].summary() if recorder.timings else "–",
                 }
 
                 # Check for redirect headers
@@ -131,6 +270,7 @@ async def check_moodle_redirect(verbose: bool = False) -> DiagnosticResult:
         if hit_microsoft:
             return DiagnosticResult(
                 name="Moodle Portal",
+                timings=recorder.timings,
                 status="ok",
                 message=f"Redirect chain OK → Microsoft Entra ({len(redirects)} hops)",
                 details={"redirects": redirects} if verbose else None,
@@ -138,6 +278,7 @@ async def check_moodle_redirect(verbose: bool = False) -> DiagnosticResult:
         else:
             return DiagnosticResult(
                 name="Moodle Portal",
+                timings=recorder.timings,
                 status="warning",
                 message=f"Unexpected redirect chain ({len(redirects)} hops)",
                 details={"redirects": redirects},
@@ -146,12 +287,14 @@ async def check_moodle_redirect(verbose: bool = False) -> DiagnosticResult:
     except httpx.TimeoutException:
         return DiagnosticResult(
             name="Moodle Portal",
+            timings=recorder.flush(),
             status="error",
             message="Connection timeout",
         )
     except Exception as e:
         return DiagnosticResult(
             name="Moodle Portal",
+            timings=recorder.flush(),
             status="error",
             message=f"Connection failed: {e!s}",
         )
@@ -163,9 +306,10 @@ async def check_graphql_endpoint(verbose: bool = False) -> DiagnosticResult:
 
     settings = get_settings()
     url = settings.graphql_endpoint
+    recorder = TimingRecorder()
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with httpx.AsyncClient(timeout=10.0, event_hooks=recorder.event_hooks) as client:
             # Try introspection query (may fail without auth, but shows endpoint is up)
             response = await client.post(
                 url,
@@ -176,6 +320,7 @@ async def check_graphql_endpoint(verbose: bool = False) -> DiagnosticResult:
             if response.status_code == 200:
                 return DiagnosticResult(
                     name="GraphQL API",
+                    timings=recorder.timings,
                     status="ok",
                     message=f"Endpoint reachable ({url})",
                     details={"response": response.json()} if verbose else None,
@@ -183,6 +328,7 @@ async def check_graphql_endpoint(verbose: bool = False) -> DiagnosticResult:
             elif response.status_code == 401:
                 return DiagnosticResult(
                     name="GraphQL API",
+                    timings=recorder.timings,
                     status="warning",
                     message="Endpoint reachable (auth required)",
                     details={"status": 401, "url": url},
@@ -190,6 +336,7 @@ async def check_graphql_endpoint(verbose: bool = False) -> DiagnosticResult:
             else:
                 return DiagnosticResult(
                     name="GraphQL API",
+                    timings=recorder.timings,
                     status="warning",
                     message=f"Unexpected status: {response.status_code}",
                     details={"status": response.status_code, "url": url},
@@ -198,12 +345,14 @@ async def check_graphql_endpoint(verbose: bool = False) -> DiagnosticResult:
     except httpx.TimeoutException:
         return DiagnosticResult(
             name="GraphQL API",
+            timings=recorder.flush(),
             status="error",
             message="Connection timeout",
         )
     except Exception as e:
         return DiagnosticResult(
             name="GraphQL API",
+            timings=recorder.flush(),
             status="error",
             message=f"Connection failed: {e!s}",
         )
@@ -214,7 +363,8 @@ async def check_keyring() -> DiagnosticResult:
     try:
         import keyring
 
-        backend = keyring.get_keyring()
+        # Resolving the backend may probe D-Bus or other services
+        backend = await asyncio.to_thread(keyring.get_keyring)
         backend_name = type(backend).__name__
 
         # Check if it's a usable backend
@@ -241,21 +391,26 @@ async def check_keyring() -> DiagnosticResult:
         )
 
 
+async def _timed(check: Awaitable[DiagnosticResult]) -> DiagnosticResult:
+    start = time.perf_counter()
+    result = await check
+    result.duration = (time.perf_counter() - start) * 1000
+    return result
+
+
 async def run_diagnostics(console: Console, verbose: bool = False) -> None:
-    """Run all diagnostic checks and display results."""
+    """Run all diagnostic checks concurrently and display results."""
     checks = [
-        ("Checking secrets...", check_secrets()),
-        ("Checking keyring...", check_keyring()),
-        ("Checking Moodle portal...", check_moodle_redirect(verbose)),
-        ("Checking GraphQL API...", check_graphql_endpoint(verbose)),
+        check_secrets(),
+        check_keyring(),
+        check_moodle_redirect(verbose),
+        check_graphql_endpoint(verbose),
     ]
 
-    results: list[DiagnosticResult] = []
-
-    for description, coro in checks:
-        console.print(f"[dim]{description}[/dim]")
-        result = await coro
-        results.append(result)
+    console.print(f"[dim]Running {len(checks)} checks...[/dim]")
+    start = time.perf_counter()
+    results: list[DiagnosticResult] = await asyncio.gather(*(_timed(c) for c in checks))
+    elapsed = time.perf_counter() - start
 
     console.print()
 
@@ -263,6 +418,7 @@ async def run_diagnostics(console: Console, verbose: bool = False) -> None:
     table = Table(title="Diagnostic Results")
     table.add_column("Check", style="cyan")
     table.add_column("Status")
+    table.add_column("Time", justify="right")
     table.add_column("Details", style="dim")
 
     status_icons = {
@@ -275,11 +431,33 @@ async def run_diagnostics(console: Console, verbose: bool = False) -> None:
         table.add_row(
             result.name,
             status_icons.get(result.status, result.status),
+            f"{result.duration:.0f} ms" if result.duration is not None else "–",
             result.message,
         )
 
     console.print(table)
 
+    # Per-request breakdown, one row per redirect hop
+    requests = [(result.name, timing) for result in results for timing in result.timings]
+    if requests:
+        timing_table = Table(title="Network Timing (ms)")
+        timing_table.add_column("Check", style="cyan")
+        timing_table.add_column("Request", style="dim", overflow="fold")
+        timing_table.add_column("Status")
+        for phase in ("DNS", "Connect", "TLS", "TTFB", "Total"):
+            timing_table.add_column(phase, justify="right")
+        for name, timing in requests:
+            timing_table.add_row(
+                name,
+                f"{timing.method} {_short_url(timing.url)}",
+                str(timing.status or "–"),
+                *(
+                    f"{value:.0f}" if value is not None else "–"
+                    for value in (timing.dns, timing.connect, timing.tls, timing.ttfb, timing.total)
+                ),
+            )
+        console.print(timing_table)
+
     # Show verbose details if requested
     if verbose:
         console.print("\n[bold]Detailed Results:[/bold]")
@@ -305,3 +483,4 @@ async def run_diagnostics(console: Console, verbose: bool = False) -> None:
         console.print(f"[yellow]⚠ {warnings} warning(s) found[/yellow]")
     else:
         console.print("[green]✓ All checks passed[/green]")
+    console.print(f"[dim]Completed in {elapsed:.2f}s[/dim]")
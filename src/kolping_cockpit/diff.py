@@ -0,0 +1,132 @@
+"""Keyed diff engine for normalized snapshots.
+
+Compares two snapshots produced by :func:`kolping_cockpit.snapshot.normalize_snapshot`.
+Records are matched by their natural key (modules by ``modulId``, events and
+courses by id, ...) instead of list position, so reordering is not a change.
+Whole collections and single records are compared with ``==`` first, which
+skips unchanged subtrees without walking them. Changes are yielded as a
+stream, collection by collection.
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from kolping_cockpit.snapshot import COLLECTION_KEYS, COLLECTION_LABELS
+
+# Fields that change on every fetch and carry no information
+VOLATILE_FIELDS = frozenset({"raw_html"})
+
+
+@dataclass
+class Change:
+    """A single change between two snapshots."""
+
+    op: str  # "add", "remove" or "replace"
+    path: str  # JSON pointer into the normalized snapshot
+    old: Any = None
+    new: Any = None
+    collection: str | None = None
+    key: str | None = None
+    label: str | None = None
+
+    @property
+    def field(self) -> str | None:
+        """Record field affected by a replace, None for whole-record changes."""
+        parts = self.path.split("/")
+        return _unescape(parts[3]) if self.collection and len(parts) > 3 else None
+
+
+def _escape(token: str) -> str:
+    """Escape a JSON pointer reference token (RFC 6901)."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _diff_values(path: str, old: Any, new: Any, **meta: Any) -> Iterator[Change]:
+    """Diff two values, descending into dicts; lists and scalars are replaced whole."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old.keys() | new.keys():
+            if key in VOLATILE_FIELDS:
+                continue
+            child_path = f"{path}/{_escape(str(key))}"
+            if key not in new:
+                yield Change("remove", child_path, old=old[key], **meta)
+            elif key not in old:
+                yield Change("add", child_path, new=new[key], **meta)
+            elif old[key] != new[key]:
+                yield from _diff_values(child_path, old[key], new[key], **meta)
+    elif old != new:
+        yield Change("replace", path, old=old, new=new, **meta)
+
+
+def _label(collection: str, record: dict[str, Any] | None, key: str) -> str:
+    if record:
+        value = record.get(COLLECTION_LABELS.get(collection, ""))
+        if value:
+            return str(value)
+    return key
+
+
+def diff_collection(
+    name: str, old: dict[str, dict[str, Any]], new: dict[str, dict[str, Any]]
+) -> Iterator[Change]:
+    """Diff one keyed collection of two snapshots."""
+    if old == new:
+        return
+
+    # Old keys first (in their order), then keys only present in the new snapshot
+    keys = list(old) + [key for key in new if key not in old]
+    for key in keys:
+        path = f"/{name}/{_escape(key)}"
+        old_record, new_record = old.get(key), new.get(key)
+        label = _label(name, new_record or old_record, key)
+        meta = {"collection": name, "key": key, "label": label}
+
+        if new_record is None:
+            yield Change("remove", path, old=old_record, **meta)
+        elif old_record is None:
+            yield Change("add", path, new=new_record, **meta)
+        elif old_record != new_record:
+            yield from sorted(
+                _diff_values(path, old_record, new_record, **meta), key=lambda c: c.path
+            )
+
+
+def diff_snapshots(old: dict[str, Any], new: dict[str, Any]) -> Iterator[Change]:
+    """Stream all changes between two normalized snapshots.
+
+    Args:
+        old: Earlier normalized snapshot
+        new: Later normalized snapshot
+
+    Yields:
+        Change objects, grouped by overview, collections and student data
+    """
+    yield from sorted(
+        _diff_values("/overview", old.get("overview") or {}, new.get("overview") or {}),
+        key=lambda c: c.path,
+    )
+    for name in COLLECTION_KEYS:
+        yield from diff_collection(name, old.get(name) or {}, new.get(name) or {})
+    old_student, new_student = old.get("student") or None, new.get("student") or None
+    if old_student is None and new_student is not None:
+        yield Change("add", "/student", new=new_student)
+    elif new_student is None and old_student is not None:
+        yield Change("remove", "/student", old=old_student)
+    elif old_student != new_student:
+        yield from sorted(_diff_values("/student", old_student, new_student), key=lambda c: c.path)
+
+
+def to_json_patch(changes: Iterable[Change]) -> list[dict[str, Any]]:
+    """Convert changes to a JSON Patch (RFC 6902) against the old snapshot."""
+    patch = []
+    for change in changes:
+        operation: dict[str, Any] = {"op": change.op, "path": change.path}
+        if change.op != "remove":
+            operation["value"] = change.new
+        patch.append(operation)
+    return patch
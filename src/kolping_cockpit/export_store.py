@@ -0,0 +1,368 @@
+"""Content-addressed export store for Kolping Study Cockpit.
+
+Daily exports are mostly identical from one day to the next: the same modules,
+the same courses, the same calendar entries. Instead of writing a full copy into
+``exports/YYYY-MM-DD/`` every day, exports are split into records which are
+content-hashed and stored once. A daily snapshot is a small manifest that maps
+file names to the root chunk of each export.
+
+Layout (below ``settings.export_dir``):
+
+    .store/
+        objects/ab/cdef...      zlib-compressed canonical JSON chunks
+        snapshots/2026-01-11.json  manifest: file name -> root chunk hash
+
+Every dict inside a list (a module, an event, a course, ...) becomes its own
+chunk, recursively. Chunks reference each other through ``{"$chunk": "<hash>"}``
+markers, so storage grows with the amount of change, not with the number of days.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+REF_KEY = "$chunk"
+
+# Parsed chunks kept in memory; enough for a full snapshot of a large account
+CHUNK_CACHE_SIZE = 65_536
+
+
+def canonical_json(value: Any) -> bytes:
+    """Serialize a value to canonical JSON bytes (sorted keys, no whitespace)."""
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+
+def content_hash(value: Any) -> str:
+    """Get the SHA-256 content hash of a JSON-compatible value."""
+    return hashlib.sha256(canonical_json(value)).hexdigest()
+
+
+def _is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and REF_KEY in value
+
+
+@dataclass
+class SnapshotInfo:
+    """Manifest of a single daily snapshot."""
+
+    date: str
+    created_at: str
+    files: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class CommitResult:
+    """Result of committing files into the store."""
+
+    snapshot: SnapshotInfo
+    new_chunks: int = 0
+    total_chunks: int = 0
+
+
+@dataclass
+class GcResult:
+    """Result of a garbage collection run."""
+
+    removed: int = 0
+    kept: int = 0
+    freed_bytes: int = 0
+
+
+class ExportStore:
+    """Deduplicated, content-addressed history of exports."""
+
+    def __init__(self, root: Path, chunk_cache_size: int = CHUNK_CACHE_SIZE):
+        """Initialize the store.
+
+        Args:
+            root: Store directory (created on first write)
+            chunk_cache_size: Parsed chunks kept in memory, least recently used evicted first
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+        self.chunk_cache_size = chunk_cache_size
+        self._chunk_cache: OrderedDict[str, Any] = OrderedDict()
+
+    @classmethod
+    def from_settings(cls) -> "ExportStore":
+        """Open the store configured in the application settings."""
+        from kolping_cockpit.settings import get_settings
+
+        return cls(get_settings().get_store_path())
+
+    # -- chunks -----------------------------------------------------------
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _write_chunk(self, value: Any, stats: CommitResult) -> str:
+        data = canonical_json(value)
+        digest = hashlib.sha256(data).hexdigest()
+        stats.total_chunks += 1
+        path = self._object_path(digest)
+        if path.exists():
+            return digest
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(zlib.compress(data))
+        os.replace(tmp_path, path)
+        stats.new_chunks += 1
+        self._cache_chunk(digest, value)
+        return digest
+
+    def _cache_chunk(self, digest: str, value: Any) -> None:
+        self._chunk_cache[digest] = value
+        self._chunk_cache.move_to_end(digest)
+        while len(self._chunk_cache) > self.chunk_cache_size:
+            self._chunk_cache.popitem(last=False)
+
+    def _split(self, value: Any, stats: CommitResult) -> Any:
+        """Replace every dict inside a list by a reference to its chunk."""
+        if isinstance(value, dict):
+            return {key: self._split(item, stats) for key, item in value.items()}
+        if isinstance(value, list):
+            return [
+                {REF_KEY: self._write_chunk(self._split(item, stats), stats)}
+                if isinstance(item, dict)
+                else self._split(item, stats)
+                for item in value
+            ]
+        return value
+
+    def read_chunk(self, digest: str) -> Any:
+        """Read a raw chunk (references are not resolved).
+
+        Raises:
+            FileNotFoundError: If the chunk does not exist
+        """
+        value = self._chunk_cache.get(digest)
+        if value is None:
+            data = zlib.decompress(self._object_path(digest).read_bytes())
+            value = json.loads(data)
+        self._cache_chunk(digest, value)
+        return value
+
+    def _join(self, value: Any) -> Any:
+        """Resolve all chunk references in a value."""
+        if _is_ref(value):
+            return self._join(self.read_chunk(value[REF_KEY]))
+        if isinstance(value, dict):
+            return {key: self._join(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._join(item) for item in value]
+        return value
+
+    # -- snapshots --------------------------------------------------------
+
+    def _manifest_path(self, date: str) -> Path:
+        return self.snapshots_dir / f"{date}.json"
+
+    def commit(self, files: dict[str, Any], date: str | None = None) -> CommitResult:
+        """Store export files as (part of) the snapshot for a date.
+
+        Files already in the snapshot of the same date are replaced, other
+        files of that snapshot are kept.
+
+        Args:
+            files: Mapping of file name (e.g. "graphql.json") to JSON data
+            date: Snapshot date (YYYY-MM-DD), defaults to today (UTC)
+
+        Returns:
+            CommitResult with the updated manifest and chunk statistics
+        """
+        now = datetime.now(UTC)
+        date = date or now.strftime("%Y-%m-%d")
+        existing = self.get_snapshot(date)
+        snapshot = SnapshotInfo(
+            date=date,
+            created_at=now.isoformat(),
+            files=dict(existing.files) if existing else {},
+        )
+        result = CommitResult(snapshot=snapshot)
+
+        for name, data in files.items():
+            # Round-trip through JSON so stored data matches what a file export would contain
+            normalized = json.loads(canonical_json(data))
+            root = self._split(normalized, result)
+            snapshot.files[name] = self._write_chunk(root, result)
+
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self._manifest_path(date)
+        tmp_path = manifest_path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {"date": snapshot.date, "created_at": snapshot.created_at, "files": snapshot.files},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, manifest_path)
+
+        logger.debug(
+            f"Committed snapshot {date}: {result.new_chunks}/{result.total_chunks} new chunks"
+        )
+        return result
+
+    def get_snapshot(self, date: str) -> SnapshotInfo | None:
+        """Get the manifest for a date, or None if there is no snapshot."""
+        manifest_path = self._manifest_path(date)
+        if not manifest_path.exists():
+            return None
+        with manifest_path.open(encoding="utf-8") as f:
+            manifest = json.load(f)
+        return SnapshotInfo(
+            date=manifest.get("date", date),
+            created_at=manifest.get("created_at", ""),
+            files=manifest.get("files", {}),
+        )
+
+    def snapshots(self) -> list[SnapshotInfo]:
+        """List all snapshots, oldest first."""
+        if not self.snapshots_dir.exists():
+            return []
+        result = []
+        for manifest_path in sorted(self.snapshots_dir.glob("*.json")):
+            snapshot = self.get_snapshot(manifest_path.stem)
+            if snapshot:
+                result.append(snapshot)
+        return result
+
+    def dates(self) -> list[str]:
+        """List the dates of all snapshots without reading their manifests, oldest first."""
+        if not self.snapshots_dir.exists():
+            return []
+        return sorted(path.stem for path in self.snapshots_dir.glob("*.json"))
+
+    def latest(self) -> SnapshotInfo | None:
+        """Get the most recent snapshot, or None if the store is empty."""
+        snapshots = self.snapshots()
+        return snapshots[-1] if snapshots else None
+
+    def read(self, date: str, filename: str) -> Any:
+        """Read a single file from a snapshot.
+
+        Raises:
+            KeyError: If the snapshot or file does not exist
+        """
+        snapshot = self.get_snapshot(date)
+        if snapshot is None:
+            msg = f"No snapshot for {date}"
+            raise KeyError(msg)
+        if filename not in snapshot.files:
+            msg = f"{filename} not in snapshot {date}"
+            raise KeyError(msg)
+        return self._join(self.read_chunk(snapshot.files[filename]))
+
+    def load(self, date: str) -> dict[str, Any]:
+        """Read all files of a snapshot.
+
+        Raises:
+            KeyError: If the snapshot does not exist
+        """
+        snapshot = self.get_snapshot(date)
+        if snapshot is None:
+            msg = f"No snapshot for {date}"
+            raise KeyError(msg)
+        return {name: self.read(date, name) for name in snapshot.files}
+
+    def checkout(self, date: str, dest: Path) -> list[Path]:
+        """Write the files of a snapshot as plain JSON files.
+
+        Args:
+            date: Snapshot date
+            dest: Target directory
+
+        Returns:
+            List of written file paths
+        """
+        dest.mkdir(parents=True, exist_ok=True)
+        written = []
+        for name, data in self.load(date).items():
+            path = dest / name
+            with path.open("w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            written.append(path)
+        return written
+
+    def delete_snapshot(self, date: str) -> bool:
+        """Remove a snapshot manifest (chunks are freed by the next gc)."""
+        manifest_path = self._manifest_path(date)
+        if not manifest_path.exists():
+            return False
+        manifest_path.unlink()
+        return True
+
+    # -- maintenance ------------------------------------------------------
+
+    def _reachable(self) -> set[str]:
+        """Collect all chunk hashes referenced from any snapshot."""
+        reachable: set[str] = set()
+        pending = [digest for s in self.snapshots() for digest in s.files.values()]
+
+        while pending:
+            digest = pending.pop()
+            if digest in reachable:
+                continue
+            reachable.add(digest)
+            try:
+                chunk = self.read_chunk(digest)
+            except FileNotFoundError:
+                logger.warning(f"Snapshot references missing chunk {digest}")
+                continue
+
+            stack = [chunk]
+            while stack:
+                value = stack.pop()
+                if _is_ref(value):
+                    pending.append(value[REF_KEY])
+                elif isinstance(value, dict):
+                    stack.extend(value.values())
+                elif isinstance(value, list):
+                    stack.extend(value)
+        return reachable
+
+    def gc(self, dry_run: bool = False) -> GcResult:
+        """Remove chunks that are no longer referenced by any snapshot.
+
+        Args:
+            dry_run: Only count what would be removed
+
+        Returns:
+            GcResult with removed/kept counts and freed bytes
+        """
+        result = GcResult()
+        if not self.objects_dir.exists():
+            return result
+
+        reachable = self._reachable()
+        for path in self.objects_dir.glob("*/*"):
+            digest = path.parent.name + path.name
+            if path.suffix != ".tmp" and digest in reachable:
+                result.kept += 1
+                continue
+            result.removed += 1
+            result.freed_bytes += path.stat().st_size
+            if not dry_run:
+                path.unlink()
+                self._chunk_cache.pop(digest, None)
+        return result
+
+    def disk_usage(self) -> tuple[int, int]:
+        """Get (chunk count, total bytes) of the object store."""
+        if not self.objects_dir.exists():
+            return 0, 0
+        sizes = [p.stat().st_size for p in self.objects_dir.glob("*/*")]
+        return len(sizes), sum(sizes)
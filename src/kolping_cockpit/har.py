@@ -0,0 +1,168 @@
+"""Streaming reader for HAR files (browser network exports).
+
+HAR exports of a portal session quickly grow to hundreds of megabytes, mostly
+response bodies. :func:`iter_har_entries` reads ``log.entries`` one entry at a
+time from a chunked, incrementally decoded stream, so memory stays bounded by
+the largest single entry. Bodies are only decoded (base64, gzip) when
+:meth:`HarEntry.body` is called.
+"""
+
+import base64
+import codecs
+import gzip
+import json
+import re
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+CHUNK_SIZE = 1 << 20
+
+_ENTRIES_RE = re.compile(r'"entries"\s*:\s*\[')
+_SEPARATORS_RE = re.compile(r"[\s,]*")
+
+
+class HarError(ValueError):
+    """The file is not a readable HAR export."""
+
+
+@dataclass
+class HarEntry:
+    """One request/response pair of a HAR export."""
+
+    method: str
+    url: str
+    status: int
+    request_headers: dict[str, str]
+    response_headers: dict[str, str]
+    mime_type: str
+    content: dict[str, Any]
+
+    @classmethod
+    def from_json(cls, entry: dict[str, Any]) -> "HarEntry":
+        """Create an entry from its HAR JSON object."""
+        request = entry.get("request") or {}
+        response = entry.get("response") or {}
+        content = response.get("content") or {}
+        return cls(
+            method=request.get("method", "GET"),
+            url=request.get("url", ""),
+            status=response.get("status", 0),
+            request_headers=_headers(request.get("headers")),
+            response_headers=_headers(response.get("headers")),
+            mime_type=(content.get("mimeType") or "").split(";")[0].strip().lower(),
+            content=content,
+        )
+
+    @property
+    def authorization(self) -> str | None:
+        """The Authorization request header, if any."""
+        return self.request_headers.get("authorization")
+
+    @property
+    def is_graphql(self) -> bool:
+        """Whether this is a GraphQL request with a JSON response."""
+        return "graphql" in self.url.lower() and self.mime_type.endswith("json")
+
+    @property
+    def is_html(self) -> bool:
+        """Whether the response is an HTML page."""
+        return self.mime_type == "text/html"
+
+    def body(self) -> bytes:
+        """Decode the response body (base64 and gzip/deflate if still encoded)."""
+        text = self.content.get("text")
+        if not text:
+            return b""
+        if self.content.get("encoding") == "base64":
+            data = base64.b64decode(text)
+        else:
+            data = text.encode("utf-8")
+
+        encoding = self.response_headers.get("content-encoding", "")
+        try:
+            if data[:2] == b"\x1f\x8b":
+                data = gzip.decompress(data)
+            elif encoding == "deflate":
+                data = zlib.decompress(data)
+        except (OSError, zlib.error):
+            pass  # Body was already decoded by the browser
+        return data
+
+
+def _headers(headers: Any) -> dict[str, str]:
+    return {
+        str(h.get("name", "")).lower(): str(h.get("value", ""))
+        for h in headers or []
+        if isinstance(h, dict)
+    }
+
+
+def _skip_separators(buffer: str, pos: int) -> int:
+    return _SEPARATORS_RE.match(buffer, pos).end()  # type: ignore[union-attr]
+
+
+def _chunks(path: Path) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with Path(path).open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def iter_har_entries(path: Path) -> Iterator[HarEntry]:
+    """Stream the entries of a HAR file.
+
+    Raises:
+        HarError: If the file has no ``log.entries`` array or an entry is malformed
+    """
+    decoder = json.JSONDecoder()
+    chunks = _chunks(path)
+    buffer = ""
+
+    # Find the start of the entries array
+    for chunk in chunks:
+        buffer += chunk
+        match = _ENTRIES_RE.search(buffer)
+        if match:
+            buffer = buffer[match.end() :]
+            break
+        buffer = buffer[-32:]  # keep enough for a key split across chunks
+    else:
+        raise HarError(f"No log.entries in {path}")
+
+    # Decode entries in place; the buffer is only compacted when a chunk is added
+    pos = 0
+    exhausted = False
+    # Text needed after pos before the next decode attempt. A failed attempt
+    # rescans the entry from its start, so retrying only once the text has
+    # doubled keeps entries larger than a chunk linear instead of quadratic.
+    need = 0
+    while True:
+        pos = _skip_separators(buffer, pos)
+        if buffer.startswith("]", pos):
+            return
+        if pos < len(buffer) and (exhausted or len(buffer) - pos >= need):
+            try:
+                entry, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise HarError(f"Malformed entry in {path}") from None
+                need = 2 * (len(buffer) - pos)
+            else:
+                need = 0
+                if isinstance(entry, dict):
+                    yield HarEntry.from_json(entry)
+                continue
+        elif pos >= len(buffer) and exhausted:
+            raise HarError(f"Unterminated log.entries in {path}")
+
+        # Need more data for the next entry
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+        else:
+            buffer = buffer[pos:] + chunk
+            pos = 0
@@ -0,0 +1,339 @@
+"""Grade and ECTS history for Kolping Study Cockpit.
+
+Every sync appends the observed per-module values (``examStatus``, ``note``,
+``grade``, ``eCTS``) to an append-only SQLite time series keyed by
+(module, timestamp). Historical exports can be backfilled, so questions like
+"ECTS per semester over time" or "when did module X change status" are
+answered through indexed range scans instead of loading every snapshot.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PASSED_STATUSES = ("bestanden", "anerkannt")
+
+# Upper bound for open-ended timestamp ranges (sorts after any ISO-8601 string)
+_TS_MAX = "\uffff"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS module_history (
+    modul_id TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    semester INTEGER,
+    modulbezeichnung TEXT,
+    pruefungsform TEXT,
+    ects REAL,
+    exam_status TEXT,
+    note TEXT,
+    grade TEXT,
+    PRIMARY KEY (modul_id, ts)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_module_history_ts
+    ON module_history (ts, exam_status, semester, ects);
+
+CREATE TABLE IF NOT EXISTS overview_history (
+    ts TEXT PRIMARY KEY,
+    grade TEXT,
+    ects REAL,
+    current_semester TEXT,
+    source TEXT
+) WITHOUT ROWID;
+"""
+
+
+def _escape_like(term: str) -> str:
+    """Escape the LIKE wildcards in a search term (used with ESCAPE '\\')."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@dataclass
+class ModuleChange:
+    """A point in time where a module's status or grade changed."""
+
+    modul_id: str
+    modulbezeichnung: str | None
+    ts: str
+    exam_status: str | None
+    note: str | None
+    previous_status: str | None = None
+    previous_note: str | None = None
+
+
+def extract_grade_overview(data: Any) -> dict[str, Any] | None:
+    """Find the ``myStudentGradeOverview`` object in any known export shape.
+
+    Supports ``kolping export graphql`` files, ``kolping fetch`` output and raw
+    GraphQL responses.
+    """
+    if not isinstance(data, dict):
+        return None
+
+    candidates = [
+        data.get("gradeOverview"),
+        (data.get("graphql") or {}).get("gradeOverview"),
+        data.get("myStudentGradeOverview"),
+        (data.get("data") or {}).get("myStudentGradeOverview"),
+        ((data.get("data") or {}).get("grade_overview") or {}).get("myStudentGradeOverview"),
+    ]
+    for candidate in candidates:
+        if isinstance(candidate, dict):
+            return candidate
+    return None
+
+
+def extract_timestamp(data: Any) -> str | None:
+    """Get the export/fetch timestamp of an export file."""
+    if not isinstance(data, dict):
+        return None
+    for key in ("fetch_timestamp", "export_timestamp", "timestamp"):
+        value = data.get(key)
+        if isinstance(value, str) and value:
+            return value
+    return None
+
+
+class GradeHistory:
+    """Append-only time series of module grades and ECTS."""
+
+    def __init__(self, path: Path | str):
+        """Open (and create if needed) the history database.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        self.path = path
+        if isinstance(path, Path):
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_settings(cls) -> "GradeHistory":
+        """Open the history database configured in the application settings."""
+        from kolping_cockpit.settings import get_settings
+
+        return cls(get_settings().get_history_path())
+
+    def record(self, overview: dict[str, Any], ts: str, source: str = "sync") -> int:
+        """Append one observation of the grade overview.
+
+        Re-recording the same timestamp is a no-op, so backfills are idempotent.
+
+        Args:
+            overview: ``myStudentGradeOverview`` object
+            ts: ISO-8601 timestamp of the observation
+            source: Where the observation came from (sync, backfill, ...)
+
+        Returns:
+            Number of module rows inserted
+        """
+        rows = [
+            (
+                str(m.get("modulId")),
+                ts,
+                m.get("semester"),
+                m.get("modulbezeichnung"),
+                m.get("pruefungsform"),
+                m.get("eCTS"),
+                m.get("examStatus"),
+                None if m.get("note") is None else str(m.get("note")),
+                None if m.get("grade") is None else str(m.get("grade")),
+            )
+            for m in overview.get("modules") or []
+            if m.get("modulId") is not None
+        ]
+
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO overview_history VALUES (?, ?, ?, ?, ?)",
+                (
+                    ts,
+                    None if overview.get("grade") is None else str(overview.get("grade")),
+                    overview.get("eCTS"),
+                    overview.get("currentSemester"),
+                    source,
+                ),
+            )
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO module_history VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            return self._conn.total_changes - before
+
+    def record_export(self, data: Any, fallback_ts: str, source: str = "sync") -> int:
+        """Record the grade overview contained in an export file, if any."""
+        overview = extract_grade_overview(data)
+        if overview is None:
+            return 0
+        return self.record(overview, extract_timestamp(data) or fallback_ts, source=source)
+
+    def backfill(self, export_dir: Path) -> int:
+        """Backfill from legacy export directories and the export store.
+
+        Reads ``exports/*/graphql.json`` / ``fetch.json`` as well as all
+        snapshots of the deduplicated export store.
+
+        Returns:
+            Number of module rows inserted
+        """
+        from kolping_cockpit.export_store import ExportStore
+
+        inserted = 0
+        if export_dir.exists():
+            for day_dir in sorted(export_dir.iterdir()):
+                if not day_dir.is_dir() or not re.fullmatch(r"\d{4}-\d{2}-\d{2}", day_dir.name):
+                    continue
+                for name in ("graphql.json", "fetch.json"):
+                    export_file = day_dir / name
+                    if not export_file.exists():
+                        continue
+                    try:
+                        with export_file.open(encoding="utf-8") as f:
+                            data = json.load(f)
+                    except (OSError, json.JSONDecodeError):
+                        logger.debug(f"Skipping unreadable export {export_file}", exc_info=True)
+                        continue
+                    inserted += self.record_export(
+                        data, f"{day_dir.name}T00:00:00+00:00", source="backfill"
+                    )
+
+        store = ExportStore(export_dir / ".store")
+        for snapshot in store.snapshots():
+            for name in ("graphql.json", "fetch.json"):
+                if name in snapshot.files:
+                    inserted += self.record_export(
+                        store.read(snapshot.date, name),
+                        snapshot.created_at or f"{snapshot.date}T00:00:00+00:00",
+                        source="backfill",
+                    )
+        return inserted
+
+    def find_modules(self, query: str) -> list[tuple[str, str | None]]:
+        """Find modules by exact modulId or case-insensitive name substring.
+
+        Returns:
+            List of (modul_id, modulbezeichnung)
+        """
+        rows = self._conn.execute(
+            """
+            SELECT modul_id, MAX(modulbezeichnung) AS name FROM module_history
+            WHERE modul_id = ? OR modulbezeichnung LIKE ? ESCAPE '\\'
+            GROUP BY modul_id ORDER BY name
+            """,
+            (query, f"%{_escape_like(query)}%"),
+        ).fetchall()
+        return [(row["modul_id"], row["name"]) for row in rows]
+
+    def module_changes(
+        self,
+        modul_id: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> Iterator[ModuleChange]:
+        """Yield status/grade changes, oldest first.
+
+        The first observation of a module counts as a change.
+
+        Args:
+            modul_id: Restrict to one module (primary key range scan)
+            since: Only changes at or after this timestamp
+            until: Only changes at or before this timestamp
+        """
+        module_filter = "AND modul_id = ?" if modul_id is not None else ""
+        params: list[Any] = [since or "", until or _TS_MAX]
+        if modul_id is not None:
+            params.append(modul_id)
+
+        # Only rows inside the range are windowed (index range scan); the row
+        # before a module's first in-range row is a primary key lookup.
+        cursor = self._conn.execute(
+            f"""
+            WITH ranged AS (
+                SELECT modul_id, modulbezeichnung, ts, exam_status, note,
+                    LAG(exam_status) OVER w AS lag_status,
+                    LAG(note) OVER w AS lag_note,
+                    ROW_NUMBER() OVER w = 1 AS first_in_range
+                FROM module_history
+                WHERE ts >= ? AND ts <= ? {module_filter}
+                WINDOW w AS (PARTITION BY modul_id ORDER BY ts)
+            ),
+            seeded AS MATERIALIZED (
+                SELECT r.*, CASE WHEN r.first_in_range THEN (
+                    SELECT MAX(p.ts) FROM module_history p
+                    WHERE p.modul_id = r.modul_id AND p.ts < r.ts
+                ) END AS seed_ts
+                FROM ranged r
+            ),
+            changes AS (
+                SELECT s.modul_id, s.modulbezeichnung, s.ts, s.exam_status, s.note,
+                    CASE WHEN s.first_in_range THEN p.exam_status ELSE s.lag_status END
+                        AS previous_status,
+                    CASE WHEN s.first_in_range THEN p.note ELSE s.lag_note END AS previous_note,
+                    s.first_in_range AND s.seed_ts IS NULL AS first_seen
+                FROM seeded s
+                LEFT JOIN module_history p ON p.modul_id = s.modul_id AND p.ts = s.seed_ts
+            )
+            SELECT * FROM changes
+            WHERE first_seen OR exam_status IS NOT previous_status OR note IS NOT previous_note
+            ORDER BY ts, modul_id
+            """,  # noqa: S608 - only a fixed filter clause is interpolated
+            params,
+        )
+        for row in cursor:
+            yield ModuleChange(
+                modul_id=row["modul_id"],
+                modulbezeichnung=row["modulbezeichnung"],
+                ts=row["ts"],
+                exam_status=row["exam_status"],
+                note=row["note"],
+                previous_status=row["previous_status"],
+                previous_note=row["previous_note"],
+            )
+
+    def ects_by_semester(
+        self, since: str | None = None, until: str | None = None
+    ) -> list[tuple[str, int | None, float]]:
+        """Get earned ECTS (bestanden/anerkannt) per semester at each observation.
+
+        Returns:
+            List of (timestamp, semester, ects), ordered by timestamp and semester
+        """
+        rows = self._conn.execute(
+            """
+            SELECT ts, semester, SUM(ects) AS ects FROM module_history
+            WHERE ts >= ? AND ts <= ? AND exam_status IN (?, ?)
+            GROUP BY ts, semester
+            ORDER BY ts, semester
+            """,
+            (since or "", until or _TS_MAX, *PASSED_STATUSES),
+        ).fetchall()
+        return [(row["ts"], row["semester"], row["ects"] or 0.0) for row in rows]
+
+    def overview(self, since: str | None = None, until: str | None = None) -> list[sqlite3.Row]:
+        """Get overall grade/ECTS observations in a time range."""
+        return self._conn.execute(
+            "SELECT * FROM overview_history WHERE ts >= ? AND ts <= ? ORDER BY ts",
+            (since or "", until or _TS_MAX),
+        ).fetchall()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "GradeHistory":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Context manager exit."""
+        self.close()
@@ -16,6 +16,13 @@ from typing import Any
 import httpx
 from bs4 import BeautifulSoup
 
+from kolping_cockpit.prefilter import (
+    ASSIGNMENT_MARKERS,
+    EVENT_MARKERS,
+    assignment_strainer,
+    event_strainer,
+    parse_filtered,
+)
 from kolping_cockpit.settings import get_secret_from_env_or_keyring, get_settings
 
 
@@ -230,6 +237,17 @@ class KolpingMoodleClient:
 
         return courses
 
+    def _event_soup(self, html: str) -> BeautifulSoup:
+        """Parse a calendar page, building only the event blocks when it has any."""
+        soup = parse_filtered(html, EVENT_MARKERS, event_strainer())
+        if soup is not None and soup.find(
+            "div", class_="event", attrs={"data-region": "event-item"}
+        ):
+            return soup
+        # The fallback search in _extract_events needs the full tree: a strained
+        # soup holds only the marked blocks, not the rest of the page
+        return BeautifulSoup(html, "html.parser")
+
     def _extract_events(self, soup: BeautifulSoup) -> list[MoodleEvent]:
         """Extract calendar events from dashboard HTML."""
         events = []
@@ -340,8 +358,9 @@ class KolpingMoodleClient:
         response = self.client.get(f"{self.base_url}/mod/assign/index.php")
 
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-            return self._extract_assignments_from_page(soup)
+            soup = parse_filtered(response.text, ASSIGNMENT_MARKERS, assignment_strainer())
+            if soup is not None:
+                return self._extract_assignments_from_page(soup)
 
         return []
 
@@ -431,8 +450,7 @@ class KolpingMoodleClient:
         if response.status_code != 200:
             return []
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        return self._extract_events(soup)
+        return self._extract_events(self._event_soup(response.text))
 
     def get_upcoming_deadlines(self) -> list[MoodleEvent]:
         """Fetch upcoming deadlines from the calendar block.
@@ -445,8 +463,7 @@ class KolpingMoodleClient:
         if response.status_code != 200:
             return []
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        return self._extract_events(soup)
+        return self._extract_events(self._event_soup(response.text))
 
     def export_all(self) -> dict[str, Any]:
         """Export all available Moodle data.
@@ -0,0 +1,101 @@
+"""Byte-level prefilter for HTML before BeautifulSoup parsing.
+
+Building a soup is by far the most expensive step of extracting data from
+Moodle pages, and most pages (or saved captures) do not contain the structure
+an extractor looks for. The prefilter searches the raw text for marker strings
+first: pages without a marker are skipped, pages with one are parsed with a
+``SoupStrainer`` so only the matching elements and their subtrees are built.
+Matching elements carry a marker in their start tag, so only the text from
+the first marked tag on is decoded and parsed.
+
+Large files are memory-mapped, so scanning a capture for markers does not read
+it into Python memory, and the parsed range is decoded straight from the
+mapping without copying the file into a bytes object first.
+"""
+
+import mmap
+import re
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+# Files from this size on are memory-mapped instead of read
+MMAP_THRESHOLD = 1 << 20
+
+# Calendar event blocks (upcoming view, month view, dashboard block)
+EVENT_MARKERS = ('data-region="event-item"',)
+
+# Assignment links on the assignment overview
+ASSIGNMENT_MARKERS = ("/mod/assign/view.php?id=",)
+
+# GraphQL responses with data used by the offline analysis
+GRAPHQL_MARKERS = ("myStudentGradeOverview", "myStudentData")
+
+ASSIGNMENT_LINK_RE = re.compile(r"/mod/assign/view\.php\?id=\d+")
+
+
+@contextmanager
+def open_bytes(path: Path) -> Iterator[bytes | mmap.mmap]:
+    """Open a file as a read-only buffer, memory-mapped if it is large."""
+    with Path(path).open("rb") as f:
+        if Path(path).stat().st_size < MMAP_THRESHOLD:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def contains_any(content: str | bytes | mmap.mmap, markers: Iterable[str]) -> bool:
+    """Check whether text or a byte buffer contains any of the markers."""
+    if isinstance(content, str):
+        return any(marker in content for marker in markers)
+    return any(content.find(marker.encode()) != -1 for marker in markers)
+
+
+def event_strainer() -> Any:
+    """Strainer keeping only calendar event blocks."""
+    from bs4.filter import SoupStrainer
+
+    return SoupStrainer("div", attrs={"data-region": "event-item"})
+
+
+def assignment_strainer() -> Any:
+    """Strainer keeping only assignment links."""
+    from bs4.filter import SoupStrainer
+
+    return SoupStrainer("a", href=ASSIGNMENT_LINK_RE)
+
+
+def parse_filtered(
+    content: str | bytes | mmap.mmap, markers: Iterable[str], strainer: Any
+) -> Any | None:
+    """Parse only the matching subtrees of a page.
+
+    Args:
+        content: Page text or raw bytes
+        markers: Strings one of which a relevant page contains
+        strainer: ``SoupStrainer`` selecting the elements to build
+
+    Returns:
+        BeautifulSoup with the matching elements, or None if no marker occurs
+    """
+    from bs4 import BeautifulSoup
+
+    if isinstance(content, str):
+        positions = [content.find(marker) for marker in markers]
+    else:
+        positions = [content.find(marker.encode()) for marker in markers]
+    positions = [position for position in positions if position != -1]
+    if not positions:
+        return None
+
+    # Elements before the tag holding the first marker cannot match the strainer
+    first = min(positions)
+    if isinstance(content, str):
+        text = content[max(content.rfind("<", 0, first), 0) :]
+    else:
+        start = max(content.rfind(b"<", 0, first), 0)
+        with memoryview(content) as view:
+            text = str(view[start:], "utf-8", errors="replace")
+    return BeautifulSoup(text, "html.parser", parse_only=strainer)
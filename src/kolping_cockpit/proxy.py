@@ -0,0 +1,381 @@
+"""Caching reverse proxy for the GraphQL gateway (``kolping proxy``).
+
+Point GraphQL clients at the proxy instead of the gateway, e.g. with
+``KOLPING_GRAPHQL_ENDPOINT=http://127.0.0.1:8766/graphql`` or the KMP client's
+endpoint setting. Queries are forwarded once and then answered locally:
+
+- The cache key is the normalized query document (comments, insignificant
+  whitespace and commas removed) plus variables and operation name, hashed.
+- Entries are kept per bearer token (its ``oid``/``sub`` claim plus a hash
+  of the token), so a response is only replayed for the token upstream
+  accepted, and different accounts never see each other's data.
+- Entries expire after a TTL. Mutations, GraphQL errors and non-200 responses
+  are never cached.
+- Identical requests in flight at the same time are forwarded once.
+
+``GET /_proxy/stats`` returns hit/miss counters. The proxy forwards to the
+production gateway, not to ``KOLPING_GRAPHQL_ENDPOINT`` (which points at the
+proxy itself); ``--upstream`` points it at any other GraphQL server, e.g. a
+local stand-in for offline tests. An upstream that is the proxy's own address
+is refused.
+"""
+
+import hashlib
+import ipaddress
+import json
+import logging
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from kolping_cockpit.export_store import canonical_json
+from kolping_cockpit.server import SingleFlight
+from kolping_cockpit.tokens import decode_jwt_payload
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60.0
+MAX_ENTRIES = 1024
+
+# Strings are kept verbatim; comments, whitespace and commas are insignificant
+_TOKEN_RE = re.compile(r'"""(?:\\"""|.)*?"""|"(?:\\.|[^"\\])*"|#[^\n]*|[\s,]+|[^\s,"#]+', re.S)
+_PUNCTUATORS = frozenset("!$&()...:=@[]{}|")
+
+# Tokens that delimit top-level definitions (strings, comments and directives are skipped)
+_DEFINITION_RE = re.compile(
+    r'"""(?:\\"""|.)*?"""|"(?:\\.|[^"\\])*"|#[^\n]*|@\w+|[{}()]|[_A-Za-z]\w*', re.S
+)
+_DEFINITION_KEYWORDS = frozenset({"query", "mutation", "subscription", "fragment"})
+
+# Headers passed through to the upstream gateway
+_FORWARD_HEADERS = ("Authorization", "Origin", "Referer", "Accept", "Accept-Language")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a GraphQL document so formatting differences share a cache entry."""
+    out: list[str] = []
+    pending_space = False
+    for token in _TOKEN_RE.findall(query):
+        if token.startswith("#") or not token.strip(" \t\r\n,"):
+            pending_space = True
+            continue
+        if (
+            pending_space
+            and out
+            and out[-1][-1] not in _PUNCTUATORS
+            and token[0] not in _PUNCTUATORS
+        ):
+            out.append(" ")
+        out.append(token)
+        pending_space = False
+    return "".join(out)
+
+
+def operations(query: str) -> list[tuple[str, str | None]]:
+    """List the ``(type, name)`` of the operation definitions in a document.
+
+    Fragments are skipped; the ``{ ... }`` shorthand is an anonymous query.
+    """
+    found: list[tuple[str, str | None]] = []
+    depth = parens = 0
+    current: list[Any] | None = None  # [keyword, name] of the definition being read
+    for part in _DEFINITION_RE.findall(query):
+        if part[0] in '"#@':
+            continue
+        if part in "()":
+            parens += 1 if part == "(" else -1
+        elif parens:
+            continue
+        elif part == "{":
+            if depth == 0:
+                if current is None:
+                    found.append(("query", None))
+                elif current[0] != "fragment":
+                    found.append((current[0], current[1]))
+                current = None
+            depth += 1
+        elif part == "}":
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            if current is None and part in _DEFINITION_KEYWORDS:
+                current = [part, None]
+            elif current is not None and current[1] is None:
+                current[1] = part
+    return found
+
+
+def is_mutation(query: str, operation_name: str | None = None) -> bool:
+    """Check whether a request executes a mutation or subscription.
+
+    The operation named by ``operation_name`` decides; without a name (or an
+    unknown one) any mutation or subscription in the document does.
+    """
+    found = operations(query)
+    selected = [kind for kind, name in found if operation_name and name == operation_name]
+    return any(kind != "query" for kind in selected or [kind for kind, _ in found])
+
+
+def cache_key(subject: str, payload: dict[str, Any]) -> str:
+    """Hash a subject and a GraphQL request payload into a cache key."""
+    return hashlib.sha256(
+        canonical_json(
+            {
+                "subject": subject,
+                "query": normalize_query(payload.get("query") or ""),
+                "variables": payload.get("variables") or {},
+                "operationName": payload.get("operationName"),
+            }
+        )
+    ).hexdigest()
+
+
+def token_subject(authorization: str | None) -> str:
+    """Get the cache partition of an Authorization header.
+
+    The claims are not verified, so the partition is the ``oid``/``sub``
+    claim of a bearer JWT plus a hash of the whole header: a forged or other
+    token with the same subject never reads entries that upstream
+    authorized for another token.
+    """
+    if not authorization:
+        return "anonymous"
+    digest = hashlib.sha256(authorization.encode()).hexdigest()[:32]
+    token = authorization.removeprefix("Bearer ").strip()
+    claims = decode_jwt_payload(token)
+    subject = claims.get("oid") or claims.get("sub")
+    return f"{subject}:{digest}" if subject else f"token:{digest}"
+
+
+@dataclass
+class ProxyStats:
+    """Counters exposed at ``/_proxy/stats``."""
+
+    hits: int = 0
+    misses: int = 0
+    collapsed: int = 0
+    bypassed: int = 0
+    upstream_errors: int = 0
+    entries: int = 0
+
+
+@dataclass
+class UpstreamResponse:
+    """A response of the upstream gateway."""
+
+    status: int
+    body: bytes
+    content_type: str = "application/json"
+
+
+class GraphQLProxy:
+    """Forwards GraphQL requests and caches query responses per token subject."""
+
+    def __init__(
+        self,
+        upstream: str,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = MAX_ENTRIES,
+        client: httpx.Client | None = None,
+    ):
+        """Initialize the proxy.
+
+        Args:
+            upstream: GraphQL endpoint to forward to
+            ttl: Seconds a cached response stays valid
+            max_entries: Cache size; the oldest entries are evicted first
+            client: Optional HTTP client (default: a pooled httpx.Client)
+        """
+        self.upstream = upstream
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.client = client or httpx.Client(timeout=30.0)
+        self.stats = ProxyStats()
+        self._cache: OrderedDict[str, tuple[float, UpstreamResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def _forward(self, body: bytes, headers: dict[str, str]) -> UpstreamResponse:
+        try:
+            response = self.client.post(
+                self.upstream,
+                content=body,
+                headers={"Content-Type": "application/json", **headers},
+            )
+        except httpx.HTTPError as e:
+            with self._lock:
+                self.stats.upstream_errors += 1
+            logger.debug(f"Upstream request failed: {e}", exc_info=True)
+            message = canonical_json({"errors": [{"message": f"Upstream error: {e}"}]})
+            return UpstreamResponse(HTTPStatus.BAD_GATEWAY, message)
+        return UpstreamResponse(
+            response.status_code,
+            response.content,
+            response.headers.get("Content-Type", "application/json"),
+        )
+
+    def _cacheable(self, response: UpstreamResponse) -> bool:
+        if response.status != HTTPStatus.OK:
+            return False
+        try:
+            return not json.loads(response.body).get("errors")
+        except (ValueError, AttributeError):
+            return False
+
+    def _lookup(self, key: str) -> UpstreamResponse | None:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires, response = entry
+            if expires < time.monotonic():
+                del self._cache[key]
+                self.stats.entries = len(self._cache)
+                return None
+            return response
+
+    def _store(self, key: str, response: UpstreamResponse) -> None:
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.ttl, response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            self.stats.entries = len(self._cache)
+
+    def handle(self, body: bytes, headers: dict[str, str]) -> tuple[UpstreamResponse, str]:
+        """Answer a GraphQL POST from the cache or the upstream gateway.
+
+        Args:
+            body: Raw request body
+            headers: Request headers to forward (Authorization, Origin, ...)
+
+        Returns:
+            Tuple of (response, cache status "HIT", "MISS" or "BYPASS")
+        """
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict) or is_mutation(
+            str(payload.get("query") or ""), payload.get("operationName")
+        ):
+            # Batched requests, mutations and invalid JSON go straight through
+            with self._lock:
+                self.stats.bypassed += 1
+            return self._forward(body, headers), "BYPASS"
+
+        key = cache_key(token_subject(headers.get("Authorization")), payload)
+        cached = self._lookup(key)
+        if cached is not None:
+            with self._lock:
+                self.stats.hits += 1
+            return cached, "HIT"
+
+        with self._lock:
+            self.stats.misses += 1
+
+        def fetch() -> UpstreamResponse:
+            response = self._forward(body, headers)
+            if self._cacheable(response):
+                self._store(key, response)
+            return response
+
+        response = self._flight.do(key, fetch)
+        with self._lock:
+            self.stats.collapsed = self._flight.collapsed
+        return response, "MISS"
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._cache.clear()
+            self.stats.entries = 0
+
+    def close(self) -> None:
+        """Close the upstream HTTP client."""
+        self.client.close()
+
+
+class ProxyRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler forwarding GraphQL POSTs through :class:`GraphQLProxy`."""
+
+    proxy: GraphQLProxy
+    server_version = "KolpingCockpitProxy"
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, body: bytes, content_type: str, cache: str | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if cache:
+            self.send_header("X-Cache", cache)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.rstrip("/") == "/_proxy/stats":
+            self._send(HTTPStatus.OK, canonical_json(asdict(self.proxy.stats)), "application/json")
+        else:
+            self._send(HTTPStatus.NOT_FOUND, b'{"error":"Not found"}', "application/json")
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        headers = {name: self.headers[name] for name in _FORWARD_HEADERS if self.headers.get(name)}
+        response, cache = self.proxy.handle(body, headers)
+        self._send(response.status, response.body, response.content_type, cache)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def create_proxy_server(
+    proxy: GraphQLProxy, host: str = "127.0.0.1", port: int = 8766
+) -> ThreadingHTTPServer:
+    """Create the proxy server (call ``serve_forever()`` to run it).
+
+    Args:
+        proxy: Proxy with upstream and cache configuration
+        host: Interface to bind (default: localhost only)
+        port: TCP port (0 picks a free port)
+
+    Raises:
+        ValueError: If the upstream is the proxy's own address
+    """
+    handler = type("Handler", (ProxyRequestHandler,), {"proxy": proxy})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    if _addresses_server(proxy.upstream, server):
+        server.server_close()
+        raise ValueError(f"Upstream {proxy.upstream} is the proxy itself")
+    return server
+
+
+def _addresses_server(url: str, server: ThreadingHTTPServer) -> bool:
+    """Whether a URL reaches the given server, which would forward to itself forever."""
+    parts = urlsplit(url)
+    bound_host, bound_port = str(server.server_address[0]), server.server_address[1]
+    if (parts.port or (443 if parts.scheme == "https" else 80)) != bound_port:
+        return False
+    try:
+        targets = {str(info[4][0]) for info in socket.getaddrinfo(parts.hostname, bound_port)}
+    except (OSError, UnicodeError):
+        return False
+    if not ipaddress.ip_address(bound_host).is_unspecified:
+        return bound_host in targets
+    # A wildcard bind answers on loopback and every address of this host
+    if any(target.startswith("127.") or target == "::1" for target in targets):
+        return True
+    try:
+        local = {str(info[4][0]) for info in socket.getaddrinfo(socket.gethostname(), None)}
+    except OSError:
+        return False
+    return bool(targets & local)
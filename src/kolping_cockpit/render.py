@@ -0,0 +1,282 @@
+"""Output renderers for the reporting commands (``--format``).
+
+``deadlines``, ``exams``, ``analyze`` and ``fetch`` describe their output as
+fields, tables and summaries of raw values. The renderer decides how they look:
+
+- ``rich``: tables and panels on the terminal (default)
+- ``plain``: one tab-separated line per row, prefixed with the section name,
+  e.g. ``registered<TAB>Statistik<TAB>2<TAB>Klausur<TAB>5``
+- ``json``: one JSON document with a key per section
+- ``ndjson``: one JSON object per row, ``{"section": "registered", ...}``
+
+The plain and NDJSON renderers never touch Rich and write each row as soon as
+the command produces it, so ``kolping deadlines --format ndjson | jq`` starts
+printing before all modules are classified. Progress and error messages go to
+stderr in the machine-readable formats.
+"""
+
+import json
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+from rich.console import Console
+
+
+class OutputFormat(StrEnum):
+    """Output formats of the reporting commands."""
+
+    RICH = "rich"
+    PLAIN = "plain"
+    JSON = "json"
+    NDJSON = "ndjson"
+
+
+@dataclass
+class Column:
+    """A table column: row key, header and how the Rich view shows the value."""
+
+    key: str
+    header: str
+    style: str | None = None
+    justify: str = "left"
+    width: int | None = None
+    max_width: int | None = None
+    empty: str = "?"  # Shown for missing values
+    truncate: int | None = None
+    format: Callable[[str], str] | None = None  # e.g. status -> colored markup
+    table_options: dict[str, Any] = field(default_factory=dict)
+
+    def rich_cell(self, value: Any) -> str:
+        """Format a raw value for the Rich table."""
+        text = self.empty if value is None or value == "" else str(value)
+        if self.truncate is not None:
+            text = text[: self.truncate].strip()
+        return self.format(text) if self.format else text
+
+
+def _stdout(line: str) -> None:
+    # Resolved per call so redirected stdout (tests, shell pipelines) is honored
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+
+class Renderer(ABC):
+    """Base renderer; subclasses implement one output format."""
+
+    # Whether the output is meant for a human at a terminal
+    interactive = False
+
+    def __init__(self, console: Console, write: Callable[[str], Any] | None = None):
+        """Initialize the renderer.
+
+        Args:
+            console: Console for Rich output (stdout)
+            write: Replaces the line writer of the machine-readable formats
+        """
+        self.console = console
+        self.write = write or _stdout
+        self._messages: Console | None = None
+
+    def print(self, *objects: Any) -> None:  # noqa: B027 - no-op outside the Rich view
+        """Print decoration (headings, hints, panels) shown only in the Rich view."""
+
+    def message(self, text: str = "") -> None:
+        """Print a progress or error message (stderr unless Rich)."""
+        if self._messages is None:
+            # Created on first use: most machine-readable runs print no message
+            self._messages = Console(stderr=True)
+        self._messages.print(text)
+
+    @abstractmethod
+    def fields(self, name: str, items: Iterable[tuple[str, str, Any]]) -> None:
+        """Output named values, given as (key, label, value)."""
+
+    @abstractmethod
+    def table(
+        self,
+        name: str,
+        title: str,
+        columns: list[Column],
+        rows: Iterable[dict[str, Any]],
+        limit: int | None = None,
+        **options: Any,
+    ) -> int:
+        """Output a table.
+
+        Args:
+            name: Section name in machine-readable output
+            title: Table title in the Rich view
+            columns: Columns shown
+            rows: Row dicts with raw values (keys beyond the columns are kept
+                  in JSON output)
+            limit: Maximum rows shown in the Rich view
+            options: Further ``rich.table.Table`` options (title_style, ...)
+
+        Returns:
+            Number of rows
+        """
+
+    def summary(self, name: str, title: str, values: dict[str, Any], text: str) -> None:
+        """Output summary counts; the Rich view shows ``text`` in a panel."""
+        self.fields(name, ((key, key, value) for key, value in values.items()))
+
+    def close(self) -> None:  # noqa: B027 - only JSON output is buffered
+        """Finish the output."""
+
+
+class RichRenderer(Renderer):
+    """Tables and panels on the terminal."""
+
+    interactive = True
+
+    def print(self, *objects: Any) -> None:
+        self.console.print(*objects)
+
+    def message(self, text: str = "") -> None:
+        self.console.print(text)
+
+    def fields(self, name: str, items: Iterable[tuple[str, str, Any]]) -> None:
+        for _key, label, value in items:
+            self.console.print(f"[bold]{label}:[/bold] {value}")
+
+    def table(
+        self,
+        name: str,
+        title: str,
+        columns: list[Column],
+        rows: Iterable[dict[str, Any]],
+        limit: int | None = None,
+        **options: Any,
+    ) -> int:
+        from rich.table import Table
+
+        table = Table(title=title, **options)
+        for column in columns:
+            table.add_column(
+                column.header,
+                style=column.style,
+                justify=column.justify,  # type: ignore[arg-type]
+                width=column.width,
+                max_width=column.max_width,
+                **column.table_options,
+            )
+        count = 0
+        for row in rows:
+            count += 1
+            if limit is None or count <= limit:
+                table.add_row(*(column.rich_cell(row.get(column.key)) for column in columns))
+        if count:
+            self.console.print("\n")
+            self.console.print(table)
+        return count
+
+    def summary(self, name: str, title: str, values: dict[str, Any], text: str) -> None:
+        from rich.panel import Panel
+
+        self.console.print(Panel(text, title=title, border_style="cyan"))
+
+
+def _plain_value(value: Any) -> str:
+    if value is None:
+        return ""
+    return " ".join(str(value).split()) if isinstance(value, str) else str(value)
+
+
+class PlainRenderer(Renderer):
+    """Tab-separated lines without colors or box drawing."""
+
+    def fields(self, name: str, items: Iterable[tuple[str, str, Any]]) -> None:
+        for key, _label, value in items:
+            self.write(f"{name}\t{key}\t{_plain_value(value)}")
+
+    def table(
+        self,
+        name: str,
+        title: str,
+        columns: list[Column],
+        rows: Iterable[dict[str, Any]],
+        limit: int | None = None,
+        **options: Any,
+    ) -> int:
+        count = 0
+        for row in rows:
+            count += 1
+            values = (_plain_value(row.get(column.key)) for column in columns)
+            self.write("\t".join((name, *values)))
+        return count
+
+
+class NdjsonRenderer(Renderer):
+    """One JSON object per row."""
+
+    def _emit(self, name: str, content: dict[str, Any]) -> None:
+        self.write(json.dumps({"section": name, **content}, ensure_ascii=False, default=str))
+
+    def fields(self, name: str, items: Iterable[tuple[str, str, Any]]) -> None:
+        self._emit(name, {key: value for key, _label, value in items})
+
+    def table(
+        self,
+        name: str,
+        title: str,
+        columns: list[Column],
+        rows: Iterable[dict[str, Any]],
+        limit: int | None = None,
+        **options: Any,
+    ) -> int:
+        count = 0
+        for row in rows:
+            count += 1
+            self._emit(name, row)
+        return count
+
+
+class JsonRenderer(Renderer):
+    """A single JSON document, written on close."""
+
+    def __init__(self, console: Console, write: Callable[[str], Any] | None = None):
+        super().__init__(console, write)
+        self.document: dict[str, Any] = {}
+
+    def fields(self, name: str, items: Iterable[tuple[str, str, Any]]) -> None:
+        self.document.setdefault(name, {}).update({key: value for key, _label, value in items})
+
+    def table(
+        self,
+        name: str,
+        title: str,
+        columns: list[Column],
+        rows: Iterable[dict[str, Any]],
+        limit: int | None = None,
+        **options: Any,
+    ) -> int:
+        section = self.document.setdefault(name, [])
+        before = len(section)
+        section.extend(rows)
+        return len(section) - before
+
+    def close(self) -> None:
+        self.write(json.dumps(self.document, indent=2, ensure_ascii=False, default=str))
+
+
+_RENDERERS: dict[OutputFormat, type[Renderer]] = {
+    OutputFormat.RICH: RichRenderer,
+    OutputFormat.PLAIN: PlainRenderer,
+    OutputFormat.JSON: JsonRenderer,
+    OutputFormat.NDJSON: NdjsonRenderer,
+}
+
+
+def create_renderer(
+    output_format: OutputFormat | str, console: Console, write: Callable[[str], Any] | None = None
+) -> Renderer:
+    """Create the renderer for an output format.
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    return _RENDERERS[OutputFormat(output_format)](console, write)
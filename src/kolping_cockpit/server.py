@@ -0,0 +1,338 @@
+"""Local HTTP/JSON API over the latest study data snapshot (``kolping serve``).
+
+Local consumers (the Android app's sync, scripts, dashboards) read the cached
+snapshot from here instead of each calling Moodle and the GraphQL gateway. The
+snapshot is written by ``kolping fetch`` (all data) and ``kolping export all``;
+the server notices a new snapshot on the next request.
+
+Endpoints (GET and HEAD):
+
+    /api                    index: snapshot date and available endpoints
+    /api/meta               snapshot date, timestamp and record counts
+    /api/snapshot           the whole normalized snapshot
+    /api/overview           grade, ECTS and current semester
+    /api/student            student data
+    /api/<collection>       records of modules, exams, events, courses,
+                            assignments or grades as a list
+    /api/<collection>/<id>  a single record by its natural key
+
+``?fields=a,b`` keeps only the given fields of each record. Responses carry a
+strong ETag (honoured via ``If-None-Match``) and are gzip-compressed when the
+client accepts it. Concurrent requests for the same resource are rendered once.
+"""
+
+import gzip
+import hashlib
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from kolping_cockpit.export_store import ExportStore, canonical_json
+from kolping_cockpit.snapshot import COLLECTION_KEYS, available_dates, load_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+# Rendered responses kept per snapshot version
+RESPONSE_CACHE_SIZE = 256
+
+
+class SingleFlight:
+    """Run a function once per key for all concurrent callers.
+
+    The first caller of a key runs the function; callers arriving while it
+    runs wait for and share its result (or exception). ``collapsed`` counts
+    the callers that were served by another caller's run.
+    """
+
+    @dataclass
+    class _Call:
+        done: threading.Event
+        result: Any = None
+        error: BaseException | None = None
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Any, SingleFlight._Call] = {}
+        self.collapsed = 0
+
+    def do(self, key: Any, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` for a key, or wait for the run already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = self._Call(threading.Event())
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+@dataclass
+class Response:
+    """A rendered JSON response in identity and gzip encoding."""
+
+    status: int
+    body: bytes
+    etag: str
+    gzipped: bytes | None = None
+
+    @property
+    def gzip_etag(self) -> str:
+        # A strong ETag must differ between content codings (RFC 9110 8.8.3)
+        return self.etag[:-1] + '-gzip"'
+
+
+class ApiError(Exception):
+    """Request error with an HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def project(value: Any, fields: list[str] | None) -> Any:
+    """Keep only the given fields of a record or of each record in a list."""
+    if not fields:
+        return value
+    if isinstance(value, list):
+        return [project(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {key: value[key] for key in fields if key in value}
+    return value
+
+
+def render(status: int, value: Any) -> Response:
+    """Serialize a value to a response with ETag and (for larger bodies) gzip."""
+    body = canonical_json(value)
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    gzipped = gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_SIZE else None
+    return Response(status, body, etag, gzipped)
+
+
+class SnapshotApi:
+    """Resolves API paths against the latest snapshot and caches responses."""
+
+    def __init__(self, export_dir: Path):
+        """Initialize the API.
+
+        Args:
+            export_dir: Export directory with the ``.store`` and legacy dirs
+        """
+        self.export_dir = Path(export_dir)
+        self.store = ExportStore(self.export_dir / ".store")
+        self._lock = threading.Lock()
+        self._version: Any = None
+        self._snapshot: dict[str, Any] | None = None
+        self._responses: dict[tuple[Any, str, tuple[str, ...]], Response] = {}
+        self._flight = SingleFlight()
+
+    def _current_version(self) -> tuple[str, Any] | None:
+        """Cheap identity of the latest snapshot (manifest roots or file mtimes)."""
+        dates = available_dates(self.export_dir)
+        if not dates:
+            return None
+        date = dates[-1]
+        manifest = self.store.get_snapshot(date)
+        if manifest is not None:
+            return date, tuple(sorted(manifest.files.items()))
+        legacy_dir = self.export_dir / date
+        return date, tuple(
+            sorted((p.name, p.stat().st_mtime_ns) for p in legacy_dir.glob("*.json"))
+        )
+
+    def snapshot(self) -> tuple[Any, dict[str, Any]]:
+        """Get the latest snapshot, reloading it when a newer one exists.
+
+        Returns:
+            Tuple of (version, snapshot); the version starts with the date
+
+        Raises:
+            ApiError: If there is no snapshot yet
+        """
+        version = self._current_version()
+        if version is None:
+            raise ApiError(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                "No snapshot available. Run 'kolping fetch' or 'kolping export all' first.",
+            )
+        with self._lock:
+            if version != self._version or self._snapshot is None:
+                self._snapshot = load_snapshot(version[0], self.export_dir)
+                self._version = version
+                self._responses.clear()
+            return version, self._snapshot
+
+    def _resolve(
+        self, date: str, snapshot: dict[str, Any], path: str, fields: list[str] | None
+    ) -> Any:
+        parts = [unquote(p) for p in path.strip("/").split("/")]
+        if parts[0] != "api":
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Not found: {path}")
+        parts = parts[1:]
+
+        if not parts:
+            return {
+                "date": date,
+                "endpoints": ["/api/meta", "/api/snapshot", "/api/overview", "/api/student"]
+                + [f"/api/{name}" for name in COLLECTION_KEYS],
+            }
+        name = parts[0]
+        if name == "meta" and len(parts) == 1:
+            return {
+                "date": date,
+                "timestamp": snapshot.get("timestamp"),
+                "counts": {key: len(snapshot.get(key) or {}) for key in COLLECTION_KEYS},
+            }
+        if name == "snapshot" and len(parts) == 1:
+            return project(snapshot, fields)
+        if name in ("overview", "student") and len(parts) == 1:
+            return project(snapshot.get(name), fields)
+        if name in COLLECTION_KEYS and len(parts) == 1:
+            return project(list((snapshot.get(name) or {}).values()), fields)
+        if name in COLLECTION_KEYS and len(parts) == 2:
+            record = (snapshot.get(name) or {}).get(parts[1])
+            if record is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"No {name} record {parts[1]}")
+            return project(record, fields)
+        raise ApiError(HTTPStatus.NOT_FOUND, f"Not found: {path}")
+
+    def get(self, path: str, fields: list[str] | None = None) -> Response:
+        """Get the rendered response for a path (cached per snapshot version)."""
+        try:
+            version, snapshot = self.snapshot()
+        except ApiError as e:
+            return render(e.status, {"error": str(e)})
+
+        key = (version, path.rstrip("/") or "/", tuple(fields or ()))
+        cached = self._responses.get(key)
+        if cached is not None:
+            return cached
+
+        def build() -> Response:
+            try:
+                response = render(HTTPStatus.OK, self._resolve(version[0], snapshot, path, fields))
+            except ApiError as e:
+                response = render(e.status, {"error": str(e)})
+            if len(self._responses) >= RESPONSE_CACHE_SIZE:
+                self._responses.clear()
+            self._responses[key] = response
+            return response
+
+        return self._flight.do(key, build)
+
+
+def etag_matches(header: str | None, *etags: str) -> bool:
+    """Check an If-None-Match header against ETags (weak comparison)."""
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or any(etag in candidates for etag in etags)
+
+
+def accepts_gzip(header: str | None) -> bool:
+    """Check whether an Accept-Encoding header allows gzip (q above 0 for gzip or ``*``)."""
+    qualities: dict[str, float] = {}
+    for part in (header or "").split(","):
+        coding, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler serving :class:`SnapshotApi` responses."""
+
+    api: SnapshotApi
+    server_version = "KolpingCockpit"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        self._respond(include_body=True)
+
+    def do_HEAD(self) -> None:  # noqa: N802 - http.server naming
+        self._respond(include_body=False)
+
+    def _respond(self, include_body: bool) -> None:
+        url = urlsplit(self.path)
+        fields_param = parse_qs(url.query).get("fields")
+        fields = [f for f in ",".join(fields_param).split(",") if f] if fields_param else None
+        response = self.api.get(url.path, fields)
+
+        use_gzip = (
+            accepts_gzip(self.headers.get("Accept-Encoding")) and response.gzipped is not None
+        )
+        etag = response.gzip_etag if use_gzip else response.etag
+
+        if response.status == HTTPStatus.OK and etag_matches(
+            self.headers.get("If-None-Match"), response.etag, response.gzip_etag
+        ):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        body = response.gzipped if use_gzip and response.gzipped is not None else response.body
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if response.status == HTTPStatus.OK:
+            self.send_header("ETag", etag)
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def create_server(
+    export_dir: Path, host: str = "127.0.0.1", port: int = 8765
+) -> ThreadingHTTPServer:
+    """Create the API server (call ``serve_forever()`` to run it).
+
+    Args:
+        export_dir: Export directory to serve snapshots from
+        host: Interface to bind (default: localhost only)
+        port: TCP port (0 picks a free port)
+    """
+    handler = type("Handler", (ApiRequestHandler,), {"api": SnapshotApi(export_dir)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
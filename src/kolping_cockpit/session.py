@@ -0,0 +1,114 @@
+"""Shared client session for long-running processes (``kolping shell``).
+
+A single CLI call creates its clients, uses them once and closes them again.
+Inside a session the GraphQL and Moodle clients (with their connection pools
+and the token/cookie read from the keyring), the export store and the history
+database are created on first use and kept until the session ends, so repeated
+commands skip the keyring lookups and TCP/TLS handshakes. Browser-backed
+commands get contexts from one browser pool, so Chromium is launched once.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from kolping_cockpit.browser import BrowserPool
+    from kolping_cockpit.export_store import ExportStore
+    from kolping_cockpit.graphql_client import KolpingGraphQLClient
+    from kolping_cockpit.history import GradeHistory
+    from kolping_cockpit.moodle_client import KolpingMoodleClient
+
+_active: "ClientSession | None" = None
+
+
+def current_session() -> "ClientSession | None":
+    """Return the active client session, None outside of ``kolping shell``."""
+    return _active
+
+
+class ClientSession:
+    """Keeps clients, store and history open across commands in one process."""
+
+    def __init__(self) -> None:
+        self._graphql: KolpingGraphQLClient | None = None
+        self._moodle: KolpingMoodleClient | None = None
+        self._store: ExportStore | None = None
+        self._history: GradeHistory | None = None
+        self._browser: BrowserPool | None = None
+        self._previous: ClientSession | None = None
+
+    @property
+    def graphql(self) -> "KolpingGraphQLClient":
+        """GraphQL client, created on first access."""
+        if self._graphql is None:
+            from kolping_cockpit.graphql_client import KolpingGraphQLClient
+
+            self._graphql = KolpingGraphQLClient()
+        return self._graphql
+
+    @property
+    def moodle(self) -> "KolpingMoodleClient":
+        """Moodle client, created on first access."""
+        if self._moodle is None:
+            from kolping_cockpit.moodle_client import KolpingMoodleClient
+
+            self._moodle = KolpingMoodleClient()
+        return self._moodle
+
+    @property
+    def store(self) -> "ExportStore":
+        """Export store (keeps its chunk cache between commands)."""
+        if self._store is None:
+            from kolping_cockpit.export_store import ExportStore
+
+            self._store = ExportStore.from_settings()
+        return self._store
+
+    @property
+    def history(self) -> "GradeHistory":
+        """Grade history database, opened on first access."""
+        if self._history is None:
+            from kolping_cockpit.history import GradeHistory
+
+            self._history = GradeHistory.from_settings()
+        return self._history
+
+    @property
+    def browser(self) -> "BrowserPool":
+        """Browser pool, started on first access and kept until the session ends."""
+        if self._browser is None:
+            from kolping_cockpit.browser import BrowserPool
+
+            self._browser = BrowserPool()
+        return self._browser
+
+    def reset_clients(self) -> None:
+        """Close the HTTP clients so the next command picks up new credentials."""
+        from kolping_cockpit.settings import get_secret_store
+
+        get_secret_store().invalidate()
+        for client in (self._graphql, self._moodle):
+            if client is not None:
+                client.close()
+        self._graphql = None
+        self._moodle = None
+
+    def close(self) -> None:
+        """Close all clients, the browser pool and the history database."""
+        self.reset_clients()
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._history is not None:
+            self._history.close()
+            self._history = None
+        self._store = None
+
+    def __enter__(self) -> "ClientSession":
+        global _active
+        self._previous, _active = _active, self
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        global _active
+        _active = self._previous
+        self.close()
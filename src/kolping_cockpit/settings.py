@@ -1,15 +1,23 @@
 """Environment and configuration management for Kolping Study Cockpit."""
 
+import json
 import logging
 import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 logger = logging.getLogger(__name__)
 
+# The production GraphQL gateway (default of KOLPING_GRAPHQL_ENDPOINT)
+GRAPHQL_GATEWAY = "https://app-kolping-prod-gateway.azurewebsites.net/graphql"
+
 
 class KolpingSettings(BaseSettings):
     """
@@ -44,7 +52,7 @@ class KolpingSettings(BaseSettings):
         description="Moodle portal base URL",
     )
     graphql_endpoint: str = Field(
-        default="https://app-kolping-prod-gateway.azurewebsites.net/graphql",
+        default=GRAPHQL_GATEWAY,
         description="GraphQL API endpoint",
     )
 
@@ -72,6 +80,27 @@ class KolpingSettings(BaseSettings):
         default="INFO",
         description="Logging level",
     )
+    browser_block: bool = Field(
+        default=True,
+        description="Abort non-essential requests (images, fonts, third parties) in browsers",
+    )
+    browser_block_resources: list[str] = Field(
+        default=["image", "media", "font"],
+        description="Playwright resource types aborted by the browser profile",
+    )
+    browser_allow_hosts: list[str] = Field(
+        default=[
+            "kolping-hochschule.de",
+            "khs-meinstudium.de",
+            "azurewebsites.net",
+            "microsoftonline.com",
+            "login.microsoft.com",
+            "msauth.net",
+            "msftauth.net",
+            "live.com",
+        ],
+        description="Host suffixes the browser may load (login, portal, GraphQL gateway)",
+    )
 
     # Token storage (set after login, not in .env)
     moodle_session: str | None = Field(default=None, description="Moodle session cookie")
@@ -109,6 +138,42 @@ class KolpingSettings(BaseSettings):
         export_path.mkdir(parents=True, exist_ok=True)
         return export_path / filename
 
+    def get_store_path(self) -> Path:
+        """
+        Get the directory of the deduplicated export store.
+
+        Returns:
+            Path like exports/.store
+        """
+        return self.export_dir / ".store"
+
+    def get_history_path(self) -> Path:
+        """
+        Get the path of the grade/ECTS history database.
+
+        Returns:
+            Path like exports/history.sqlite3
+        """
+        return self.export_dir / "history.sqlite3"
+
+    def get_live_cache_path(self) -> Path:
+        """
+        Get the path of the live cache used for instant command output.
+
+        Returns:
+            Path like exports/.cache/live.json
+        """
+        return self.export_dir / ".cache" / "live.json"
+
+    def get_capture_index_path(self) -> Path:
+        """
+        Get the path of the index of parsed HTTP captures.
+
+        Returns:
+            Path like exports/.cache/captures.json
+        """
+        return self.export_dir / ".cache" / "captures.json"
+
 
 @lru_cache
 def get_settings() -> KolpingSettings:
@@ -121,6 +186,239 @@ def get_settings() -> KolpingSettings:
     return KolpingSettings()
 
 
+class SecretStore:
+    """
+    Process-wide cache of secrets from the keyring and the secrets file.
+
+    Commands and client constructors look up the same few secrets many times
+    per process. The store resolves the keyring backend once, memoizes keyring
+    lookups (including misses) until :meth:`invalidate` is called, and reads
+    each secrets file at most once. Writes update the cache; file writes are
+    atomic and can be batched with :meth:`batch`.
+
+    Secrets file locations, in lookup order: ``./.secrets.json`` (project
+    directory) and ``~/.kolping-cockpit/secrets.json``. New secrets go to the
+    first existing file, or the project directory if there is none.
+    """
+
+    def __init__(self, service: str = "kolping-cockpit", locations: list[Path] | None = None):
+        self.service = service
+        self.locations = locations or [
+            Path.cwd() / ".secrets.json",
+            Path.home() / ".kolping-cockpit" / "secrets.json",
+        ]
+        self._lock = threading.RLock()
+        self._backend: Any = None  # keyring module, False if unavailable
+        self._keyring_cache: dict[str, str | None] = {}
+        self._files: dict[Path, dict[str, str]] | None = None
+        self._unreadable: set[Path] = set()
+        self._batches = threading.local()  # depth and pending write of this thread's batch
+        self._pending = 0  # batches (of all threads) holding a deferred write
+        self._stale = False  # invalidated while writes were pending
+
+    def _keyring(self) -> Any:
+        """The keyring module if a working backend exists, else None."""
+        if self._backend is None:
+            self._backend = False
+            try:
+                import keyring
+                from keyring.backends.fail import Keyring as FailKeyring
+
+                if not isinstance(keyring.get_keyring(), FailKeyring):
+                    self._backend = keyring
+            except Exception:
+                logger.debug("Keyring not available, falling back to file storage", exc_info=True)
+        return self._backend or None
+
+    def _load_files(self) -> dict[Path, dict[str, str]]:
+        if self._files is None:
+            self._files = {}
+            self._unreadable = set()
+            for secrets_file in self.locations:
+                if not secrets_file.exists():
+                    continue
+                try:
+                    with secrets_file.open(encoding="utf-8") as f:
+                        secrets = json.load(f)
+                    if isinstance(secrets, dict):
+                        self._files[secrets_file] = secrets
+                    else:
+                        self._unreadable.add(secrets_file)
+                except Exception:
+                    logger.debug(f"Failed to read secrets from {secrets_file}", exc_info=True)
+                    self._unreadable.add(secrets_file)
+        return self._files
+
+    def _target_file(self) -> Path:
+        for secrets_file in self.locations:
+            if secrets_file.exists():
+                return secrets_file
+        return self.locations[0]
+
+    def get(self, key: str) -> str | None:
+        """
+        Get a secret from environment variable, keyring or secrets file.
+
+        Priority:
+        1. Environment variable ``KOLPING_<KEY>`` (for Codespaces/CI)
+        2. System keyring (for local development)
+        3. Secrets file
+        """
+        env_value = os.environ.get(f"KOLPING_{key.upper()}")
+        if env_value:
+            return env_value
+
+        with self._lock:
+            backend = self._keyring()
+            if backend is not None:
+                if key not in self._keyring_cache:
+                    try:
+                        self._keyring_cache[key] = backend.get_password(self.service, key)
+                    except Exception:
+                        logger.debug(f"Keyring lookup of {key} failed", exc_info=True)
+                        self._keyring_cache[key] = None
+                return self._keyring_cache[key]
+
+            for secrets in self._load_files().values():
+                if key in secrets:
+                    return secrets[key]
+            return None
+
+    def set(self, key: str, value: str) -> bool:
+        """
+        Store a secret in the keyring, or the secrets file if there is none.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        with self._lock:
+            backend = self._keyring()
+            if backend is not None:
+                try:
+                    backend.set_password(self.service, key, value)
+                    self._keyring_cache[key] = value
+                    return True
+                except Exception:
+                    logger.debug(
+                        "Failed to store secret in keyring, falling back to file", exc_info=True
+                    )
+
+            files = self._load_files()
+            files.setdefault(self._target_file(), {})[key] = value
+            return self._write()
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete a secret from the keyring and the secrets file.
+
+        Returns:
+            True if the secret was deleted anywhere, False otherwise
+        """
+        deleted = False
+        with self._lock:
+            backend = self._keyring()
+            if backend is not None:
+                try:
+                    backend.delete_password(self.service, key)
+                    deleted = True
+                except Exception:
+                    logger.debug("Failed to delete secret from keyring", exc_info=True)
+                self._keyring_cache[key] = None
+
+            secrets = self._load_files().get(self._target_file(), {})
+            if key in secrets:
+                del secrets[key]
+                deleted = self._write() or deleted
+        return deleted
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Forget cached secrets (one key, or all) so the next lookup reads them again.
+
+        While a batch holds a deferred write, the secrets files are only read
+        again after it is flushed; reloading them earlier would lose the write.
+        """
+        with self._lock:
+            if key is None:
+                self._keyring_cache.clear()
+            else:
+                self._keyring_cache.pop(key, None)
+            if self._pending:
+                self._stale = True
+            else:
+                self._files = None
+
+    @contextmanager
+    def batch(self) -> Iterator["SecretStore"]:
+        """
+        Defer this thread's secrets file writes until the block ends, then write once.
+
+        Deferred writes report success; a failure of the final write is raised
+        when the block ends (an exception from the block takes precedence).
+
+        Raises:
+            OSError: If the secrets file could not be written
+        """
+        batches = self._batches
+        batches.depth = getattr(batches, "depth", 0) + 1
+        try:
+            yield self
+        finally:
+            batches.depth -= 1
+            saved = True
+            if batches.depth == 0 and getattr(batches, "pending", False):
+                batches.pending = False
+                with self._lock:
+                    self._pending -= 1
+                    saved = self._write()
+                    if self._stale and not self._pending:
+                        self._stale = False
+                        self._files = None
+        if not saved:
+            raise OSError(f"Secrets could not be saved to {self._target_file()}")
+
+    def _write(self) -> bool:
+        """Write the secrets file atomically (deferred inside :meth:`batch`)."""
+        if getattr(self._batches, "depth", 0):
+            if not getattr(self._batches, "pending", False):
+                self._batches.pending = True
+                self._pending += 1
+            return True
+
+        files = self._load_files()
+        secrets_file = self._target_file()
+        if secrets_file in self._unreadable:
+            # Writing would replace the secrets we could not read
+            logger.warning(f"Not overwriting unreadable secrets file {secrets_file}")
+            return False
+        secrets = files.get(secrets_file, {})
+        tmp_path = secrets_file.with_suffix(".tmp")
+        try:
+            secrets_file.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(secrets, f, indent=2)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, secrets_file)
+            return True
+        except OSError:
+            logger.debug(f"Failed to write secrets to {secrets_file}", exc_info=True)
+            return False
+
+
+@lru_cache
+def get_secret_store(service: str = "kolping-cockpit") -> SecretStore:
+    """
+    Get the process-wide secret store.
+
+    Args:
+        service: Keyring service name
+
+    Returns:
+        SecretStore instance (cached for the process lifetime)
+    """
+    return SecretStore(service)
+
+
 def get_secret_from_env_or_keyring(key: str, service: str = "kolping-cockpit") -> str | None:
     """
     Get a secret from environment variable or keyring.
@@ -136,110 +434,7 @@ def get_secret_from_env_or_keyring(key: str, service: str = "kolping-cockpit") -
     Returns:
         The secret value or None if not found
     """
-    # Check environment first (Codespaces, CI)
-    env_key = f"KOLPING_{key.upper()}"
-    env_value = os.environ.get(env_key)
-    if env_value:
-        return env_value
-
-    # Fall back to keyring or file storage
-    try:
-        import keyring
-        from keyring.backends.fail import Keyring as FailKeyring
-
-        # Check if keyring has a working backend
-        if not isinstance(keyring.get_keyring(), FailKeyring):
-            return keyring.get_password(service, key)
-    except Exception:
-        logger.debug("Keyring not available, falling back to file storage", exc_info=True)
-
-    # Fall back to file-based storage
-    return _get_secret_from_file(key)
-
-
-def _get_secrets_file() -> Path:
-    """Get path to local secrets file."""
-    # Try multiple locations
-    locations = [
-        Path.cwd() / ".secrets.json",  # Project directory first
-        Path.home() / ".kolping-cockpit" / "secrets.json",
-    ]
-    for loc in locations:
-        if loc.exists():
-            return loc
-    # Default to project directory for new files
-    return Path.cwd() / ".secrets.json"
-
-
-def _get_secret_from_file(key: str) -> str | None:
-    """Get a secret from the local secrets file."""
-    # Check both locations
-    locations = [
-        Path.cwd() / ".secrets.json",
-        Path.home() / ".kolping-cockpit" / "secrets.json",
-    ]
-    for secrets_file in locations:
-        if not secrets_file.exists():
-            continue
-        try:
-            import json
-
-            with secrets_file.open() as f:
-                secrets = json.load(f)
-            if key in secrets:
-                return secrets.get(key)
-        except Exception:
-            logger.debug(f"Failed to read secrets from {secrets_file}", exc_info=True)
-            continue
-    return None
-
-
-def _store_secret_to_file(key: str, value: str) -> bool:
-    """Store a secret to the local secrets file."""
-    secrets_file = _get_secrets_file()
-    try:
-        import json
-
-        secrets_file.parent.mkdir(parents=True, exist_ok=True)
-        secrets_file.chmod(0o700) if secrets_file.parent.exists() else None
-
-        # Load existing secrets
-        secrets = {}
-        if secrets_file.exists():
-            with secrets_file.open() as f:
-                secrets = json.load(f)
-
-        # Update and save
-        secrets[key] = value
-        with secrets_file.open("w") as f:
-            json.dump(secrets, f, indent=2)
-
-        # Secure the file
-        secrets_file.chmod(0o600)
-        return True
-    except Exception:
-        return False
-
-
-def _delete_secret_from_file(key: str) -> bool:
-    """Delete a secret from the local secrets file."""
-    secrets_file = _get_secrets_file()
-    if not secrets_file.exists():
-        return False
-    try:
-        import json
-
-        with secrets_file.open() as f:
-            secrets = json.load(f)
-
-        if key in secrets:
-            del secrets[key]
-            with secrets_file.open("w") as f:
-                json.dump(secrets, f, indent=2)
-            return True
-        return False
-    except Exception:
-        return False
+    return get_secret_store(service).get(key)
 
 
 def store_secret(key: str, value: str, service: str = "kolping-cockpit") -> bool:
@@ -256,19 +451,7 @@ def store_secret(key: str, value: str, service: str = "kolping-cockpit") -> bool
     Returns:
         True if successful, False otherwise
     """
-    # Try keyring first
-    try:
-        import keyring
-        from keyring.backends.fail import Keyring as FailKeyring
-
-        if not isinstance(keyring.get_keyring(), FailKeyring):
-            keyring.set_password(service, key, value)
-            return True
-    except Exception:
-        logger.debug("Failed to store secret in keyring, falling back to file", exc_info=True)
-
-    # Fall back to file storage
-    return _store_secret_to_file(key, value)
+    return get_secret_store(service).set(key, value)
 
 
 def delete_secret(key: str, service: str = "kolping-cockpit") -> bool:
@@ -282,21 +465,4 @@ def delete_secret(key: str, service: str = "kolping-cockpit") -> bool:
     Returns:
         True if successful, False otherwise
     """
-    deleted = False
-
-    # Try keyring
-    try:
-        import keyring
-        from keyring.backends.fail import Keyring as FailKeyring
-
-        if not isinstance(keyring.get_keyring(), FailKeyring):
-            keyring.delete_password(service, key)
-            deleted = True
-    except Exception:
-        logger.debug("Failed to delete secret from keyring", exc_info=True)
-
-    # Also try file storage
-    if _delete_secret_from_file(key):
-        deleted = True
-
-    return deleted
+    return get_secret_store(service).delete(key)
@@ -0,0 +1,229 @@
+"""Normalized study data snapshots for Kolping Study Cockpit.
+
+Export files come in several shapes (``kolping export graphql``,
+``kolping export moodle``, ``kolping fetch``). This module folds them into one
+normalized snapshot where every collection is a dict keyed by its natural id:
+
+    {
+        "timestamp": "2026-01-11T12:00:00+00:00",
+        "overview": {"grade": "1.7", "eCTS": 90, "currentSemester": "..."},
+        "student": {...},
+        "modules": {"<modulId>": {...}},
+        "exams": {"<id>": {...}},
+        "events": {"<id>": {...}},
+        "courses": {"<id>": {...}},
+        "assignments": {"<id>": {...}},
+        "grades": {"<item name>": {...}},
+    }
+"""
+
+from pathlib import Path
+from typing import Any
+
+# Collection name -> field holding the natural key of a record
+COLLECTION_KEYS: dict[str, str] = {
+    "modules": "modulId",
+    "exams": "id",
+    "events": "id",
+    "courses": "id",
+    "assignments": "id",
+    "grades": "item",
+}
+
+# Collection name -> field used as human-readable label
+COLLECTION_LABELS: dict[str, str] = {
+    "modules": "modulbezeichnung",
+    "exams": "pruefungsform",
+    "events": "title",
+    "courses": "name",
+    "assignments": "name",
+    "grades": "item",
+}
+
+OVERVIEW_FIELDS = ("grade", "eCTS", "currentSemester")
+
+# Moodle collection -> fields stored in fetch.json. moodle.json stores the full
+# client dataclasses; projecting them onto these fields keeps a switch between
+# the sources from showing up as changes.
+MOODLE_FIELDS: dict[str, tuple[str, ...]] = {
+    "courses": ("id", "name", "url"),
+    "events": ("id", "title", "start_time", "course_name", "url"),
+    "assignments": ("id", "name", "due_date", "course_name"),
+}
+
+
+def empty_snapshot() -> dict[str, Any]:
+    """Create an empty normalized snapshot."""
+    snapshot: dict[str, Any] = {"timestamp": None, "overview": {}, "student": None}
+    for name in COLLECTION_KEYS:
+        snapshot[name] = {}
+    return snapshot
+
+
+def index_records(records: Any, key_field: str) -> dict[str, dict[str, Any]]:
+    """Index a list of records by a key field.
+
+    Records without a usable key (or with duplicate keys, e.g. Moodle events
+    with id "unknown") get a positional suffix so no record is lost.
+    """
+    indexed: dict[str, dict[str, Any]] = {}
+    if not isinstance(records, list):
+        return indexed
+    for position, record in enumerate(records):
+        if not isinstance(record, dict):
+            continue
+        key = record.get(key_field)
+        key = str(key) if key not in (None, "", "unknown") else f"#{position}"
+        if key in indexed:
+            key = f"{key}#{position}"
+        indexed[key] = record
+    return indexed
+
+
+def _merge_graphql(snapshot: dict[str, Any], student: Any, overview: Any, exams: Any) -> None:
+    if isinstance(student, dict):
+        snapshot["student"] = student
+    if isinstance(overview, dict):
+        snapshot["overview"] = {k: overview.get(k) for k in OVERVIEW_FIELDS if k in overview}
+        if overview.get("modules") is not None:
+            snapshot["modules"] = index_records(overview["modules"], "modulId")
+        if snapshot["student"] is None and isinstance(overview.get("student"), dict):
+            snapshot["student"] = overview["student"]
+    if isinstance(exams, list):
+        snapshot["exams"] = index_records(exams, "id")
+
+
+def _project(records: list[Any], fields: tuple[str, ...]) -> list[dict[str, Any]]:
+    return [
+        {f: record[f] for f in fields if f in record}
+        for record in records
+        if isinstance(record, dict)
+    ]
+
+
+def _merge_moodle(
+    snapshot: dict[str, Any],
+    courses: Any,
+    events: Any,
+    assignments: Any,
+    grades: Any,
+    project: bool = False,
+) -> None:
+    for name, records in (("courses", courses), ("events", events), ("assignments", assignments)):
+        if isinstance(records, list):
+            if project:
+                records = _project(records, MOODLE_FIELDS[name])
+            snapshot[name] = index_records(records, "id")
+    if isinstance(grades, list):
+        normalized = [
+            {"item": g.get("item", g.get("item_name")), "grade": g.get("grade")}
+            for g in grades
+            if isinstance(g, dict)
+        ]
+        snapshot["grades"] = index_records(normalized, "item")
+
+
+def normalize_snapshot(files: dict[str, Any]) -> dict[str, Any]:
+    """Fold export files into one normalized snapshot.
+
+    Args:
+        files: Mapping of file name to parsed JSON (graphql.json, moodle.json,
+               fetch.json); unknown files are ignored
+
+    Returns:
+        Normalized snapshot (see module docstring)
+    """
+    snapshot = empty_snapshot()
+
+    # Order matters: fetch.json is the most complete source and wins
+    for name in ("graphql.json", "moodle.json", "fetch.json"):
+        data = files.get(name)
+        if not isinstance(data, dict):
+            continue
+
+        if name == "graphql.json":
+            exported = data.get("data") or {}
+            _merge_graphql(
+                snapshot,
+                (exported.get("student_data") or {}).get("myStudentData"),
+                (exported.get("grade_overview") or {}).get("myStudentGradeOverview"),
+                (exported.get("pruefungs") or {}).get("pruefungs"),
+            )
+        elif name == "moodle.json":
+            exported = data.get("data") or {}
+            _merge_moodle(
+                snapshot,
+                exported.get("courses"),
+                exported.get("upcoming_deadlines"),
+                exported.get("assignments"),
+                exported.get("grades"),
+                project=True,
+            )
+        else:
+            graphql = data.get("graphql") or {}
+            moodle = data.get("moodle") or {}
+            _merge_graphql(
+                snapshot, graphql.get("student"), graphql.get("gradeOverview"), graphql.get("exams")
+            )
+            _merge_moodle(
+                snapshot,
+                moodle.get("courses"),
+                moodle.get("events"),
+                moodle.get("assignments"),
+                moodle.get("grades"),
+            )
+
+        timestamp = data.get("fetch_timestamp") or data.get("export_timestamp")
+        if timestamp and (snapshot["timestamp"] is None or timestamp > snapshot["timestamp"]):
+            snapshot["timestamp"] = timestamp
+
+    return snapshot
+
+
+def load_snapshot(date: str, export_dir: Path | None = None) -> dict[str, Any]:
+    """Load and normalize the snapshot of a date.
+
+    Looks in the export store first and falls back to a legacy
+    ``exports/YYYY-MM-DD/`` directory.
+
+    Raises:
+        KeyError: If no data exists for the date
+    """
+    import json
+
+    from kolping_cockpit.export_store import ExportStore
+    from kolping_cockpit.settings import get_settings
+
+    export_dir = export_dir or get_settings().export_dir
+    store = ExportStore(export_dir / ".store")
+    if store.get_snapshot(date) is not None:
+        return normalize_snapshot(store.load(date))
+
+    legacy_dir = export_dir / date
+    if legacy_dir.is_dir():
+        files = {}
+        for path in legacy_dir.glob("*.json"):
+            with path.open(encoding="utf-8") as f:
+                files[path.name] = json.load(f)
+        return normalize_snapshot(files)
+
+    msg = f"No snapshot for {date}"
+    raise KeyError(msg)
+
+
+def available_dates(export_dir: Path | None = None) -> list[str]:
+    """List all dates with snapshot data (store and legacy directories), oldest first."""
+    import re
+
+    from kolping_cockpit.export_store import ExportStore
+    from kolping_cockpit.settings import get_settings
+
+    export_dir = export_dir or get_settings().export_dir
+    dates = set(ExportStore(export_dir / ".store").dates())
+    if export_dir.exists():
+        dates.update(
+            p.name
+            for p in export_dir.iterdir()
+            if p.is_dir() and re.fullmatch(r"\d{4}-\d{2}-\d{2}", p.name)
+        )
+    return sorted(dates)
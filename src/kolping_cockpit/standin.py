@@ -0,0 +1,304 @@
+"""Local stand-in servers for the Moodle portal and the GraphQL gateway.
+
+A stand-in answers the requests of :class:`KolpingMoodleClient` and
+:class:`KolpingGraphQLClient` from recorded responses, so ``fetch``,
+``export all`` and ``kolping bench`` run offline against real HTTP, parsing
+and serialization. Point the clients at it through the settings
+(``KOLPING_MOODLE_BASE_URL`` and ``KOLPING_GRAPHQL_ENDPOINT``).
+
+One server serves both: ``POST /graphql`` answers each query's root fields
+from recorded GraphQL responses, every other path serves a recorded Moodle
+page. Recordings live in a directory::
+
+    graphql/<rootField>.json   a GraphQL response body ({"data": {"<rootField>": ...}})
+    moodle/pages.json          {"<path>": "<file>.html", ...}
+    moodle/<file>.html         a Moodle page
+
+Responses can be delayed (latency with jitter) and scaled: with ``scale=n``
+the outermost lists of objects in GraphQL data and the
+``<!-- repeat -->…<!-- /repeat -->`` blocks of pages are repeated n times,
+with IDs offset per copy so that copies stay distinct and joins by ID keep
+working.
+"""
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# IDs of the n-th copy of a scaled item are offset by n times this
+ID_OFFSET = 1_000_000
+
+# Field with optional alias in a selection, e.g. "result: myStudentData"
+_FIELD_RE = re.compile(r"(?:(\w+)\s*:\s*)?(\w+)")
+_ARGUMENTS_RE = re.compile(r"\([^)]*\)")
+_REPEAT_RE = re.compile(r"<!-- repeat -->(.*?)<!-- /repeat -->", re.DOTALL)
+_HTML_ID_RE = re.compile(r'((?:[?&;]id=)|(?:data-(?:event|course)-?id="))(\d+)')
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour of a stand-in server."""
+
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # +/- seconds of uniform noise on the latency
+    scale: int = 1  # copies of every repeated item
+    require_auth: bool = True  # answer 401/login redirect without credentials
+    seed: int | None = None
+
+
+@dataclass
+class StandInData:
+    """Recorded responses served by a stand-in."""
+
+    graphql: dict[str, Any] = field(default_factory=dict)  # root field -> data
+    pages: dict[str, str] = field(default_factory=dict)  # path -> HTML
+
+    @classmethod
+    def from_directory(cls, root: Path) -> "StandInData":
+        """Load recordings from ``graphql/*.json`` and ``moodle/pages.json``."""
+        root = Path(root)
+        data = cls()
+        for path in sorted((root / "graphql").glob("*.json")):
+            body = json.loads(path.read_text(encoding="utf-8"))
+            data.graphql.update(body.get("data") or {})
+        manifest = root / "moodle" / "pages.json"
+        if manifest.exists():
+            for page_path, name in json.loads(manifest.read_text(encoding="utf-8")).items():
+                data.pages[page_path] = (root / "moodle" / name).read_text(encoding="utf-8")
+        return data
+
+    def scaled(self, scale: int) -> "StandInData":
+        """Copy of the data with every repeated item ``scale`` times."""
+        if scale <= 1:
+            return self
+        return StandInData(
+            graphql={k: scale_json(v, scale) for k, v in self.graphql.items()},
+            pages={k: scale_html(v, scale) for k, v in self.pages.items()},
+        )
+
+
+def _offset_ids(value: Any, n: int) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: (_offset_id(v, n) if k == "id" or k.endswith("Id") else _offset_ids(v, n))
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_offset_ids(item, n) for item in value]
+    return value
+
+
+def _offset_id(value: Any, n: int) -> Any:
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return value + n * ID_OFFSET
+    if isinstance(value, str):
+        return str(int(value) + n * ID_OFFSET) if value.isdigit() else f"{value}-{n}"
+    return value
+
+
+def scale_json(value: Any, scale: int) -> Any:
+    """Repeat the items of the outermost lists of objects ``scale`` times (IDs offset per copy).
+
+    Lists inside the repeated objects (e.g. the exams of a module) are copied
+    with their object but not repeated again, so the data grows ``scale``
+    times regardless of how deeply lists are nested.
+    """
+    if isinstance(value, dict):
+        return {k: scale_json(v, scale) for k, v in value.items()}
+    if isinstance(value, list):
+        if not any(isinstance(item, dict) for item in value):
+            return [scale_json(item, scale) for item in value]
+        return [*value, *(item for n in range(1, scale) for item in _offset_ids(value, n))]
+    return value
+
+
+def _offset_html_ids(block: str, n: int) -> str:
+    return _HTML_ID_RE.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + n * ID_OFFSET}", block)
+
+
+def scale_html(html: str, scale: int) -> str:
+    """Repeat every ``<!-- repeat -->`` block ``scale`` times (IDs offset per copy)."""
+    return _REPEAT_RE.sub(
+        lambda m: "".join(_offset_html_ids(m.group(1), n) for n in range(scale)), html
+    )
+
+
+def root_fields(query: str) -> list[tuple[str, str]]:
+    """The ``(response key, field)`` pairs of a query's top-level selection."""
+    start = query.find("{")
+    if start < 0:
+        return []
+    depth, selection = 0, []
+    for char in query[start + 1 :]:
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            if depth == 0:
+                break
+            depth -= 1
+        elif depth == 0:
+            selection.append(char)
+    fields = _ARGUMENTS_RE.sub(" ", "".join(selection))
+    return [(alias or name, name) for alias, name in _FIELD_RE.findall(fields)]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """HTTP handler answering from :class:`StandInData`."""
+
+    data: StandInData
+    config: StandInConfig
+    rng: random.Random
+    rng_lock: threading.Lock
+    server_version = "KolpingStandIn"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are written separately
+
+    def _delay(self) -> None:
+        if not (self.config.latency or self.config.jitter):
+            return
+        with self.rng_lock:
+            noise = self.rng.uniform(-self.config.jitter, self.config.jitter)
+        time.sleep(max(0.0, self.config.latency + noise))
+
+    def _send(
+        self, status: int, body: bytes, content_type: str, location: str | None = None
+    ) -> None:
+        self._delay()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if location:
+            self.send_header("Location", location)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, value: Any) -> None:
+        body = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        path = urlsplit(self.path).path
+        login = path.startswith("/login/")
+        if (
+            self.config.require_auth
+            and not login
+            and "MoodleSession=" not in (self.headers.get("Cookie") or "")
+        ):
+            self._send(HTTPStatus.SEE_OTHER, b"", "text/html", location="/login/index.php")
+            return
+        page = self.data.pages.get(path)
+        if page is None:
+            self._send(HTTPStatus.NOT_FOUND, b"<h1>Not found</h1>", "text/html; charset=utf-8")
+            return
+        self._send(HTTPStatus.OK, page.encode("utf-8"), "text/html; charset=utf-8")
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if urlsplit(self.path).path.rstrip("/") != "/graphql":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        if self.config.require_auth and not self.headers.get("Authorization"):
+            self._send_json(
+                HTTPStatus.UNAUTHORIZED,
+                {"errors": [{"message": "The current user is not authorized"}]},
+            )
+            return
+        try:
+            query = json.loads(body)["query"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(HTTPStatus.BAD_REQUEST, {"errors": [{"message": "Invalid request"}]})
+            return
+
+        data: dict[str, Any] = {}
+        errors = []
+        for key, name in root_fields(query):
+            if name == "__typename":
+                data[key] = "Query"
+            elif name in self.data.graphql:
+                data[key] = self.data.graphql[name]
+            else:
+                errors.append({"message": f'The field "{name}" does not exist on type "Query".'})
+        response: dict[str, Any] = {"data": data or None}
+        if errors:
+            response["errors"] = errors
+        self._send_json(HTTPStatus.OK, response)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def create_standin_server(
+    data: StandInData,
+    config: StandInConfig | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> ThreadingHTTPServer:
+    """Create a stand-in server (call ``serve_forever()`` to run it).
+
+    Args:
+        data: Recorded responses (scaled here according to the config)
+        config: Latency, jitter, scale and authentication behaviour
+        host: Interface to bind (default: localhost only)
+        port: TCP port (0 picks a free port)
+    """
+    config = config or StandInConfig()
+    handler = type(
+        "Handler",
+        (StandInHandler,),
+        {
+            "data": data.scaled(config.scale),
+            "config": config,
+            "rng": random.Random(config.seed),  # noqa: S311
+            "rng_lock": threading.Lock(),
+        },
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class StandIn:
+    """Stand-in server running on a background thread.
+
+    Used as a context manager; while it runs, :attr:`url` is the Moodle base
+    URL and :attr:`graphql_endpoint` the GraphQL endpoint to configure.
+    """
+
+    def __init__(self, data: StandInData, config: StandInConfig | None = None, port: int = 0):
+        self.server = create_standin_server(data, config, port=port)
+        host, bound_port = self.server.server_address[:2]
+        self.url = f"http://{host}:{bound_port}"
+        self.graphql_endpoint = f"{self.url}/graphql"
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="stand-in", daemon=True
+        )
+
+    def start(self) -> "StandIn":
+        """Start serving on the background thread."""
+        self._thread.start()
+        return self
+
+    def __enter__(self) -> "StandIn":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the server."""
+        if self._thread.is_alive():
+            self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,225 @@
+"""Stale-while-revalidate cache for interactive commands.
+
+``deadlines``, ``exams`` and ``status`` render the last known data right away
+and refresh it in the background. The last known data is the newer of
+
+- the latest snapshot in the export store (``kolping fetch`` / ``export all``) and
+- the live cache (``exports/.cache/live.json``), a normalized snapshot that is
+  updated with every background refresh.
+
+Only the parts a refresh actually fetched are replaced in the live cache, so a
+``deadlines`` refresh (modules and events) keeps the courses of the last full
+fetch.
+"""
+
+import json
+import os
+import threading
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from kolping_cockpit.diff import diff_snapshots
+from kolping_cockpit.snapshot import (
+    available_dates,
+    empty_snapshot,
+    load_snapshot,
+    normalize_snapshot,
+)
+from kolping_cockpit.watch import ChangeEvent, classify
+
+# Snapshot part -> (source, key) in a fetch.json export that provides it
+PART_SOURCES: dict[str, tuple[str, str]] = {
+    "overview": ("graphql", "gradeOverview"),
+    "modules": ("graphql", "gradeOverview"),
+    "student": ("graphql", "student"),
+    "exams": ("graphql", "exams"),
+    "events": ("moodle", "events"),
+    "courses": ("moodle", "courses"),
+    "assignments": ("moodle", "assignments"),
+    "grades": ("moodle", "grades"),
+}
+
+
+def fetched_parts(data: dict[str, Any]) -> set[str]:
+    """Get the snapshot parts present in a ``fetch.json``-shaped export."""
+    return {
+        part
+        for part, (source, key) in PART_SOURCES.items()
+        if (data.get(source) or {}).get(key) is not None
+    }
+
+
+class LiveCache:
+    """JSON file with the last known snapshot and connection checks."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    @classmethod
+    def from_settings(cls) -> "LiveCache":
+        """Create the live cache at the configured location."""
+        from kolping_cockpit.settings import get_settings
+
+        return cls(get_settings().get_live_cache_path())
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return content if isinstance(content, dict) else {}
+
+    def _write(self, content: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(content, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.path)
+
+    def load_snapshot(self) -> dict[str, Any] | None:
+        """Get the cached snapshot, None if there is none."""
+        snapshot = self._read().get("snapshot")
+        return snapshot if isinstance(snapshot, dict) else None
+
+    def save_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Replace the cached snapshot."""
+        content = self._read()
+        content["snapshot"] = snapshot
+        self._write(content)
+
+    def load_check(self, name: str) -> dict[str, Any] | None:
+        """Get the last result of a connection check (ok, message, checked_at)."""
+        check = (self._read().get("checks") or {}).get(name)
+        return check if isinstance(check, dict) else None
+
+    def save_check(self, name: str, ok: bool, message: str) -> None:
+        """Store the result of a connection check."""
+        content = self._read()
+        content.setdefault("checks", {})[name] = {
+            "ok": ok,
+            "message": message,
+            "checked_at": datetime.now(UTC).isoformat(),
+        }
+        self._write(content)
+
+
+def load_cached(
+    export_dir: Path | None = None, cache: LiveCache | None = None
+) -> dict[str, Any] | None:
+    """Get the most recent known snapshot (live cache or export store).
+
+    Returns:
+        Normalized snapshot, or None if nothing was fetched yet
+    """
+    cache = cache or LiveCache.from_settings()
+    candidates = []
+    live = cache.load_snapshot()
+    if live is not None:
+        candidates.append(live)
+    dates = available_dates(export_dir)
+    if dates:
+        candidates.append(load_snapshot(dates[-1], export_dir))
+    if not candidates:
+        return None
+    return max(candidates, key=lambda snapshot: snapshot.get("timestamp") or "")
+
+
+def update_cache(
+    data: dict[str, Any], base: dict[str, Any] | None, cache: LiveCache | None = None
+) -> dict[str, Any]:
+    """Merge freshly fetched parts into the last known snapshot and store it.
+
+    Args:
+        data: ``fetch.json``-shaped export of a refresh
+        base: Snapshot the refreshed parts replace (None: start empty)
+        cache: Live cache to write (default: configured location)
+
+    Returns:
+        The merged snapshot
+    """
+    fresh = normalize_snapshot({"fetch.json": data})
+    merged = dict(base) if base else empty_snapshot()
+    for part in fetched_parts(data):
+        merged[part] = fresh[part]
+    merged["timestamp"] = fresh["timestamp"] or datetime.now(UTC).isoformat()
+    (cache or LiveCache.from_settings()).save_snapshot(merged)
+    return merged
+
+
+def changes(old: dict[str, Any], new: dict[str, Any], parts: set[str]) -> list[ChangeEvent]:
+    """Changes between two snapshots, limited to the refreshed parts."""
+    now = datetime.now(UTC).isoformat()
+    return [
+        classify(change, now)
+        for change in diff_snapshots(old, new)
+        if (change.collection or change.path.split("/")[1]) in parts
+    ]
+
+
+def _parse_timestamp(timestamp: str) -> datetime | None:
+    try:
+        then = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    return then if then.tzinfo else then.replace(tzinfo=UTC)
+
+
+def format_time(timestamp: str | None) -> str:
+    """Format a timestamp in local time, e.g. '11.01. 12:00'."""
+    then = _parse_timestamp(timestamp) if timestamp else None
+    if then is None:
+        return timestamp or "?"
+    return then.astimezone().strftime("%d.%m. %H:%M")
+
+
+def format_age(timestamp: str | None, now: datetime | None = None) -> str:
+    """Describe the age of a snapshot timestamp, e.g. 'vor 3 Std. (11.01. 12:00)'."""
+    then = _parse_timestamp(timestamp) if timestamp else None
+    if then is None:
+        return timestamp or "unbekannt"
+    seconds = ((now or datetime.now(UTC)) - then).total_seconds()
+
+    if seconds < 60:
+        age = "gerade eben"
+    elif seconds < 3600:
+        age = f"vor {int(seconds // 60)} Min."
+    elif seconds < 86400:
+        age = f"vor {int(seconds // 3600)} Std."
+    else:
+        days = int(seconds // 86400)
+        age = f"vor {days} Tag{'en' if days > 1 else ''}"
+    return f"{age} ({format_time(timestamp)})"
+
+
+class Revalidation:
+    """Runs a refresh in a background thread."""
+
+    def __init__(self, fn: Callable[[], Any]):
+        self._result: Any = None
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, args=(fn,), daemon=True)
+        self._thread.start()
+
+    def _run(self, fn: Callable[[], Any]) -> None:
+        try:
+            self._result = fn()
+        except BaseException as e:
+            self._error = e
+
+    def wait(self, timeout: float | None = None) -> Any:
+        """Wait for the refresh and return its result.
+
+        Raises:
+            TimeoutError: If the refresh did not finish in time
+            Exception: Whatever the refresh raised
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            msg = "Refresh did not finish in time"
+            raise TimeoutError(msg)
+        if self._error is not None:
+            raise self._error
+        return self._result
@@ -0,0 +1,443 @@
+"""Seeded synthetic datasets for scaling tests.
+
+Real accounts have a few dozen modules and events, which hides behaviour that
+grows with the product of two lists (e.g. matching every open module against
+every Moodle course). :func:`generate_dataset` builds a consistent account
+of any size: a grade overview with exam states spread over several study
+programs and semesters, ``pruefungs`` exam dates for registered and failed
+modules, and the Moodle side (courses, calendar events, assignments and
+grades) of the same modules, all reproducible from a seed.
+
+A dataset renders to the GraphQL responses and Moodle pages of a stand-in
+(:meth:`SyntheticDataset.standin_data`), so fetch, export and ``kolping
+bench`` run against it offline::
+
+    kolping stand-in --synthetic 5000
+"""
+
+import html
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from kolping_cockpit.standin import StandInData
+
+PORTAL_URL = "https://portal.kolping-hochschule.de"
+
+PROGRAMS = [
+    "Soziale Arbeit",
+    "Betriebswirtschaftslehre",
+    "Psychologie",
+    "Pflegemanagement",
+    "Wirtschaftsinformatik",
+]
+TOPICS = [
+    "Betriebswirtschaftslehre",
+    "Statistik",
+    "Sozialpolitik",
+    "Entwicklungspsychologie",
+    "Rechnungswesen",
+    "Projektmanagement",
+    "Sozialrecht",
+    "Organisationsentwicklung",
+    "Empirische Sozialforschung",
+    "Personalführung",
+    "Gesundheitsökonomie",
+    "Datenbanksysteme",
+    "Kommunikationspsychologie",
+    "Ethik",
+    "Marketing",
+    "Psychologische Diagnostik",
+    "Wissenschaftliches Arbeiten",
+    "Mathematik für Wirtschaftswissenschaften",
+]
+PREFIXES = ["", "Grundlagen der", "Einführung in die", "Methoden der", "Vertiefung"]
+# Assessment types with their weights
+PRUEFUNGSFORMEN = {
+    "Klausur": 40,
+    "Hausarbeit": 12,
+    "Portfolio": 10,
+    "Präsentation": 8,
+    "Lerntagebuch": 6,
+    "Mündliche Prüfung": 6,
+    "Seminararbeit": 8,
+    "Praxistransferbericht": 6,
+    "Anerkennung": 4,
+}
+GRADES = [1.0, 1.3, 1.7, 2.0, 2.3, 2.7, 3.0, 3.3, 3.7, 4.0]
+ROOMS = ["Online", "Köln, Raum 2.14", "Köln, Aula", "Paderborn, Raum 1.03"]
+WEEKDAYS = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
+MONTHS = [
+    "Januar",
+    "Februar",
+    "März",
+    "April",
+    "Mai",
+    "Juni",
+    "Juli",
+    "August",
+    "September",
+    "Oktober",
+    "November",
+    "Dezember",
+]
+
+
+@dataclass
+class SyntheticConfig:
+    """Size and shape of a synthetic dataset."""
+
+    modules: int = 40
+    events_per_course: int = 2
+    assignments_per_course: int = 2
+    sections: int = 8  # sections of the course page
+    current_semester: int = 4
+    start: date = date(2026, 1, 12)  # "today" of the calendar
+    seed: int = 0
+
+
+@dataclass
+class SyntheticDataset:
+    """Records of a synthetic account, in the shapes the clients return."""
+
+    student: dict[str, Any]
+    overview: dict[str, Any]  # myStudentGradeOverview without its modules
+    modules: list[dict[str, Any]] = field(default_factory=list)
+    exams: list[dict[str, Any]] = field(default_factory=list)
+    courses: list[dict[str, Any]] = field(default_factory=list)
+    events: list[dict[str, Any]] = field(default_factory=list)
+    assignments: list[dict[str, Any]] = field(default_factory=list)
+    sections: list[dict[str, Any]] = field(default_factory=list)
+
+    def graphql(self) -> dict[str, Any]:
+        """GraphQL data by root field."""
+        return {
+            "myStudentData": self.student,
+            "myStudentGradeOverview": {**self.overview, "modules": self.modules},
+            "pruefungs": self.exams,
+            "moduls": [
+                {
+                    "id": m["modulId"],
+                    "modulName": m["modulbezeichnung"],
+                    "modulkuerzel": f"M{m['modulId']}",
+                    "ectspunkte": m["eCTS"],
+                    "semester": m["semester"],
+                    "pruefungsform": m["pruefungsform"],
+                    "beschreibung": None,
+                }
+                for m in self.modules
+            ],
+        }
+
+    def pages(self) -> dict[str, str]:
+        """Moodle pages by path."""
+        user = f"{self.student['vorname']} {self.student['nachname']}"
+        return {
+            "/my/": _dashboard_page(user, self.courses, self.events),
+            "/my/courses.php": _courses_page(user, self.courses),
+            "/course/view.php": _course_page(user, self.courses, self.sections),
+            "/calendar/view.php": _calendar_page(user, self.events),
+            "/mod/assign/index.php": _assignments_page(user, self.assignments),
+            "/grade/report/overview/index.php": _grades_page(user, self.courses),
+            "/login/index.php": _page("Kolping Hochschule: Login", "login-index", None, _LOGIN),
+        }
+
+    def standin_data(self) -> StandInData:
+        """The dataset as responses of a stand-in server."""
+        return StandInData(graphql=self.graphql(), pages=self.pages())
+
+
+def generate_dataset(config: SyntheticConfig | None = None) -> SyntheticDataset:
+    """Generate a synthetic account; the same config always yields the same data."""
+    config = config or SyntheticConfig()
+    rng = random.Random(config.seed)  # noqa: S311
+    dataset = SyntheticDataset(student=_student(), overview={})
+
+    names: dict[str, int] = {}
+    forms, weights = list(PRUEFUNGSFORMEN), list(PRUEFUNGSFORMEN.values())
+    ects_total, graded = 0, []
+    for index in range(config.modules):
+        modul_id = 101 + index
+        program = PROGRAMS[index % len(PROGRAMS)]
+        semester = rng.randint(1, 7)
+        form = rng.choices(forms, weights)[0]
+        name = " ".join(filter(None, [rng.choice(PREFIXES), rng.choice(TOPICS)]))
+        if rng.random() < 0.3:
+            name = f"{name} ({program})"
+        names[name] = names.get(name, 0) + 1
+        if names[name] > 1:
+            name = f"{name} {names[name]}"
+
+        status = _exam_status(rng, form, semester, config.current_semester)
+        grade = None
+        if status == "bestanden":
+            grade = rng.choice(GRADES)
+        elif status == "nicht bestanden":
+            grade = 5.0
+        ects = rng.choice([5, 5, 5, 10])
+        if status in ("bestanden", "anerkannt"):
+            ects_total += ects
+        if grade is not None and grade <= 4.0:
+            graded.append(grade)
+
+        module = {
+            "modulId": modul_id,
+            "semester": semester,
+            "modulbezeichnung": name,
+            "eCTS": ects,
+            "pruefungsId": 9000 + index + 1 if form != "Anerkennung" else None,
+            "pruefungsform": form,
+            "grade": grade,
+            "points": None,
+            "note": f"{grade:.1f}".replace(".", ",") if grade is not None else None,
+            "color": {"bestanden": "green", "nicht bestanden": "red"}.get(status or ""),
+            "examStatus": status,
+            "eCTSString": f"{ects} ECTS",
+        }
+        dataset.modules.append(module)
+
+        if status in ("angemeldet", "nicht bestanden"):
+            day = config.start + timedelta(days=rng.randint(7, 120))
+            dataset.exams.append(
+                {
+                    "id": module["pruefungsId"],
+                    "modulId": modul_id,
+                    "datum": f"{day.isoformat()}T00:00:00",
+                    "uhrzeit": rng.choice(["09:00", "10:00", "13:00", "15:30"]),
+                    "raum": rng.choice(ROOMS),
+                    "pruefungsform": form,
+                    "anmerkung": "Wiederholungsprüfung" if status == "nicht bestanden" else None,
+                }
+            )
+
+        # Recognized modules and a few others have no Moodle course
+        if form == "Anerkennung" or rng.random() < 0.08:
+            continue
+        course_id = str(2000 + modul_id)
+        dataset.courses.append(
+            {
+                "id": course_id,
+                "name": name,
+                "url": f"{PORTAL_URL}/course/view.php?id={course_id}",
+                "category": f"Bachelor {program} · Semester {semester}",
+                "progress": 100 if status == "bestanden" else rng.randint(0, 95),
+                "grade": module["note"] or "-",
+            }
+        )
+        _add_course_activities(dataset, config, rng, name, form)
+
+    dataset.events.sort(key=lambda e: e["when"])
+    dataset.sections = [
+        {
+            "number": n,
+            "name": f"Lerneinheit {n}: {rng.choice(TOPICS)}",
+            "resource_id": str(70000 + 2 * n),
+            "assign_id": str(70001 + 2 * n),
+        }
+        for n in range(1, config.sections + 1)
+    ]
+    dataset.overview = {
+        "grade": round(sum(graded) / len(graded), 2) if graded else None,
+        "eCTS": ects_total,
+        "currentSemester": f"{config.current_semester}. Semester",
+        "student": dataset.student,
+    }
+    return dataset
+
+
+def _exam_status(rng: random.Random, form: str, semester: int, current: int) -> str | None:
+    if form == "Anerkennung":
+        return "anerkannt" if semester < current else None
+    if semester < current:
+        return rng.choices(["bestanden", "nicht bestanden", "abgemeldet"], [85, 10, 5])[0]
+    if semester == current:
+        return rng.choices(["angemeldet", None], [60, 40])[0]
+    return None
+
+
+def _add_course_activities(
+    dataset: SyntheticDataset, config: SyntheticConfig, rng: random.Random, name: str, form: str
+) -> None:
+    for n in range(1, config.events_per_course + 1):
+        event_id = str(53000 + len(dataset.events))
+        when = datetime.combine(
+            config.start + timedelta(days=rng.randint(0, 60)), time(rng.choice([12, 18, 23]), 0)
+        )
+        if n % 3 == 2:
+            title, start_time = f"Online-Vorlesung {name}", f"{_german_date(when)} » 19:30"
+        elif n % 3 == 0:
+            title, start_time = f"{name}: {form} Abgabe", _german_date(when)
+        else:
+            title, start_time = f"{name}: Einsendeaufgabe {n} ist fällig", _german_date(when)
+        dataset.events.append(
+            {
+                "id": event_id,
+                "title": title,
+                "start_time": start_time,
+                "course_name": name,
+                "url": f"{PORTAL_URL}/calendar/view.php?view=day&id={event_id}",
+                "when": when.isoformat(),
+            }
+        )
+    for n in range(1, config.assignments_per_course + 1):
+        assign_id = str(88000 + len(dataset.assignments))
+        due = config.start + timedelta(days=rng.randint(-60, 60))
+        dataset.assignments.append(
+            {
+                "id": assign_id,
+                "name": f"Einsendeaufgabe {n}",
+                "section": f"Lerneinheit {n}",
+                "course_name": name,
+                "url": f"{PORTAL_URL}/mod/assign/view.php?id={assign_id}",
+                "due_date": _german_date(datetime.combine(due, time(23, 59)), year=True),
+                "status": rng.choice(["Eingereicht", "Keine Abgabe", "Entwurf"]),
+            }
+        )
+
+
+def _german_date(when: datetime, year: bool = False) -> str:
+    """Moodle's German date format, e.g. "Dienstag, 13. Januar, 23:59"."""
+    day = f"{WEEKDAYS[when.weekday()]}, {when.day}. {MONTHS[when.month - 1]}"
+    return f"{day}{f' {when.year}' if year else ''}, {when:%H:%M}"
+
+
+def _student() -> dict[str, Any]:
+    return {
+        "studentId": 4711,
+        "vorname": "Max",
+        "nachname": "Mustermann",
+        "geburtsdatum": "1998-04-12T00:00:00",
+        "wohnort": "Köln",
+        "benutzername": "mmustermann",
+        "emailKh": "max.mustermann@stud.kolping-hochschule.de",
+    }
+
+
+# Pages follow the structure of the recorded pages in tests/fixtures/standin;
+# lists are wrapped in repeat markers so that stand-in scaling applies too
+
+_LOGIN = (
+    '<a class="btn login-identityprovider-btn" href="https://portal.kolping-hochschule.de'
+    '/auth/oidc/">Microsoft Entra</a>'
+)
+
+
+def _page(title: str, page_id: str, user: str | None, content: str) -> str:
+    menu = (
+        f'<div class="usermenu"><span class="usertext">{html.escape(user)}</span></div>\n'
+        if user
+        else ""
+    )
+    return (
+        '<!DOCTYPE html>\n<html lang="de">\n'
+        f'<head><meta charset="utf-8"><title>{html.escape(title)}</title></head>\n'
+        f'<body id="page-{page_id}">\n{menu}'
+        f'<div id="page-content">\n{content}\n</div>\n</body>\n</html>\n'
+    )
+
+
+def _repeat(items: list[str]) -> str:
+    return "<!-- repeat -->\n" + "\n".join(items) + "\n<!-- /repeat -->"
+
+
+def _event_link(event: dict[str, Any]) -> str:
+    return (
+        f'<a data-event-id="{event["id"]}" href="{html.escape(event["url"])}">'
+        f"{html.escape(event['title'])}</a>"
+    )
+
+
+def _dashboard_page(user: str, courses: list[dict], events: list[dict]) -> str:
+    cards = [
+        f'<div class="card dashboard-card" data-course-id="{c["id"]}">'
+        f'<a href="{c["url"]}">{html.escape(c["name"])}</a>'
+        f'<div class="progress-text">Fortschritt: {c["progress"]}%</div></div>'
+        for c in courses
+        if c["progress"] < 100
+    ]
+    timeline = [
+        f'<div class="event" data-region="event-item">{_event_link(e)}'
+        f'<div class="date">{html.escape(e["start_time"])}</div></div>'
+        for e in events
+        if "Online-Vorlesung" not in e["title"]
+    ]
+    content = (
+        '<section class="block_myoverview" data-region="myoverview"><h5>Meine Kurse</h5>\n'
+        f'<div class="course-list">\n{_repeat(cards)}\n</div></section>\n'
+        '<section class="block_timeline" data-region="timeline"><h5>Zeitleiste</h5>\n'
+        f"{_repeat(timeline)}\n</section>"
+    )
+    return _page("Dashboard | Kolping Hochschule", "my-index", user, content)
+
+
+def _courses_page(user: str, courses: list[dict]) -> str:
+    items = [
+        f'<li class="list-group-item course-listitem" data-course-id="{c["id"]}">'
+        f'<a href="{c["url"]}">{html.escape(c["name"])}</a>'
+        f'<span class="categoryname">{html.escape(c["category"])}</span></li>'
+        for c in courses
+    ]
+    content = f'<h2>Meine Kurse</h2>\n<ul class="list-group">\n{_repeat(items)}\n</ul>'
+    return _page("Meine Kurse | Kolping Hochschule", "my-courses", user, content)
+
+
+def _course_page(user: str, courses: list[dict], sections: list[dict]) -> str:
+    name = courses[0]["name"] if courses else "Kurs"
+    items = [
+        f'<li class="section main" id="section-{s["number"]}">'
+        f'<h3 class="sectionname">{html.escape(s["name"])}</h3>'
+        '<ul class="section-activities">'
+        f'<li class="activity resource"><a href="{PORTAL_URL}/mod/resource/view.php'
+        f'?id={s["resource_id"]}">Skript Lerneinheit {s["number"]}</a></li>'
+        f'<li class="activity assign"><a href="{PORTAL_URL}/mod/assign/view.php'
+        f'?id={s["assign_id"]}">Einsendeaufgabe {s["number"]}</a></li></ul></li>'
+        for s in sections
+    ]
+    content = (
+        f'<div class="page-header-headings"><h1>{html.escape(name)}</h1></div>\n'
+        f'<ul class="topics">\n{_repeat(items)}\n</ul>'
+    )
+    return _page(f"Kurs: {name} | Kolping Hochschule", "course-view-topics", user, content)
+
+
+def _calendar_page(user: str, events: list[dict]) -> str:
+    items = [
+        '<div class="event mt-3" data-region="event-item" data-type="event">'
+        f'<div class="card rounded"><h3 class="name d-inline-block">{_event_link(e)}</h3>'
+        f'<div class="date">{html.escape(e["start_time"])}</div></div></div>'
+        for e in events
+    ]
+    content = f'<h2>Kalender</h2>\n<div class="eventlist my-1">\n{_repeat(items)}\n</div>'
+    return _page("Kalender | Kolping Hochschule", "calendar-view", user, content)
+
+
+def _assignments_page(user: str, assignments: list[dict]) -> str:
+    rows = [
+        f"<tr><td>{html.escape(a['section'])}</td>"
+        f'<td><a href="{a["url"]}">{html.escape(a["name"])}</a></td>'
+        f"<td>{a['due_date']}</td><td>{a['status']}</td></tr>"
+        for a in assignments
+    ]
+    content = (
+        '<table class="generaltable mod_index">\n<thead><tr><th>Thema</th><th>Aufgabe</th>'
+        "<th>Fälligkeitsdatum</th><th>Abgabe</th></tr></thead>\n"
+        f"<tbody>\n{_repeat(rows)}\n</tbody>\n</table>"
+    )
+    return _page("Aufgaben | Kolping Hochschule", "mod-assign-index", user, content)
+
+
+def _grades_page(user: str, courses: list[dict]) -> str:
+    rows = [
+        f'<tr class="grade-item"><td><a href="{PORTAL_URL}/grade/report/user/index.php'
+        f'?id={c["id"]}">{html.escape(c["name"])}</a></td><td>{c["grade"]}</td></tr>'
+        for c in courses
+    ]
+    content = (
+        '<table id="overview-grade" class="generaltable boxaligncenter">\n'
+        "<thead><tr><th>Kurs</th><th>Bewertung</th></tr></thead>\n"
+        f"<tbody>\n{_repeat(rows)}\n</tbody>\n</table>"
+    )
+    return _page(
+        "Bewertungen: Übersicht | Kolping Hochschule", "grade-report-overview-index", user, content
+    )
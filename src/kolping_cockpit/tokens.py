@@ -0,0 +1,208 @@
+"""Scanner for bearer tokens (JWTs) in captures, exports and archives.
+
+``kolping extract-token`` looks for a usable GraphQL token in whatever the user
+saved from a browser session: capture folders, HAR exports, logs, or zip/tar
+archives of all of these. Instead of parsing each format, every file is
+searched for the byte pattern of a JWT (``eyJ…`` header and payload): regular
+files are memory-mapped, archive members are streamed in chunks, and files are
+scanned in a thread pool. Tokens are deduplicated before their claims are
+decoded, so each distinct token is decoded once, and candidates are ranked by
+audience and expiry.
+"""
+
+import base64
+import json
+import logging
+import os
+import re
+import tarfile
+import time
+import zipfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from kolping_cockpit.prefilter import open_bytes
+
+logger = logging.getLogger(__name__)
+
+# Audience of tokens accepted by the GraphQL gateway
+GRAPHQL_AUDIENCE = "api://b3d6dbac-7f13-4032-9e12-c0aae5910e20"
+
+# Base64url header and payload of a JSON object (both start with '{"'), then a signature
+JWT_RE = re.compile(
+    rb"(?<![A-Za-z0-9_-])eyJ[A-Za-z0-9_-]{8,}\.eyJ[A-Za-z0-9_-]{8,}\.[A-Za-z0-9_-]+"
+)
+
+# Archive members are read in chunks of this size
+CHUNK_SIZE = 1 << 20
+
+# Bytes kept between chunks, so a token split across two chunks is still found
+MAX_TOKEN_LENGTH = 16 * 1024
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+def decode_jwt_payload(token: str) -> dict[str, Any]:
+    """Decode the claims of a JWT without verifying it (empty dict if not a JWT)."""
+    parts = token.split(".")
+    if len(parts) < 2:
+        return {}
+    payload_b64 = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+@dataclass
+class TokenCandidate:
+    """A distinct token found in the scanned files."""
+
+    token: str
+    claims: dict[str, Any]
+    sources: list[str] = field(default_factory=list)
+
+    @property
+    def audience(self) -> str:
+        """The ``aud`` claim (lists are joined with commas)."""
+        aud = self.claims.get("aud", "")
+        return ", ".join(aud) if isinstance(aud, list) else str(aud)
+
+    @property
+    def expires(self) -> int | None:
+        """The ``exp`` claim as a Unix timestamp, if present."""
+        exp = self.claims.get("exp")
+        return int(exp) if isinstance(exp, int | float) else None
+
+    def matches(self, audience: str) -> bool:
+        """Whether the token was issued for the given audience."""
+        aud = self.claims.get("aud")
+        return audience in aud if isinstance(aud, list) else aud == audience
+
+    def is_expired(self, now: float | None = None) -> bool:
+        """Whether the token has expired (tokens without ``exp`` never do)."""
+        exp = self.expires
+        return exp is not None and exp <= (time.time() if now is None else now)
+
+
+def _is_archive(path: Path) -> bool:
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _scan_buffer(content: Any) -> set[bytes]:
+    return {match.group() for match in JWT_RE.finditer(content)}
+
+
+def _scan_stream(stream: IO[bytes]) -> set[bytes]:
+    found: set[bytes] = set()
+    tail = b""
+    while chunk := stream.read(CHUNK_SIZE):
+        buffer = tail + chunk
+        for match in JWT_RE.finditer(buffer):
+            # A match at the very end may continue in the next chunk
+            if match.end() < len(buffer):
+                found.add(match.group())
+        tail = buffer[-MAX_TOKEN_LENGTH:]
+    return found | _scan_buffer(tail)
+
+
+def _scan_archive(path: Path) -> Iterator[tuple[bytes, str]]:
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                with archive.open(info) as member:
+                    for token in _scan_stream(member):
+                        yield token, f"{path}:{info.filename}"
+        return
+
+    with tarfile.open(path) as archive:
+        for info in archive:
+            if not info.isfile():
+                continue
+            member = archive.extractfile(info)
+            if member is None:
+                continue
+            with member:
+                for token in _scan_stream(member):
+                    yield token, f"{path}:{info.name}"
+
+
+def scan_file(path: Path) -> list[tuple[bytes, str]]:
+    """Find JWTs in a file or in the members of an archive.
+
+    Returns:
+        ``(token, source)`` pairs; the source names the archive member if any
+    """
+    path = Path(path)
+    try:
+        if _is_archive(path):
+            return list(_scan_archive(path))
+        if path.stat().st_size == 0:
+            return []
+        with open_bytes(path) as content:
+            return [(token, str(path)) for token in _scan_buffer(content)]
+    except (OSError, zipfile.BadZipFile, tarfile.TarError):
+        logger.debug(f"Failed to scan {path} for tokens", exc_info=True)
+        return []
+
+
+def iter_scan_files(root: Path) -> Iterator[Path]:
+    """Yield the files below a directory (or the path itself if it is a file)."""
+    root = Path(root)
+    if root.is_file():
+        yield root
+        return
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in sorted(filenames):
+            path = Path(dirpath) / name
+            if not path.is_symlink():
+                yield path
+
+
+def scan_tokens(root: Path, workers: int | None = None) -> list[TokenCandidate]:
+    """Scan a directory, file or archive for distinct JWTs.
+
+    Args:
+        root: Directory to walk, or a single file or archive
+        workers: Scanner threads (default: ``ThreadPoolExecutor`` default)
+
+    Returns:
+        One candidate per distinct token that decodes to a JSON payload
+    """
+    sources: dict[bytes, list[str]] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for found in pool.map(scan_file, iter_scan_files(root)):
+            for token, source in found:
+                sources.setdefault(token, []).append(source)
+
+    candidates = []
+    for raw, token_sources in sources.items():
+        token = raw.decode("ascii")
+        claims = decode_jwt_payload(token)
+        if claims:
+            candidates.append(TokenCandidate(token, claims, token_sources))
+    return candidates
+
+
+def rank_tokens(
+    candidates: Iterable[TokenCandidate],
+    audience: str = GRAPHQL_AUDIENCE,
+    now: float | None = None,
+) -> list[TokenCandidate]:
+    """Order candidates best first.
+
+    Tokens for the audience come first, then unexpired ones, then those that
+    expire latest.
+    """
+    now = time.time() if now is None else now
+    return sorted(
+        candidates,
+        key=lambda c: (c.matches(audience), not c.is_expired(now), c.expires or 0),
+        reverse=True,
+    )
@@ -0,0 +1,344 @@
+"""Change watcher with adaptive polling (``kolping watch``).
+
+Each poll fetches only the grade overview (one GraphQL query) and the upcoming
+Moodle calendar (one page), normalizes them and diffs them against the previous
+poll with :mod:`kolping_cockpit.diff`. Changes become structured events:
+
+    {"type": "grade", "time": "...", "collection": "modules", "key": "12",
+     "label": "Statistik", "field": "grade", "old": null, "new": "1.7", ...}
+
+The poll interval adapts: it drops to the minimum after a change, grows while
+nothing happens, and is capped lower while registered exams await a result.
+"""
+
+import json
+import logging
+import random
+import shlex
+import subprocess
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from kolping_cockpit.diff import Change, diff_snapshots
+from kolping_cockpit.snapshot import empty_snapshot, normalize_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Parts of a snapshot covered by one poll
+WATCHED_COLLECTIONS = ("modules", "events")
+
+# Module fields that carry a result
+GRADE_FIELDS = frozenset({"grade", "note", "points"})
+
+# Exam status while a result is pending
+PENDING_STATUS = "angemeldet"
+
+
+@dataclass
+class ChangeEvent:
+    """A structured change notification."""
+
+    type: str  # grade, status, module, deadline, deadline_changed, deadline_removed, overview
+    time: str
+    collection: str | None
+    key: str | None
+    label: str | None
+    field: str | None
+    old: Any
+    new: Any
+    path: str
+
+    def to_json(self) -> str:
+        """Serialize the event as a single JSON line."""
+        return json.dumps(asdict(self), ensure_ascii=False, default=str)
+
+
+def classify(change: Change, now: str) -> ChangeEvent:
+    """Turn a diff change into a typed event."""
+    field = change.field
+    if change.collection == "modules":
+        if change.op == "replace" and field in GRADE_FIELDS:
+            kind = "grade"
+        elif change.op == "replace" and field == "examStatus":
+            kind = "status"
+        else:
+            kind = "module"
+    elif change.collection == "events":
+        if field is None and change.op == "add":
+            kind = "deadline"
+        elif field is None and change.op == "remove":
+            kind = "deadline_removed"
+        else:
+            kind = "deadline_changed"
+    else:
+        kind = "overview"
+    return ChangeEvent(
+        kind,
+        now,
+        change.collection,
+        change.key,
+        change.label,
+        field,
+        change.old,
+        change.new,
+        change.path,
+    )
+
+
+def watched_view(snapshot: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a full snapshot to the parts a poll fetches."""
+    view = empty_snapshot()
+    view["overview"] = snapshot.get("overview") or {}
+    for name in WATCHED_COLLECTIONS:
+        view[name] = snapshot.get(name) or {}
+    return view
+
+
+def has_pending_exams(snapshot: dict[str, Any]) -> bool:
+    """Check whether any registered exam still waits for its result."""
+    return any(
+        module.get("examStatus") == PENDING_STATUS
+        for module in (snapshot.get("modules") or {}).values()
+    )
+
+
+class AdaptiveInterval:
+    """Poll interval that speeds up after changes and backs off when quiet."""
+
+    def __init__(
+        self,
+        minimum: float = 300.0,
+        maximum: float = 7200.0,
+        exam_maximum: float = 900.0,
+        backoff: float = 1.5,
+        jitter: float = 0.1,
+    ):
+        """Initialize the interval.
+
+        Args:
+            minimum: Seconds between polls right after a change
+            maximum: Upper bound during quiet periods
+            exam_maximum: Upper bound while exams await their results
+            backoff: Growth factor per quiet poll
+            jitter: Random +/- fraction so several watchers do not align
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.exam_maximum = min(exam_maximum, maximum)
+        self.backoff = backoff
+        self.jitter = jitter
+        self.current = minimum
+
+    def update(self, changed: bool, exam_period: bool = False, failed: bool = False) -> float:
+        """Compute the next delay after a poll.
+
+        Returns:
+            Seconds to wait before the next poll
+        """
+        # Failed polls back off up to the maximum, so an expired session is not hammered
+        ceiling = self.exam_maximum if exam_period and not failed else self.maximum
+        if changed:
+            self.current = self.minimum
+        else:
+            self.current = max(min(self.current * self.backoff, ceiling), self.minimum)
+        return self.current * random.uniform(1 - self.jitter, 1 + self.jitter)  # noqa: S311
+
+
+def fetch_delta(session: Any) -> dict[str, Any]:
+    """Fetch the grade overview and upcoming deadlines as a ``fetch.json`` export.
+
+    Args:
+        session: :class:`kolping_cockpit.session.ClientSession` with pooled clients
+
+    After a failed source the session's clients are reset, so the next poll
+    uses credentials renewed in the meantime.
+
+    Raises:
+        RuntimeError: If neither source could be fetched
+    """
+    data: dict[str, Any] = {
+        "fetch_timestamp": datetime.now(UTC).isoformat(),
+        "graphql": {},
+        "moodle": {},
+    }
+    errors = []
+
+    graphql = session.graphql
+    if graphql.is_authenticated:
+        try:
+            response = graphql.execute_named_query("myStudentGradeOverview")
+            if response.data and "myStudentGradeOverview" in response.data:
+                data["graphql"]["gradeOverview"] = response.data["myStudentGradeOverview"]
+            else:
+                errors.append(f"GraphQL: {response.errors}")
+        except Exception as e:
+            logger.debug("Grade overview poll failed", exc_info=True)
+            errors.append(f"GraphQL: {e}")
+
+    moodle = session.moodle
+    if moodle.is_authenticated:
+        try:
+            data["moodle"]["events"] = [
+                {
+                    "id": e.id,
+                    "title": e.title,
+                    "start_time": e.start_time,
+                    "course_name": e.course_name,
+                    "url": e.url,
+                }
+                for e in moodle.get_upcoming_deadlines()
+            ]
+        except Exception as e:
+            logger.debug("Calendar poll failed", exc_info=True)
+            errors.append(f"Moodle: {e}")
+
+    if errors or (not data["graphql"] and not data["moodle"]):
+        # Tokens may have been renewed meanwhile (e.g. by a scheduled 'kolping
+        # renew'): re-read the credentials for the next poll
+        session.reset_clients()
+    if not data["graphql"] and not data["moodle"]:
+        raise RuntimeError("; ".join(errors) or "No credentials configured")
+    return data
+
+
+class EventSink:
+    """Delivers events to stdout, an NDJSON file and/or a hook command."""
+
+    def __init__(
+        self,
+        stdout: bool = True,
+        output: Path | None = None,
+        hook: str | None = None,
+        write: Callable[[str], Any] | None = None,
+    ):
+        """Initialize the sink.
+
+        Args:
+            stdout: Print one JSON line per event
+            output: File to append JSON lines to
+            hook: Command run per event with the JSON line on stdin
+            write: Replaces the stdout writer (e.g. in tests)
+        """
+        self.stdout = stdout
+        self.output = Path(output) if output else None
+        self.hook = shlex.split(hook) if hook else None
+        self._write = write or (lambda line: print(line, flush=True))
+
+    def emit(self, events: Iterable[ChangeEvent]) -> None:
+        """Deliver a batch of events."""
+        lines = [event.to_json() for event in events]
+        if not lines:
+            return
+        if self.stdout:
+            for line in lines:
+                self._write(line)
+        if self.output:
+            self.output.parent.mkdir(parents=True, exist_ok=True)
+            with self.output.open("a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        if self.hook:
+            for line in lines:
+                try:
+                    subprocess.run(  # noqa: S603 - command configured by the user
+                        self.hook, input=line, text=True, timeout=60, check=True
+                    )
+                except (OSError, subprocess.SubprocessError):
+                    logger.warning(f"Hook {self.hook[0]} failed", exc_info=True)
+
+
+class Watcher:
+    """Polls for changes and emits events."""
+
+    def __init__(
+        self,
+        fetch: Callable[[], dict[str, Any]],
+        sink: EventSink,
+        interval: AdaptiveInterval,
+        baseline: dict[str, Any] | None = None,
+        on_change: Callable[[dict[str, Any]], Any] | None = None,
+        status: Callable[[str], Any] | None = None,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            fetch: Returns a ``fetch.json``-shaped export (see :func:`fetch_delta`)
+            sink: Where events go
+            interval: Adaptive poll interval
+            baseline: Normalized snapshot to compare the first poll against;
+                its empty parts (e.g. no Moodle data stored) are taken from the
+                first poll that has them instead of being reported as added
+            on_change: Called with the raw export after a poll with changes
+            status: Receives human-readable progress messages
+            sleep: Sleep function (replaceable in tests)
+        """
+        self.fetch = fetch
+        self.sink = sink
+        self.interval = interval
+        self.previous = watched_view(baseline) if baseline else None
+        # Parts the baseline has no data for are unknown, not empty
+        self._unknown = {
+            name
+            for name in ("overview", *WATCHED_COLLECTIONS)
+            if self.previous is not None and not self.previous[name]
+        }
+        self.on_change = on_change
+        self.status = status or logger.info
+        self.sleep = sleep
+        self.polls = 0
+
+    def poll(self) -> list[ChangeEvent]:
+        """Fetch once, diff against the previous poll and emit events.
+
+        Raises:
+            Exception: Whatever the fetch function raises
+        """
+        data = self.fetch()
+        self.polls += 1
+        current = watched_view(normalize_snapshot({"fetch.json": data}))
+        # Keep what this poll could not fetch (e.g. Moodle session expired)
+        if self.previous is not None:
+            if not data.get("graphql"):
+                current["overview"] = self.previous["overview"]
+                current["modules"] = self.previous["modules"]
+            if "events" not in (data.get("moodle") or {}):
+                current["events"] = self.previous["events"]
+            for name in [name for name in self._unknown if current[name]]:
+                self._unknown.discard(name)
+                self.previous[name] = current[name]
+
+        events: list[ChangeEvent] = []
+        if self.previous is not None:
+            now = datetime.now(UTC).isoformat()
+            events = [classify(change, now) for change in diff_snapshots(self.previous, current)]
+        self.previous = current
+
+        if events:
+            self.sink.emit(events)
+            if self.on_change:
+                self.on_change(data)
+        return events
+
+    def run(self, max_polls: int | None = None) -> None:
+        """Poll until interrupted (or ``max_polls`` polls are done)."""
+        while max_polls is None or self.polls < max_polls:
+            failed = False
+            changed = False
+            try:
+                changed = bool(self.poll())
+            except Exception as e:
+                failed = True
+                self.polls += 1
+                logger.debug("Poll failed", exc_info=True)
+                self.status(f"Poll failed: {e}")
+            exam_period = self.previous is not None and has_pending_exams(self.previous)
+            delay = self.interval.update(changed, exam_period=exam_period, failed=failed)
+            if max_polls is not None and self.polls >= max_polls:
+                break
+            mode = " (exam period)" if exam_period else ""
+            self.status(f"Next poll in {delay / 60:.1f} min{mode}")
+            self.sleep(delay)
@@ -0,0 +1 @@
+"""Benchmarks of the parsing, classification and export hot paths."""
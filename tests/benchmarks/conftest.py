@@ -0,0 +1,99 @@
+"""Timing harness of the benchmark suite.
+
+Benchmarks are skipped by default; run them with::
+
+    pytest tests/benchmarks --benchmarks
+    pytest tests/benchmarks --benchmarks --benchmark-update   # new baseline
+
+Each benchmark times its hot path with the ``bench`` fixture: one warm-up
+call, then repeated calls for at least ``MIN_TIME`` seconds (at most
+``MAX_ROUNDS``), keeping the fastest. The result is compared with the time
+stored for the same test ID in ``baseline.json``; a benchmark slower than
+``--benchmark-tolerance`` times its baseline fails. The terminal summary lists
+every time next to its baseline, so regressions are visible per change.
+"""
+
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Repeat a benchmark for at least this many seconds, at most MAX_ROUNDS times
+MIN_TIME = 0.2
+MAX_ROUNDS = 5
+
+_results: dict[str, float] = {}
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark the benchmarks and skip them unless --benchmarks is given."""
+    skip = pytest.mark.skip(reason="benchmark (run with --benchmarks)")
+    run = config.getoption("--benchmarks")
+    for item in items:
+        if "benchmarks" in item.path.parts:
+            item.add_marker(pytest.mark.benchmark)
+            if not run:
+                item.add_marker(skip)
+
+
+def _load_baseline() -> dict[str, float]:
+    try:
+        return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+@pytest.fixture
+def bench(request) -> Callable[..., Any]:
+    """Time a function and check it against the baseline.
+
+    Returns:
+        ``bench(func, *args)``, which returns the result of the last call
+    """
+    name = request.node.nodeid.split("::", 1)[-1]
+    tolerance = request.config.getoption("--benchmark-tolerance")
+    update = request.config.getoption("--benchmark-update")
+
+    def run(func: Callable[..., Any], *args: Any) -> Any:
+        result = func(*args)  # warm-up (imports, caches)
+        best, total, rounds = float("inf"), 0.0, 0
+        while rounds < MAX_ROUNDS and (rounds == 0 or total < MIN_TIME):
+            start = time.perf_counter()
+            result = func(*args)
+            elapsed = time.perf_counter() - start
+            best, total, rounds = min(best, elapsed), total + elapsed, rounds + 1
+        _results[name] = best
+
+        baseline = _load_baseline().get(name)
+        if baseline and not update and best > baseline * tolerance:
+            pytest.fail(
+                f"{name}: {best * 1000:.1f} ms is more than {tolerance:g}x "
+                f"the baseline of {baseline * 1000:.1f} ms"
+            )
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """List the measured times next to the baseline and write it if requested."""
+    if not _results:
+        return
+    baseline = _load_baseline()
+    terminalreporter.section("benchmarks")
+    for name, seconds in _results.items():
+        previous = baseline.get(name)
+        change = f"{seconds / previous:5.2f}x" if previous else "  new"
+        terminalreporter.write_line(f"{seconds * 1000:10.2f} ms  {change}  {name}")
+
+    if config.getoption("--benchmark-update"):
+        baseline.update({name: round(seconds, 6) for name, seconds in _results.items()})
+        BASELINE_PATH.write_text(
+            json.dumps(dict(sorted(baseline.items())), indent=2) + "\n", encoding="utf-8"
+        )
+        terminalreporter.write_line(f"Baseline written to {BASELINE_PATH}")
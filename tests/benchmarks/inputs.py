@@ -0,0 +1,61 @@
+"""Synthetic benchmark inputs.
+
+Every size is a generated account (see :mod:`kolping_cockpit.synthetic`) with
+that many modules; its courses, events and assignments grow with it.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+import httpx
+
+from kolping_cockpit.moodle_client import KolpingMoodleClient
+from kolping_cockpit.synthetic import SyntheticConfig, SyntheticDataset, generate_dataset
+
+# Modules of the generated accounts
+SIZES = [10, 100, 1_000, 10_000]
+
+
+@lru_cache
+def dataset(size: int) -> SyntheticDataset:
+    """The generated account with ``size`` modules."""
+    return generate_dataset(SyntheticConfig(modules=size, seed=size))
+
+
+@lru_cache
+def page(path: str, size: int) -> str:
+    """A Moodle page of the account with ``size`` modules."""
+    return dataset(size).pages()[path]
+
+
+def moodle_client(html: str) -> KolpingMoodleClient:
+    """A Moodle client answering every request with the given page."""
+    client = KolpingMoodleClient(session_cookie="benchmark")
+    client._client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, text=html))
+    )
+    return client
+
+
+@lru_cache
+def fetch_export(size: int) -> dict[str, Any]:
+    """The ``kolping fetch`` export of the account with ``size`` modules."""
+    data = dataset(size)
+    graphql = data.graphql()
+    return {
+        "fetch_timestamp": "2026-01-11T12:00:00+00:00",
+        "graphql": {
+            "student": graphql["myStudentData"],
+            "gradeOverview": graphql["myStudentGradeOverview"],
+            "exams": graphql["pruefungs"],
+        },
+        "moodle": {
+            "user": "Max Mustermann",
+            "courses": [{k: c[k] for k in ("id", "name", "url")} for c in data.courses],
+            "events": [
+                {k: e[k] for k in ("id", "title", "start_time", "course_name", "url")}
+                for e in data.events
+            ],
+        },
+        "errors": [],
+    }
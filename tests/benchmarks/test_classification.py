@@ -0,0 +1,30 @@
+"""Benchmarks of the module classification of 'deadlines' and 'exams'."""
+
+import pytest
+from rich.console import Console
+
+from kolping_cockpit.commands.deadlines import _render_deadlines
+from kolping_cockpit.commands.exams import _render_exams
+from kolping_cockpit.render import create_renderer
+from kolping_cockpit.snapshot import normalize_snapshot
+from tests.benchmarks.inputs import SIZES, fetch_export
+
+
+def _renderer():
+    return create_renderer("ndjson", Console(), write=lambda line: None)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_deadlines(bench, size):
+    """Status filters, open-module selection and summary counts."""
+    snapshot = normalize_snapshot({"fetch.json": fetch_export(size)})
+
+    bench(_render_deadlines, _renderer(), snapshot, False, None)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_exams(bench, size):
+    """Categories, exam-date join and Moodle course matching."""
+    snapshot = normalize_snapshot({"fetch.json": fetch_export(size)})
+
+    bench(_render_exams, _renderer(), snapshot, None, True)
@@ -0,0 +1,40 @@
+"""Benchmarks of snapshot normalization and JSON export."""
+
+import json
+
+import pytest
+
+from kolping_cockpit.export_store import ExportStore
+from kolping_cockpit.snapshot import normalize_snapshot
+from tests.benchmarks.inputs import SIZES, fetch_export
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_export_file(bench, size):
+    """Indented JSON as written by --output and --output-dir."""
+    data = fetch_export(size)
+
+    text = bench(lambda: json.dumps(data, indent=2, ensure_ascii=False, default=str))
+
+    assert text.startswith("{")
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_normalize_snapshot(bench, size):
+    """Folding an export into the normalized snapshot."""
+    files = {"fetch.json": fetch_export(size)}
+
+    snapshot = bench(normalize_snapshot, files)
+
+    assert len(snapshot["modules"]) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_store_commit(bench, size, tmp_path):
+    """Committing a snapshot to the deduplicated export store (unchanged re-commit)."""
+    store = ExportStore(tmp_path / "store")
+    files = {"fetch.json": fetch_export(size)}
+
+    result = bench(store.commit, files, "2026-01-11")
+
+    assert result.new_chunks == 0
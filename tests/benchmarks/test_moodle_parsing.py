@@ -0,0 +1,45 @@
+"""Benchmarks of the Moodle page parsers."""
+
+import pytest
+
+from tests.benchmarks.inputs import SIZES, dataset, moodle_client, page
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_extract_courses(bench, size):
+    """Course list page → _extract_courses."""
+    client = moodle_client(page("/my/courses.php", size))
+
+    courses = bench(client.get_courses)
+
+    assert len(courses) == len(dataset(size).courses)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_extract_events(bench, size):
+    """Calendar month page → prefiltered parse and _extract_events."""
+    client = moodle_client(page("/calendar/view.php", size))
+
+    events = bench(client.get_calendar_events)
+
+    assert len(events) == len(dataset(size).events)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_extract_assignments(bench, size):
+    """Assignment overview → prefiltered parse and _extract_assignments_from_page."""
+    client = moodle_client(page("/mod/assign/index.php", size))
+
+    assignments = bench(client.get_assignments)
+
+    assert len(assignments) == len(dataset(size).assignments)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_grade_rows(bench, size):
+    """Grade overview → get_grades row parsing."""
+    client = moodle_client(page("/grade/report/overview/index.php", size))
+
+    grades = bench(client.get_grades)
+
+    assert len(grades) == len(dataset(size).courses)
@@ -3,6 +3,25 @@
 import pytest
 
 
+def pytest_addoption(parser):
+    """Options of the benchmark suite in tests/benchmarks."""
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--benchmarks", action="store_true", help="Run the benchmarks in tests/benchmarks"
+    )
+    group.addoption(
+        "--benchmark-update",
+        action="store_true",
+        help="Write the measured times to tests/benchmarks/baseline.json",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=2.0,
+        help="Fail a benchmark slower than this factor times its baseline (default: 2.0)",
+    )
+
+
 @pytest.fixture
 def mock_credentials():
     """Provide mock credentials for testing."""
@@ -24,3 +43,17 @@ def sample_export_data():
             }
         ],
     }
+
+
+@pytest.fixture(autouse=True)
+def isolated_export_dir(tmp_path, monkeypatch):
+    """Keep exports, snapshots and history of CLI runs out of the working tree."""
+    from kolping_cockpit.settings import get_secret_store, get_settings
+
+    export_dir = tmp_path / "exports"
+    monkeypatch.setenv("KOLPING_EXPORT_DIR", str(export_dir))
+    get_settings.cache_clear()
+    get_secret_store.cache_clear()
+    yield export_dir
+    get_settings.cache_clear()
+    get_secret_store.cache_clear()
@@ -0,0 +1,159 @@
+"""Tests for the browser credential capture."""
+
+import asyncio
+import base64
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from kolping_cockpit import auth
+from kolping_cockpit.auth import CMS_URL, CapturedCredentials, capture_credentials
+from kolping_cockpit.settings import get_settings
+from kolping_cockpit.tokens import GRAPHQL_AUDIENCE
+
+
+def _jwt(aud: str) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"aud": aud}).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJSUzI1NiJ9.{payload}.sig"
+
+
+class FakePage:
+    """Page that reports navigations to its context."""
+
+    url = "https://login.microsoftonline.com/common/oauth2/authorize"
+
+    def __init__(self, context):
+        self.context = context
+
+    async def goto(self, url, wait_until=None):
+        self.context.visits.append(url)
+        asyncio.get_running_loop().call_soon(self.context.navigate, url)
+
+    def is_closed(self):
+        return False
+
+    async def wait_for_selector(self, selector, state, timeout):
+        if self.context.logged_in:
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError
+        return object()  # Entra shows the email form
+
+
+class FakeContext:
+    """Browser context emitting the events of an SSO login."""
+
+    def __init__(self, logged_in: bool):
+        self.logged_in = logged_in
+        self.listeners = []
+        self.visits = []
+        self.jar = []
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def cookies(self, url):
+        return self.jar
+
+    async def wait_for_event(self, event, predicate, timeout):
+        future = asyncio.get_running_loop().create_future()
+        self.listeners.append((event, predicate, future))
+        return await asyncio.wait_for(future, timeout / 1000)
+
+    def emit(self, event, value):
+        for name, predicate, future in list(self.listeners):
+            if name == event and not future.done() and predicate(value):
+                future.set_result(value)
+
+    def navigate(self, url):
+        moodle = get_settings().moodle_base_url
+        if url == CMS_URL and self.logged_in:
+            for aud in ("https://graph.microsoft.com", GRAPHQL_AUDIENCE):
+                headers = {"authorization": f"Bearer {_jwt(aud)}"}
+                self.emit("request", SimpleNamespace(url="https://gw/graphql", headers=headers))
+        elif url.startswith(moodle):
+            # Anonymous sessions end on the login page until SSO has completed
+            logged_in = self.logged_in and CMS_URL in self.visits
+            path = "/my/" if logged_in else "/login/index.php"
+            self.jar = [{"name": "MoodleSession", "value": "auth" if logged_in else "anon"}]
+            document = SimpleNamespace(resource_type="document")
+            self.emit("response", SimpleNamespace(url=moodle + path, status=200, request=document))
+
+
+async def test_capture_follows_sso_and_returns_when_both_are_captured():
+    """Test that the Moodle page is reloaded after the CMS login and both are captured."""
+    context = FakeContext(logged_in=True)
+
+    captured = await capture_credentials(context, timeout=5)
+
+    assert captured.graphql_token == _jwt(GRAPHQL_AUDIENCE)
+    assert captured.moodle_session == "auth"
+    moodle_url = get_settings().moodle_login_url
+    assert context.visits == [CMS_URL, moodle_url, moodle_url]
+
+
+async def test_capture_times_out_without_login():
+    """Test that missing artifacts are None once the timeout expires."""
+    context = FakeContext(logged_in=False)
+
+    captured = await capture_credentials(context, moodle=False, timeout=0.05)
+
+    assert captured.graphql_token is None
+    assert captured.moodle_session is None
+
+
+async def test_silent_capture_stops_at_login_form():
+    """Test that a non-interactive capture gives up as soon as Entra asks for the user."""
+    context = FakeContext(logged_in=False)
+
+    captured = await asyncio.wait_for(
+        capture_credentials(context, timeout=30, interactive=False), timeout=1
+    )
+
+    assert captured.interaction_required
+    assert captured.graphql_token is None
+
+
+async def test_capture_cancels_listeners_when_navigation_fails():
+    """Test that a failing navigation does not leave capture tasks behind."""
+    context = FakeContext(logged_in=False)
+
+    async def goto(url, wait_until=None):
+        await asyncio.sleep(0)
+        raise RuntimeError("net::ERR_NAME_NOT_RESOLVED")
+
+    async def new_page():
+        page = FakePage(context)
+        page.goto = goto
+        return page
+
+    context.new_page = new_page
+
+    with pytest.raises(RuntimeError):
+        await capture_credentials(context, timeout=30)
+
+    assert context.listeners
+    assert all(future.cancelled() for _, _, future in context.listeners)
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+def test_refresh_falls_back_to_interactive_login(tmp_path, monkeypatch):
+    """Test that only the artifacts missing after the silent attempt are captured interactively."""
+    monkeypatch.setattr(auth, "get_auth_storage_path", lambda: tmp_path)
+    (tmp_path / "state.json").write_text("{}")
+    calls = []
+
+    def fake_acquire(headless, **options):
+        calls.append((headless, options["token"], options["moodle"]))
+        if headless:
+            return CapturedCredentials(graphql_token="token", interaction_required=True)
+        return CapturedCredentials(moodle_session="cookie")
+
+    monkeypatch.setattr(auth, "acquire_credentials", fake_acquire)
+
+    silent = auth.refresh_credentials(fallback=False)
+    assert silent.interaction_required and silent.moodle_session is None
+
+    captured = auth.refresh_credentials()
+    assert (captured.graphql_token, captured.moodle_session) == ("token", "cookie")
+    assert calls[-2:] == [(True, True, True), (False, False, True)]
@@ -0,0 +1,91 @@
+"""Tests for the load and latency probe."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from kolping_cockpit.bench import OPERATIONS, BenchClients, parse_mix, percentile, run_bench
+from kolping_cockpit.graphql_client import KolpingGraphQLClient
+from kolping_cockpit.moodle_client import KolpingMoodleClient
+
+PAGE = b"""<html><body><h1>Kurs</h1>
+<div class="coursebox" data-courseid="7"><a href="/course/view.php?id=7">Mathe</a></div>
+</body></html>"""
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """Moodle pages for every GET; the GraphQL endpoint rejects the token."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802
+        self._send(200, PAGE)
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self._send(401, b'{"errors": [{"message": "unauthorized"}]}')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def clients():
+    """Real clients pointed at a local stand-in server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    moodle = KolpingMoodleClient(session_cookie="stand-in")
+    graphql = KolpingGraphQLClient(bearer_token="stand-in")
+    moodle.base_url, graphql.endpoint = base, f"{base}/graphql"
+    yield BenchClients(moodle=moodle, graphql=graphql)
+    moodle.close()
+    graphql.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_mix_and_percentile():
+    """Test mix weights and nearest-rank percentiles."""
+    assert parse_mix("graphql=3, dashboard,course=0.5") == {
+        "graphql": 3.0,
+        "dashboard": 1.0,
+        "course": 0.5,
+    }
+    with pytest.raises(ValueError, match="Unknown operation"):
+        parse_mix("grades")
+    with pytest.raises(ValueError):
+        parse_mix("courses=0")
+
+    values = [float(v) for v in range(1, 101)]
+    assert (percentile(values, 50), percentile(values, 99), percentile([], 50)) == (50, 99, 0)
+
+
+def test_closed_loop_counts_operations_bytes_and_errors(clients):
+    """Test that every operation is sampled and HTTP errors are counted per operation."""
+    mix = {**dict.fromkeys(OPERATIONS, 1.0), "graphql": 4.0}
+    report = run_bench(clients, mix, concurrency=3, max_operations=20, seed=1)
+
+    stats = {s.operation: s for s in report.stats()}
+    assert stats["total"].count == 20
+    assert stats["graphql"].errors == stats["graphql"].count > 0
+    assert all(stats[name].errors == 0 for name in stats if name not in ("graphql", "total"))
+    assert report.error_kinds() == {"HTTP 401": stats["graphql"].count}
+    assert stats["total"].requests == 20
+    assert all(s.bytes == len(PAGE) for s in report.samples if s.operation != "graphql")
+    assert stats["total"].p50 <= stats["total"].p95 <= stats["total"].p99
+
+
+def test_open_loop_runs_at_the_requested_rate(clients):
+    """Test that a fixed rate issues operations on schedule for the duration."""
+    report = run_bench(clients, {"courses": 1}, rate=40, duration=0.25)
+
+    assert 9 <= len(report.samples) <= 10
+    assert all(sample.ok for sample in report.samples)
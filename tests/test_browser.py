@@ -0,0 +1,129 @@
+"""Tests for the browser routing profile."""
+
+import json
+from types import SimpleNamespace
+
+from kolping_cockpit.browser import BlockingProfile, BrowserPool
+from kolping_cockpit.settings import get_settings
+
+
+class FakeRoute:
+    """Route recording whether it was aborted or continued."""
+
+    def __init__(self, url: str, resource_type: str):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = None
+
+    def abort(self):
+        self.outcome = "abort"
+
+    def continue_(self):
+        self.outcome = "continue"
+
+
+def test_profile_blocks_resources_and_third_party_hosts():
+    """Test that only first-party documents, scripts and API calls pass."""
+    profile = BlockingProfile.from_settings()
+    routes = [
+        FakeRoute("https://portal.kolping-hochschule.de/my/", "document"),
+        FakeRoute("https://aadcdn.msftauth.net/shared/1.0/converged.js", "script"),
+        FakeRoute("https://app-kolping-prod-gateway.azurewebsites.net/graphql", "fetch"),
+        FakeRoute("https://portal.kolping-hochschule.de/theme/image.php/logo.png", "image"),
+        FakeRoute("https://www.google-analytics.com/g/collect", "ping"),
+        FakeRoute("https://fonts.gstatic.com/s/roboto.woff2", "font"),
+        FakeRoute("https://evil-kolping-hochschule.de/x.js", "script"),
+        FakeRoute("data:image/png;base64,iVBOR", "image"),
+    ]
+
+    for route in routes:
+        profile.handle(route)
+
+    assert [r.outcome for r in routes] == ["continue"] * 3 + ["abort"] * 4 + ["continue"]
+    assert profile.summary() == "4 blocked, 4 allowed"
+    assert "www.google-analytics.com" in profile.blocked_hosts
+
+
+def test_profile_is_configurable(monkeypatch):
+    """Test the allowlist and on/off settings."""
+    monkeypatch.setenv("KOLPING_BROWSER_ALLOW_HOSTS", json.dumps(["example.org"]))
+    monkeypatch.setenv("KOLPING_BROWSER_BLOCK_RESOURCES", json.dumps(["media"]))
+    get_settings.cache_clear()
+
+    profile = BlockingProfile.from_settings()
+    assert profile.should_block(
+        FakeRoute("https://portal.kolping-hochschule.de/", "document").request
+    )
+    assert not profile.should_block(FakeRoute("https://cdn.example.org/logo.png", "image").request)
+
+    monkeypatch.setenv("KOLPING_BROWSER_BLOCK", "false")
+    get_settings.cache_clear()
+    assert BlockingProfile.from_settings() is None
+
+
+class FakeContext:
+    """Async browser context recording whether it was closed."""
+
+    def __init__(self, browser, options):
+        self.browser = browser
+        self.options = options
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """Async browser handing out fake contexts."""
+
+    def __init__(self):
+        self.contexts = []
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        self.contexts.append(FakeContext(self, options))
+        return self.contexts[-1]
+
+    async def close(self):
+        pass
+
+
+class FakeChromium:
+    """Chromium launcher counting launches."""
+
+    def __init__(self):
+        self.browsers = []
+
+    async def launch(self, headless=True):
+        self.browsers.append(FakeBrowser())
+        return self.browsers[-1]
+
+
+def test_pool_keeps_the_browser_and_closes_every_context():
+    """Test one launch across sync calls, fresh contexts per use and relaunch after a crash."""
+    chromium = FakeChromium()
+    pool = BrowserPool()
+
+    async def stop():
+        pass
+
+    pool._playwright = SimpleNamespace(chromium=chromium, stop=stop)
+
+    async def use(pool, **options):
+        async with pool.context(**options) as context:
+            return context
+
+    try:
+        first = pool.run(use)
+        with_state = pool.run(lambda pool: use(pool, storage_state="state.json"))
+        chromium.browsers[0].connected = False
+        after_crash = pool.run(use)
+    finally:
+        pool.close()
+
+    assert first is not with_state and first.closed and with_state.closed
+    assert with_state.options == {"storage_state": "state.json"}
+    assert after_crash.browser is chromium.browsers[1] and after_crash.closed
+    assert pool.launches == 2
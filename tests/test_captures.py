@@ -0,0 +1,69 @@
+"""Tests for the capture index."""
+
+import json
+import os
+
+from kolping_cockpit import captures
+from kolping_cockpit.captures import CaptureIndex
+
+CALENDAR_HTML = """
+<div class="event" data-region="event-item">
+  <a data-event-id="1" href="https://portal/calendar/view.php?time={ts}">Klausur {title}</a>
+  <div class="date">Morgen » 10:00</div>
+</div>
+"""
+
+
+def _write_captures(docs, count: int) -> None:
+    graphql = docs / "000-graphql"
+    graphql.mkdir(parents=True)
+    (graphql / "response_body.json").write_text(
+        json.dumps({"data": {"myStudentGradeOverview": {"grade": "1.7", "modules": []}}})
+    )
+    for i in range(count):
+        page = docs / f"{i + 1:03d}-calendar"
+        page.mkdir()
+        html = CALENDAR_HTML.format(ts=1767225600 + i, title=f"Modul {i}")
+        (page / "calendar.html").write_text(html)
+
+
+def test_scan_parses_only_new_or_changed_captures(tmp_path):
+    """Test that unchanged, touched and removed captures are not parsed again."""
+    docs = tmp_path / "docs"
+    _write_captures(docs, 3)
+    index_path = tmp_path / "captures.json"
+
+    first = CaptureIndex(index_path).scan(docs)
+    assert first.parsed == 4
+    assert first.grade == {"grade": "1.7", "modules": []}
+    assert [e["title"] for e in first.events] == [
+        "Klausur Modul 0",
+        "Klausur Modul 1",
+        "Klausur Modul 2",
+    ]
+    assert first.events[0]["date_text"] == "Morgen → 10:00"
+
+    page = docs / "001-calendar" / "calendar.html"
+    stat = page.stat()
+    os.utime(page, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    (docs / "002-calendar" / "calendar.html").write_text(CALENDAR_HTML.format(ts=1, title="Neu"))
+    (docs / "003-calendar" / "calendar.html").unlink()
+
+    second = CaptureIndex(index_path).scan(docs)
+    assert second.parsed == 1
+    assert [e["title"] for e in second.events] == ["Klausur Modul 0", "Klausur Neu"]
+    assert len(CaptureIndex(index_path).entries) == 3
+
+
+def test_scan_uses_process_pool_for_large_batches(tmp_path, monkeypatch):
+    """Test that the pooled parse yields the same data as the serial one."""
+    docs = tmp_path / "docs"
+    _write_captures(docs, 6)
+    monkeypatch.setattr(captures, "PARALLEL_THRESHOLD", 2)
+
+    pooled = CaptureIndex(None, workers=2).scan(docs)
+    serial = CaptureIndex(None, workers=1).scan(docs)
+
+    assert pooled.parsed == serial.parsed == 7
+    assert pooled.events == serial.events
+    assert len(pooled.events) == 6
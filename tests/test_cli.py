@@ -183,3 +183,39 @@ def test_exams_command_with_semester_filter(mock_moodle_class, mock_graphql_clas
 
     # Should complete successfully
     assert result.exit_code == 0
+
+
+def test_shell_runs_commands_in_process():
+    """Test that the shell dispatches several commands and exits."""
+    result = runner.invoke(app, ["shell"], input="version\nnot-a-command\nversion\nexit\n")
+    assert result.exit_code == 0
+    assert result.stdout.count("Kolping Study Cockpit v0.1.0") == 3  # banner + 2x version
+    assert "No such command" in result.output
+
+
+def test_shell_survives_command_exceptions():
+    """Test that an exception escaping a command becomes exit code 1."""
+    from kolping_cockpit.commands.shell import run_command
+
+    group = MagicMock()
+    group.main.side_effect = RuntimeError("kaputt")
+
+    assert run_command(group, ["fetch"]) == 1
+
+
+@patch("kolping_cockpit.settings.store_secret", return_value=True)
+@patch("kolping_cockpit.graphql_client.KolpingGraphQLClient")
+@patch("kolping_cockpit.moodle_client.KolpingMoodleClient")
+def test_shell_reuses_clients(mock_moodle_class, mock_graphql_class, mock_store):
+    """Test that repeated commands in the shell share one client per API."""
+    mock_graphql_class.return_value.is_authenticated = False
+    mock_moodle_class.return_value.is_authenticated = False
+
+    commands = "deadlines\ndeadlines\nset-moodle\nnew-cookie\ndeadlines\n"
+    result = runner.invoke(app, ["shell"], input=commands)
+
+    assert result.exit_code == 0
+    mock_store.assert_called_once_with("moodle_session", "new-cookie")
+    assert mock_graphql_class.call_count == 2  # recreated after set-moodle
+    assert mock_moodle_class.call_count == 2
+    mock_graphql_class.return_value.__enter__.assert_not_called()
@@ -1,10 +1,13 @@
 """Tests for the connector module."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from contextlib import nullcontext
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from kolping_cockpit.connector import ConnectorConfig, LocalConnector
+from kolping_cockpit.browser import BrowserPool
+from kolping_cockpit.connector import ConnectorConfig, LocalConnector, PortalView, default_views
 
 
 def test_connector_config_defaults():
@@ -76,34 +79,73 @@ def test_get_credentials_no_password(mock_keyring):
 
 
 @patch("kolping_cockpit.connector.keyring")
-@patch("kolping_cockpit.connector.sync_playwright")
-def test_export_data(mock_playwright, mock_keyring):
+def test_export_data(mock_keyring, tmp_path, monkeypatch):
     """Test that export_data returns expected structure."""
     # Mock credentials
     mock_keyring.get_password.side_effect = ["testuser", "testpass"]
-
-    # Mock Playwright
-    mock_browser = MagicMock()
-    mock_context = MagicMock()
-    mock_page = MagicMock()
-
-    mock_playwright_instance = MagicMock()
-    mock_playwright_instance.__enter__.return_value.chromium.launch.return_value = mock_browser
-    mock_browser.new_context.return_value = mock_context
+    monkeypatch.setenv("KOLPING_MOODLE_SESSION", "cookie")
+    monkeypatch.setattr("kolping_cockpit.auth.get_auth_storage_path", lambda: tmp_path)
+
+    # Mock Playwright behind the browser pool
+    mock_page = AsyncMock()
+    mock_page.evaluate.return_value = [{"id": 1, "title": "Sample Record"}]
+    mock_context = AsyncMock(pages=[])
+    mock_context.set_default_timeout = MagicMock()
     mock_context.new_page.return_value = mock_page
-
-    mock_playwright.return_value = mock_playwright_instance
+    mock_browser = MagicMock()
+    mock_browser.new_context = AsyncMock(return_value=mock_context)
+    pool = BrowserPool()
+    pool.browser = AsyncMock(return_value=mock_browser)
 
     # Test export
     connector = LocalConnector()
-    data = connector.export_data()
+    with patch("kolping_cockpit.connector.browser_pool", return_value=nullcontext(pool)):
+        data = connector.export_data(default_views(months=2))
+    pool.close()
 
     assert "version" in data
     assert "exported_at" in data
     assert "user" in data
     assert data["user"] == "testuser"
     assert "records" in data
-    assert isinstance(data["records"], list)
+    assert sorted(r["view"] for r in data["records"]) == ["calendar", "calendar", "grades"]
+    mock_context.set_default_timeout.assert_called_once_with(30000)
+    cookie = mock_context.add_cookies.call_args.args[0][0]
+    assert (cookie["name"], cookie["value"]) == ("MoodleSession", "cookie")
+
+
+async def test_extract_views_streams_with_bounded_concurrency():
+    """Test that views run in parallel pages, at most max_pages at a time, in completion order."""
+    open_pages = []
+    peak = 0
+    delays = {"/slow": 0.05, "/a": 0.01, "/b": 0.01, "/c": 0.01}
+
+    class Page:
+        async def goto(self, url):
+            nonlocal peak
+            open_pages.append(self)
+            peak = max(peak, len(open_pages))
+            self.path = url.removeprefix(connector.config.base_url)
+            await asyncio.sleep(delays[self.path])
+
+        async def evaluate(self, script):
+            if self.path == "/b":
+                raise RuntimeError("page crashed")
+            return [{"path": self.path}]
+
+        async def close(self):
+            open_pages.remove(self)
+
+    context = AsyncMock()
+    context.new_page.side_effect = Page
+    connector = LocalConnector(ConnectorConfig(max_pages=2))
+    views = [PortalView(name, name, "() => []") for name in ("/slow", "/a", "/b", "/c")]
+
+    records = [r async for r in connector.extract_views(context, views)]
+
+    assert [r["path"] for r in records] == ["/a", "/c", "/slow"]
+    assert peak == 2
+    assert not open_pages
 
 
 def test_get_timestamp():
@@ -113,3 +155,38 @@ def test_get_timestamp():
     # Should be ISO format with timezone
     assert "T" in timestamp
     assert timestamp.endswith("+00:00") or timestamp.endswith("Z")
+
+
+async def test_extract_views_survives_page_failures():
+    """Test that views whose page cannot be opened or closed still report to the consumer."""
+
+    class Page:
+        async def goto(self, url):
+            pass
+
+        async def evaluate(self, script):
+            return [{"ok": True}]
+
+        async def close(self):
+            raise RuntimeError("browser crashed")
+
+    pages = iter([RuntimeError("browser crashed"), Page()])
+
+    async def new_page():
+        page = next(pages)
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    context = AsyncMock()
+    context.new_page.side_effect = new_page
+    connector = LocalConnector(ConnectorConfig(max_pages=1))
+    views = [PortalView(name, f"/{name}", "() => []") for name in ("broken", "calendar")]
+
+    records = await asyncio.wait_for(_collect(connector.extract_views(context, views)), 5)
+
+    assert records == [{"view": "calendar", "ok": True}]
+
+
+async def _collect(records):
+    return [record async for record in records]
@@ -0,0 +1,104 @@
+"""Tests for the connectivity diagnostics."""
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from rich.console import Console
+
+from kolping_cockpit.diagnostics import (
+    check_graphql_endpoint,
+    check_moodle_redirect,
+    run_diagnostics,
+)
+from kolping_cockpit.settings import get_settings
+
+
+class _StandInPortal(BaseHTTPRequestHandler):
+    """Portal redirecting to the login page, and a GraphQL endpoint requiring auth."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        if self.path == "/my/":
+            self.send_response(303)
+            self.send_header("Location", "/login/index.php")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b"<form>login.microsoftonline.com</form>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({"errors": [{"message": "unauthorized"}]}).encode()
+        self.send_response(401)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def portal(monkeypatch):
+    """Point the portal and GraphQL settings at a local stand-in server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInPortal)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setenv("KOLPING_MOODLE_BASE_URL", base)
+    monkeypatch.setenv("KOLPING_GRAPHQL_ENDPOINT", f"{base}/graphql")
+    get_settings.cache_clear()
+    yield base
+    server.shutdown()
+    server.server_close()
+
+
+async def test_redirect_hops_are_timed(portal):
+    """Test that each hop records its phases and a kept-alive hop skips connect."""
+    result = await check_moodle_redirect(verbose=True)
+
+    first, second = result.timings
+    assert [t.status for t in result.timings] == [303, 200]
+    assert first.url == f"{portal}/my/"
+    assert first.dns is not None and first.connect is not None and first.tls is None
+    assert second.dns is None and second.connect is None
+    assert all(t.ttfb <= t.total for t in result.timings)
+    assert [hop["time"] for hop in result.details["redirects"]] == [
+        t.summary() for t in result.timings
+    ]
+
+
+async def test_run_diagnostics_shows_timing_breakdown(portal):
+    """Test that the report has a time per check and a row per request."""
+    console = Console(record=True, width=200)
+
+    await run_diagnostics(console)
+
+    output = console.export_text()
+    assert "Network Timing (ms)" in output
+    assert "GET 127.0.0.1" in output and "POST 127.0.0.1" in output
+    assert "Completed in" in output
+
+
+async def test_failed_requests_keep_partial_timings(monkeypatch):
+    """Test that a refused connection is reported with the phases before the failure."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    monkeypatch.setenv("KOLPING_GRAPHQL_ENDPOINT", f"http://127.0.0.1:{port}/graphql")
+    get_settings.cache_clear()
+
+    result = await check_graphql_endpoint()
+
+    assert result.status == "error"
+    (timing,) = result.timings
+    assert timing.method == "POST" and timing.status is None
+    assert timing.dns is not None and timing.connect is None
+    assert timing.total is not None
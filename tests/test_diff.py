@@ -0,0 +1,119 @@
+"""Tests for snapshot normalization and the diff engine."""
+
+from kolping_cockpit.diff import diff_snapshots, to_json_patch
+from kolping_cockpit.snapshot import normalize_snapshot
+
+
+def _fetch_export(status: str, events: list[dict]) -> dict:
+    return {
+        "fetch_timestamp": "2026-01-11T12:00:00+00:00",
+        "graphql": {
+            "gradeOverview": {
+                "grade": "1.7",
+                "eCTS": 90,
+                "modules": [
+                    {"modulId": 1, "modulbezeichnung": "Mathematik", "examStatus": "bestanden"},
+                    {"modulId": 2, "modulbezeichnung": "Statistik", "examStatus": status},
+                ],
+            }
+        },
+        "moodle": {"events": events, "courses": [{"id": "10", "name": "Statistik"}]},
+    }
+
+
+def test_normalize_indexes_collections_by_key():
+    """Test that records are keyed by their natural id."""
+    snapshot = normalize_snapshot({"fetch.json": _fetch_export("angemeldet", [])})
+
+    assert set(snapshot["modules"]) == {"1", "2"}
+    assert snapshot["courses"]["10"]["name"] == "Statistik"
+    assert snapshot["overview"] == {"grade": "1.7", "eCTS": 90}
+
+
+def test_normalize_graphql_and_moodle_exports():
+    """Test that export files of both sources are merged."""
+    graphql = {
+        "data": {
+            "grade_overview": {
+                "myStudentGradeOverview": {"grade": "2.0", "modules": [{"modulId": 7}]}
+            }
+        }
+    }
+    moodle = {"data": {"upcoming_deadlines": [{"id": "3", "title": "Abgabe"}]}}
+
+    snapshot = normalize_snapshot({"graphql.json": graphql, "moodle.json": moodle})
+
+    assert list(snapshot["modules"]) == ["7"]
+    assert snapshot["events"]["3"]["title"] == "Abgabe"
+
+
+def test_diff_detects_status_change_and_new_event():
+    """Test keyed matching of modules and events."""
+    old = normalize_snapshot({"fetch.json": _fetch_export("angemeldet", [])})
+    new = normalize_snapshot(
+        {"fetch.json": _fetch_export("bestanden", [{"id": "5", "title": "Klausur"}])}
+    )
+
+    changes = list(diff_snapshots(old, new))
+
+    assert [(c.op, c.path) for c in changes] == [
+        ("replace", "/modules/2/examStatus"),
+        ("add", "/events/5"),
+    ]
+    assert changes[0].label == "Statistik"
+    assert changes[0].field == "examStatus"
+
+
+def test_diff_ignores_reordering():
+    """Test that reordered records are not reported as changes."""
+    export = _fetch_export("angemeldet", [])
+    reordered = _fetch_export("angemeldet", [])
+    reordered["graphql"]["gradeOverview"]["modules"].reverse()
+
+    old = normalize_snapshot({"fetch.json": export})
+    new = normalize_snapshot({"fetch.json": reordered})
+
+    assert list(diff_snapshots(old, new)) == []
+
+
+def test_json_patch_output():
+    """Test RFC 6902 patch conversion."""
+    old = normalize_snapshot({"fetch.json": _fetch_export("angemeldet", [{"id": "4"}])})
+    new = normalize_snapshot({"fetch.json": _fetch_export("angemeldet", [])})
+
+    assert to_json_patch(diff_snapshots(old, new)) == [{"op": "remove", "path": "/events/4"}]
+
+
+def test_moodle_and_fetch_events_normalize_alike():
+    """Test that the full moodle.json records and fetch.json records give equal snapshots."""
+    event = {"id": "3", "title": "Abgabe", "start_time": "Montag", "course_name": None, "url": None}
+    moodle = {
+        "data": {
+            "upcoming_deadlines": [
+                {**event, "description": "Text", "course_id": "3", "event_type": "due"}
+            ],
+            "courses": [{"id": "10", "name": "Statistik", "url": None, "shortname": "STA"}],
+        }
+    }
+    fetch = {
+        "moodle": {"events": [event], "courses": [{"id": "10", "name": "Statistik", "url": None}]}
+    }
+
+    old = normalize_snapshot({"moodle.json": moodle})
+    new = normalize_snapshot({"fetch.json": fetch})
+
+    assert old["events"]["3"] == event
+    assert list(diff_snapshots(old, new)) == []
+
+
+def test_diff_adds_student_as_a_whole():
+    """Test that student data appearing for the first time is one applicable add."""
+    old = normalize_snapshot({"fetch.json": _fetch_export("angemeldet", [])})
+    export = _fetch_export("angemeldet", [])
+    export["graphql"]["student"] = {"vorname": "Max", "nachname": "Mustermann"}
+    new = normalize_snapshot({"fetch.json": export})
+
+    assert to_json_patch(diff_snapshots(old, new)) == [
+        {"op": "add", "path": "/student", "value": {"vorname": "Max", "nachname": "Mustermann"}}
+    ]
+    assert to_json_patch(diff_snapshots(new, old)) == [{"op": "remove", "path": "/student"}]
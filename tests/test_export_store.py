@@ -0,0 +1,95 @@
+"""Tests for the deduplicated export store."""
+
+import json
+
+from kolping_cockpit.export_store import ExportStore
+
+
+def _grade_export(status: str) -> dict:
+    return {
+        "export_timestamp": "2026-01-11T12:00:00+00:00",
+        "data": {
+            "grade_overview": {
+                "myStudentGradeOverview": {
+                    "grade": "1.7",
+                    "eCTS": 90,
+                    "modules": [
+                        {"modulId": 1, "modulbezeichnung": "Mathe", "examStatus": "bestanden"},
+                        {"modulId": 2, "modulbezeichnung": "BWL", "examStatus": status},
+                    ],
+                }
+            }
+        },
+    }
+
+
+def test_commit_and_read_roundtrip(tmp_path):
+    """Test that committed data is restored unchanged."""
+    store = ExportStore(tmp_path / ".store")
+    data = _grade_export("angemeldet")
+
+    store.commit({"graphql.json": data}, date="2026-01-11")
+
+    assert store.read("2026-01-11", "graphql.json") == data
+    assert [s.date for s in store.snapshots()] == ["2026-01-11"]
+
+
+def test_unchanged_records_are_shared(tmp_path):
+    """Test that a second snapshot only stores changed chunks."""
+    store = ExportStore(tmp_path / ".store")
+
+    first = store.commit({"graphql.json": _grade_export("angemeldet")}, date="2026-01-11")
+    second = store.commit({"graphql.json": _grade_export("bestanden")}, date="2026-01-12")
+
+    assert first.new_chunks == first.total_chunks
+    # Only the changed module and its parents are new, "Mathe" is shared
+    assert second.new_chunks < second.total_chunks
+    assert store.read("2026-01-11", "graphql.json") == _grade_export("angemeldet")
+    assert store.read("2026-01-12", "graphql.json") == _grade_export("bestanden")
+
+
+def test_chunk_cache_is_bounded(tmp_path):
+    """Test that only the most recently used chunks stay in memory."""
+    store = ExportStore(tmp_path / ".store", chunk_cache_size=2)
+    store.commit({"graphql.json": _grade_export("angemeldet")}, date="2026-01-11")
+
+    assert len(store._chunk_cache) == 2
+    assert store.read("2026-01-11", "graphql.json") == _grade_export("angemeldet")
+    assert len(store._chunk_cache) == 2
+
+
+def test_commit_same_day_keeps_other_files(tmp_path):
+    """Test that committing one file keeps the other files of the day."""
+    store = ExportStore(tmp_path / ".store")
+
+    store.commit({"graphql.json": {"a": 1}}, date="2026-01-11")
+    store.commit({"moodle.json": {"b": 2}}, date="2026-01-11")
+
+    assert set(store.load("2026-01-11")) == {"graphql.json", "moodle.json"}
+
+
+def test_checkout_writes_json_files(tmp_path):
+    """Test that checkout restores plain JSON files."""
+    store = ExportStore(tmp_path / ".store")
+    data = _grade_export("angemeldet")
+    store.commit({"graphql.json": data}, date="2026-01-11")
+
+    written = store.checkout("2026-01-11", tmp_path / "out")
+
+    assert written == [tmp_path / "out" / "graphql.json"]
+    assert json.loads(written[0].read_text(encoding="utf-8")) == data
+
+
+def test_gc_removes_unreferenced_chunks(tmp_path):
+    """Test that gc keeps shared chunks and removes orphaned ones."""
+    store = ExportStore(tmp_path / ".store")
+    store.commit({"graphql.json": _grade_export("angemeldet")}, date="2026-01-11")
+    store.commit({"graphql.json": _grade_export("bestanden")}, date="2026-01-12")
+
+    store.delete_snapshot("2026-01-11")
+    result = store.gc()
+
+    assert result.removed > 0
+    fresh = ExportStore(tmp_path / ".store")
+    assert fresh.read("2026-01-12", "graphql.json") == _grade_export("bestanden")
+    assert fresh.gc(dry_run=True).removed == 0
@@ -0,0 +1,113 @@
+"""Tests for the streaming HAR reader."""
+
+import base64
+import gzip
+import json
+
+import pytest
+
+from kolping_cockpit import har
+from kolping_cockpit.captures import CaptureIndex
+from kolping_cockpit.har import HarError, iter_har_entries
+
+CALENDAR_HTML = (
+    '<div class="event" data-region="event-item">'
+    '<a data-event-id="7" href="https://portal/calendar/view.php?time=1767225600">Klausur</a>'
+    '<div class="date">Morgen</div></div>'
+)
+
+
+def _entry(url: str, mime: str, content: dict, headers: list | None = None) -> dict:
+    return {
+        "request": {"method": "POST", "url": url, "headers": headers or []},
+        "response": {
+            "status": 200,
+            "headers": [{"name": "Content-Encoding", "value": "gzip"}],
+            "content": {"mimeType": mime, **content},
+        },
+    }
+
+
+def _write_har(path) -> None:
+    graphql_body = json.dumps({"data": {"myStudentGradeOverview": {"grade": "1.7"}}})
+    html_body = base64.b64encode(gzip.compress(CALENDAR_HTML.encode())).decode()
+    entries = [
+        _entry(
+            "https://app-kolping-prod-gateway.azurewebsites.net/graphql",
+            "application/json; charset=utf-8",
+            {"text": graphql_body},
+            [{"name": "Authorization", "value": "Bearer aaa.bbb.ccc"}],
+        ),
+        _entry(
+            "https://portal/calendar/view.php",
+            "text/html",
+            {"text": html_body, "encoding": "base64"},
+        ),
+        _entry("https://portal/theme/image.png", "image/png", {}),
+    ]
+    har_doc = {"log": {"version": "1.2", "pages": [{"id": "page_1"}], "entries": entries}}
+    path.write_text(json.dumps(har_doc, indent=1))
+
+
+def test_entries_are_streamed_and_bodies_decoded(tmp_path, monkeypatch):
+    """Test entry parsing across chunk boundaries and on-demand body decoding."""
+    monkeypatch.setattr(har, "CHUNK_SIZE", 16)
+    path = tmp_path / "portal.har"
+    _write_har(path)
+
+    entries = list(iter_har_entries(path))
+
+    assert [e.mime_type for e in entries] == ["application/json", "text/html", "image/png"]
+    assert entries[0].is_graphql
+    assert entries[0].authorization == "Bearer aaa.bbb.ccc"
+    assert entries[1].is_html
+    assert entries[1].body() == CALENDAR_HTML.encode()
+    assert entries[2].body() == b""
+
+
+def test_large_entries_are_decoded_in_few_attempts(tmp_path, monkeypatch):
+    """Test that an entry spanning many chunks is not re-decoded for each chunk."""
+    monkeypatch.setattr(har, "CHUNK_SIZE", 64)
+    path = tmp_path / "large.har"
+    body = "x" * 64_000
+    entry = _entry("https://portal/my/", "text/html", {"text": body})
+    path.write_text(json.dumps({"log": {"entries": [entry, entry]}}))
+
+    attempts = 0
+    raw_decode = json.JSONDecoder.raw_decode
+
+    def counting(self, s, idx=0):
+        nonlocal attempts
+        attempts += 1
+        return raw_decode(self, s, idx)
+
+    monkeypatch.setattr(json.JSONDecoder, "raw_decode", counting)
+    entries = list(iter_har_entries(path))
+
+    assert [e.body() for e in entries] == [body.encode(), body.encode()]
+    # About 1000 chunks per entry, but only a logarithmic number of attempts
+    assert attempts < 40
+
+
+def test_malformed_har_raises(tmp_path):
+    """Test that truncated files and non-HAR JSON are reported."""
+    path = tmp_path / "broken.har"
+    path.write_text('{"log": {"entries": [{"request": {}}, {"request": ')
+    with pytest.raises(HarError):
+        list(iter_har_entries(path))
+
+    path.write_text('{"data": []}')
+    with pytest.raises(HarError):
+        list(iter_har_entries(path))
+
+
+def test_capture_index_reads_har_files(tmp_path):
+    """Test that GraphQL responses and calendar pages of a HAR reach the analysis."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write_har(docs / "session.har")
+
+    data = CaptureIndex(None).scan(docs)
+
+    assert data.grade == {"grade": "1.7"}
+    assert [e["title"] for e in data.events] == ["Klausur"]
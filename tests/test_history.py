@@ -0,0 +1,125 @@
+"""Tests for the grade history time series."""
+
+import json
+
+from kolping_cockpit.export_store import ExportStore
+from kolping_cockpit.history import GradeHistory
+
+
+def _overview(status: str | None, note: str | None = None) -> dict:
+    return {
+        "grade": "2.0",
+        "eCTS": 35,
+        "currentSemester": "3. Semester",
+        "modules": [
+            {
+                "modulId": 1,
+                "modulbezeichnung": "Mathematik",
+                "semester": 1,
+                "eCTS": 5,
+                "examStatus": "bestanden",
+                "note": "1.7",
+            },
+            {
+                "modulId": 2,
+                "modulbezeichnung": "Statistik",
+                "semester": 2,
+                "eCTS": 5,
+                "examStatus": status,
+                "note": note,
+            },
+        ],
+    }
+
+
+def test_record_is_idempotent():
+    """Test that recording the same timestamp twice adds no rows."""
+    with GradeHistory(":memory:") as history:
+        assert history.record(_overview(None), "2026-01-01T00:00:00+00:00") == 2
+        assert history.record(_overview(None), "2026-01-01T00:00:00+00:00") == 0
+
+
+def test_module_changes_only_reports_transitions():
+    """Test that unchanged observations are collapsed."""
+    with GradeHistory(":memory:") as history:
+        history.record(_overview(None), "2026-01-01T00:00:00+00:00")
+        history.record(_overview("angemeldet"), "2026-01-05T00:00:00+00:00")
+        history.record(_overview("angemeldet"), "2026-01-06T00:00:00+00:00")
+        history.record(_overview("bestanden", "2.3"), "2026-02-01T00:00:00+00:00")
+
+        changes = list(history.module_changes("2"))
+
+    assert [(c.ts[:10], c.exam_status) for c in changes] == [
+        ("2026-01-01", None),
+        ("2026-01-05", "angemeldet"),
+        ("2026-02-01", "bestanden"),
+    ]
+    assert changes[-1].previous_status == "angemeldet"
+    assert changes[-1].note == "2.3"
+
+
+def test_module_changes_time_range():
+    """Test that range filters keep the previous value for comparison."""
+    with GradeHistory(":memory:") as history:
+        history.record(_overview("angemeldet"), "2026-01-05T00:00:00+00:00")
+        history.record(_overview("angemeldet"), "2026-01-12T00:00:00+00:00")
+        history.record(_overview("bestanden", "2.3"), "2026-02-01T00:00:00+00:00")
+
+        changes = list(history.module_changes("2", since="2026-01-10"))
+        all_changes = list(history.module_changes(since="2026-01-10"))
+        first_seen = list(history.module_changes(until="2026-01-10"))
+
+    assert len(changes) == 1
+    assert changes[0].previous_status == "angemeldet"
+    assert [(c.modul_id, c.ts[:10]) for c in all_changes] == [("2", "2026-02-01")]
+    assert [(c.modul_id, c.previous_status) for c in first_seen] == [("1", None), ("2", None)]
+
+
+def test_find_modules_escapes_wildcards():
+    """Test that % and _ in a search term match literally."""
+    with GradeHistory(":memory:") as history:
+        history.record(_overview(None), "2026-01-01T00:00:00+00:00")
+
+        assert history.find_modules("%") == []
+        assert history.find_modules("_tatistik") == []
+        assert history.find_modules("statistik") == [("2", "Statistik")]
+
+
+def test_ects_by_semester():
+    """Test that passed ECTS are summed per semester and observation."""
+    with GradeHistory(":memory:") as history:
+        history.record(_overview("angemeldet"), "2026-01-05T00:00:00+00:00")
+        history.record(_overview("bestanden", "2.3"), "2026-02-01T00:00:00+00:00")
+
+        rows = history.ects_by_semester()
+
+    assert rows == [
+        ("2026-01-05T00:00:00+00:00", 1, 5.0),
+        ("2026-02-01T00:00:00+00:00", 1, 5.0),
+        ("2026-02-01T00:00:00+00:00", 2, 5.0),
+    ]
+
+
+def test_backfill_from_exports_and_store(tmp_path):
+    """Test backfilling from legacy export folders and store snapshots."""
+    export_dir = tmp_path / "exports"
+    legacy = export_dir / "2026-01-05"
+    legacy.mkdir(parents=True)
+    graphql_export = {
+        "export_timestamp": "2026-01-05T08:00:00+00:00",
+        "data": {"grade_overview": {"myStudentGradeOverview": _overview("angemeldet")}},
+    }
+    (legacy / "graphql.json").write_text(json.dumps(graphql_export), encoding="utf-8")
+
+    fetch_export = {
+        "fetch_timestamp": "2026-02-01T08:00:00+00:00",
+        "graphql": {"gradeOverview": _overview("bestanden", "2.3")},
+    }
+    ExportStore(export_dir / ".store").commit({"fetch.json": fetch_export}, date="2026-02-01")
+
+    with GradeHistory(tmp_path / "history.sqlite3") as history:
+        assert history.backfill(export_dir) == 4
+        assert history.backfill(export_dir) == 0
+        statuses = [c.exam_status for c in history.module_changes("2")]
+
+    assert statuses == ["angemeldet", "bestanden"]
@@ -0,0 +1,72 @@
+"""Tests for CLI startup cost (lazy command loading)."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import kolping_cockpit
+from kolping_cockpit.cli import COMMANDS, app
+
+# Dependencies that only individual commands need
+HEAVY_MODULES = ("httpx", "bs4", "lxml", "playwright", "keyring", "pydantic_settings", "pydantic")
+
+# Cumulative import time of kolping_cockpit.cli in microseconds (measured ~50ms)
+CLI_IMPORT_BUDGET_US = 250_000
+
+
+def _run_cli(*args: str) -> dict[str, int]:
+    """Run the console entry point with -X importtime.
+
+    Returns:
+        Mapping of imported module name to cumulative import time (us)
+    """
+    src = str(Path(kolping_cockpit.__file__).parent.parent)
+    env = {**os.environ, "PYTHONPATH": src + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    code = f"import sys; sys.argv = ['kolping', *{list(args)!r}]; "
+    code += "from kolping_cockpit.__main__ import main; main()"
+    result = subprocess.run(  # noqa: S603 - fixed argv, own interpreter
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_help_does_not_import_heavy_modules():
+    """Test that 'kolping --help' only loads Typer and Rich."""
+    modules = _run_cli("--help")
+    loaded = {name.split(".")[0] for name in modules}
+    assert not loaded & set(HEAVY_MODULES)
+    assert not any(name.startswith("kolping_cockpit.commands.") for name in modules)
+    assert modules["kolping_cockpit.cli"] < CLI_IMPORT_BUDGET_US
+
+
+def test_version_fast_path_skips_typer():
+    """Test that 'kolping version' is answered without importing the CLI."""
+    modules = _run_cli("version")
+    assert "typer" not in modules
+    assert "kolping_cockpit.cli" not in modules
+
+
+@pytest.mark.parametrize("name", list(COMMANDS))
+def test_registered_commands_load(name):
+    """Test that every registry entry resolves to a command with matching help."""
+    import typer
+
+    group = typer.main.get_command(app)
+    command = group.load_command(name)
+    assert command.name == name
+    assert command.get_short_help_str(limit=200) == COMMANDS[name].help
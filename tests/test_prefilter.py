@@ -0,0 +1,76 @@
+"""Tests for the HTML prefilter."""
+
+import bs4
+
+from kolping_cockpit import prefilter
+from kolping_cockpit.moodle_client import KolpingMoodleClient
+from kolping_cockpit.prefilter import (
+    EVENT_MARKERS,
+    contains_any,
+    event_strainer,
+    open_bytes,
+    parse_filtered,
+)
+
+PAGE = """
+<html><body>
+<nav><a href="/course/view.php?id=1">Statistik</a></nav>
+<div class="event" data-region="event-item">
+  <a data-event-id="42" href="https://portal/mod/assign/view.php?id=7">Abgabe Statistik</a>
+  <div class="date">Dienstag, 13. Januar, 18:00 » 19:30</div>
+</div>
+</body></html>
+"""
+
+
+def test_parse_filtered_builds_only_matching_subtrees():
+    """Test that pages without markers are skipped and others are strained."""
+    assert parse_filtered("<html><p>Dashboard</p></html>", EVENT_MARKERS, event_strainer()) is None
+
+    soup = parse_filtered(PAGE, EVENT_MARKERS, event_strainer())
+    assert soup.find("nav") is None
+    assert soup.find("div", class_="date").get_text(strip=True).startswith("Dienstag")
+
+    client = KolpingMoodleClient(session_cookie="x")
+    events = client._extract_events(client._event_soup(PAGE))
+    assert [(e.id, e.title) for e in events] == [("42", "Abgabe Statistik")]
+    assert events[0].start_time == "Dienstag, 13. Januar, 18:00 → 19:30"
+
+
+def test_fallback_search_sees_the_whole_page():
+    """Test that marked blocks without the event class do not hide other events."""
+    page = """
+    <html><body>
+    <div data-region="event-item"><span>Keine Termine</span></div>
+    <ul><li class="deadline"><a href="/mod/assign/view.php?id=9">Hausarbeit Recht</a></li></ul>
+    </body></html>
+    """
+    client = KolpingMoodleClient(session_cookie="x")
+    events = client._extract_events(client._event_soup(page))
+
+    assert [(e.id, e.title) for e in events] == [("9", "Hausarbeit Recht")]
+
+
+def test_large_files_are_memory_mapped(tmp_path, monkeypatch):
+    """Test marker search and parsing on a memory-mapped capture."""
+    monkeypatch.setattr(prefilter, "MMAP_THRESHOLD", 64)
+    parsed: list[str] = []
+    soup_class = bs4.BeautifulSoup
+
+    def recording_soup(markup, *args, **kwargs):
+        parsed.append(markup)
+        return soup_class(markup, *args, **kwargs)
+
+    monkeypatch.setattr(bs4, "BeautifulSoup", recording_soup)
+    path = tmp_path / "calendar.html"
+    path.write_text("<!-- padding -->" * 100 + PAGE, encoding="utf-8")
+
+    with open_bytes(path) as content:
+        assert not isinstance(content, bytes)
+        assert contains_any(content, EVENT_MARKERS)
+        assert not contains_any(content, ['data-region="timeline"'])
+        soup = parse_filtered(content, EVENT_MARKERS, event_strainer())
+        assert soup.find("a", attrs={"data-event-id": "42"}) is not None
+
+    # Only the text from the first marked tag on is decoded and parsed
+    assert parsed[0].startswith('<div class="event" data-region="event-item">')
@@ -0,0 +1,158 @@
+"""Tests for the caching GraphQL proxy."""
+
+import base64
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from kolping_cockpit.proxy import (
+    GraphQLProxy,
+    create_proxy_server,
+    is_mutation,
+    normalize_query,
+    token_subject,
+)
+
+
+def _jwt(claims: dict) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJub25lIn0.{payload}.sig"
+
+
+class _StandInGateway(BaseHTTPRequestHandler):
+    """Upstream stand-in answering every query with a counter."""
+
+    requests: list = []
+
+    def do_POST(self):  # noqa: N802
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.requests.append((json.loads(body), self.headers.get("Authorization")))
+        time.sleep(0.05)
+        data = json.dumps({"data": {"count": len(self.requests)}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def proxy_client():
+    """Proxy server in front of a stand-in gateway."""
+    handler = type("Gateway", (_StandInGateway,), {"requests": []})
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+
+    graphql_proxy = GraphQLProxy(f"http://127.0.0.1:{upstream.server_address[1]}/graphql", ttl=60)
+    server = create_proxy_server(graphql_proxy, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with httpx.Client(base_url=f"http://127.0.0.1:{server.server_address[1]}") as client:
+        yield client, handler.requests
+    for s in (server, upstream):
+        s.shutdown()
+        s.server_close()
+    graphql_proxy.close()
+
+
+def test_normalize_query_ignores_formatting():
+    """Test that whitespace, commas and comments do not change the document."""
+    a = """
+        # grade overview
+        query getOverview($id: ID!, $all: Boolean) {
+            overview(id: $id) { grade, eCTS }
+        }
+    """
+    b = "query getOverview($id:ID!$all:Boolean){overview(id:$id){grade eCTS}}"
+
+    assert normalize_query(a) == normalize_query(b) == b
+    assert normalize_query('{ a(s: "x  ,  y") }') == '{a(s:"x  ,  y")}'
+
+
+def test_is_mutation_checks_every_operation():
+    """Test mutation detection behind fragments and with operationName."""
+    assert is_mutation("mutation { x }")
+    assert is_mutation("fragment F on X { a } mutation M { ...F }")
+    assert is_mutation("query A { a } mutation B { b }", "B")
+    assert is_mutation("query A { a } mutation B { b }")
+    assert not is_mutation("query A { a } mutation B { b }", "A")
+    assert not is_mutation('query Q($f: In = {a: 1}) @live { a(s: "mutation {") }')
+    assert not is_mutation("{ me { id } }")
+
+
+def test_token_subject_partitions_by_token():
+    """Test that each token gets its own partition, even with a forged equal subject."""
+    first = _jwt({"oid": "user-1", "exp": 1})
+    forged = _jwt({"oid": "user-1", "exp": 2})
+
+    assert token_subject(f"Bearer {first}").startswith("user-1:")
+    assert token_subject(f"Bearer {first}") == token_subject(f"Bearer {first}")
+    assert token_subject(f"Bearer {first}") != token_subject(f"Bearer {forged}")
+    assert token_subject(None) == "anonymous"
+    assert token_subject("Bearer opaque").startswith("token:")
+
+
+def test_repeated_query_is_served_from_cache(proxy_client):
+    """Test hits, per-subject partitioning and mutation bypass."""
+    client, upstream_requests = proxy_client
+    alice = {"Authorization": f"Bearer {_jwt({'oid': 'alice'})}"}
+    bob = {"Authorization": f"Bearer {_jwt({'oid': 'bob'})}"}
+
+    first = client.post("/graphql", json={"query": "{ me { id } }"}, headers=alice)
+    second = client.post("/graphql", json={"query": "{me{id}}"}, headers=alice)
+    other = client.post("/graphql", json={"query": "{ me { id } }"}, headers=bob)
+    mutation = client.post("/graphql", json={"query": "mutation { x }"}, headers=alice)
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert other.headers["X-Cache"] == "MISS"
+    assert mutation.headers["X-Cache"] == "BYPASS"
+    assert upstream_requests[0][1] == alice["Authorization"]
+    assert len(upstream_requests) == 3
+
+    stats = client.get("/_proxy/stats").json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["bypassed"] == 1
+
+
+def test_concurrent_identical_requests_are_collapsed(proxy_client):
+    """Test that identical in-flight queries reach the upstream once."""
+    client, upstream_requests = proxy_client
+    results = []
+
+    def query():
+        results.append(client.post("/graphql", json={"query": "{ slow }"}).json())
+
+    threads = [threading.Thread(target=query) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(upstream_requests) == 1
+    assert results == [{"data": {"count": 1}}] * 6
+
+
+@pytest.mark.parametrize("bind", ["127.0.0.1", "0.0.0.0"])  # noqa: S104
+def test_proxy_refuses_itself_as_upstream(bind):
+    """Test that an upstream at the proxy's own address does not start a forwarding loop."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    graphql_proxy = GraphQLProxy(f"http://localhost:{port}/graphql")
+    try:
+        with pytest.raises(ValueError, match="proxy itself"):
+            create_proxy_server(graphql_proxy, bind, port)
+        create_proxy_server(graphql_proxy, bind, 0).server_close()
+    finally:
+        graphql_proxy.close()
@@ -0,0 +1,97 @@
+"""Tests for the output renderers."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from rich.console import Console
+from typer.testing import CliRunner
+
+from kolping_cockpit.cli import app
+from kolping_cockpit.render import Column, Renderer, create_renderer
+
+runner = CliRunner()
+
+COLUMNS = [Column("name", "Modul"), Column("semester", "Sem.")]
+
+
+def test_ndjson_streams_rows_as_they_are_produced():
+    """Test that each row is written before the next one is produced."""
+    lines: list[str] = []
+    out = create_renderer("ndjson", Console(), write=lines.append)
+
+    def rows():
+        for i in range(3):
+            assert len(lines) == i
+            yield {"name": f"Modul {i}", "semester": i, "modulId": i}
+
+    assert out.table("open", "Offen", COLUMNS, rows()) == 3
+    out.fields("overview", [("grade", "Note", "1.7")])
+    out.close()
+
+    assert json.loads(lines[0]) == {
+        "section": "open",
+        "name": "Modul 0",
+        "semester": 0,
+        "modulId": 0,
+    }
+    assert json.loads(lines[-1]) == {"section": "overview", "grade": "1.7"}
+
+
+def test_plain_and_json_output():
+    """Test tab-separated plain lines and the single JSON document."""
+    lines: list[str] = []
+    plain = create_renderer("plain", Console(), write=lines.append)
+    plain.table("open", "Offen", COLUMNS, [{"name": "Recht\tund Ethik", "semester": None}])
+    plain.summary("summary", "Zusammenfassung", {"offen": 1}, "[dim]Offen: 1[/dim]")
+    assert lines == ["open\tRecht und Ethik\t", "summary\toffen\t1"]
+
+    lines.clear()
+    document = create_renderer("json", Console(), write=lines.append)
+    document.print("[bold]Rich only[/bold]")
+    document.table("failed", "Nicht bestanden", COLUMNS, [])
+    document.fields("overview", [("eCTS", "ECTS", 60)])
+    document.close()
+    assert json.loads(lines[0]) == {"failed": [], "overview": {"eCTS": 60}}
+
+
+def test_stderr_console_is_created_on_first_message():
+    """Test that the base class is abstract and messages need no console up front."""
+    with pytest.raises(TypeError):
+        Renderer(Console())  # type: ignore[abstract]
+
+    plain = create_renderer("plain", Console(), write=lambda line: None)
+    assert plain._messages is None
+    plain.message("[yellow]Hinweis[/yellow]")
+    assert plain._messages is not None
+
+
+@patch("kolping_cockpit.commands.deadlines._fetch_deadline_data")
+def test_deadlines_json_output_is_machine_readable(mock_fetch):
+    """Test that --format json prints only the JSON document to stdout."""
+    mock_fetch.return_value = {
+        "fetch_timestamp": "2026-01-11T12:00:00+00:00",
+        "graphql": {
+            "gradeOverview": {
+                "grade": "1.7",
+                "modules": [
+                    {
+                        "modulId": 2,
+                        "modulbezeichnung": "Statistik",
+                        "examStatus": "angemeldet",
+                        "semester": 1,
+                    }
+                ],
+            }
+        },
+        "moodle": {},
+        "errors": ["Moodle: Keine Session konfiguriert"],
+    }
+
+    result = runner.invoke(app, ["deadlines", "--format", "json"])
+
+    assert result.exit_code == 0
+    document = json.loads(result.stdout)
+    assert [m["modulbezeichnung"] for m in document["registered"]] == ["Statistik"]
+    assert document["summary"]["angemeldet"] == 1
+    assert "Keine Session" in result.stderr
@@ -0,0 +1,136 @@
+"""Tests for the secret store."""
+
+import json
+import stat
+import threading
+
+import pytest
+
+from kolping_cockpit.settings import SecretStore
+
+
+class FakeKeyring:
+    """Keyring backend counting lookups."""
+
+    def __init__(self):
+        self.passwords = {("kolping-cockpit", "moodle_session"): "cookie"}
+        self.lookups = 0
+
+    def get_password(self, service, key):
+        self.lookups += 1
+        return self.passwords.get((service, key))
+
+    def set_password(self, service, key, value):
+        self.passwords[(service, key)] = value
+
+    def delete_password(self, service, key):
+        del self.passwords[(service, key)]
+
+
+def test_keyring_lookups_are_memoized_until_invalidated(monkeypatch):
+    """Test that hits and misses reach the keyring once per key."""
+    monkeypatch.delenv("KOLPING_MOODLE_SESSION", raising=False)
+    monkeypatch.delenv("KOLPING_GRAPHQL_BEARER_TOKEN", raising=False)
+    backend = FakeKeyring()
+    store = SecretStore()
+    store._backend = backend
+
+    for _ in range(3):
+        assert store.get("moodle_session") == "cookie"
+        assert store.get("graphql_bearer_token") is None
+    assert backend.lookups == 2
+
+    backend.passwords[("kolping-cockpit", "moodle_session")] = "changed elsewhere"
+    assert store.get("moodle_session") == "cookie"
+    store.invalidate("moodle_session")
+    assert store.get("moodle_session") == "changed elsewhere"
+    assert backend.lookups == 3
+
+    assert store.set("graphql_bearer_token", "token")
+    assert store.get("graphql_bearer_token") == "token"
+    assert store.delete("graphql_bearer_token")
+    assert store.get("graphql_bearer_token") is None
+    assert backend.lookups == 3
+
+    monkeypatch.setenv("KOLPING_MOODLE_SESSION", "from-env")
+    assert store.get("moodle_session") == "from-env"
+
+
+def test_secrets_file_is_read_once_and_written_in_batches(tmp_path, monkeypatch):
+    """Test file fallback: lookup order, single read and one atomic batched write."""
+    monkeypatch.delenv("KOLPING_MOODLE_SESSION", raising=False)
+    monkeypatch.delenv("KOLPING_GRAPHQL_BEARER_TOKEN", raising=False)
+    project = tmp_path / ".secrets.json"
+    home = tmp_path / "home" / "secrets.json"
+    home.parent.mkdir()
+    home.write_text(json.dumps({"moodle_session": "home", "username": "student"}))
+    store = SecretStore(locations=[project, home])
+    store._backend = False
+
+    assert store.get("moodle_session") == "home"
+    home.write_text("{}")  # not read again
+    assert store.get("username") == "student"
+
+    with store.batch():
+        assert store.set("moodle_session", "new")
+        assert store.set("graphql_bearer_token", "token")
+        assert home.read_text() == "{}"
+    assert json.loads(home.read_text()) == {
+        "moodle_session": "new",
+        "username": "student",
+        "graphql_bearer_token": "token",
+    }
+    assert stat.S_IMODE(home.stat().st_mode) == 0o600
+    assert not project.exists()
+
+    fresh = SecretStore(locations=[project, home])
+    fresh._backend = False
+    assert fresh.get("graphql_bearer_token") == "token"
+    assert fresh.delete("username")
+    assert fresh.get("username") is None
+
+
+def test_batch_does_not_block_other_threads_or_clobber_unreadable_files(tmp_path, monkeypatch):
+    """Test that other threads write during a batch and failed flushes are raised."""
+    monkeypatch.delenv("KOLPING_MOODLE_SESSION", raising=False)
+    monkeypatch.delenv("KOLPING_USERNAME", raising=False)
+    secrets_file = tmp_path / ".secrets.json"
+    store = SecretStore(locations=[secrets_file])
+    store._backend = False
+
+    with store.batch():
+        store.set("moodle_session", "batched")
+        other = threading.Thread(target=store.set, args=("username", "student"))
+        other.start()
+        other.join(timeout=5)
+        assert not other.is_alive()
+        assert json.loads(secrets_file.read_text()) == {
+            "moodle_session": "batched",
+            "username": "student",
+        }
+
+    secrets_file.write_text("{not json")
+    store.invalidate()
+    with pytest.raises(OSError), store.batch():
+        assert store.set("moodle_session", "new")
+    assert not store.set("moodle_session", "new")
+    assert secrets_file.read_text() == "{not json"
+
+
+def test_invalidate_keeps_pending_batch_writes(tmp_path, monkeypatch):
+    """Test that invalidating during a batch neither drops its write nor skips the reload."""
+    monkeypatch.delenv("KOLPING_GRAPHQL_BEARER_TOKEN", raising=False)
+    monkeypatch.delenv("KOLPING_USERNAME", raising=False)
+    secrets_file = tmp_path / ".secrets.json"
+    secrets_file.write_text("{}")
+    store = SecretStore(locations=[secrets_file])
+    store._backend = False
+
+    with store.batch():
+        assert store.set("graphql_bearer_token", "NEW")
+        store.invalidate()
+        assert store.get("graphql_bearer_token") == "NEW"
+    assert json.loads(secrets_file.read_text()) == {"graphql_bearer_token": "NEW"}
+
+    secrets_file.write_text(json.dumps({"username": "changed elsewhere"}))
+    assert store.get("username") == "changed elsewhere"
@@ -0,0 +1,132 @@
+"""Tests for the local snapshot API server."""
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from kolping_cockpit.export_store import ExportStore
+from kolping_cockpit.server import SingleFlight, SnapshotApi, accepts_gzip, create_server
+
+
+def _fetch_export(grade: str) -> dict:
+    return {
+        "fetch_timestamp": "2026-01-11T12:00:00+00:00",
+        "graphql": {
+            "gradeOverview": {
+                "grade": grade,
+                "eCTS": 90,
+                "modules": [
+                    {"modulId": i, "modulbezeichnung": f"Modul {i}", "semester": i % 6 + 1}
+                    for i in range(40)
+                ],
+            }
+        },
+        "moodle": {"courses": [{"id": "10", "name": "Statistik"}]},
+    }
+
+
+@pytest.fixture
+def api(tmp_path):
+    """Running API server over an export dir with one snapshot."""
+    store = ExportStore(tmp_path / ".store")
+    store.commit({"fetch.json": _fetch_export("1.7")}, date="2026-01-11")
+    server = create_server(tmp_path, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    with httpx.Client(base_url=f"http://{host}:{port}") as client:
+        yield client, store
+    server.shutdown()
+    server.server_close()
+
+
+def test_collections_and_projection(api):
+    """Test collection listing, single records and field projection."""
+    client, _ = api
+
+    modules = client.get("/api/modules", params={"fields": "modulId,semester"}).json()
+    assert len(modules) == 40
+    assert modules[1] == {"modulId": 1, "semester": 2}
+
+    assert client.get("/api/courses/10").json() == {"id": "10", "name": "Statistik"}
+    assert client.get("/api/courses/99").status_code == 404
+    assert client.get("/api/meta").json()["counts"]["modules"] == 40
+
+
+def test_etag_and_if_none_match(api):
+    """Test that an unchanged resource is answered with 304."""
+    client, store = api
+
+    first = client.get("/api/overview")
+    etag = first.headers["ETag"]
+    assert first.json()["grade"] == "1.7"
+
+    again = client.get("/api/overview", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    # A new snapshot changes the representation and the ETag
+    store.commit({"fetch.json": _fetch_export("1.3")}, date="2026-01-12")
+    changed = client.get("/api/overview", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["grade"] == "1.3"
+    assert changed.headers["ETag"] != etag
+
+
+def test_gzip_encoding(api):
+    """Test that large responses are compressed with their own ETag."""
+    client, _ = api
+
+    plain = client.get("/api/modules", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/modules", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.json() == plain.json()
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+    assert int(compressed.headers["Content-Length"]) < len(plain.content)
+
+    refused = client.get("/api/modules", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "Content-Encoding" not in refused.headers
+
+
+def test_accept_encoding_quality_values():
+    """Test that gzip is used only with a positive q-value for gzip or the wildcard."""
+    assert accepts_gzip("deflate, gzip;q=0.5")
+    assert accepts_gzip("br, *")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("gzip; q=0.0, *")
+    assert not accepts_gzip("x-gzip, identity")
+    assert not accepts_gzip("*;q=0")
+    assert not accepts_gzip(None)
+
+
+def test_no_snapshot_returns_503(tmp_path):
+    """Test the error response of an empty export dir."""
+    response = SnapshotApi(tmp_path).get("/api/modules")
+    assert response.status == 503
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent callers of one key share a single run."""
+    flight = SingleFlight()
+    calls = []
+
+    def slow() -> int:
+        calls.append(1)
+        time.sleep(0.1)
+        return 42
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("key", slow))) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [42] * 8
+    assert len(calls) == 1
@@ -0,0 +1,124 @@
+"""Tests for the Moodle/GraphQL stand-in server and offline end-to-end runs."""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from kolping_cockpit.cli import app
+from kolping_cockpit.moodle_client import KolpingMoodleClient
+from kolping_cockpit.settings import get_settings
+from kolping_cockpit.standin import (
+    ID_OFFSET,
+    StandIn,
+    StandInConfig,
+    StandInData,
+    root_fields,
+    scale_json,
+)
+
+RECORDINGS = Path(__file__).parent / "fixtures" / "standin"
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    """Stand-in with the recorded fixtures, configured as Moodle and GraphQL endpoint."""
+
+    def start(config=None):
+        server = StandIn(StandInData.from_directory(RECORDINGS), config).start()
+        started.append(server)
+        monkeypatch.setenv("KOLPING_MOODLE_BASE_URL", server.url)
+        monkeypatch.setenv("KOLPING_GRAPHQL_ENDPOINT", server.graphql_endpoint)
+        monkeypatch.setenv("KOLPING_MOODLE_SESSION", "stand-in")
+        monkeypatch.setenv("KOLPING_GRAPHQL_BEARER_TOKEN", "stand-in")
+        get_settings.cache_clear()
+        return server
+
+    started: list[StandIn] = []
+    yield start
+    for server in started:
+        server.close()
+
+
+def test_root_fields_and_json_scaling():
+    """Test query routing by root field and ID-consistent scaling of lists."""
+    assert root_fields("query q { result: myStudentData { a b { c } } x(id: 1) { d } }") == [
+        ("result", "myStudentData"),
+        ("x", "x"),
+    ]
+    assert root_fields("{ __typename }") == [("__typename", "__typename")]
+
+    exams = [{"id": 3, "versuche": [{"id": 4}]}]
+    data = {
+        "modules": [{"modulId": 1, "pruefungsId": "7", "tags": ["a"], "exams": exams}],
+        "grade": 1.7,
+    }
+    scaled = scale_json(data, 3)
+    assert [m["modulId"] for m in scaled["modules"]] == [1, 1 + ID_OFFSET, 1 + 2 * ID_OFFSET]
+    assert scaled["modules"][1]["pruefungsId"] == str(7 + ID_OFFSET)
+    assert scaled["modules"][2]["tags"] == ["a"] and scaled["grade"] == 1.7
+    # Nested lists are copied with their module, not scaled again
+    assert scaled["modules"][0]["exams"] == exams
+    assert scaled["modules"][1]["exams"] == [
+        {"id": 3 + ID_OFFSET, "versuche": [{"id": 4 + ID_OFFSET}]}
+    ]
+
+
+def test_export_all_runs_offline_against_recordings(standin, tmp_path):
+    """Test that 'export all' parses the recorded GraphQL responses and Moodle pages."""
+    standin()
+
+    result = runner.invoke(app, ["export", "all", "--output-dir", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    graphql = json.loads((tmp_path / "graphql.json").read_text())
+    moodle = json.loads((tmp_path / "moodle.json").read_text())
+    assert graphql["data"]["student_data"]["myStudentData"]["vorname"] == "Max"
+    assert graphql["data"]["grade_overview"]["myStudentGradeOverview"]["eCTS"] == 15
+    assert moodle["session_valid"]
+    assert len(moodle["data"]["courses"]) == 5
+    assert len(moodle["data"]["assignments"]) == 3
+    assert len(moodle["data"]["upcoming_deadlines"]) == 3
+    assert moodle["data"]["dashboard"]["user_name"] == "Max Mustermann"
+
+
+def test_fetch_stores_snapshot_with_modules(standin):
+    """Test that 'fetch' commits a snapshot that normalizes to the fetched modules."""
+    from kolping_cockpit.snapshot import available_dates, load_snapshot
+
+    standin()
+
+    result = runner.invoke(app, ["fetch", "--format", "json"])
+
+    assert result.exit_code == 0, result.output
+    snapshot = load_snapshot(available_dates()[-1])
+    assert len(snapshot["modules"]) == 8
+    assert snapshot["modules"]["104"]["examStatus"] == "angemeldet"
+    assert len(snapshot["courses"]) == 5
+    assert snapshot["student"]["vorname"] == "Max"
+
+
+def test_scaling_latency_and_auth(standin):
+    """Test scaled pages, the configured delay and the responses without credentials."""
+    server = standin(StandInConfig(latency=0.05, scale=4))
+
+    with KolpingMoodleClient() as client:
+        courses = client.get_courses()
+        events = client.get_calendar_events()
+    assert len(courses) == 20 and len({c.id for c in courses}) == 20
+    assert len(events) == 12
+
+    with httpx.Client(base_url=server.url) as client:
+        response = client.get("/my/")
+        assert response.status_code == 303
+        assert response.headers["location"] == "/login/index.php"
+        assert response.elapsed.total_seconds() >= 0.05
+        assert client.post("/graphql", json={"query": "{ moduls { id } }"}).status_code == 401
+        unknown = client.post(
+            "/graphql", json={"query": "{ nope }"}, headers={"Authorization": "Bearer x"}
+        ).json()
+        assert unknown["data"] is None and "nope" in unknown["errors"][0]["message"]
@@ -0,0 +1,93 @@
+"""Tests for stale-while-revalidate rendering."""
+
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from kolping_cockpit.cli import app
+from kolping_cockpit.snapshot import normalize_snapshot
+from kolping_cockpit.swr import LiveCache, changes, fetched_parts, load_cached, update_cache
+
+runner = CliRunner()
+
+
+def _export(timestamp: str, grade: str | None, events: list[dict] | None = None) -> dict:
+    data = {
+        "fetch_timestamp": timestamp,
+        "graphql": {
+            "gradeOverview": {
+                "grade": "1.7",
+                "modules": [
+                    {
+                        "modulId": 2,
+                        "modulbezeichnung": "Statistik",
+                        "examStatus": "angemeldet",
+                        "grade": grade,
+                        "semester": 1,
+                    }
+                ],
+            }
+        },
+        "moodle": {},
+        "errors": [],
+    }
+    if events is not None:
+        data["moodle"]["events"] = events
+    return data
+
+
+def test_update_cache_replaces_only_fetched_parts(tmp_path):
+    """Test that a partial refresh keeps the other parts of the last snapshot."""
+    cache = LiveCache(tmp_path / "live.json")
+    full = _export("2026-01-10T12:00:00+00:00", None, [{"id": "5", "title": "Abgabe"}])
+    base = normalize_snapshot({"fetch.json": full})
+
+    refresh = _export("2026-01-11T12:00:00+00:00", "1.3")
+    merged = update_cache(refresh, base, cache)
+
+    assert fetched_parts(refresh) == {"overview", "modules"}
+    assert merged["events"] == base["events"]
+    assert merged["modules"]["2"]["grade"] == "1.3"
+    assert cache.load_snapshot() == merged
+
+    events = changes(base, merged, fetched_parts(refresh))
+    assert [(e.type, e.new) for e in events] == [("grade", "1.3")]
+
+
+def test_load_cached_prefers_newer_source(tmp_path):
+    """Test that the newer of live cache and export store wins."""
+    from kolping_cockpit.export_store import ExportStore
+
+    cache = LiveCache(tmp_path / "live.json")
+    assert load_cached(tmp_path, cache) is None
+
+    ExportStore(tmp_path / ".store").commit(
+        {"fetch.json": _export("2026-01-10T12:00:00+00:00", None)}, "2026-01-10"
+    )
+    assert load_cached(tmp_path, cache)["modules"]["2"]["grade"] is None
+
+    update_cache(_export("2026-01-11T12:00:00+00:00", "1.3"), None, cache)
+    assert load_cached(tmp_path, cache)["modules"]["2"]["grade"] == "1.3"
+
+
+def test_deadlines_renders_cache_then_changes(isolated_export_dir):
+    """Test that cached data is shown first and the refresh delta follows."""
+    from kolping_cockpit.settings import get_settings
+
+    update_cache(
+        _export("2026-01-10T12:00:00+00:00", None, []),
+        None,
+        LiveCache(get_settings().get_live_cache_path()),
+    )
+
+    with patch(
+        "kolping_cockpit.commands.deadlines._fetch_deadline_data",
+        return_value=_export("2026-01-11T12:00:00+00:00", "1.3", []),
+    ):
+        result = runner.invoke(app, ["deadlines"])
+
+    assert result.exit_code == 0
+    assert "Aktualisierung läuft im Hintergrund" in result.stdout
+    assert "Statistik" in result.stdout
+    assert "Note: Statistik: – → 1.3" in result.stdout
+    assert LiveCache.from_settings().load_snapshot()["modules"]["2"]["grade"] == "1.3"
@@ -0,0 +1,58 @@
+"""Tests for the synthetic dataset generator."""
+
+from kolping_cockpit.graphql_client import KolpingGraphQLClient
+from kolping_cockpit.moodle_client import KolpingMoodleClient
+from kolping_cockpit.standin import StandIn
+from kolping_cockpit.synthetic import SyntheticConfig, generate_dataset
+
+
+def test_generated_datasets_are_seeded_and_consistent():
+    """Test reproducibility by seed and the joins between modules, exams and courses."""
+    config = SyntheticConfig(modules=300, seed=7)
+    dataset = generate_dataset(config)
+
+    assert generate_dataset(config) == dataset
+    assert generate_dataset(SyntheticConfig(modules=300, seed=8)) != dataset
+    assert len(dataset.modules) == 300
+    assert len({m["modulbezeichnung"] for m in dataset.modules}) == 300
+
+    modules = {m["modulId"]: m for m in dataset.modules}
+    assert dataset.exams
+    for exam in dataset.exams:
+        module = modules[exam["modulId"]]
+        assert module["examStatus"] in ("angemeldet", "nicht bestanden")
+        assert module["pruefungsId"] == exam["id"]
+    statuses = {m["examStatus"] for m in dataset.modules}
+    assert {"angemeldet", "bestanden", "nicht bestanden", None} <= statuses
+    names = {m["modulbezeichnung"] for m in dataset.modules}
+    assert all(c["name"] in names for c in dataset.courses)
+    assert len(dataset.events) == 2 * len(dataset.courses)
+    assert dataset.overview["currentSemester"] == "4. Semester"
+
+
+def test_standin_serves_generated_dataset():
+    """Test that the clients parse every generated record from a stand-in."""
+    dataset = generate_dataset(SyntheticConfig(modules=120, sections=5, seed=3))
+
+    with StandIn(dataset.standin_data()) as server:
+        with KolpingMoodleClient(session_cookie="stand-in") as moodle:
+            moodle.base_url = server.url
+            courses = moodle.get_courses()
+            events = moodle.get_calendar_events()
+            assignments = moodle.get_assignments()
+            grades = moodle.get_grades()
+            details = moodle.get_course_details(courses[0].id)
+            dashboard = moodle.get_dashboard()
+        with KolpingGraphQLClient(bearer_token="stand-in") as graphql:
+            graphql.endpoint = server.graphql_endpoint
+            overview = graphql.execute_named_query("myStudentGradeOverview")
+            exams = graphql.execute_named_query("pruefungs", simple=True)
+
+    assert [c.id for c in courses] == [c["id"] for c in dataset.courses]
+    assert [e.title for e in events] == [e["title"][:100] for e in dataset.events]
+    assert len(assignments) == len(dataset.assignments)
+    assert len(grades) == len(dataset.courses)
+    assert details["title"] == dataset.courses[0]["name"]
+    assert dashboard.user_name == "Max Mustermann"
+    assert len(overview.data["myStudentGradeOverview"]["modules"]) == 120
+    assert len(exams.data["pruefungs"]) == len(dataset.exams)
@@ -0,0 +1,77 @@
+"""Tests for the token scanner."""
+
+import base64
+import json
+import tarfile
+import zipfile
+
+from typer.testing import CliRunner
+
+from kolping_cockpit import tokens
+from kolping_cockpit.cli import app
+from kolping_cockpit.tokens import GRAPHQL_AUDIENCE, rank_tokens, scan_tokens
+
+NOW = 1_800_000_000
+
+
+def _jwt(**claims) -> str:
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    return f"{encode({'alg': 'RS256', 'typ': 'JWT'})}.{encode(claims)}.c2lnbmF0dXJl"
+
+
+GOOD = _jwt(aud=GRAPHQL_AUDIENCE, exp=NOW + 3600, oid="student")
+EXPIRED = _jwt(aud=GRAPHQL_AUDIENCE, exp=NOW - 60, oid="student")
+OTHER = _jwt(aud="https://graph.microsoft.com", exp=NOW + 7200)
+
+
+def _write_tree(root) -> None:
+    (root / "12").mkdir(parents=True)
+    (root / "12" / "request.txt").write_text(f"Authorization: Bearer {EXPIRED}\n")
+    (root / "nested" / "deep").mkdir(parents=True)
+    (root / "nested" / "deep" / "session.har").write_text(
+        json.dumps({"log": {"entries": [{"request": {"headers": [{"value": f"Bearer {OTHER}"}]}}]}})
+    )
+    (root / "notes.txt").write_text("eyJnot.eyJa.token and " + EXPIRED)
+
+    with zipfile.ZipFile(root / "captures.zip", "w") as archive:
+        archive.writestr("200/request.json", json.dumps({"authorization": f"Bearer {GOOD}"}))
+    with tarfile.open(root / "old.tar.gz", "w:gz") as archive:
+        archive.add(root / "12" / "request.txt", arcname="12/request.txt")
+
+
+def test_scan_finds_tokens_in_tree_and_archives(tmp_path, monkeypatch):
+    """Test that tokens are found anywhere, deduplicated and ranked."""
+    monkeypatch.setattr("kolping_cockpit.prefilter.MMAP_THRESHOLD", 64)
+    monkeypatch.setattr(tokens, "CHUNK_SIZE", 50)
+    _write_tree(tmp_path)
+
+    candidates = rank_tokens(scan_tokens(tmp_path, workers=2), now=NOW)
+
+    assert [c.token for c in candidates] == [GOOD, EXPIRED, OTHER]
+    assert candidates[0].sources == [f"{tmp_path / 'captures.zip'}:200/request.json"]
+    assert len(candidates[1].sources) == 3
+    assert candidates[1].is_expired(NOW)
+    assert not candidates[2].matches(GRAPHQL_AUDIENCE)
+    assert candidates[2].audience == "https://graph.microsoft.com"
+
+
+def test_extract_token_stores_best_candidate(tmp_path, monkeypatch):
+    """Test that extract-token offers the matching token for any path."""
+    _write_tree(tmp_path)
+    stored = {}
+    monkeypatch.setattr(
+        "kolping_cockpit.settings.store_secret",
+        lambda key, value: stored.setdefault(key, value) is not None,
+    )
+    monkeypatch.setattr(tokens.time, "time", lambda: NOW)
+
+    result = CliRunner().invoke(app, ["extract-token", str(tmp_path)], input="y\n")
+
+    assert result.exit_code == 0, result.output
+    assert "Gefundene Tokens: 3" in result.output
+    assert stored == {"graphql_bearer_token": GOOD}
+
+    missing = CliRunner().invoke(app, ["extract-token", str(tmp_path / "missing")])
+    assert missing.exit_code == 1
@@ -0,0 +1,149 @@
+"""Tests for the change watcher."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from kolping_cockpit.snapshot import normalize_snapshot
+from kolping_cockpit.watch import AdaptiveInterval, EventSink, Watcher, fetch_delta
+
+
+def _export(status: str, grade: str | None, events: list[dict]) -> dict:
+    return {
+        "fetch_timestamp": "2026-01-11T12:00:00+00:00",
+        "graphql": {
+            "gradeOverview": {
+                "grade": "1.7",
+                "modules": [
+                    {
+                        "modulId": 2,
+                        "modulbezeichnung": "Statistik",
+                        "examStatus": status,
+                        "grade": grade,
+                    }
+                ],
+            }
+        },
+        "moodle": {"events": events},
+    }
+
+
+def test_watcher_emits_typed_events(tmp_path):
+    """Test that status, grade and deadline changes become events."""
+    polls = iter(
+        [
+            _export("angemeldet", None, []),
+            _export("bestanden", "1.3", [{"id": "5", "title": "Abgabe Statistik"}]),
+        ]
+    )
+    lines: list[str] = []
+    sink = EventSink(output=tmp_path / "events.jsonl", write=lines.append)
+    watcher = Watcher(lambda: next(polls), sink, AdaptiveInterval(), sleep=lambda _: None)
+
+    assert watcher.poll() == []  # first poll is the baseline
+    events = watcher.poll()
+
+    assert [(e.type, e.field) for e in events] == [
+        ("status", "examStatus"),
+        ("grade", "grade"),
+        ("deadline", None),
+    ]
+    assert events[1].new == "1.3"
+    assert events[2].label == "Abgabe Statistik"
+    assert [json.loads(line)["type"] for line in lines] == ["status", "grade", "deadline"]
+    assert (tmp_path / "events.jsonl").read_text().count("\n") == 3
+
+
+def test_watcher_compares_first_poll_with_baseline():
+    """Test that changes since the stored snapshot are reported on the first poll."""
+    known = {"id": "5", "title": "Abgabe"}
+    baseline = normalize_snapshot({"fetch.json": _export("angemeldet", None, [known])})
+    lines: list[str] = []
+    watcher = Watcher(
+        lambda: _export("angemeldet", None, [known, {"id": "9", "title": "Klausur"}]),
+        EventSink(write=lines.append),
+        AdaptiveInterval(),
+        baseline=baseline,
+    )
+
+    assert [e.type for e in watcher.poll()] == ["deadline"]
+
+
+def test_watcher_learns_parts_missing_from_the_baseline():
+    """Test that a baseline without Moodle data does not report every event as added."""
+    baseline = normalize_snapshot({"fetch.json": {**_export("angemeldet", None, []), "moodle": {}}})
+    polls = iter(
+        [
+            _export("angemeldet", None, [{"id": "5", "title": "Abgabe"}]),
+            _export("bestanden", None, [{"id": "5", "title": "Abgabe"}]),
+        ]
+    )
+    watcher = Watcher(
+        lambda: next(polls), EventSink(write=print), AdaptiveInterval(), baseline=baseline
+    )
+
+    assert watcher.poll() == []
+    assert [e.type for e in watcher.poll()] == ["status"]
+
+
+def test_watcher_keeps_sources_missing_from_a_poll():
+    """Test that a failed Moodle poll does not report all deadlines as removed."""
+    full = _export("angemeldet", None, [{"id": "5", "title": "Abgabe"}])
+    without_moodle = {**full, "moodle": {}}
+    polls = iter([full, without_moodle])
+    watcher = Watcher(lambda: next(polls), EventSink(write=print), AdaptiveInterval())
+
+    watcher.poll()
+    assert watcher.poll() == []
+
+
+def test_adaptive_interval_backs_off_and_resets():
+    """Test backoff while quiet, exam period cap and reset after a change."""
+    interval = AdaptiveInterval(minimum=60, maximum=600, exam_maximum=120, backoff=2, jitter=0)
+
+    assert [interval.update(changed=False) for _ in range(5)] == [120, 240, 480, 600, 600]
+    assert interval.update(changed=False, exam_period=True) == 120
+    assert interval.update(changed=True) == 60
+
+
+def test_run_stops_after_count_and_survives_failures():
+    """Test that failed polls are reported and the loop continues."""
+    calls = []
+    messages: list[str] = []
+
+    def fetch():
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("session expired")
+        return _export("angemeldet", None, [])
+
+    sleeps: list[float] = []
+    watcher = Watcher(
+        fetch,
+        EventSink(write=print),
+        AdaptiveInterval(minimum=1, maximum=10, jitter=0),
+        status=messages.append,
+        sleep=sleeps.append,
+    )
+    watcher.run(max_polls=3)
+
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+    assert any("session expired" in message for message in messages)
+
+
+def test_fetch_delta_resets_clients_after_failures():
+    """Test that a failed poll makes the next one re-read the credentials."""
+    session = MagicMock()
+    session.graphql.execute_named_query.side_effect = RuntimeError("401 Unauthorized")
+    session.moodle.is_authenticated = False
+
+    with pytest.raises(RuntimeError, match="401"):
+        fetch_delta(session)
+    assert session.reset_clients.call_count == 1
+
+    session.graphql.execute_named_query.side_effect = None
+    session.graphql.execute_named_query.return_value.data = {"myStudentGradeOverview": {}}
+    assert fetch_delta(session)["graphql"]["gradeOverview"] == {}
+    assert session.reset_clients.call_count == 1